@@ -1,6 +1,9 @@
 #!/usr/bin/env bash
 set -euo pipefail
 IFS=$'\n\t'
+# The Python helpers import .deadf/lib; bytecode caches written there would
+# show up in the project's git status (verify.sh's git_clean check).
+export PYTHONDONTWRITEBYTECODE=1
 
 # Exit codes:
 # 0  - success (cycle kicked; subprocess exit code 0)
@@ -9,7 +12,10 @@ IFS=$'\n\t'
 # 12 - skip: complete
 # 13 - skip: cycle_running
 # 14 - skip: stale_running_cycle (recovered -> needs_human)
-# 20 - error: preflight/deps/state parse/update failure
+# 15 - skip: admission refused (iteration cap or time budget cannot fit a cycle)
+# 16 - skip: admission deferred (dispatch rate limit; see deadf-admission.py)
+# 20 - error: preflight/deps/state parse/update failure (incl. kick.sh's
+#      DEADF_INTEGRITY=enforce manifest check)
 # 21 - error: orchestrator spawn failure
 
 json_escape() {
@@ -35,7 +41,8 @@ log_json() {
   else
     ts="unknown"
   fi
-  printf '{"ts":"%s","level":"%s","event":"%s","exit_code":%s,"reason":"%s","project_path":"%s","cycle_id":"%s"}\n' \
+  local line
+  printf -v line '{"ts":"%s","level":"%s","event":"%s","exit_code":%s,"reason":"%s","project_path":"%s","cycle_id":"%s"}' \
     "$(json_escape "$ts")" \
     "$(json_escape "$level")" \
     "$(json_escape "$event")" \
@@ -43,6 +50,11 @@ log_json() {
     "$(json_escape "$reason")" \
     "$(json_escape "$project_path")" \
     "$(json_escape "$cycle_id")"
+  printf '%s\n' "$line"
+  # Keep a copy for deadf-stats.py (one O_APPEND write per event).
+  if [[ -n "${EVENTS_FILE:-}" && -d "${EVENTS_FILE%/*}" ]]; then
+    printf '%s\n' "$line" >> "$EVENTS_FILE" 2>/dev/null || true
+  fi
 }
 
 num_or_default() {
@@ -55,15 +67,14 @@ num_or_default() {
   fi
 }
 
-yq_read() {
-  local query="$1"
-  local file="$2"
+# Reads every requested STATE.yaml field with one parse; assigns them as shell variables.
+state_read() {
   local out
-  if ! out=$(yq -r "$query" "$file"); then
+  if ! out=$(python3 "$STATE_HELPER" get --file "$STATE_FILE" "$@"); then
     log_json "ERROR" "error" 20 "state_parse_failed" "$PROJECT_PATH" ""
     exit 20
   fi
-  printf '%s' "$out"
+  eval "$out"
 }
 
 stat_mtime() {
@@ -86,6 +97,9 @@ LOG_DIR="$DEADF_DIR/logs"
 STATE_FILE="$DEADF_DIR/state/STATE.yaml"
 POLICY_FILE="$DEADF_DIR/state/POLICY.yaml"
 KICK_SCRIPT="$DEADF_DIR/bin/kick.sh"
+STATE_HELPER="$DEADF_DIR/bin/deadf-state.py"
+LOGS_HELPER="$DEADF_DIR/bin/deadf-logs.py"
+EVENTS_FILE="$LOG_DIR/cron-kick.jsonl"
 
 if [[ ! -d "$DEADF_DIR" ]]; then
   if ! mkdir -p "$DEADF_DIR"; then
@@ -104,7 +118,7 @@ if [[ ! -w "$DEADF_DIR" || ! -w "$LOG_DIR" ]]; then
   exit 20
 fi
 
-for dep in flock yq date mktemp tee stat od tr; do
+for dep in flock yq python3 date mktemp tee stat od tr; do
   if ! command -v "$dep" >/dev/null 2>&1; then
     log_json "ERROR" "error" 20 "missing_dependency:$dep" "$PROJECT_PATH" ""
     exit 20
@@ -127,9 +141,12 @@ if ! flock -n 9; then
   exit 10
 fi
 
-cycle_status=$(yq_read '.cycle.status // "unknown"' "$STATE_FILE")
-phase=$(yq_read '.phase // "unknown"' "$STATE_FILE")
-started_at=$(yq_read '.cycle.started_at // ""' "$STATE_FILE")
+state_read \
+  "cycle_status=cycle.status//unknown" \
+  "phase=phase//unknown" \
+  "started_at=cycle.started_at//" \
+  "iteration_raw=loop.iteration//0" \
+  "current_track=track.id//"
 
 if [[ -z "$cycle_status" || "$cycle_status" == "null" ]]; then
   log_json "ERROR" "error" 20 "state_parse_failed" "$PROJECT_PATH" ""
@@ -149,15 +166,12 @@ if [[ "$cycle_status" == "running" ]]; then
   fi
   age=$((now_epoch - started_epoch))
   if (( age >= P1_CYCLE_TIMEOUT_S )); then
-    (
-      flock -w 5 8 || exit 1
-      tmp=$(mktemp "${STATE_FILE}.tmp.XXXXXX")
-      yq -y '(.cycle.status = "timed_out") | (.phase = "needs_human")' "$STATE_FILE" > "$tmp"
-      mv -f "$tmp" "$STATE_FILE"
-    ) 8>"${STATE_FILE}.flock" || {
+    # One batch under STATE.yaml.flock, journaled to STATE.journal.
+    if ! python3 "$STATE_HELPER" set --file "$STATE_FILE" --lock-timeout 5 \
+      "cycle.status=timed_out" "phase=needs_human" >/dev/null; then
       log_json "ERROR" "error" 20 "state_update_failed" "$PROJECT_PATH" ""
       exit 20
-    }
+    fi
     log_json "INFO" "skip" 14 "stale_running_cycle" "$PROJECT_PATH" ""
     exit 14
   fi
@@ -175,7 +189,6 @@ if [[ "$phase" == "complete" ]]; then
   exit 12
 fi
 
-iteration_raw=$(yq_read '.loop.iteration // 0' "$STATE_FILE")
 iteration=$(num_or_default "$iteration_raw" 0)
 iteration_plus_one=$((iteration + 1))
 hex=$(od -An -N4 -tx1 /dev/urandom | tr -d ' \n')
@@ -194,7 +207,6 @@ is_valid_task_list_id() {
 # ── Rotation check ──
 if [[ -f "$TASK_LIST_ID_FILE" ]]; then
   file_age=$(( $(date -u +%s) - $(stat_mtime "$TASK_LIST_ID_FILE") ))
-  current_track=$(yq_read '.track.id // ""' "$STATE_FILE")
   prev_track=""
   [[ -f "$TASK_LIST_TRACK_FILE" ]] && prev_track=$(cat "$TASK_LIST_TRACK_FILE")
 
@@ -231,23 +243,39 @@ if [[ -z "${CLAUDE_CODE_TASK_LIST_ID:-}" ]]; then
   fi
 fi
 
+# Older cycle logs move into the compressed, indexed archive (deadf-logs.py).
 P1_MAX_LOGS=${P1_MAX_LOGS:-50}
+P1_ARCHIVE_MAX_MB=$(num_or_default "${P1_ARCHIVE_MAX_MB:-}" 1024)
+P1_ARCHIVE_MAX_CYCLES=$(num_or_default "${P1_ARCHIVE_MAX_CYCLES:-}" 0)
 if [[ "$P1_MAX_LOGS" =~ ^[0-9]+$ ]]; then
-  mapfile -t old_logs < <(
-    find "$LOG_DIR" -maxdepth 1 -type f -name 'cycle-*.log' -printf '%T@ %p\n' |
-      sort -nr |
-      awk -v keep="$P1_MAX_LOGS" 'NR>keep {print $2}'
-  )
-  if (( ${#old_logs[@]} > 0 )); then
-    rm -f -- "${old_logs[@]}"
+  if ! python3 "$LOGS_HELPER" --deadf-dir "$DEADF_DIR" archive --keep "$P1_MAX_LOGS" \
+    --max-mb "$P1_ARCHIVE_MAX_MB" --max-cycles "$P1_ARCHIVE_MAX_CYCLES" >/dev/null; then
+    log_json "WARN" "log_archive_failed" 0 "logs left in place" "$PROJECT_PATH" "$CYCLE_ID"
   fi
 fi
 
 log_json "INFO" "spawn" 0 "spawn" "$PROJECT_PATH" "$CYCLE_ID"
-if ! CYCLE_ID="$CYCLE_ID" "$KICK_SCRIPT"; then
-  log_json "ERROR" "error" 21 "spawn_failed" "$PROJECT_PATH" "$CYCLE_ID"
-  exit 21
-fi
+kick_rc=0
+CYCLE_ID="$CYCLE_ID" "$KICK_SCRIPT" || kick_rc=$?
+case "$kick_rc" in
+  0) ;;
+  15)
+    log_json "INFO" "skip" 15 "admission_refused" "$PROJECT_PATH" "$CYCLE_ID"
+    exit 15
+    ;;
+  16)
+    log_json "INFO" "skip" 16 "admission_deferred" "$PROJECT_PATH" "$CYCLE_ID"
+    exit 16
+    ;;
+  20)
+    log_json "ERROR" "error" 20 "kick_preflight_failed" "$PROJECT_PATH" "$CYCLE_ID"
+    exit 20
+    ;;
+  *)
+    log_json "ERROR" "error" 21 "spawn_failed" "$PROJECT_PATH" "$CYCLE_ID"
+    exit 21
+    ;;
+esac
 
 log_json "INFO" "done" 0 "complete" "$PROJECT_PATH" "$CYCLE_ID"
 exit 0
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""deadf-admission.py — admission control for the next cycle (deadf.admission).
+
+`deadf-admission.py admit --cycle-id ID` decides whether a cycle may start
+now and records the outcome in .deadf/metrics/cycles.jsonl. It predicts the
+cycle's wall time from recent cycles (POLICY admission.*) and refuses a kick
+that cannot finish inside budget.started_at + budget.max_hours, or that is
+past loop.max_iterations. It defers a kick once
+admission.max_dispatches_per_hour dispatches happened in the last hour. The
+decision is printed as ADMISSION_* shell assignments (or --format json).
+`check` prints the same decision without recording it.
+
+`deadf-admission.py record --cycle-id ID --started T [--dispatched T]
+--exit-code N` records a finished cycle (kick.sh calls it when the CLI
+returns); `stats` summarizes wall, LLM dispatch and verify time as JSON.
+
+Exit 0: Admitted (or recorded / printed)
+Exit 1: STATE.yaml is missing or unparseable
+Exit 2: Bad usage
+Exit 15: Refused (iterations or time budget; waiting will not help)
+Exit 16: Deferred (dispatch rate limit; retry after ADMISSION_RETRY_AFTER_S)
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.admission.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
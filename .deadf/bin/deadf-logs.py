@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""deadf-logs.py — compressed, indexed cycle log history (deadf.logarchive).
+
+`deadf-logs.py archive [--keep N] [--max-mb MB] [--max-cycles N]` moves every
+.deadf/logs/cycle-*.log except the newest N (default 50) into rolling
+compressed segments under .deadf/logs/archive/. It then drops the oldest
+whole segments while the archive is over MB (default 1024) or N cycles.
+ralph.sh and cron-kick.sh run it before each kick; it prints one summary
+line, or nothing when there was nothing to archive or drop. Each log becomes
+its own zstd frame (or gzip member without the zstandard module), with an
+index line holding the cycle id, the frame's byte range, the exit token and
+timestamps.
+
+`deadf-logs.py show CYCLE_ID` prints one cycle's log, decompressing only its
+own frame. `deadf-logs.py list [--last N]` prints the index as
+tab-separated lines.
+
+Exit 0: Archived (or skipped: nothing changed, another run holds the lock) / printed
+Exit 1: No log for that cycle, or the archive cannot be read or written
+Exit 2: Bad usage (e.g. --codec zstd without the zstandard module)
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.logarchive.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""deadf-state.py — read and write STATE.yaml / POLICY.yaml fields (deadf.state).
+
+`deadf-state.py get [--file FILE] [--format shell|nul] FIELD...` parses the
+file once and prints every requested field. A field is
+`[NAME=]path[//default]`, e.g. `cycle_status=cycle.status//unknown`.
+With `--format shell` (default) the output is `NAME='value'` lines for `eval`;
+with `--format nul` it is the values alone, each NUL-terminated.
+
+`deadf-state.py serve [--file FILE] [--watch DIR]` stays running for a loop
+controller (ralph.sh runs it as a coprocess). Each stdin line is a
+tab-separated list of fields; each reply is an exit-code line plus shell
+assignments, terminated by NUL. The parse is reused until the file's inode,
+mtime or size changes. A `!wait<TAB>SECONDS` line blocks (inotify on Linux)
+until the file differs from the version last served, or a file under a
+`--watch` directory is written, and replies changed, activity or timeout.
+
+`deadf-state.py set [--file FILE] [--compact] path=value|path:=json ...`
+applies all assignments as one batch under STATE.yaml.flock, appended to
+STATE.journal. The journal is compacted into STATE.yaml once it holds 16
+batches or 64 KiB, or at once with `--compact`.
+`deadf-state.py compact` folds pending journal batches into STATE.yaml; run it
+before reading or rewriting STATE.yaml with anything else (yq).
+Readers (get, serve) always see STATE.yaml with the journal applied.
+
+Exit 0: Fields printed / batch written / journal compacted
+Exit 1: The file is missing, unreadable or not valid YAML, or the lock timed out
+Exit 2: A field spec or assignment is malformed (or bad usage)
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.state.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
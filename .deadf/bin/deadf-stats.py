@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""deadf-stats.py — cycle throughput report from the metrics store (deadf.stats).
+
+`deadf-stats.py [--hours H] [--json]` first ingests what is new in
+.deadf/logs/cron-kick.jsonl (cron-kick.sh's log_json events) and
+.deadf/metrics/cycles.jsonl (dispatches, cycle times, verify results) into
+.deadf/metrics/metrics.db (SQLite). It then reports the last H hours
+(default 24): cycles/hour, p50/p95 cycle time, verify pass rate, skip and
+error reasons, admission refusals and deferrals, retries per track, and an
+hourly breakdown.
+
+Ingestion is incremental: only complete lines past the stored offset are
+read, and each line is stored once. Once ingested, either file past 8 MiB
+is renamed to `<file>.1` and its writers start a new one. `--ingest-only` just ingests (e.g. from
+cron); `--no-ingest` reports from the store as it is.
+
+Exit 0: Report printed (or events ingested)
+Exit 1: The store cannot be opened or written
+Exit 2: Bad usage
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.stats.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""deadf-supervisor.py — run many deadf pipelines from one process (deadf.supervisor).
+
+`deadf-supervisor.py --root DIR [--root DIR ...] [--max-concurrent N]` finds
+every project under the roots (a directory with .deadf/state/STATE.yaml and
+an executable .deadf/bin/cron-kick.sh) and keeps kicking the ready ones:
+idle, not needs_human/complete, iterations and time budget left. The least
+recently kicked project goes first, each project runs one cycle at a time,
+and at most N cycles (default: CPU count) run at once. Each cycle is the
+project's own cron-kick.sh, whose output goes to .deadf/logs/supervisor.log
+(moved to supervisor.log.1 once it passes 8 MiB). A cycle running past
+--cycle-timeout gets SIGTERM, then SIGKILL --kill-grace seconds later, while
+the other projects keep being scheduled.
+The supervisor's events are JSON lines on stdout (or --log FILE).
+
+`--once` gives every ready project one cycle and exits; `--list` prints the
+discovered projects. SIGTERM/SIGINT terminates running cycles and exits.
+
+Exit 0: Stopped (signal, or --once finished)
+Exit 2: Bad usage (a root is not a directory)
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.supervisor.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""init-collect.py — single-pass P12 evidence collector (deadf.initcollect).
+
+`init-collect.py [--project DIR] [--depth N] [--jobs N] [--no-gitignore]`
+walks DIR once and writes .deadf/p12/evidence/ in the layout init-collect.sh
+always produced: tree.txt plus deps-, config-, doc-, ci- and entry- snippets.
+Paths ignored by the project's .gitignore files (and .git/info/exclude) are
+left out unless --no-gitignore is given. Snippets are written by N threads
+(default 8). Phase timings and counts go to .deadf/p12/collect-timing.json.
+
+init-collect.sh execs this when python3 is available and falls back to its
+find pipelines otherwise.
+
+Exit 0: Evidence written
+Exit 1: Project path missing or evidence dir cannot be created
+Exit 2: Bad usage
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.initcollect.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 #!/bin/bash
 set -uo pipefail
+# The Python helpers import .deadf/lib; bytecode caches written there would
+# show up in the project's git status (verify.sh's git_clean check).
+export PYTHONDONTWRITEBYTECODE=1
 
 usage() {
     cat <<'USAGE'
@@ -69,6 +72,14 @@ if [[ "$DEPTH" -ge 2 ]]; then
     FIND_MAX_DEPTH=4
 fi
 
+# The Python collector does all of the below in one walk, with .gitignore
+# support and threaded snippet writes. The find pipelines are the fallback
+# without python3 (or with DEADF_COLLECT_PY=0).
+COLLECT_PY="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/init-collect.py"
+if [[ "${DEADF_COLLECT_PY:-1}" != "0" && -f "$COLLECT_PY" ]] && command -v python3 >/dev/null 2>&1; then
+    exec python3 "$COLLECT_PY" --project "$PROJECT_PATH" --depth "$DEPTH"
+fi
+
 EVIDENCE_DIR="$PROJECT_PATH/.deadf/p12/evidence"
 
 if ! mkdir -p "$EVIDENCE_DIR"; then
@@ -3,6 +3,9 @@
 # Responsibilities: assemble kick message from template, dispatch to Claude Code.
 set -euo pipefail
 IFS=$'\n\t'
+# The Python helpers import .deadf/lib; bytecode caches written there would
+# show up in the project's git status (verify.sh's git_clean check).
+export PYTHONDONTWRITEBYTECODE=1
 
 SCRIPT_DIR=$(cd -- "$(dirname -- "${BASH_SOURCE[0]}")" && pwd)
 DEADF_ROOT="${DEADF_ROOT:-$(cd -- "$SCRIPT_DIR/.." && pwd)}"
@@ -12,6 +15,9 @@ STATE_FILE="$DEADF_ROOT/state/STATE.yaml"
 POLICY_FILE="$DEADF_ROOT/state/POLICY.yaml"
 TEMPLATE_FILE="$DEADF_ROOT/templates/kick/cycle-kick.md"
 LOG_DIR="$DEADF_ROOT/logs"
+STATE_HELPER="$DEADF_ROOT/bin/deadf-state.py"
+ADMISSION_HELPER="$DEADF_ROOT/bin/deadf-admission.py"
+LINT_HELPER="$DEADF_ROOT/bin/lint-templates.py"
 
 log_err() { echo "[kick] $(date -u -Iseconds) ERROR: $*" >&2; }
 
@@ -23,20 +29,17 @@ preflight() {
   [[ -f "$STATE_FILE" ]] || { log_err "STATE.yaml not found: $STATE_FILE"; exit 20; }
   [[ -f "$POLICY_FILE" ]] || { log_err "POLICY.yaml not found: $POLICY_FILE"; exit 20; }
   [[ -f "$TEMPLATE_FILE" ]] || { log_err "Kick template not found: $TEMPLATE_FILE"; exit 20; }
+  [[ -f "$STATE_HELPER" ]] || { log_err "deadf-state.py not found: $STATE_HELPER"; exit 20; }
+  [[ -f "$ADMISSION_HELPER" ]] || { log_err "deadf-admission.py not found: $ADMISSION_HELPER"; exit 20; }
 
   mkdir -p "$LOG_DIR" || { log_err "Cannot create log dir: $LOG_DIR"; exit 20; }
   [[ -w "$LOG_DIR" ]] || { log_err "Log dir not writable: $LOG_DIR"; exit 20; }
 
-  require_cmd yq
+  require_cmd python3
   require_cmd mktemp
   require_cmd tee
   require_cmd od
   require_cmd tr
-
-  if ! yq --version 2>/dev/null | grep -qE 'version v?4\.'; then
-    log_err "yq v4.x required (mikefarah/yq). Found: $(yq --version 2>/dev/null || echo 'unknown')"
-    exit 20
-  fi
 }
 
 num_or_default() {
@@ -49,15 +52,16 @@ num_or_default() {
   fi
 }
 
-yq_read() {
-  local query="$1"
-  local file="$2"
+# Reads every requested field with one parse; assigns them as shell variables.
+state_read() {
+  local file="$1"
+  shift
   local out
-  if ! out=$(yq -r "$query" "$file" 2>/dev/null); then
-    log_err "Failed to read: $query from $file"
+  if ! out=$(python3 "$STATE_HELPER" get --file "$file" "$@"); then
+    log_err "Failed to read state fields from $file"
     exit 20
   fi
-  printf '%s' "$out"
+  eval "$out"
 }
 
 parse_template() {
@@ -70,6 +74,53 @@ parse_template() {
   printf '%s' "$tpl"
 }
 
+# Unix time with sub-second precision (for the cycle metrics).
+now_epoch() {
+  if [[ -n "${EPOCHREALTIME:-}" ]]; then
+    printf '%s' "${EPOCHREALTIME/,/.}"
+  else
+    date -u +%s
+  fi
+}
+
+# Drift and tamper check against .deadf/manifest.yaml (digests are cached, so
+# this costs a few ms). DEADF_INTEGRITY: warn (default) logs and continues,
+# enforce stops the kick (exit 20), off skips it.
+integrity_check() {
+  local mode="${DEADF_INTEGRITY:-warn}" out rc=0
+  [[ "$mode" == "off" ]] && return 0
+  [[ -f "$LINT_HELPER" && -f "$PROJECT_ROOT/.deadf/manifest.yaml" ]] || return 0
+  out=$(python3 "$LINT_HELPER" --root "$PROJECT_ROOT" --integrity) || rc=$?
+  [[ $rc -eq 0 ]] && return 0
+  log_err "Integrity check failed (exit $rc):"
+  printf '%s\n' "$out" | grep -v '^\[OK\]' >&2 || true
+  if [[ "$mode" == "enforce" ]]; then
+    exit 20
+  fi
+}
+
+# Admission control: refuse (15) or defer (16) a cycle that cannot finish
+# inside the time budget or exceeds the dispatch rate limit. Admitted
+# dispatches are recorded in .deadf/metrics/cycles.jsonl.
+admit_cycle() {
+  local cycle_id="$1"
+  local out rc=0
+  out=$(python3 "$ADMISSION_HELPER" --deadf-dir "$DEADF_ROOT" admit --cycle-id "$cycle_id") || rc=$?
+  case "$rc" in
+    0) return 0 ;;
+    15|16)
+      local ADMISSION_ACTION="" ADMISSION_REASON="" ADMISSION_PREDICTED_S="" ADMISSION_REMAINING_S=""
+      local ADMISSION_RETRY_AFTER_S="" ADMISSION_SAMPLES=""
+      eval "$out"
+      echo "[kick] $(date -u -Iseconds) Admission ${ADMISSION_ACTION}: ${ADMISSION_REASON}" \
+        "(predicted_s=${ADMISSION_PREDICTED_S} remaining_s=${ADMISSION_REMAINING_S:-none}" \
+        "retry_after_s=${ADMISSION_RETRY_AFTER_S})" >&2
+      exit "$rc"
+      ;;
+    *) log_err "Admission check failed (exit $rc)"; exit 20 ;;
+  esac
+}
+
 generate_cycle_id() {
   local iteration="$1"
   local iteration_plus_one=$((iteration + 1))
@@ -79,20 +130,25 @@ generate_cycle_id() {
 }
 
 main() {
+  local kick_started
+  kick_started=$(now_epoch)
   preflight
+  integrity_check
 
   local project_path project_name
   project_path="$PROJECT_ROOT"
   project_name=$(basename -- "$project_path")
 
-  local cycle_status phase sub_step iteration_raw task_id retry_count_raw max_retries_raw
-  cycle_status=$(yq_read '.cycle.status // "unknown"' "$STATE_FILE")
-  phase=$(yq_read '.phase // "unknown"' "$STATE_FILE")
-  sub_step=$(yq_read '.task.sub_step // "-"' "$STATE_FILE")
-  iteration_raw=$(yq_read '.loop.iteration // 0' "$STATE_FILE")
-  task_id=$(yq_read '.task.id // "-"' "$STATE_FILE")
-  retry_count_raw=$(yq_read '.task.retry_count // 0' "$STATE_FILE")
-  max_retries_raw=$(yq_read '.task.max_retries // 0' "$STATE_FILE")
+  local cycle_status phase sub_step iteration_raw task_id retry_count_raw max_retries_raw mode
+  state_read "$STATE_FILE" \
+    "cycle_status=cycle.status//unknown" \
+    "phase=phase//unknown" \
+    "sub_step=task.sub_step//-" \
+    "iteration_raw=loop.iteration//0" \
+    "task_id=task.id//-" \
+    "retry_count_raw=task.retry_count//0" \
+    "max_retries_raw=task.max_retries//0" \
+    "mode=mode//unknown"
 
   local iteration retry_count max_retries
   iteration=$(num_or_default "$iteration_raw" 0)
@@ -102,9 +158,8 @@ main() {
   local state_hint
   state_hint="${cycle_status} ${phase}:${sub_step} #${iteration} task=${task_id} retry=${retry_count}/${max_retries}"
 
-  local mode discord_channel
-  mode=$(yq_read '.mode // "unknown"' "$STATE_FILE")
-  discord_channel=$(yq_read '.heartbeat.discord_channel // "unknown"' "$POLICY_FILE")
+  local discord_channel
+  state_read "$POLICY_FILE" "discord_channel=heartbeat.discord_channel//unknown"
   if [[ -z "$discord_channel" || "$discord_channel" == "null" ]]; then
     discord_channel="unknown"
   fi
@@ -138,9 +193,19 @@ main() {
     exit 21
   fi
 
+  admit_cycle "$cycle_id"
+  # verify.sh attributes its run time to this cycle through DEADF_CYCLE_ID.
+  export DEADF_CYCLE_ID="$cycle_id"
+
+  local dispatched
+  dispatched=$(now_epoch)
+  local rc=0
+  # pipefail: rc is the CLI's exit code (set -e must not skip the metrics record).
   "$claude_exe" --print --allowedTools "Read,Write,Edit,Bash,Task,Glob,Grep" "$kick_message" \
-    2>&1 | tee "$LOG_DIR/cycle-${cycle_id}.log"
-  local rc=${PIPESTATUS[0]}
+    2>&1 | tee "$LOG_DIR/cycle-${cycle_id}.log" || rc=$?
+  python3 "$ADMISSION_HELPER" --deadf-dir "$DEADF_ROOT" record --cycle-id "$cycle_id" \
+    --started "$kick_started" --dispatched "$dispatched" --exit-code "$rc" \
+    || log_err "Failed to record cycle metrics"
   if [[ $rc -ne 0 ]]; then
     log_err "Claude Code CLI exited non-zero: $rc"
     exit 21
@@ -1,38 +1,41 @@
 #!/usr/bin/env python3
+"""lint-templates.py — template ↔ contract drift checker.
+
+Checks that every file in .deadf/manifest.yaml exists, that every sentinel
+block a template opens has a grammar under .deadf/contracts/sentinel/, and
+that every grammar is used by some template.
+
+`--integrity` also compares each manifest file's sha256 with the recorded
+one and reports files under .deadf/{bin,contracts,lib,templates} that the
+manifest does not list (deadf.manifest). Digests are cached by (size,
+mtime_ns, inode) in .deadf/cache/manifest/, so a run with nothing changed
+hashes nothing; `--no-cache` re-hashes every file. `--regenerate` rewrites
+the manifest from the tree in one pass.
+
+Template references come from a persistent index in .deadf/cache/templates/
+that re-reads only templates whose size or mtime changed. `--used-by
+GRAMMAR` lists the templates that open GRAMMAR's blocks. `--json` prints the
+whole report (manifest, references, missing and orphaned grammars and
+templates) as JSON.
+
+Exit 0: No drift (or manifest regenerated)
+Exit 1: Drift, missing or modified files
+"""
 import argparse
-import re
+import json
+import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.manifest import integrity, refindex  # noqa: E402
+
 
 def parse_manifest_paths(manifest_path: Path) -> list[Path]:
     if not manifest_path.exists():
         raise FileNotFoundError(f"manifest missing: {manifest_path}")
-    paths = []
-    path_re = re.compile(r"^\s*-\s+path:\s*(.+?)\s*$")
-    for line in manifest_path.read_text(encoding="utf-8").splitlines():
-        m = path_re.match(line)
-        if m:
-            paths.append(Path(m.group(1)))
-    return paths
-
-
-def extract_sentinel_refs(text: str) -> list[tuple[str, str]]:
-    # Match openers like <<<TRACK:V1:NONCE=...>>>
-    # Ignore END_ blocks.
-    refs = []
-    for m in re.finditer(r"<<<([A-Z0-9_]+):V(\d+):", text):
-        block_type = m.group(1)
-        if block_type.startswith("END_"):
-            continue
-        version = m.group(2)
-        refs.append((block_type, version))
-    return refs
-
-
-def type_to_grammar(block_type: str, version: str) -> str:
-    name = block_type.lower().replace("_", "-")
-    return f"{name}.v{version}.md"
+    return [Path(p) for p, _ in integrity.parse_manifest(str(manifest_path))]
 
 
 def relpath(path: Path, base: Path) -> str:
@@ -45,79 +48,102 @@ def relpath(path: Path, base: Path) -> str:
 def main() -> int:
     parser = argparse.ArgumentParser(description="Template ↔ contract drift checker")
     parser.add_argument("--verbose", action="store_true", help="show OK lines")
+    parser.add_argument("--root", default=None, help="repo root (default: current directory)")
+    parser.add_argument("--integrity", action="store_true", help="verify manifest sha256 digests")
+    parser.add_argument("--regenerate", action="store_true", help="rewrite manifest.yaml from the tree")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="hash and scan every file, ignoring cached digests and the template index")
+    parser.add_argument("--jobs", type=int, default=8, help="hashing threads (default: 8)")
+    parser.add_argument("--json", action="store_true", help="print a JSON report instead of text")
+    parser.add_argument("--used-by", metavar="GRAMMAR", default=None,
+                        help="list the templates that reference GRAMMAR (e.g. plan.v1.md) and exit")
     args = parser.parse_args()
 
-    repo_root = Path.cwd()
+    repo_root = Path(args.root) if args.root else Path.cwd()
     deadf = repo_root / ".deadf"
     manifest_path = deadf / "manifest.yaml"
-    templates_dir = deadf / "templates"
-    sentinel_dir = deadf / "contracts" / "sentinel"
 
-    drift = False
+    if args.regenerate:
+        count = integrity.regenerate(str(repo_root), str(manifest_path), args.jobs, not args.no_cache)
+        print(f"[OK] Regenerated {relpath(manifest_path, repo_root)} ({count} files)")
+        return 0
+
+    index = refindex.TemplateIndex(str(deadf), use_cache=not args.no_cache)
+    index.update()
+    if args.used_by:
+        for tpl in index.used_by(args.used_by):
+            print(tpl)
+        return 0
+
+    report: dict = {"ok": True, "manifest": {}, "templates": {}, "missing_grammars": [],
+                    "orphaned_templates": [], "orphaned_grammars": []}
+    lines: list[str] = []
 
     # 1) Manifest verification
     try:
         manifest_paths = parse_manifest_paths(manifest_path)
     except FileNotFoundError as e:
-        print(f"[FAIL] {e}")
+        report["ok"] = False
+        report["error"] = str(e)
+        print(json.dumps(report, indent=2) if args.json else f"[FAIL] {e}")
         return 1
 
-    missing_manifest = [p for p in manifest_paths if not (repo_root / p).exists()]
-    if missing_manifest:
-        drift = True
-        print(f"[FAIL] Missing {len(missing_manifest)} manifest files:")
-        for p in missing_manifest:
-            print(f"  - {p}")
+    manifest = report["manifest"]
+    manifest["entries"] = len(manifest_paths)
+    if args.integrity:
+        check = integrity.check(str(repo_root), str(manifest_path), args.jobs, not args.no_cache)
+        manifest.update(missing=check.missing, modified=check.mismatched, unlisted=check.unlisted,
+                        hashed=check.hashed, cached=check.cached)
+        for label, paths in (("Missing {} manifest files", check.missing),
+                             ("{} manifest files modified (sha256 mismatch)", check.mismatched),
+                             ("{} files not in manifest", check.unlisted)):
+            if paths:
+                lines.append(f"[FAIL] {label.format(len(paths))}:")
+                lines.extend(f"  - {p}" for p in paths)
+        if check.ok:
+            lines.append(f"[OK] All {check.total} manifest digests match "
+                         f"({check.hashed} hashed, {check.cached} cached)")
     else:
-        if args.verbose:
-            print(f"[OK] All {len(manifest_paths)} manifest files present")
+        missing_manifest = [str(p) for p in manifest_paths if not (repo_root / p).exists()]
+        manifest["missing"] = missing_manifest
+        if missing_manifest:
+            lines.append(f"[FAIL] Missing {len(missing_manifest)} manifest files:")
+            lines.extend(f"  - {p}" for p in missing_manifest)
         else:
-            print(f"[OK] All {len(manifest_paths)} manifest files present")
+            lines.append(f"[OK] All {len(manifest_paths)} manifest files present")
+    if any(manifest.get(k) for k in ("missing", "modified", "unlisted")):
+        report["ok"] = False
 
     # 2) Template → grammar references
-    template_refs: dict[Path, list[Path]] = {}
-    referenced_grammars: set[Path] = set()
-
-    for template in sorted(templates_dir.rglob("*")):
-        if not template.is_file():
-            continue
-        text = template.read_text(encoding="utf-8")
-        refs = list(set(extract_sentinel_refs(text)))
-        grammars = []
-        has_marker = re.search(r"<<<[A-Z0-9_]+:V\d+:", text) is not None
-        for block_type, version in refs:
-            grammar_name = type_to_grammar(block_type, version)
-            grammar_path = sentinel_dir / grammar_name
-            grammars.append(grammar_path)
-            if grammar_path.exists():
-                referenced_grammars.add(grammar_path)
+    report["templates"] = {"count": len(index.templates), "reparsed": index.reparsed,
+                           "references": {}}
+    for tpl in sorted(index.templates, key=lambda rel: rel.split("/")):
+        entry = index.templates[tpl]
+        report["templates"]["references"][tpl] = entry["refs"]
+        for grammar in entry["refs"]:
+            if index.has_grammar(grammar):
                 if args.verbose:
-                    tpl_rel = relpath(template, templates_dir)
-                    gram_rel = relpath(grammar_path, deadf / "contracts")
-                    print(f"[OK] Template {tpl_rel} → {gram_rel} ✓")
+                    lines.append(f"[OK] Template {tpl} → sentinel/{grammar} ✓")
             else:
-                drift = True
-                tpl_rel = relpath(template, templates_dir)
-                gram_rel = relpath(grammar_path, deadf / "contracts")
-                print(
-                    f"[FAIL] Template {tpl_rel} references {gram_rel} but file missing"
-                )
-        template_refs[template] = grammars
-        if not grammars and has_marker:
-            drift = True
-            tpl_rel = relpath(template, templates_dir)
-            print(f"[WARN] Orphaned template: {tpl_rel} (no sentinel references)")
+                report["missing_grammars"].append({"template": tpl, "grammar": grammar})
+                lines.append(f"[FAIL] Template {tpl} references sentinel/{grammar} but file missing")
+        if not entry["refs"] and entry["marker"]:
+            report["orphaned_templates"].append(tpl)
+            lines.append(f"[WARN] Orphaned template: {tpl} (no sentinel references)")
 
     # 3) Orphaned grammars (no templates reference)
-    for grammar in sorted(sentinel_dir.glob("*.md")):
-        if grammar not in referenced_grammars:
-            drift = True
-            gram_rel = relpath(grammar, deadf / "contracts")
-            print(
-                f"[WARN] Orphaned grammar: {gram_rel} (no template references it)"
-            )
-
-    return 1 if drift else 0
+    for grammar in index.orphaned():
+        report["orphaned_grammars"].append(grammar)
+        lines.append(f"[WARN] Orphaned grammar: sentinel/{grammar} (no template references it)")
+
+    if report["missing_grammars"] or report["orphaned_templates"] or report["orphaned_grammars"]:
+        report["ok"] = False
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for line in lines:
+            print(line)
+    return 0 if report["ok"] else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""verify-criteria.py — concurrent LLM criterion verification (deadf.criteria).
+
+`verify-criteria.py --plan PLAN.json --nonce NONCE [--evidence EVIDENCE.json]
+[--criteria AC1,AC2] [--cli CMD] [--jobs N] [--timeout S] [--fail-fast]`
+renders templates/verify/verify-criterion.md for each criterion of the plan
+(parse-blocks.py plan output), sends every prompt to the verifier CLI on
+stdin (default `$DEADF_VERIFY_CLI`, else `$CLAUDE_BIN --print`), at most N
+at once, and prints the verdict JSON build-verdict.py would build from the
+responses. The first NEEDS_HUMAN (unparseable response, CLI failure or
+timeout), or with --fail-fast the first NO, stops the remaining criteria;
+they are reported as SKIPPED. --save-responses FILE keeps the raw
+[criterion_id, raw_response] pairs.
+
+Exit 0: Verdict JSON emitted (PASS, FAIL or NEEDS_HUMAN)
+Exit 1: Bad input (nonce, plan, evidence, template, criteria) or CLI not found
+Exit 2: Bad usage
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.criteria.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
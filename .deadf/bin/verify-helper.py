@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""verify-helper.py — Python helpers for verify.sh (deadf.verify).
+
+`verify-helper.py snapshot --repo DIR --out DIR` collects the git facts shared
+by the diff, path and secret checks: one `git diff --numstat -z` run and one
+streamed patch, parsed into changed paths and added lines per file.
+
+`verify-helper.py secrets --added FILE [--config FILE]` scans a snapshot's
+added lines with every secret rule in one pass and prints one
+rule<TAB>path<TAB>line<TAB>truncated-match row per finding.
+
+`verify-helper.py test-impact --repo DIR --changed-z FILE --cache DIR` maps
+changed paths to the pytest files they can affect (import graph + cached
+collection) and prints MODE=impact|full, REASON=, TOTAL= and one TEST= line
+per selected file.
+
+`verify-helper.py test-report --kind junit|jest|none --report FILE --log FILE`
+summarizes a test run from the runner's report (or TAP / summary lines in its
+log) and prints COUNT=, SUMMARY= and JSON= (counts, failures, slowest tests).
+
+`verify-helper.py cache-key|cache-get|cache-put` compute the result-cache key
+(HEAD, working-tree hash, check inputs) and read or store a result under it.
+
+Exit 0: Snapshot written / scan or selection completed / cache hit or stored
+Exit 1: A git command failed, the secrets config is invalid, or a cache miss
+        (verify.sh treats the first two as failures)
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from deadf.verify.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,18 @@
 #   2. Linter            — run project lint command, capture exit code
 #   3. Git diff analysis — count changed lines, compare to ESTIMATED_DIFF
 #   4. Path validation   — ensure only allowed files were modified
-#   5. Secret scanning   — grep for common secret patterns
+#   5. Secret scanning   — match secret patterns against added lines
 #   6. Git clean check   — no uncommitted files after implementation
 #
+# Checks 3-5 read one shared git snapshot (verify-helper.py snapshot) taken
+# up front instead of each walking the diff themselves.
+# Checks 1-6 run concurrently in two phases (git checks, then lint + tests),
+# each in its own subshell writing to a per-check result file; results are
+# merged in a fixed order, so the JSON matches a serial run apart from
+# "timings_ms". VERIFY_PARALLEL=0 runs them one at a time.
+# Passing results are cached by tree hash and check inputs (see Result Cache);
+# --no-cache or VERIFY_NO_CACHE=1 always re-runs.
+#
 # Output: structured JSON to stdout (all diagnostic logging to stderr).
 # Exit 0 always (result carried in JSON "pass" field).
 # Exit 1 only on internal error (cannot produce valid JSON).
@@ -18,18 +27,26 @@
 # The orchestrator (Clawdbot) and LLM verifier handle judgment.
 
 set -uo pipefail
+# The Python helpers import .deadf/lib; bytecode caches written there would
+# show up in the project's git status (verify.sh's git_clean check).
+export PYTHONDONTWRITEBYTECODE=1
 
 # ── Task Discovery ─────────────────────────────────────────────────────────
 DEADF_ROOT="${VERIFY_DEADF_ROOT:-${VERIFY_PROJECT_DIR:-$(pwd)}}"
 STATE_FILE="${DEADF_ROOT}/STATE.yaml"
+# deadf-state.py applies STATE.journal batches not yet compacted into STATE.yaml.
+STATE_HELPER="$(dirname "${BASH_SOURCE[0]}")/deadf-state.py"
 
 if [[ -n "${VERIFY_TASK_FILE:-}" ]]; then
   TASK_FILE="${VERIFY_TASK_FILE}"
 else
   TASK_FILE=""
-  if command -v yq &>/dev/null && [[ -f "$STATE_FILE" ]]; then
-    TRACK_ID=$(yq -r '.track.id // "null"' "$STATE_FILE" 2>/dev/null || echo "null")
-    TASK_CURRENT=$(yq -r '.track.task_current // "null"' "$STATE_FILE" 2>/dev/null || echo "null")
+  if [[ -f "$STATE_FILE" ]]; then
+    TRACK_ID="null"
+    TASK_CURRENT="null"
+    { IFS= read -r -d '' TRACK_ID && IFS= read -r -d '' TASK_CURRENT; } < <(
+      python3 "$STATE_HELPER" get --file "$STATE_FILE" --format nul \
+        "track.id//null" "track.task_current//null" 2>/dev/null) || true
     if [[ "$TRACK_ID" != "null" && "$TASK_CURRENT" != "null" && "$TASK_CURRENT" =~ ^[0-9]+$ ]]; then
       TASK_NUM=$(printf '%03d' "$TASK_CURRENT")
       TASK_FILE="${DEADF_ROOT}/tracks/${TRACK_ID}/tasks/${TASK_NUM}.task.md"
@@ -44,10 +61,21 @@ fi
 # ── Configuration ──────────────────────────────────────────────────────────
 PROJECT_DIR="${VERIFY_PROJECT_DIR:-.}"
 CHECK_TIMEOUT="${VERIFY_CHECK_TIMEOUT:-120}"
+VERIFY_BIN_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+VERIFY_PARALLEL="${VERIFY_PARALLEL:-1}"
+SECRETS_FILE="${VERIFY_SECRETS_FILE:-${PROJECT_DIR}/.deadf/secrets.json}"
+VERIFY_CACHE_DIR="${VERIFY_CACHE_DIR:-${PROJECT_DIR}/.deadf/cache/verify}"
+VERIFY_TEST_IMPACT="${VERIFY_TEST_IMPACT:-1}"
+VERIFY_FULL_SUITE_EVERY="${VERIFY_FULL_SUITE_EVERY:-10}"
+VERIFY_NO_CACHE="${VERIFY_NO_CACHE:-0}"
+VERIFY_CACHE_MAX_KB="${VERIFY_CACHE_MAX_KB:-4096}"
+VERIFY_SLOWEST_TESTS="${VERIFY_SLOWEST_TESTS:-5}"
+VERIFY_METRICS_FILE="${VERIFY_METRICS_FILE:-${PROJECT_DIR}/.deadf/metrics/cycles.jsonl}"
 
 # ── Globals ────────────────────────────────────────────────────────────────
 FAILURES=()
 PASS=true
+VERIFY_WORK_DIR=""  # per-run scratch directory (set in main)
 
 # ── Helpers ────────────────────────────────────────────────────────────────
 
@@ -65,11 +93,12 @@ run_with_timeout() {
   return $?
 }
 
-# Read a field from STATE.yaml using yq. Returns "null" if missing.
+# Read a field from STATE.yaml (journal applied). Returns "null" if missing.
 read_state() {
-  local path="$1"
-  if command -v yq &>/dev/null && [[ -f "$STATE_FILE" ]]; then
-    yq -r ".$path // \"null\"" "$STATE_FILE" 2>/dev/null || echo "null"
+  local path="$1" value=""
+  if [[ -f "$STATE_FILE" ]] && IFS= read -r -d '' value \
+      < <(python3 "$STATE_HELPER" get --file "$STATE_FILE" --format nul "$path//null" 2>/dev/null); then
+    printf '%s\n' "$value"
   else
     echo "null"
   fi
@@ -121,61 +150,179 @@ parse_task_file() {
   fi
 }
 
-# ── Check 1: Test Suite ───────────────────────────────────────────────────
-
-check_tests() {
-  local test_exit=0
-  local test_count=0
-  local test_summary="no tests found"
-  local test_output=""
-
-  # Detect test runner
-  local test_cmd=""
+# Detect the project's test command. Sets TEST_CMD (empty if none) and
+# PYTEST_RUNNER (the bare pytest invocation, empty for other runners).
+detect_test_cmd() {
+  TEST_CMD=""
+  PYTEST_RUNNER=""
   if [[ -f "${PROJECT_DIR}/package.json" ]]; then
     if command -v npm &>/dev/null; then
-      test_cmd="npm test"
+      TEST_CMD="npm test"
     fi
   elif [[ -f "${PROJECT_DIR}/pytest.ini" ]] || [[ -f "${PROJECT_DIR}/setup.py" ]] || \
        [[ -f "${PROJECT_DIR}/pyproject.toml" ]] || [[ -d "${PROJECT_DIR}/tests" ]]; then
     if command -v pytest &>/dev/null; then
-      test_cmd="pytest --tb=short -q"
+      PYTEST_RUNNER="pytest"
     elif command -v python3 &>/dev/null; then
-      test_cmd="python3 -m pytest --tb=short -q"
+      PYTEST_RUNNER="python3 -m pytest"
     fi
+    [[ -n "$PYTEST_RUNNER" ]] && TEST_CMD="${PYTEST_RUNNER} --tb=short -q"
   elif [[ -f "${PROJECT_DIR}/Makefile" ]] && grep -q '^test:' "${PROJECT_DIR}/Makefile" 2>/dev/null; then
-    test_cmd="make test"
+    TEST_CMD="make test"
+  fi
+}
+
+# Detect the project's lint command. Sets LINT_CMD (empty if none).
+detect_lint_cmd() {
+  LINT_CMD=""
+  if [[ -f "${PROJECT_DIR}/package.json" ]]; then
+    if command -v npx &>/dev/null && { ls "${PROJECT_DIR}"/.eslintrc* &>/dev/null || \
+       grep -q '"eslint"' "${PROJECT_DIR}/package.json" 2>/dev/null; }; then
+      LINT_CMD="npx eslint . --max-warnings=0"
+    fi
+  elif [[ -f "${PROJECT_DIR}/pyproject.toml" ]] || [[ -f "${PROJECT_DIR}/setup.cfg" ]]; then
+    if command -v ruff &>/dev/null; then
+      LINT_CMD="ruff check ."
+    elif command -v flake8 &>/dev/null; then
+      LINT_CMD="flake8 ."
+    fi
+  elif [[ -f "${PROJECT_DIR}/Makefile" ]] && grep -q '^lint:' "${PROJECT_DIR}/Makefile" 2>/dev/null; then
+    LINT_CMD="make lint"
+  fi
+}
+
+# ── Check 1: Test Suite ───────────────────────────────────────────────────
+
+# Test-impact selection for pytest (verify-helper.py test-impact): map the
+# snapshot's changed paths plus the task's FILES to the test files they can
+# affect. Sets TEST_SELECTION_MODE (impact|full), TEST_SELECTION_REASON,
+# TEST_SELECTION_TOTAL and TEST_SELECTION_FILES. Anything it cannot decide
+# safely selects the full suite.
+select_tests() {
+  local runner="$1"
+  TEST_SELECTION_MODE="full"
+  TEST_SELECTION_REASON=""
+  TEST_SELECTION_TOTAL=0
+  TEST_SELECTION_FILES=()
+
+  if [[ "$VERIFY_TEST_IMPACT" == "0" ]]; then
+    TEST_SELECTION_REASON="disabled (VERIFY_TEST_IMPACT=0)"
+    return
+  fi
+  if [[ -z "$GIT_SNAPSHOT_DIR" ]]; then
+    TEST_SELECTION_REASON="no git snapshot"
+    return
+  fi
+
+  # The last task of a track always gets the full suite.
+  local force_full="" task_current tasks_total
+  task_current=$(read_state "track.task_current")
+  tasks_total=$(read_state "track.tasks_total")
+  if [[ "$task_current" =~ ^[0-9]+$ && "$tasks_total" =~ ^[0-9]+$ && "$tasks_total" -gt 0 && \
+        "$task_current" -ge "$tasks_total" ]]; then
+    force_full="last task in track (${task_current}/${tasks_total})"
+  fi
+
+  parse_task_file "$TASK_FILE"
+  local -a task_paths=()
+  local p
+  for p in "${TASK_ALLOWED_PATHS[@]}"; do
+    [[ -n "$p" ]] && task_paths+=(--changed "$p")
+  done
+
+  local output
+  if ! output=$(python3 "${VERIFY_BIN_DIR}/verify-helper.py" test-impact \
+      --repo "$PROJECT_DIR" --changed-z "${GIT_SNAPSHOT_DIR}/changed.z" "${task_paths[@]}" \
+      --cache "$VERIFY_CACHE_DIR" --runner "$runner" --full-every "$VERIFY_FULL_SUITE_EVERY" \
+      --force-full "$force_full" --timeout "$CHECK_TIMEOUT"); then
+    TEST_SELECTION_REASON="test-impact selection failed"
+    return
+  fi
+
+  local line
+  while IFS= read -r line; do
+    case "$line" in
+      MODE=*) TEST_SELECTION_MODE="${line#MODE=}" ;;
+      REASON=*) TEST_SELECTION_REASON="${line#REASON=}" ;;
+      TOTAL=*) TEST_SELECTION_TOTAL="${line#TOTAL=}" ;;
+      TEST=*) TEST_SELECTION_FILES+=("${line#TEST=}") ;;
+    esac
+  done <<< "$output"
+}
+
+check_tests() {
+  local test_exit=0
+  local test_count=0
+  local test_summary="no tests found"
+  local test_results="null"
+  local selection_mode="none" selection_reason="no test runner detected"
+  local selection_count=0 selection_total=0
+
+  detect_test_cmd
+  local test_cmd="$TEST_CMD" pytest_runner="$PYTEST_RUNNER"
+
+  # Ask the runner for a machine-readable report where it can write one.
+  local report_kind="none" report_file=""
+  if [[ -n "$pytest_runner" ]]; then
+    report_kind="junit"
+    report_file="${VERIFY_WORK_DIR}/tests-junit.xml"
+    test_cmd+=" --junitxml=$(printf '%q' "$report_file")"
+  elif [[ "$test_cmd" == "npm test" ]] && \
+       grep -qE '"test"[[:space:]]*:[[:space:]]*"[^"]*\<jest\>' "${PROJECT_DIR}/package.json" 2>/dev/null; then
+    report_kind="jest"
+    report_file="${VERIFY_WORK_DIR}/tests-jest.json"
+    test_cmd+=" -- --json --outputFile=$(printf '%q' "$report_file")"
+  fi
+
+  local skip_run=false
+  if [[ -n "$test_cmd" ]]; then
+    selection_mode="full"
+    selection_reason="runner has no test-impact support"
+  fi
+  if [[ -n "$pytest_runner" ]]; then
+    select_tests "$pytest_runner"
+    selection_mode="$TEST_SELECTION_MODE"
+    selection_reason="$TEST_SELECTION_REASON"
+    selection_count="${#TEST_SELECTION_FILES[@]}"
+    selection_total="$TEST_SELECTION_TOTAL"
+    [[ "$selection_mode" == "full" ]] && selection_count="$selection_total"
+    log "Test selection: ${selection_mode} (${selection_reason})"
+    if [[ "$selection_mode" == "impact" ]]; then
+      if [[ "$selection_count" -eq 0 ]]; then
+        skip_run=true
+      else
+        test_cmd+=" $(printf '%q ' "${TEST_SELECTION_FILES[@]}")"
+        test_cmd="${test_cmd% }"
+      fi
+    fi
   fi
 
   if [[ -z "$test_cmd" ]]; then
     log "WARN: No test runner detected, skipping test check"
     test_summary="skipped (no test runner detected)"
     # Not a failure — missing test infrastructure is not a verify failure
+  elif [[ "$skip_run" == "true" ]]; then
+    log "No test files affected by the change, skipping test run"
+    test_summary="no affected tests (impact selection, ${selection_total} test files indexed)"
   else
     log "Running tests: $test_cmd"
-    test_output=$(cd "$PROJECT_DIR" && run_with_timeout "tests" bash -c "$test_cmd" 2>&1) && test_exit=0 || test_exit=$?
-
-    # Try to extract test count from common output formats
-    # pytest: "X passed, Y failed" or "X passed"
-    # jest/mocha: "X passing" / "X failing"
-    if echo "$test_output" | grep -qP '\d+ passed'; then
-      local passed failed
-      passed=$(echo "$test_output" | grep -oP '\d+(?= passed)' | tail -1)
-      failed=$(echo "$test_output" | grep -oP '\d+(?= failed)' | tail -1)
-      failed="${failed:-0}"
-      test_count=$((passed + failed))
-      test_summary="${passed} passed, ${failed} failed"
-    elif echo "$test_output" | grep -qP '\d+ passing'; then
-      local passing failing
-      passing=$(echo "$test_output" | grep -oP '\d+(?= passing)' | tail -1)
-      failing=$(echo "$test_output" | grep -oP '\d+(?= failing)' | tail -1)
-      failing="${failing:-0}"
-      test_count=$((passing + failing))
-      test_summary="${passing} passed, ${failing} failed"
-    elif echo "$test_output" | grep -qP 'Tests:\s+\d+'; then
-      # Jest summary line: Tests: X passed, Y total
-      test_count=$(echo "$test_output" | grep -oP 'Tests:\s+.*?(\d+)\s+total' | grep -oP '\d+(?=\s+total)' | tail -1)
-      test_count="${test_count:-0}"
-      test_summary="exit code $test_exit ($test_count tests detected)"
+    # Output goes to a file, never a shell variable; counts come from the
+    # runner's structured report when it wrote one (deadf.verify.testreport).
+    local log_file="${VERIFY_WORK_DIR}/tests.log"
+    (cd "$PROJECT_DIR" && run_with_timeout "tests" bash -c "$test_cmd") > "$log_file" 2>&1 \
+      && test_exit=0 || test_exit=$?
+
+    local report_output line
+    if report_output=$(python3 "${VERIFY_BIN_DIR}/verify-helper.py" test-report \
+        --kind "$report_kind" --report "$report_file" --log "$log_file" \
+        --exit "$test_exit" --slowest "$VERIFY_SLOWEST_TESTS"); then
+      while IFS= read -r line; do
+        case "$line" in
+          COUNT=*) test_count="${line#COUNT=}" ;;
+          SUMMARY=*) test_summary="${line#SUMMARY=}" ;;
+          JSON=*) test_results="${line#JSON=}" ;;
+        esac
+      done <<< "$report_output"
     else
       test_summary="exit code $test_exit (count unknown)"
     fi
@@ -186,35 +333,26 @@ check_tests() {
     elif [[ "$test_exit" -ne 0 ]]; then
       add_failure "test_exit != 0: tests failed (exit $test_exit)"
     fi
+    if [[ "$selection_mode" == "impact" ]]; then
+      test_summary+=" [impact: ${selection_count} of ${selection_total} test files]"
+    fi
   fi
 
   # Export for JSON assembly
   CHECK_TEST_EXIT="$test_exit"
   CHECK_TEST_COUNT="$test_count"
   CHECK_TEST_SUMMARY="$test_summary"
+  CHECK_TEST_RESULTS="$test_results"
+  CHECK_TEST_SELECTION="{\"mode\": \"${selection_mode}\", \"reason\": \"$(json_escape "$selection_reason")\", \"selected\": ${selection_count}, \"total\": ${selection_total}}"
 }
 
 # ── Check 2: Linter ──────────────────────────────────────────────────────
 
 check_lint() {
   local lint_exit=0
-  local lint_cmd=""
 
-  # Detect linter
-  if [[ -f "${PROJECT_DIR}/package.json" ]]; then
-    if command -v npx &>/dev/null && { ls "${PROJECT_DIR}"/.eslintrc* &>/dev/null || \
-       grep -q '"eslint"' "${PROJECT_DIR}/package.json" 2>/dev/null; }; then
-      lint_cmd="npx eslint . --max-warnings=0"
-    fi
-  elif [[ -f "${PROJECT_DIR}/pyproject.toml" ]] || [[ -f "${PROJECT_DIR}/setup.cfg" ]]; then
-    if command -v ruff &>/dev/null; then
-      lint_cmd="ruff check ."
-    elif command -v flake8 &>/dev/null; then
-      lint_cmd="flake8 ."
-    fi
-  elif [[ -f "${PROJECT_DIR}/Makefile" ]] && grep -q '^lint:' "${PROJECT_DIR}/Makefile" 2>/dev/null; then
-    lint_cmd="make lint"
-  fi
+  detect_lint_cmd
+  local lint_cmd="$LINT_CMD"
 
   if [[ -z "$lint_cmd" ]]; then
     log "WARN: No linter detected, skipping lint check"
@@ -237,7 +375,6 @@ check_lint() {
 check_diff() {
   local diff_lines=0
   local diff_ok=true
-  local numstat_output=""
 
   if ! command -v git &>/dev/null; then
     log "WARN: git not available, skipping diff check"
@@ -248,26 +385,8 @@ check_diff() {
 
   cd "$PROJECT_DIR" || return
 
-  # Count diff lines vs parent commit
-  if git rev-parse HEAD~1 &>/dev/null; then
-    numstat_output=$(git diff --numstat HEAD~1 2>/dev/null || true)
-  elif git rev-parse HEAD &>/dev/null; then
-    # First commit — count all lines
-    numstat_output=$(git show --numstat --format="" HEAD 2>/dev/null || true)
-  fi
-
-  if [[ -n "$numstat_output" ]]; then
-    local total=0
-    while IFS=$'\t' read -r added deleted _path; do
-      [[ -z "$added" && -z "$deleted" ]] && continue
-      [[ "$added" == "-" ]] && added=0
-      [[ "$deleted" == "-" ]] && deleted=0
-      [[ "$added" =~ ^[0-9]+$ ]] || added=0
-      [[ "$deleted" =~ ^[0-9]+$ ]] || deleted=0
-      total=$((total + added + deleted))
-    done <<< "$numstat_output"
-    diff_lines="$total"
-  fi
+  # Added + deleted lines vs the verification base (from the git snapshot)
+  diff_lines="${SNAP_DIFF_LINES:-0}"
 
   # Compare against ESTIMATED_DIFF from TASK file if available
   parse_task_file "$TASK_FILE"
@@ -301,12 +420,10 @@ check_paths() {
 
   cd "$PROJECT_DIR" || return
 
-  # Get list of changed files
+  # Get list of changed files (from the git snapshot)
   local -a changed_files=()
-  if git rev-parse HEAD~1 &>/dev/null; then
-    mapfile -t changed_files < <(git diff HEAD~1 --name-only 2>/dev/null)
-  elif git rev-parse HEAD &>/dev/null; then
-    mapfile -t changed_files < <(git show --name-only --format="" HEAD 2>/dev/null)
+  if [[ -n "$GIT_SNAPSHOT_DIR" ]]; then
+    mapfile -d '' -t changed_files < "${GIT_SNAPSHOT_DIR}/changed.z"
   fi
 
   # Get allowed paths from TASK file (frontmatter or legacy)
@@ -367,58 +484,52 @@ check_paths() {
 check_secrets() {
   local secrets_found=false
   local -a secret_matches=()
+  local -a secret_findings=()
 
   if ! command -v git &>/dev/null; then
     log "WARN: git not available, skipping secret scan"
     CHECK_SECRETS_FOUND=false
     CHECK_SECRET_MATCHES=()
+    CHECK_SECRET_FINDINGS=()
     return
   fi
 
-  cd "$PROJECT_DIR" || return
+  # Added lines come from the snapshot (path<TAB>line<TAB>text). All rules
+  # run in one pass (deadf.verify.secretscan); the per-repo file can add
+  # rules, disable built-ins and allowlist paths or values.
+  local added_file="${GIT_SNAPSHOT_DIR:+${GIT_SNAPSHOT_DIR}/added.tsv}"
+  if [[ -z "$added_file" || ! -s "$added_file" ]]; then
+    CHECK_SECRETS_FOUND=false
+    CHECK_SECRET_MATCHES=()
+    CHECK_SECRET_FINDINGS=()
+    return
+  fi
 
-  # Get diff content to scan
-  local diff_content=""
-  if git rev-parse HEAD~1 &>/dev/null; then
-    diff_content=$(git diff HEAD~1 2>/dev/null || true)
-  elif git rev-parse HEAD &>/dev/null; then
-    diff_content=$(git show HEAD 2>/dev/null || true)
-  fi
-
-  # Secret patterns (added lines only — lines starting with +)
-  local -a patterns=(
-    # API keys / tokens
-    'AKIA[0-9A-Z]{16}'                          # AWS Access Key
-    'sk-[a-zA-Z0-9]{20,}'                       # OpenAI / Stripe secret key
-    'ghp_[a-zA-Z0-9]{36}'                       # GitHub personal access token
-    'gho_[a-zA-Z0-9]{36}'                       # GitHub OAuth token
-    'github_pat_[a-zA-Z0-9_]{82}'               # GitHub fine-grained PAT
-    'glpat-[a-zA-Z0-9\-]{20}'                   # GitLab PAT
-    'xox[bpras]-[a-zA-Z0-9\-]+'                 # Slack tokens
-    # Generic patterns
-    '["\x27]?[a-zA-Z_]*(?:SECRET|TOKEN|KEY|PASSWORD|PASSWD|API_KEY|APIKEY|ACCESS_KEY)["\x27]?\s*[=:]\s*["\x27][^\s"'\'']{8,}["\x27]'
-    # Private keys
-    '-----BEGIN (RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----'
-    # Connection strings
-    '(?:mysql|postgres|mongodb|redis)://[^\s]{10,}'
-  )
+  local -a config_args=()
+  if [[ -f "$SECRETS_FILE" ]]; then
+    config_args=(--config "$SECRETS_FILE")
+  fi
 
-  # Only scan added lines (lines starting with +, but not +++ header)
-  local added_lines
-  added_lines=$(echo "$diff_content" | grep '^+[^+]' | sed 's/^+//' || true)
-
-  for pattern in "${patterns[@]}"; do
-    local matches
-    matches=$(echo "$added_lines" | grep -oP "$pattern" 2>/dev/null || true)
-    if [[ -n "$matches" ]]; then
-      secrets_found=true
-      while IFS= read -r match; do
-        # Truncate match for safety (don't leak actual secrets in output)
-        local truncated="${match:0:20}..."
-        secret_matches+=("$truncated")
-      done <<< "$matches"
-    fi
-  done
+  local scan_output
+  if ! scan_output=$(python3 "${VERIFY_BIN_DIR}/verify-helper.py" secrets \
+      --added "$added_file" "${config_args[@]}"); then
+    # Fail closed: a broken rules file must not pass as "no secrets".
+    add_failure "internal: secret scan failed"
+    CHECK_SECRETS_FOUND=false
+    CHECK_SECRET_MATCHES=()
+    CHECK_SECRET_FINDINGS=()
+    return
+  fi
+
+  local rule file line preview
+  while IFS=$'\t' read -r rule file line preview; do
+    [[ -n "$rule" ]] || continue
+    secrets_found=true
+    # Only the truncated match is kept (don't leak actual secrets in output)
+    secret_matches+=("$preview")
+    secret_findings+=("{\"rule\": \"$(json_escape "$rule")\", \"file\": \"$(json_escape "$file")\", \"line\": ${line}, \"match\": \"$(json_escape "$preview")\"}")
+    log "WARN: possible secret (${rule}) at ${file}:${line}"
+  done <<< "$scan_output"
 
   if [[ "$secrets_found" == "true" ]]; then
     add_failure "secrets_found: potential secrets detected in diff (${#secret_matches[@]} matches)"
@@ -426,6 +537,7 @@ check_secrets() {
 
   CHECK_SECRETS_FOUND="$secrets_found"
   CHECK_SECRET_MATCHES=("${secret_matches[@]}")
+  CHECK_SECRET_FINDINGS=("${secret_findings[@]}")
 }
 
 # ── Check 6: Git Clean ───────────────────────────────────────────────────
@@ -457,6 +569,168 @@ check_git_clean() {
   CHECK_UNCOMMITTED_FILES=("${uncommitted_files[@]}")
 }
 
+# ── Git Snapshot ──────────────────────────────────────────────────────────
+
+# One pass over the diff against the verification base (HEAD~1, or HEAD on
+# the first commit), shared by check_diff, check_paths and check_secrets.
+# verify-helper.py writes summary.env, changed.z (NUL-separated paths) and
+# added.tsv (path<TAB>line<TAB>text) into <dir>.
+GIT_SNAPSHOT_DIR=""
+SNAP_DIFF_LINES=0
+
+snapshot_git() {
+  local dir="$1"
+  command -v git &>/dev/null || return 0
+
+  log "Collecting git snapshot"
+  if ! python3 "${VERIFY_BIN_DIR}/verify-helper.py" snapshot --repo "$PROJECT_DIR" --out "$dir" >&2; then
+    # Fail closed: without the snapshot the diff/path/secret checks see nothing.
+    add_failure "internal: git snapshot failed (diff, path and secret checks incomplete)"
+    return
+  fi
+  # shellcheck disable=SC1091
+  source "${dir}/summary.env"
+  GIT_SNAPSHOT_DIR="$dir"
+}
+
+# ── Result Cache ─────────────────────────────────────────────────────────
+
+# Passing results are cached under ${VERIFY_CACHE_DIR}/results, keyed by HEAD,
+# the working tree (git write-tree of a scratch index, ignored files left out), the
+# detected test/lint commands, the task file and the verifier itself. A retry
+# on an unchanged tree gets the stored JSON back without running anything.
+# Failing results are never cached: they may be flaky or timed out.
+# --no-cache / VERIFY_NO_CACHE=1 bypasses it.
+VERIFY_CACHE_KEY=""
+
+compute_cache_key() {
+  VERIFY_CACHE_KEY=""
+  [[ "$VERIFY_NO_CACHE" == "1" ]] && return
+  command -v git &>/dev/null || return
+
+  detect_test_cmd
+  detect_lint_cmd
+  local key
+  if key=$(python3 "${VERIFY_BIN_DIR}/verify-helper.py" cache-key --repo "$PROJECT_DIR" \
+      --part "test=${TEST_CMD}" --part "lint=${LINT_CMD}" --part "timeout=${CHECK_TIMEOUT}" \
+      --part "test_impact=${VERIFY_TEST_IMPACT}" \
+      --part "task=$(read_state track.task_current)/$(read_state track.tasks_total)" \
+      --file "$TASK_FILE" --file "$SECRETS_FILE" --file "${VERIFY_BIN_DIR}/verify.sh"); then
+    VERIFY_CACHE_KEY="$key"
+  else
+    log "WARN: cannot compute verify cache key, running uncached"
+  fi
+}
+
+# Print the cached result for VERIFY_CACHE_KEY; non-zero on a miss.
+cache_lookup() {
+  [[ -n "$VERIFY_CACHE_KEY" ]] || return 1
+  python3 "${VERIFY_BIN_DIR}/verify-helper.py" cache-get --cache "$VERIFY_CACHE_DIR" \
+    --key "$VERIFY_CACHE_KEY"
+}
+
+# Store a passing result JSON (stdin) under VERIFY_CACHE_KEY.
+cache_store() {
+  [[ -n "$VERIFY_CACHE_KEY" && "$PASS" == "true" ]] || return 0
+  python3 "${VERIFY_BIN_DIR}/verify-helper.py" cache-put --cache "$VERIFY_CACHE_DIR" \
+    --key "$VERIFY_CACHE_KEY" --max-kb "$VERIFY_CACHE_MAX_KB" \
+    || log "WARN: could not store verify result in cache"
+}
+
+# ── Check Runner ─────────────────────────────────────────────────────────
+
+# CHECK_* variables each check sets (its structured result).
+declare -A CHECK_RESULT_VARS=(
+  [git_clean]="CHECK_GIT_CLEAN CHECK_UNCOMMITTED_FILES"
+  [paths]="CHECK_PATHS_OK CHECK_BLOCKED_FILES"
+  [secrets]="CHECK_SECRETS_FOUND CHECK_SECRET_MATCHES CHECK_SECRET_FINDINGS"
+  [diff]="CHECK_DIFF_LINES CHECK_DIFF_OK"
+  [lint]="CHECK_LINT_EXIT"
+  [tests]="CHECK_TEST_EXIT CHECK_TEST_COUNT CHECK_TEST_SUMMARY CHECK_TEST_SELECTION CHECK_TEST_RESULTS"
+)
+# Merge order (= the historical serial order, so failures keep their order).
+CHECK_ORDER=(git_clean paths secrets diff lint tests)
+declare -A CHECK_TIMINGS_MS=()
+
+# Wall clock in milliseconds.
+now_ms() {
+  if [[ -n "${EPOCHREALTIME:-}" ]]; then
+    local us="${EPOCHREALTIME/[.,]/}"
+    echo $(( 10#$us / 1000 ))
+  else
+    echo $(( $(date +%s%N) / 1000000 ))
+  fi
+}
+
+# Run check_<name> in a subshell; write its result variables, failures and
+# elapsed time to <out> as `declare -p` lines.
+run_check_to_file() {
+  local name="$1" out="$2"
+  (
+    FAILURES=()
+    start_ms=$(now_ms)
+    "check_${name}"
+    CHECK_ELAPSED_MS=$(( $(now_ms) - start_ms ))
+    CHECK_FAILURES=("${FAILURES[@]}")
+    # shellcheck disable=SC2086  # word-split the variable list on purpose
+    declare -p ${CHECK_RESULT_VARS[$name]} CHECK_FAILURES CHECK_ELAPSED_MS > "${out}.tmp" \
+      && mv "${out}.tmp" "$out"
+  )
+}
+
+# Run a group of independent checks (concurrently unless VERIFY_PARALLEL=0).
+run_check_group() {
+  local result_dir="$1"; shift
+  local name
+  local -a pids=()
+  for name in "$@"; do
+    if [[ "$VERIFY_PARALLEL" == "0" ]]; then
+      run_check_to_file "$name" "${result_dir}/${name}"
+    else
+      run_check_to_file "$name" "${result_dir}/${name}" &
+      pids+=("$!")
+    fi
+  done
+  local pid
+  for pid in "${pids[@]}"; do
+    wait "$pid" || true
+  done
+}
+
+# Load one check's result file into the globals. A missing result fails closed.
+merge_check_result() {
+  local name="$1" file="$2"
+  if [[ ! -s "$file" ]]; then
+    add_failure "internal: ${name} check produced no result"
+    return
+  fi
+  CHECK_FAILURES=()
+  CHECK_ELAPSED_MS=0
+  # declare -p output is function-local when sourced here; make it global.
+  # shellcheck disable=SC1090
+  source <(sed -e 's/^declare -- /declare -g /' -e 's/^declare -\([A-Za-z]*\) /declare -g\1 /' "$file")
+  local f
+  for f in "${CHECK_FAILURES[@]}"; do
+    add_failure "$f"
+  done
+  CHECK_TIMINGS_MS[$name]="$CHECK_ELAPSED_MS"
+}
+
+# Attribute this run's wall time to the current cycle (DEADF_CYCLE_ID, set by
+# kick.sh) in the admission-control metrics. Manual runs record nothing.
+record_verify_metrics() {
+  local elapsed_ms="$1"
+  [[ -n "${DEADF_CYCLE_ID:-}" ]] || return 0
+  local dir ts
+  dir=$(dirname "$VERIFY_METRICS_FILE")
+  mkdir -p "$dir" 2>/dev/null || return 0
+  [[ -f "${dir}/.gitignore" ]] || printf '*\n' > "${dir}/.gitignore" 2>/dev/null
+  ts="${EPOCHREALTIME:-$(date +%s)}"
+  printf '{"ts":%s,"event":"verify","cycle_id":"%s","seconds":%d.%03d,"pass":%s,"failures":%d}\n' \
+    "${ts/,/.}" "$(json_escape "$DEADF_CYCLE_ID")" $(( elapsed_ms / 1000 )) $(( elapsed_ms % 1000 )) \
+    "$PASS" "${#FAILURES[@]}" >> "$VERIFY_METRICS_FILE" 2>/dev/null || true
+}
+
 # ── JSON Assembly ─────────────────────────────────────────────────────────
 
 emit_json() {
@@ -486,6 +760,11 @@ emit_json() {
     secrets_json+="]"
   fi
 
+  local findings_json="[]"
+  if [[ ${#CHECK_SECRET_FINDINGS[@]} -gt 0 ]]; then
+    findings_json="[$(IFS=,; printf '%s' "${CHECK_SECRET_FINDINGS[*]}")]"
+  fi
+
   local uncommitted_json="[]"
   if [[ ${#CHECK_UNCOMMITTED_FILES[@]} -gt 0 ]]; then
     uncommitted_json="["
@@ -508,6 +787,13 @@ emit_json() {
     failures_json+="]"
   fi
 
+  local timings_json="{"
+  local name
+  for name in "${CHECK_ORDER[@]}"; do
+    timings_json+="\"${name}\": ${CHECK_TIMINGS_MS[$name]:-0}, "
+  done
+  timings_json+="\"total\": ${CHECK_TIMINGS_MS[total]:-0}}"
+
   # Emit the full JSON
   cat <<EOF
 {
@@ -516,6 +802,8 @@ emit_json() {
     "test_exit": ${CHECK_TEST_EXIT},
     "test_count": ${CHECK_TEST_COUNT},
     "test_summary": "$(json_escape "$CHECK_TEST_SUMMARY")",
+    "test_selection": ${CHECK_TEST_SELECTION},
+    "test_results": ${CHECK_TEST_RESULTS},
     "lint_exit": ${CHECK_LINT_EXIT},
     "diff_lines": ${CHECK_DIFF_LINES},
     "diff_ok": ${CHECK_DIFF_OK},
@@ -523,10 +811,13 @@ emit_json() {
     "blocked_files": ${blocked_json},
     "secrets_found": ${CHECK_SECRETS_FOUND},
     "secret_matches": ${secrets_json},
+    "secret_findings": ${findings_json},
     "git_clean": ${CHECK_GIT_CLEAN},
     "uncommitted_files": ${uncommitted_json}
   },
   "failures": ${failures_json},
+  "timings_ms": ${timings_json},
+  "cache": {"hit": false, "key": "${VERIFY_CACHE_KEY}"},
   "timestamp": "${timestamp}"
 }
 EOF
@@ -535,12 +826,22 @@ EOF
 # ── Main ──────────────────────────────────────────────────────────────────
 
 main() {
+  local arg
+  for arg in "$@"; do
+    case "$arg" in
+      --no-cache) VERIFY_NO_CACHE=1 ;;
+      *) log "WARN: ignoring unknown argument '$arg'" ;;
+    esac
+  done
+
   log "Starting deterministic verification (timeout=${CHECK_TIMEOUT}s per check)"
 
   # Initialize all check variables to safe defaults
   CHECK_TEST_EXIT=0
   CHECK_TEST_COUNT=0
   CHECK_TEST_SUMMARY="not run"
+  CHECK_TEST_SELECTION='{"mode": "none", "reason": "not run", "selected": 0, "total": 0}'
+  CHECK_TEST_RESULTS=null
   CHECK_LINT_EXIT=0
   CHECK_DIFF_LINES=0
   CHECK_DIFF_OK=true
@@ -548,19 +849,50 @@ main() {
   CHECK_BLOCKED_FILES=()
   CHECK_SECRETS_FOUND=false
   CHECK_SECRET_MATCHES=()
+  CHECK_SECRET_FINDINGS=()
   CHECK_GIT_CLEAN=true
   CHECK_UNCOMMITTED_FILES=()
 
-  # Run all checks (order matters: fast/simple first)
-  check_git_clean
-  check_paths
-  check_secrets
-  check_diff
-  check_lint
-  check_tests
+  local result_dir
+  result_dir=$(mktemp -d "${TMPDIR:-/tmp}/deadf-verify.XXXXXX") || {
+    log "ERROR: cannot create result directory"
+    exit 1
+  }
+  trap 'rm -rf "$result_dir"' EXIT
+  VERIFY_WORK_DIR="$result_dir"
+
+  local started_ms
+  started_ms=$(now_ms)
+
+  compute_cache_key
+  local cached
+  if cached=$(cache_lookup); then
+    log "Cache hit (${VERIFY_CACHE_KEY:0:12}): returning stored result"
+    printf '%s\n' "$cached"
+    record_verify_metrics $(( $(now_ms) - started_ms ))
+    exit 0
+  fi
+
+  snapshot_git "${result_dir}/git"
+
+  # Phase 1: read-only git checks. They must finish before lint/tests run,
+  # which may write caches or artifacts that git_clean would otherwise see.
+  run_check_group "$result_dir" git_clean paths secrets diff
+  # Phase 2: the slow ones, side by side.
+  run_check_group "$result_dir" lint tests
+
+  local name
+  for name in "${CHECK_ORDER[@]}"; do
+    merge_check_result "$name" "${result_dir}/${name}"
+  done
+  CHECK_TIMINGS_MS[total]=$(( $(now_ms) - started_ms ))
 
   # Emit structured JSON to stdout
-  emit_json
+  local result_json
+  result_json=$(emit_json)
+  printf '%s\n' "$result_json"
+  cache_store <<< "$result_json"
+  record_verify_metrics "${CHECK_TIMINGS_MS[total]}"
 
   log "Verification complete. pass=${PASS}, failures=${#FAILURES[@]}"
   exit 0
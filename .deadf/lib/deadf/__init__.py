@@ -0,0 +1 @@
+"""deadf(ish) pipeline support library (importable from .deadf/lib)."""
@@ -0,0 +1,8 @@
+"""deadf.admission — decide whether the next cycle may start (deadf-admission.py).
+
+Each cycle leaves records in ``.deadf/metrics/cycles.jsonl`` (``metrics``):
+its dispatch, its wall and LLM dispatch time from kick.sh, and its verify.sh
+runs. ``controller`` predicts the next cycle's wall time from that history and
+admits, refuses (it cannot finish inside ``budget.max_hours`` or the iteration
+cap) or defers (the per-hour dispatch limit is reached) a kick.
+"""
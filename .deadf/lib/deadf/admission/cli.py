@@ -0,0 +1,125 @@
+"""Command-line entry point behind .deadf/bin/deadf-admission.py."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shlex
+import sys
+import time
+from typing import Any
+
+from ..state.reader import StateError, load_snapshot
+from ..util import quantile
+from . import metrics
+from .controller import ADMIT, REFUSE, AdmissionConfig, Decision, admit, decide, predict
+
+EXIT_REFUSE = 15
+EXIT_DEFER = 16
+
+
+def default_deadf_dir() -> str:
+    # .deadf/lib/deadf/admission/cli.py -> .deadf
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def _load(deadf_dir: str) -> tuple[Any, AdmissionConfig]:
+    state = load_snapshot(os.path.join(deadf_dir, "state", "STATE.yaml"))
+    policy_path = os.path.join(deadf_dir, "state", "POLICY.yaml")
+    policy = load_snapshot(policy_path) if os.path.exists(policy_path) else {}
+    return state, AdmissionConfig.from_policy(policy)
+
+
+def _print_decision(decision: Decision, fmt: str) -> None:
+    fields = {
+        "action": decision.action,
+        "reason": decision.reason,
+        "predicted_s": round(decision.predicted_s, 1),
+        "remaining_s": None if decision.remaining_s is None else round(decision.remaining_s, 1),
+        "retry_after_s": int(round(decision.retry_after_s)),
+        "samples": decision.samples,
+    }
+    if fmt == "json":
+        print(json.dumps(fields))
+        return
+    for name, value in fields.items():
+        print(f"ADMISSION_{name.upper()}={shlex.quote('' if value is None else str(value))}")
+
+
+def _exit_code(decision: Decision) -> int:
+    if decision.action == ADMIT:
+        return 0
+    return EXIT_REFUSE if decision.action == REFUSE else EXIT_DEFER
+
+
+def _summary(values: list[float]) -> dict[str, float] | None:
+    if not values:
+        return None
+    return {"mean": round(sum(values) / len(values), 1), "p50": round(quantile(values, 0.5), 1),
+            "p90": round(quantile(values, 0.9), 1), "max": round(max(values), 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Admission control for the next deadf cycle")
+    parser.add_argument("--deadf-dir", default=None, help="Project .deadf directory (default: this one)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_check = sub.add_parser("check", help="Print the decision for the next kick (records nothing)")
+    p_check.add_argument("--format", choices=("shell", "json"), default="shell")
+
+    p_admit = sub.add_parser("admit", help="Decide for a kick and record the outcome")
+    p_admit.add_argument("--cycle-id", required=True)
+    p_admit.add_argument("--format", choices=("shell", "json"), default="shell")
+
+    p_rec = sub.add_parser("record", help="Record a finished cycle's wall and LLM dispatch time")
+    p_rec.add_argument("--cycle-id", required=True)
+    p_rec.add_argument("--started", type=float, required=True, help="Unix time the kick started")
+    p_rec.add_argument("--dispatched", type=float, default=None,
+                       help="Unix time the CLI was started (default: --started)")
+    p_rec.add_argument("--exit-code", type=int, required=True)
+
+    p_stats = sub.add_parser("stats", help="Summarize recorded cycles as JSON")
+    p_stats.add_argument("--last", type=int, default=50, help="Cycles to summarize (default: 50)")
+
+    args = parser.parse_args()
+    deadf_dir = args.deadf_dir or default_deadf_dir()
+    metrics_file = metrics.metrics_path(deadf_dir)
+
+    if args.command == "record":
+        now = time.time()
+        dispatched = args.started if args.dispatched is None else args.dispatched
+        metrics.append(metrics_file, {
+            "ts": round(now, 3), "event": "cycle", "cycle_id": args.cycle_id,
+            "wall_s": round(now - args.started, 3), "llm_s": round(now - dispatched, 3),
+            "exit_code": args.exit_code,
+        })
+        return
+
+    try:
+        state, config = _load(deadf_dir)
+    except StateError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "check":
+        decision = decide(state, metrics.read_recent(metrics_file), config)
+        _print_decision(decision, args.format)
+        sys.exit(_exit_code(decision))
+    elif args.command == "admit":
+        decision = admit(state, metrics_file, config, args.cycle_id)
+        _print_decision(decision, args.format)
+        sys.exit(_exit_code(decision))
+    elif args.command == "stats":
+        records = metrics.read_recent(metrics_file)
+        recent = metrics.cycles(records)[-max(1, args.last):]
+        predicted, samples = predict(records, config)
+        print(json.dumps({
+            "cycles": len(recent),
+            "failed": sum(1 for c in recent if c.exit_code not in (0, None)),
+            "wall_s": _summary([c.wall_s for c in recent]),
+            "llm_s": _summary([c.llm_s for c in recent if c.llm_s is not None]),
+            "verify_s": _summary([c.verify_s for c in recent if c.verify_s]),
+            "dispatches_last_hour": len(metrics.dispatch_times(records, time.time() - 3600)),
+            "predicted_next_s": round(predicted, 1),
+            "prediction_samples": samples,
+        }, indent=2))
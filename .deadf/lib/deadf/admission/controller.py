@@ -0,0 +1,143 @@
+"""Admission decisions for the next cycle.
+
+The next cycle's wall time is predicted as a high quantile (POLICY
+``admission.estimate_quantile``, default 0.9) of the last
+``admission.history_cycles`` finished cycles, capped at the cycle timeout
+(``escalation.cycle_timeout_s``): no cycle runs longer than that before
+ralph.sh or cron-kick.sh times it out. With fewer than ``MIN_SAMPLES``
+finished cycles the prediction is the timeout itself.
+
+A kick is
+
+- refused when the iteration cap is reached, the time budget
+  (``budget.started_at + budget.max_hours``) is spent, or the predicted cycle
+  would not finish before the budget runs out. Waiting does not help, so
+  callers stop kicking;
+- deferred when ``admission.max_dispatches_per_hour`` dispatches already
+  happened in the last hour. ``retry_after_s`` says when a slot frees up;
+- admitted otherwise. ``admit`` records the dispatch under the metrics lock.
+
+A budget that has not started (``budget.started_at`` is null) only limits
+iterations; the orchestrator sets it on the first cycle.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from ..state.reader import lookup
+from ..util import parse_ts, quantile
+from . import metrics
+
+ADMIT, REFUSE, DEFER = "admit", "refuse", "defer"
+MIN_SAMPLES = 3
+RATE_WINDOW_S = 3600.0
+
+
+def _number(value: Any, default: float) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return default
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    max_dispatches_per_hour: int = 0  # 0 = no limit
+    history_cycles: int = 20
+    estimate_quantile: float = 0.9
+    cycle_timeout_s: float = 600.0
+    max_hours: float = 24.0
+    max_iterations: int = 200
+
+    @classmethod
+    def from_policy(cls, policy: Any) -> "AdmissionConfig":
+        d = cls()
+        return cls(
+            max_dispatches_per_hour=int(_number(
+                lookup(policy, ("admission", "max_dispatches_per_hour")), d.max_dispatches_per_hour)),
+            history_cycles=max(1, int(_number(
+                lookup(policy, ("admission", "history_cycles")), d.history_cycles))),
+            estimate_quantile=min(1.0, max(0.0, _number(
+                lookup(policy, ("admission", "estimate_quantile")), d.estimate_quantile))),
+            cycle_timeout_s=_number(
+                lookup(policy, ("escalation", "cycle_timeout_s")), d.cycle_timeout_s),
+            max_hours=_number(lookup(policy, ("escalation", "max_hours")), d.max_hours),
+            max_iterations=int(_number(
+                lookup(policy, ("escalation", "max_iterations")), d.max_iterations)),
+        )
+
+
+@dataclass(frozen=True)
+class Decision:
+    action: str
+    reason: str
+    predicted_s: float
+    remaining_s: float | None = None  # None: time budget not started
+    retry_after_s: float = 0.0
+    samples: int = 0
+
+
+def _scalar(value: Any) -> Any:
+    """JSON-safe field value; None for missing fields and nested data."""
+    return value if isinstance(value, (str, int, float, bool)) else None
+
+
+def predict(records: list[dict[str, Any]], config: AdmissionConfig) -> tuple[float, int]:
+    """(predicted wall seconds of the next cycle, samples used)."""
+    walls = [c.wall_s for c in metrics.cycles(records)][-config.history_cycles:]
+    if len(walls) < MIN_SAMPLES:
+        return config.cycle_timeout_s, len(walls)
+    return min(quantile(walls, config.estimate_quantile), config.cycle_timeout_s), len(walls)
+
+
+def decide(state: Any, records: list[dict[str, Any]], config: AdmissionConfig,
+           now: float | None = None) -> Decision:
+    now = time.time() if now is None else now
+    predicted, samples = predict(records, config)
+
+    max_iter = lookup(state, ("loop", "max_iterations"))
+    max_iter = int(_number(max_iter, config.max_iterations))
+    iteration = lookup(state, ("loop", "iteration"))
+    if isinstance(iteration, int) and not isinstance(iteration, bool) and iteration >= max_iter:
+        return Decision(REFUSE, "max_iterations", predicted, samples=samples)
+
+    remaining: float | None = None
+    started = parse_ts(lookup(state, ("budget", "started_at")))
+    if started is not None:
+        max_hours = _number(lookup(state, ("budget", "max_hours")), config.max_hours)
+        remaining = started + max_hours * 3600 - now
+        if remaining <= 0:
+            return Decision(REFUSE, "budget_exhausted", predicted, remaining, samples=samples)
+        if predicted > remaining:
+            return Decision(REFUSE, "budget_insufficient", predicted, remaining, samples=samples)
+
+    if config.max_dispatches_per_hour > 0:
+        recent = metrics.dispatch_times(records, now - RATE_WINDOW_S)
+        if len(recent) >= config.max_dispatches_per_hour:
+            # The slot frees when the oldest dispatch that keeps us at the limit ages out.
+            oldest = recent[len(recent) - config.max_dispatches_per_hour]
+            return Decision(DEFER, "rate_limited", predicted, remaining,
+                            retry_after_s=max(1.0, oldest + RATE_WINDOW_S - now), samples=samples)
+
+    return Decision(ADMIT, "ok", predicted, remaining, samples=samples)
+
+
+def admit(state: Any, metrics_file: str, config: AdmissionConfig, cycle_id: str) -> Decision:
+    """Decide and record the outcome; admitted dispatches count toward the rate limit."""
+    with metrics.locked(metrics_file):
+        now = time.time()
+        decision = decide(state, metrics.read_recent(metrics_file), config, now)
+        event = "dispatch" if decision.action == ADMIT else decision.action
+        record: dict[str, Any] = {"ts": round(now, 3), "event": event, "cycle_id": cycle_id,
+                                  "predicted_s": round(decision.predicted_s, 1)}
+        if decision.action != ADMIT:
+            record["reason"] = decision.reason
+        if decision.remaining_s is not None:
+            record["remaining_s"] = round(decision.remaining_s, 1)
+        # What the cycle works on, for per-track stats (deadf-stats.py).
+        record["track"] = _scalar(lookup(state, ("track", "id")))
+        record["task"] = _scalar(lookup(state, ("task", "id")))
+        record["retry"] = _scalar(lookup(state, ("task", "retry_count")))
+        metrics.append(metrics_file, record)
+    return decision
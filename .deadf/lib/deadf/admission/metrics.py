@@ -0,0 +1,145 @@
+"""Per-project cycle metrics: ``.deadf/metrics/cycles.jsonl``.
+
+One JSON object per line, appended (O_APPEND, one write) by whoever saw the
+event::
+
+    {"ts": 1760775000.1, "event": "dispatch", "cycle_id": "cycle-8-1a2b3c4d", "predicted_s": 540.0,
+     "track": "auth", "task": "T3", "retry": 1}
+    {"ts": 1760775012.9, "event": "verify", "cycle_id": "cycle-8-1a2b3c4d", "seconds": 11.4, "pass": true,
+     "failures": 0}
+    {"ts": 1760775431.0, "event": "cycle", "cycle_id": "cycle-8-1a2b3c4d", "wall_s": 431.2, "llm_s": 430.8, "exit_code": 0}
+
+``dispatch`` is written by the admission check (under ``flock`` on the file,
+so two kicks cannot both take the last slot of the hour), ``cycle`` by
+kick.sh when the CLI returns, and ``verify`` by verify.sh when it runs with
+``DEADF_CYCLE_ID`` set. Refused and deferred kicks are recorded as
+``refuse``/``defer``. Dispatch records carry the state's ``track.id``,
+``task.id`` and ``task.retry_count``. ``ts`` is Unix time. The directory ignores itself in
+git, like the verify cache, so verify.sh's git_clean check never sees it.
+
+deadf-stats.py rotates the file to ``cycles.jsonl.1`` once it is ingested and
+large; ``read_recent`` reads the end of ``.1`` when the current file is shorter
+than its tail, and ``locked`` re-opens the file if it was rotated while waiting.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from ..cachedir import ensure_cache_dir
+
+METRICS_RELPATH = os.path.join("metrics", "cycles.jsonl")
+TAIL_BYTES = 256 * 1024  # enough for thousands of cycles; older lines never matter
+
+
+def metrics_path(deadf_dir: str) -> str:
+    return os.path.join(deadf_dir, METRICS_RELPATH)
+
+
+def append(path: str, record: dict[str, Any]) -> None:
+    """Append one record as a single write."""
+    ensure_cache_dir(os.path.dirname(path))
+    line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def locked(path: str) -> Iterator[None]:
+    """Exclusive flock on the metrics file (check-then-record for dispatches)."""
+    ensure_cache_dir(os.path.dirname(path))
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.stat(path).st_ino == os.fstat(fd).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        os.close(fd)  # rotated while we waited: lock the new file instead
+    try:
+        yield
+    finally:
+        os.close(fd)
+
+
+def _tail(path: str, tail_bytes: int) -> tuple[bytes, bool]:
+    """The last ``tail_bytes`` of ``path`` and whether that cut the file."""
+    try:
+        with open(path, "rb") as fh:
+            size = fh.seek(0, os.SEEK_END)
+            start = max(0, size - tail_bytes)
+            fh.seek(start)
+            return fh.read(), start > 0
+    except FileNotFoundError:
+        return b"", False
+
+
+def read_recent(path: str, tail_bytes: int = TAIL_BYTES) -> list[dict[str, Any]]:
+    """Records from the last ``tail_bytes`` of the file (and ``.1``), oldest first."""
+    data, cut = _tail(path, tail_bytes)
+    if not cut and len(data) < tail_bytes:
+        older, cut = _tail(path + ".1", tail_bytes - len(data))
+        if older and not older.endswith(b"\n"):
+            older += b"\n"
+        data = older + data
+    lines = data.split(b"\n")
+    if cut:
+        lines = lines[1:]  # first piece is a partial line
+    records = []
+    for raw in lines:
+        if not raw:
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and isinstance(record.get("ts"), (int, float)):
+            records.append(record)
+    return records
+
+
+@dataclass
+class CycleSample:
+    cycle_id: str
+    ts: float
+    wall_s: float
+    llm_s: float | None
+    verify_s: float
+    exit_code: int | None
+
+
+def cycles(records: list[dict[str, Any]]) -> list[CycleSample]:
+    """Finished cycles, oldest first, with their verify runs summed in."""
+    verify: dict[str, float] = {}
+    for record in records:
+        if record.get("event") == "verify" and isinstance(record.get("seconds"), (int, float)):
+            cid = str(record.get("cycle_id", ""))
+            verify[cid] = verify.get(cid, 0.0) + float(record["seconds"])
+    samples = []
+    for record in records:
+        if record.get("event") != "cycle" or not isinstance(record.get("wall_s"), (int, float)):
+            continue
+        cid = str(record.get("cycle_id", ""))
+        llm = record.get("llm_s")
+        code = record.get("exit_code")
+        samples.append(CycleSample(
+            cycle_id=cid, ts=float(record["ts"]), wall_s=float(record["wall_s"]),
+            llm_s=float(llm) if isinstance(llm, (int, float)) else None,
+            verify_s=verify.get(cid, 0.0),
+            exit_code=code if isinstance(code, int) else None,
+        ))
+    return samples
+
+
+def dispatch_times(records: list[dict[str, Any]], since: float) -> list[float]:
+    """Times of dispatches at or after ``since``, oldest first."""
+    return sorted(float(r["ts"]) for r in records
+                  if r.get("event") == "dispatch" and float(r["ts"]) >= since)
@@ -0,0 +1,16 @@
+"""Cache and metrics directories under .deadf/ that stay out of ``git status``."""
+from __future__ import annotations
+
+import os
+
+
+def ensure_cache_dir(path: str) -> None:
+    """Create ``path`` with a ``.gitignore`` of ``*`` so git ignores its contents.
+
+    verify.sh's git_clean check would otherwise flag the files written there.
+    """
+    os.makedirs(path, exist_ok=True)
+    ignore = os.path.join(path, ".gitignore")
+    if not os.path.exists(ignore):
+        with open(ignore, "w", encoding="utf-8") as fh:
+            fh.write("*\n")
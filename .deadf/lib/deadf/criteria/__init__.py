@@ -0,0 +1,11 @@
+"""deadf.criteria — LLM criterion verification (verify-criteria.py).
+
+The orchestrator used to render verify-criterion.md for one acceptance
+criterion at a time, wait for the CLI's answer, and pipe the collected
+responses into build-verdict.py. ``prompt`` renders the prompts for all of a
+task's criteria from the plan and the evidence bundle; ``driver`` runs the
+configured CLI for them as asyncio subprocesses (at most ``jobs`` at once,
+each with its own timeout), parses every response as it arrives with the
+build-verdict parser, and stops the rest once the verdict is decided. Verify
+latency becomes that of the slowest criterion instead of the sum.
+"""
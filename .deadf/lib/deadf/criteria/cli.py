@@ -0,0 +1,84 @@
+"""Command-line entry point behind .deadf/bin/verify-criteria.py."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shlex
+import shutil
+import sys
+
+from ..sentinel.core import RE_AC_ID, RE_NONCE
+from .driver import run
+from .prompt import DEFAULT_TEMPLATE, PromptError, load_evidence, load_plan, plan_values, render, select_criteria
+
+
+def default_cli() -> str:
+    return os.environ.get("DEADF_VERIFY_CLI") or f"{os.environ.get('CLAUDE_BIN', 'claude')} --print"
+
+
+def _fail(message: str) -> None:
+    print(f"ERROR: {message}", file=sys.stderr)
+    sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verify a task's acceptance criteria with the LLM CLI")
+    parser.add_argument("--plan", required=True, help="parse-blocks.py plan output (JSON)")
+    parser.add_argument("--evidence", help="Evidence bundle: JSON object of template values")
+    parser.add_argument("--nonce", required=True, help="Expected 6-char uppercase hex nonce")
+    parser.add_argument("--criteria", help="Comma-separated ACn ids to verify (default: all)")
+    parser.add_argument("--template", default=DEFAULT_TEMPLATE, help="Prompt template")
+    parser.add_argument("--cli", default=None,
+                        help="Verifier command; the prompt goes to its stdin "
+                             "(default: $DEADF_VERIFY_CLI or '$CLAUDE_BIN --print')")
+    parser.add_argument("--jobs", type=int, default=4, help="CLI processes at once (default: 4)")
+    parser.add_argument("--timeout", type=float, default=300.0,
+                        help="Seconds before a criterion's CLI is killed (default: 300)")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop at the first NO instead of waiting for a possible NEEDS_HUMAN")
+    parser.add_argument("--save-responses", metavar="FILE",
+                        help="Write [criterion_id, raw_response] pairs (build-verdict.py input)")
+    args = parser.parse_args()
+
+    if not RE_NONCE.match(args.nonce):
+        _fail(f"invalid nonce format: '{args.nonce}' (must match ^[0-9A-F]{{6}}$)")
+    if args.jobs < 1 or args.timeout <= 0:
+        _fail("--jobs must be at least 1 and --timeout positive")
+    wanted = None
+    if args.criteria is not None:
+        wanted = [c.strip() for c in args.criteria.split(",") if c.strip()]
+        bad = [c for c in wanted if not RE_AC_ID.match(c)]
+        if not wanted or bad:
+            _fail(f"invalid --criteria: '{args.criteria}' (ACn ids, comma-separated)")
+    argv = shlex.split(args.cli or default_cli())
+    if not argv or shutil.which(argv[0]) is None:
+        _fail(f"verifier CLI not found: {argv[0] if argv else '(empty)'}")
+
+    try:
+        plan = load_plan(args.plan)
+        evidence = load_evidence(args.evidence)
+        criteria = select_criteria(plan, wanted)
+        with open(args.template, encoding="utf-8") as fh:
+            template = fh.read()
+    except PromptError as exc:
+        _fail(str(exc))
+    except OSError as exc:
+        _fail(f"cannot read template {args.template}: {exc.strerror}")
+    if not criteria:
+        _fail("plan has no acceptance criteria")
+    bad = [c.id for c in criteria if not RE_AC_ID.match(c.id)]
+    if bad:
+        _fail(f"invalid criterion id(s) in plan: {', '.join(bad)}")
+
+    values = plan_values(plan)
+    prompts = {c.id: render(template, c, args.nonce, values, evidence) for c in criteria}
+    result, outcomes = run(argv, criteria, prompts, args.nonce,
+                           args.jobs, args.timeout, args.fail_fast)
+
+    if args.save_responses:
+        pairs = [[c.id, outcomes[c.id].raw] for c in criteria
+                 if c.id in outcomes and outcomes[c.id].raw is not None]
+        with open(args.save_responses, "w", encoding="utf-8") as fh:
+            json.dump(pairs, fh)
+    print(json.dumps(result, indent=2))
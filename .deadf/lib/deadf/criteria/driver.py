@@ -0,0 +1,167 @@
+"""Run the verifier CLI for every criterion concurrently and build the verdict.
+
+Each criterion's prompt goes to a fresh CLI process on stdin; its stdout is
+the raw response that build-verdict.py would have received. At most ``jobs``
+processes run at once and each is killed after ``timeout`` seconds.
+Responses are parsed with ``deadf.sentinel.verdict.parse_verdict`` as they
+arrive and counted the way ``build_verdict`` counts them:
+
+- a YES or NO answer is passed/failed;
+- a response that does not parse, a CLI that exits non-zero or cannot be
+  started, and a timeout are NEEDS_HUMAN (the last three also go to
+  ``missing``, as build_verdict does for a criterion without a response).
+
+NEEDS_HUMAN outranks FAIL, so the first NEEDS_HUMAN decides the verdict and
+the remaining criteria are stopped. A NO only decides it with
+``fail_fast``: without it a later NEEDS_HUMAN must still be able to win.
+Stopped and never-started criteria are reported as ``SKIPPED`` and listed in
+``skipped``. When nothing is skipped the result has build_verdict's shape
+and values; ``skipped``, ``decided_by``, ``timings`` and ``elapsed_s`` are
+added either way.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from ..sentinel.core import ParseError
+from ..sentinel.verdict import parse_verdict
+from .prompt import Criterion
+
+YES, NO, NEEDS_HUMAN, SKIPPED = "YES", "NO", "NEEDS_HUMAN", "SKIPPED"
+STDERR_TAIL = 300
+
+
+@dataclass
+class Outcome:
+    criterion: str
+    answer: str
+    reason: str
+    raw: str | None = None      # the CLI's stdout, when it exited 0
+    elapsed_s: float = 0.0
+
+
+def _classify(criterion: str, raw: str, nonce: str, elapsed: float) -> Outcome:
+    try:
+        parsed = parse_verdict(raw, nonce, criterion)
+    except ParseError as exc:
+        return Outcome(criterion, NEEDS_HUMAN, str(exc), raw, elapsed)
+    return Outcome(criterion, parsed["answer"], parsed["reason"], raw, elapsed)
+
+
+async def _run_one(
+    argv: list[str], criterion: Criterion, prompt: str, nonce: str,
+    timeout: float, slots: asyncio.Semaphore,
+) -> Outcome:
+    async with slots:
+        started = time.monotonic()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *argv, stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        except OSError as exc:
+            return Outcome(criterion.id, NEEDS_HUMAN, f"cannot start verifier CLI: {exc}")
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(prompt.encode("utf-8")), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return Outcome(criterion.id, NEEDS_HUMAN, f"verifier timed out after {timeout:g}s",
+                           elapsed_s=time.monotonic() - started)
+        except asyncio.CancelledError:
+            proc.kill()
+            await proc.wait()
+            raise
+        elapsed = time.monotonic() - started
+        if proc.returncode != 0:
+            tail = err.decode("utf-8", "replace").strip()[-STDERR_TAIL:]
+            reason = f"verifier CLI exited {proc.returncode}" + (f": {tail}" if tail else "")
+            return Outcome(criterion.id, NEEDS_HUMAN, reason, elapsed_s=elapsed)
+        return _classify(criterion.id, out.decode("utf-8", "replace"), nonce, elapsed)
+
+
+async def verify_all(
+    argv: list[str], criteria: list[Criterion], prompts: dict[str, str], nonce: str,
+    jobs: int = 4, timeout: float = 300.0, fail_fast: bool = False,
+) -> tuple[dict[str, Outcome], str | None]:
+    """Outcomes by criterion id, and the criterion that decided the verdict early."""
+    slots = asyncio.Semaphore(max(1, jobs))
+    pending = {asyncio.ensure_future(_run_one(argv, c, prompts[c.id], nonce, timeout, slots))
+               for c in criteria}
+    outcomes: dict[str, Outcome] = {}
+    decided_by: str | None = None
+    try:
+        while pending and decided_by is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                outcome = task.result()
+                outcomes[outcome.criterion] = outcome
+                if decided_by is None and (
+                        outcome.answer == NEEDS_HUMAN or (fail_fast and outcome.answer == NO)):
+                    decided_by = outcome.criterion
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return outcomes, decided_by
+
+
+def assemble(
+    criteria: list[Criterion], outcomes: dict[str, Outcome], decided_by: str | None,
+    elapsed_s: float,
+) -> dict[str, Any]:
+    criteria_out: dict[str, dict[str, str]] = {}
+    missing: list[str] = []
+    skipped: list[str] = []
+    timings: dict[str, float] = {}
+    passed = failed = needs_human = 0
+    for c in criteria:
+        outcome = outcomes.get(c.id)
+        if outcome is None:
+            skipped.append(c.id)
+            criteria_out[c.id] = {"answer": SKIPPED,
+                                  "reason": f"not run: verdict decided by {decided_by}"}
+            continue
+        criteria_out[c.id] = {"answer": outcome.answer, "reason": outcome.reason}
+        timings[c.id] = round(outcome.elapsed_s, 3)
+        if outcome.answer == YES:
+            passed += 1
+        elif outcome.answer == NO:
+            failed += 1
+        else:
+            needs_human += 1
+            if outcome.raw is None:
+                missing.append(c.id)
+
+    if needs_human > 0:
+        verdict = NEEDS_HUMAN
+    elif failed > 0:
+        verdict = "FAIL"
+    else:
+        verdict = "PASS"
+    return {
+        "verdict": verdict,
+        "criteria": criteria_out,
+        "missing": missing,
+        "total": len(criteria),
+        "passed": passed,
+        "failed": failed,
+        "skipped": skipped,
+        "decided_by": decided_by,
+        "timings": timings,
+        "elapsed_s": round(elapsed_s, 3),
+    }
+
+
+def run(
+    argv: list[str], criteria: list[Criterion], prompts: dict[str, str], nonce: str,
+    jobs: int = 4, timeout: float = 300.0, fail_fast: bool = False,
+) -> tuple[dict[str, Any], dict[str, Outcome]]:
+    """Verify ``criteria`` and return the verdict and the raw outcomes."""
+    started = time.monotonic()
+    outcomes, decided_by = asyncio.run(
+        verify_all(argv, criteria, prompts, nonce, jobs, timeout, fail_fast))
+    return assemble(criteria, outcomes, decided_by, time.monotonic() - started), outcomes
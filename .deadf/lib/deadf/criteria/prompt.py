@@ -0,0 +1,108 @@
+"""Render verify-criterion.md for each criterion of a task.
+
+Placeholders are ``{name}`` with a lower-case name; anything else in braces
+(``return {}`` in the rubric) is left alone, and a placeholder with no
+value renders empty. Values come from the plan (``task_id``, ``task_title``,
+``task_summary``, ``planned_files``, ``criterion_text``), the evidence bundle
+(any other name) and the run (``criterion_id``, ``nonce``). An evidence value
+that is a JSON object is looked up by criterion id, so ``diff_hunks`` can hold
+each criterion's relevant hunks.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Any
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# .deadf/lib/deadf/criteria -> .deadf
+DEFAULT_TEMPLATE = os.path.abspath(
+    os.path.join(_HERE, "..", "..", "..", "templates", "verify", "verify-criterion.md"))
+
+PLACEHOLDER_RE = re.compile(r"\{([a-z_]+)\}")
+
+
+class PromptError(ValueError):
+    """The plan, evidence bundle or criteria selection cannot be used."""
+
+
+@dataclass(frozen=True)
+class Criterion:
+    id: str
+    text: str
+
+
+def _load_json(path: str, what: str) -> Any:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except OSError as exc:
+        raise PromptError(f"cannot read {what} {path}: {exc.strerror}") from None
+    except ValueError as exc:
+        raise PromptError(f"{what} {path} is not valid JSON: {exc}") from None
+
+
+def load_plan(path: str) -> dict[str, Any]:
+    """parse-blocks.py plan output (task_id, title, summary, files, acceptance)."""
+    plan = _load_json(path, "plan")
+    if not isinstance(plan, dict) or not isinstance(plan.get("acceptance"), list):
+        raise PromptError(f"plan {path} has no acceptance list (expected parse-blocks.py plan output)")
+    return plan
+
+
+def load_evidence(path: str | None) -> dict[str, Any]:
+    if path is None:
+        return {}
+    evidence = _load_json(path, "evidence")
+    if not isinstance(evidence, dict):
+        raise PromptError(f"evidence {path} must be a JSON object")
+    return evidence
+
+
+def select_criteria(plan: dict[str, Any], wanted: list[str] | None) -> list[Criterion]:
+    """The plan's acceptance criteria, or the ``wanted`` ids in that order."""
+    by_id: dict[str, str] = {}
+    for item in plan["acceptance"]:
+        if not (isinstance(item, dict) and isinstance(item.get("id"), str)
+                and isinstance(item.get("text"), str)):
+            raise PromptError("plan acceptance items must have string id and text")
+        by_id[item["id"]] = item["text"]
+    if wanted is None:
+        return [Criterion(cid, text) for cid, text in by_id.items()]
+    unknown = [cid for cid in wanted if cid not in by_id]
+    if unknown:
+        raise PromptError(f"criteria not in the plan: {', '.join(unknown)}")
+    if len(set(wanted)) != len(wanted):
+        raise PromptError("duplicate criterion in --criteria")
+    return [Criterion(cid, by_id[cid]) for cid in wanted]
+
+
+def plan_values(plan: dict[str, Any]) -> dict[str, str]:
+    files = plan.get("files") or []
+    return {
+        "task_id": str(plan.get("task_id", "")),
+        "task_title": str(plan.get("title", "")),
+        "task_summary": str(plan.get("summary", "")),
+        "planned_files": ", ".join(f"{f.get('path', '')} ({f.get('action', '')})"
+                                   for f in files if isinstance(f, dict)),
+    }
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def render(template: str, criterion: Criterion, nonce: str,
+           plan: dict[str, str], evidence: dict[str, Any]) -> str:
+    values: dict[str, str] = {}
+    for name, value in evidence.items():
+        values[name] = _text(value.get(criterion.id) if isinstance(value, dict) else value)
+    values.update(plan)
+    values.update(criterion_id=criterion.id, criterion_text=criterion.text, nonce=nonce)
+    return PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), ""), template)
@@ -0,0 +1,9 @@
+"""deadf.initcollect — P12 evidence collection (init-collect.py).
+
+init-collect.sh used to run ``find`` once per evidence kind (tree, deps,
+configs, docs, entry points) and fork ``head`` per snippet. ``collector``
+walks the project once with ``os.scandir``, classifies every file against
+all the pattern sets as it goes, and writes the snippets from a thread pool
+into the same ``.deadf/p12/evidence/`` layout. Paths ignored by the project's
+``.gitignore`` files are skipped (``gitignore``).
+"""
@@ -0,0 +1,41 @@
+"""Command-line entry point behind .deadf/bin/init-collect.py."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+from .collector import collect
+
+FIND_MAX_DEPTH = 4
+TIMING_NAME = "collect-timing.json"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Collect raw P12 evidence into .deadf/p12/evidence/")
+    parser.add_argument("project_arg", nargs="?", default=None, metavar="PROJECT", help=argparse.SUPPRESS)
+    parser.add_argument("--project", default=None, help="Project directory (default: .)")
+    parser.add_argument("--depth", type=int, default=1, help="Mapping depth 1-2 (walk depth stays 4)")
+    parser.add_argument("--jobs", type=int, default=8, help="Snippet writer threads (default: 8)")
+    parser.add_argument("--no-gitignore", action="store_true", help="Collect paths .gitignore excludes")
+    args = parser.parse_args()
+
+    project = args.project or args.project_arg or "."
+    if not os.path.isdir(project):
+        print(f"Project path does not exist: {project}", file=sys.stderr)
+        sys.exit(1)
+    project = os.path.abspath(project)
+    p12_dir = os.path.join(project, ".deadf", "p12")
+    evidence_dir = os.path.join(p12_dir, "evidence")
+    try:
+        os.makedirs(evidence_dir, exist_ok=True)
+    except OSError:
+        print(f"Failed to create evidence dir: {evidence_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    timing = collect(project, evidence_dir, FIND_MAX_DEPTH, args.jobs, not args.no_gitignore)
+    # Next to evidence/, not in it: init-map.sh feeds every evidence file to the mapper.
+    with open(os.path.join(p12_dir, TIMING_NAME), "w", encoding="utf-8") as fh:
+        json.dump(timing, fh, indent=2)
+        fh.write("\n")
@@ -0,0 +1,190 @@
+"""One-walk evidence collection into ``.deadf/p12/evidence/``.
+
+The output matches what init-collect.sh's ``find`` pipelines wrote:
+
+    tree.txt            every path up to ``max_depth`` (sorted, first 500)
+    deps-<path>.txt     dependency manifests, first 100 lines
+    config-<path>.txt   tool configs, first 50 lines
+    doc-<path>.md       README/CONTRIBUTING/ARCHITECTURE/DESIGN, first 200 lines
+    ci-<path>.yml       CI definitions, first 80 lines
+    entry-<path>.txt    main/index/app sources, first 80 lines
+
+``<path>`` is the path relative to the project with ``/`` and spaces turned
+into ``_``. ``EXCLUDE_DIRS`` are pruned at any depth and only regular files
+are snapshotted. ``.github/workflows`` is still read to any depth, but now
+with the same pruning as the rest of the walk. Snippets are the first N
+lines byte for byte, like ``head -n``.
+"""
+from __future__ import annotations
+
+import fnmatch
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from .gitignore import IgnoreMatcher
+
+EXCLUDE_DIRS = frozenset({".git", "node_modules", "vendor", "dist", "build", ".deadf",
+                          ".venv", "__pycache__", ".next", ".cache"})
+TREE_LIMIT = 500
+WORKFLOWS_DIR = ".github/workflows"
+
+DEP_FILES = frozenset({"package.json", "Cargo.toml", "go.mod", "requirements.txt", "pyproject.toml",
+                       "Gemfile", "pom.xml", "build.gradle", "composer.json", "mix.exs"})
+CONFIG_NAMES = frozenset({"tsconfig.json", ".eslintrc", ".babelrc", "pytest.ini", "setup.cfg",
+                          "tox.ini", ".prettierrc", ".editorconfig", ".nvmrc"})
+CONFIG_GLOBS = ("tsconfig.*.json", ".eslintrc.*", "eslint.config.*", "vite.config.*",
+                "webpack.config.*", "rollup.config.*", "babel.config.*", ".babelrc.*",
+                "jest.config.*", "vitest.config.*", ".prettierrc.*")
+DOC_NAMES = frozenset({"readme.md", "contributing.md", "architecture.md", "design.md"})
+CI_PATHS = frozenset({".gitlab-ci.yml", "Jenkinsfile", ".circleci/config.yml"})
+ENTRY_NAMES = frozenset({"main.ts", "main.js", "main.py", "main.go", "main.rs",
+                         "index.ts", "index.js", "index.py",
+                         "app.ts", "app.js", "app.py", "app.rb"})
+
+# kind -> (file prefix, file suffix, line limit)
+KINDS = {
+    "deps": ("deps-", ".txt", 100),
+    "config": ("config-", ".txt", 50),
+    "doc": ("doc-", ".md", 200),
+    "ci": ("ci-", ".yml", 80),
+    "entry": ("entry-", ".txt", 80),
+}
+
+
+def safe_name(rel: str) -> str:
+    return rel.replace("/", "_").replace(" ", "_")
+
+
+def classify(rel: str, name: str, depth: int, max_depth: int) -> list[str]:
+    """Evidence kinds for a regular file at ``rel`` (``depth`` 1 = top level)."""
+    kinds = []
+    if depth <= max_depth:
+        if name in DEP_FILES:
+            kinds.append("deps")
+        if name in CONFIG_NAMES or any(fnmatch.fnmatchcase(name, g) for g in CONFIG_GLOBS):
+            kinds.append("config")
+        if name.lower() in DOC_NAMES:
+            kinds.append("doc")
+        if name in ENTRY_NAMES:
+            kinds.append("entry")
+    if rel in CI_PATHS or (rel.startswith(WORKFLOWS_DIR + "/") and name.endswith((".yml", ".yaml"))):
+        kinds.append("ci")
+    return kinds
+
+
+def write_snippet(src: str, out: str, limit: int) -> int:
+    """First ``limit`` lines of ``src`` into ``out``; returns bytes written.
+
+    ``out`` is created even when ``src`` cannot be read, as the shell
+    redirect did.
+    """
+    written = 0
+    with open(out, "wb") as dst:
+        try:
+            with open(src, "rb") as fh:
+                for i, line in enumerate(fh):
+                    if i >= limit:
+                        break
+                    dst.write(line)
+                    written += len(line)
+        except OSError:
+            pass
+    return written
+
+
+@dataclass
+class Collection:
+    tree: list[str] = field(default_factory=list)
+    matches: dict[str, list[str]] = field(default_factory=lambda: {k: [] for k in KINDS})
+    dirs: int = 0
+    entries: int = 0
+    ignored: int = 0
+
+
+def walk(root: str, max_depth: int, use_gitignore: bool = True) -> Collection:
+    col = Collection()
+    matcher = IgnoreMatcher(root) if use_gitignore else None
+    stack = [("", 0)]
+    while stack:
+        rel_dir, depth = stack.pop()
+        in_workflows = rel_dir == WORKFLOWS_DIR or rel_dir.startswith(WORKFLOWS_DIR + "/")
+        if matcher is not None:
+            matcher.enter(rel_dir)
+        try:
+            it = os.scandir(os.path.join(root, rel_dir) if rel_dir else root)
+        except OSError:
+            continue
+        col.dirs += 1
+        with it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                child = depth + 1
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    is_file = not is_dir and entry.is_file(follow_symlinks=False)
+                except OSError:
+                    continue
+                if matcher is not None and matcher.ignored(rel, is_dir):
+                    col.ignored += 1
+                    continue
+                col.entries += 1
+                if is_dir:
+                    if entry.name in EXCLUDE_DIRS:
+                        continue
+                    if child <= max_depth:
+                        col.tree.append(rel)
+                    # Past max_depth only the CI workflows are still wanted.
+                    if child < max_depth or in_workflows:
+                        stack.append((rel, child))
+                    continue
+                if child <= max_depth:
+                    col.tree.append(rel)
+                if is_file:
+                    for kind in classify(rel, entry.name, child, max_depth):
+                        col.matches[kind].append(rel)
+    col.tree.sort()
+    for paths in col.matches.values():
+        paths.sort()
+    return col
+
+
+def collect(project: str, evidence_dir: str, max_depth: int = 4, jobs: int = 8,
+            use_gitignore: bool = True) -> dict[str, Any]:
+    """Write the evidence files; returns the timing report."""
+    started = time.monotonic()
+    col = walk(project, max_depth, use_gitignore)
+    walked = time.monotonic()
+
+    with open(os.path.join(evidence_dir, "tree.txt"), "w", encoding="utf-8",
+              errors="surrogateescape") as fh:
+        fh.writelines(f"{rel}\n" for rel in col.tree[:TREE_LIMIT])
+
+    tasks = []
+    for kind, paths in col.matches.items():
+        prefix, suffix, limit = KINDS[kind]
+        for rel in paths:
+            out = os.path.join(evidence_dir, f"{prefix}{safe_name(rel)}{suffix}")
+            tasks.append((os.path.join(project, rel), out, limit))
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        sizes = list(pool.map(lambda t: write_snippet(*t), tasks))
+    finished = time.monotonic()
+
+    return {
+        "project": project,
+        "max_depth": max_depth,
+        "gitignore": use_gitignore,
+        "jobs": jobs,
+        "walk_s": round(walked - started, 4),
+        "write_s": round(finished - walked, 4),
+        "total_s": round(finished - started, 4),
+        "dirs": col.dirs,
+        "entries": col.entries,
+        "ignored": col.ignored,
+        "tree_entries": min(len(col.tree), TREE_LIMIT),
+        "tree_truncated": len(col.tree) > TREE_LIMIT,
+        "snippets": {kind: len(paths) for kind, paths in col.matches.items()},
+        "snippet_bytes": sum(sizes),
+    }
@@ -0,0 +1,116 @@
+"""A small ``.gitignore`` matcher for the collector's walk.
+
+Supports what project ignore files use in practice: comments, ``!``
+negation, trailing-``/`` directory rules, anchored patterns (a ``/`` before
+the end), ``*``, ``?``, ``[...]`` and ``**``. Rules are added per directory
+as the walk enters it; for a path, the last matching rule of the nearest
+files wins, as in git. A directory that is ignored is not descended, so
+nothing under it can be re-included (git behaves the same way).
+"""
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Rule:
+    base: str        # directory of the ignore file, relative to the root ("" for the root)
+    regex: re.Pattern[str]
+    anchored: bool   # match the path below ``base`` instead of the basename
+    negate: bool
+    dir_only: bool
+
+
+def _translate(pattern: str) -> str:
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        c = pattern[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "^") else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse(text: str, base: str) -> list[Rule]:
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith(("\\!", "\\#")):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        rules.append(Rule(base, re.compile(_translate(line) + r"\Z"), anchored, negate, dir_only))
+    return rules
+
+
+class IgnoreMatcher:
+    """Accumulates rules while walking top-down from the project root."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.rules: list[Rule] = []
+        self.load(os.path.join(root, ".git", "info", "exclude"), "")
+
+    def load(self, path: str, base: str) -> None:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as fh:
+                self.rules.extend(parse(fh.read(), base))
+        except OSError:
+            pass
+
+    def enter(self, rel_dir: str) -> None:
+        """Read ``rel_dir/.gitignore`` (``rel_dir`` is "" for the root)."""
+        self.load(os.path.join(self.root, rel_dir, ".gitignore"), rel_dir)
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        result = False
+        name = rel.rsplit("/", 1)[-1]
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.base:
+                if not rel.startswith(rule.base + "/"):
+                    continue
+                sub = rel[len(rule.base) + 1:]
+            else:
+                sub = rel
+            if rule.regex.match(sub if rule.anchored else name):
+                result = not rule.negate
+        return result
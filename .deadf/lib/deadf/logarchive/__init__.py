@@ -0,0 +1,9 @@
+"""deadf.logarchive — compressed, indexed cycle log history (deadf-logs.py).
+
+ralph.sh and cron-kick.sh used to delete all but the newest ``cycle-*.log``
+files. This package moves older logs into rolling compressed segment files
+under ``.deadf/logs/archive/`` (``archive``), with one index line per cycle,
+so a single cycle can be read back without decompressing the rest. Retention
+is by total bytes and by cycle count. Compression is zstd when the
+``zstandard`` module is installed, gzip otherwise (``codec``).
+"""
@@ -0,0 +1,294 @@
+"""Rolling segment archive for ``.deadf/logs/cycle-*.log``.
+
+Layout under ``.deadf/logs/archive/``::
+
+    segment-000001.log.zst    compressed frames, one per cycle, appended
+    segment-000002.log.zst    (a new segment starts past ``segment_bytes``)
+    index.jsonl               one line per archived cycle
+
+An index line::
+
+    {"cycle_id": "cycle-8-1a2b3c4d", "name": "cycle-cycle-8-1a2b3c4d.log",
+     "segment": "segment-000002.log.zst", "start": 18244, "end": 21107,
+     "size": 96512, "exit_token": "CYCLE_OK", "started": "2026-10-18T08:40:02Z",
+     "ended": "2026-10-18T08:47:13Z"}
+
+``start``/``end`` are compressed byte offsets of the cycle's frame in its
+segment; ``size`` is the original log size. ``exit_token`` is the last
+CYCLE_OK / CYCLE_FAIL / DONE line of the log (or ``none``). ``started`` comes
+from the admission metrics' dispatch record when there is one; ``ended`` is
+the log's mtime.
+
+A run archives every plain log except the newest ``keep``. Frames are
+appended and fsync'ed, then the index lines, and only then are the plain logs
+removed. A crash leaves at worst unindexed bytes at a segment's end or a log
+that is already indexed, which the next run just removes. Retention drops
+whole segments, oldest first, never the one being written. A run with
+nothing to do is skipped by comparing the log directory's mtime with the
+previous run's.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from ..admission.metrics import read_recent
+from . import codec as codecs
+
+ARCHIVE_DIRNAME = "archive"
+INDEX_NAME = "index.jsonl"
+LOCK_NAME = ".lock"
+STAMP_NAME = ".scanned"
+SEGMENT_PREFIX = "segment-"
+LOG_PREFIX, LOG_SUFFIX = "cycle-", ".log"
+EXIT_TOKENS = ("CYCLE_OK", "CYCLE_FAIL", "DONE")
+SEGMENT_BYTES = 16 * 1024 * 1024
+TOKEN_TAIL_BYTES = 4096
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def exit_token(data: bytes) -> str:
+    """Last line of the log that is exactly one of EXIT_TOKENS, else ``none``."""
+    for line in reversed(data[-TOKEN_TAIL_BYTES:].decode("utf-8", "replace").splitlines()):
+        if line.strip() in EXIT_TOKENS:
+            return line.strip()
+    return "none"
+
+
+@dataclass
+class Entry:
+    cycle_id: str
+    name: str
+    segment: str
+    start: int
+    end: int
+    size: int
+    exit_token: str
+    started: str | None
+    ended: str
+
+    @classmethod
+    def from_json(cls, raw: dict[str, Any]) -> "Entry":
+        return cls(**{k: raw.get(k) for k in cls.__dataclass_fields__})
+
+
+@dataclass
+class RunResult:
+    archived: int = 0
+    archived_bytes: int = 0
+    dropped_segments: int = 0
+    dropped_cycles: int = 0
+    skipped: str = ""  # why nothing was examined ("locked", "unchanged"), else ""
+
+
+class LogArchive:
+    def __init__(self, log_dir: str, codec: str = "auto", segment_bytes: int = SEGMENT_BYTES,
+                 metrics_file: str | None = None) -> None:
+        self.log_dir = log_dir
+        self.dir = os.path.join(log_dir, ARCHIVE_DIRNAME)
+        self.index_path = os.path.join(self.dir, INDEX_NAME)
+        self.codec = codec
+        self.segment_bytes = segment_bytes
+        self.metrics_file = metrics_file
+
+    # -- reading -------------------------------------------------------------
+    def entries(self) -> list[Entry]:
+        try:
+            with open(self.index_path, "rb") as fh:
+                lines = fh.read().split(b"\n")
+        except FileNotFoundError:
+            return []
+        entries = []
+        for raw in lines[:-1]:  # the last piece is "" or a torn write
+            try:
+                entries.append(Entry.from_json(json.loads(raw)))
+            except (ValueError, TypeError):
+                continue
+        return entries
+
+    def extract(self, cycle_id: str) -> bytes | None:
+        """One cycle's log: the plain file if it is still there, else its frame."""
+        plain = os.path.join(self.log_dir, f"{LOG_PREFIX}{cycle_id}{LOG_SUFFIX}")
+        try:
+            with open(plain, "rb") as fh:
+                return fh.read()
+        except FileNotFoundError:
+            pass
+        for entry in reversed(self.entries()):
+            if entry.cycle_id == cycle_id:
+                with open(os.path.join(self.dir, entry.segment), "rb") as fh:
+                    fh.seek(entry.start)
+                    frame = fh.read(entry.end - entry.start)
+                return codecs.decompress(frame, codecs.codec_of(entry.segment))
+        return None
+
+    # -- archiving -----------------------------------------------------------
+    def run(self, keep: int, max_bytes: int = 0, max_cycles: int = 0) -> RunResult:
+        """Archive all but the newest ``keep`` plain logs, then apply retention (0 = no limit)."""
+        os.makedirs(self.dir, exist_ok=True)
+        fd = os.open(os.path.join(self.dir, LOCK_NAME), os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return RunResult(skipped="locked")
+            stamp = f"{keep} {max_bytes} {max_cycles} {self._dir_mtime()}"
+            if self._read_stamp() == stamp:
+                return RunResult(skipped="unchanged")
+            result = RunResult()
+            self._archive(self._pending(keep), result)
+            self._retain(max_bytes, max_cycles, result)
+            self._write_stamp(f"{keep} {max_bytes} {max_cycles} {self._dir_mtime()}")
+            return result
+        finally:
+            os.close(fd)
+
+    def _pending(self, keep: int) -> list[tuple[float, str]]:
+        """(mtime, name) of plain logs beyond the newest ``keep``, oldest first."""
+        logs = []
+        with os.scandir(self.log_dir) as it:
+            for entry in it:
+                if entry.name.startswith(LOG_PREFIX) and entry.name.endswith(LOG_SUFFIX) \
+                        and entry.is_file(follow_symlinks=False):
+                    logs.append((entry.stat().st_mtime, entry.name))
+        logs.sort(reverse=True)
+        return sorted(logs[max(0, keep):])
+
+    def _archive(self, pending: list[tuple[float, str]], result: RunResult) -> None:
+        if not pending:
+            return
+        indexed = {entry.name for entry in self.entries()}
+        started_at = self._dispatch_times()
+        codec = codecs.choose(self.codec)
+        segment, handle = self._open_segment(codec)
+        new_entries: list[Entry] = []
+        done: list[str] = []
+        try:
+            for mtime, name in pending:
+                path = os.path.join(self.log_dir, name)
+                if name in indexed:  # archived by a run that crashed before removing it
+                    done.append(path)
+                    continue
+                try:
+                    with open(path, "rb") as fh:
+                        data = fh.read()
+                except FileNotFoundError:
+                    continue
+                if handle.tell() >= self.segment_bytes:
+                    self._sync_close(handle)
+                    segment, handle = self._open_segment(codec, force_new=True)
+                frame = codecs.compress(data, codec)
+                start = handle.tell()
+                handle.write(frame)
+                cycle_id = name[len(LOG_PREFIX):-len(LOG_SUFFIX)]
+                dispatched = started_at.get(cycle_id)
+                new_entries.append(Entry(
+                    cycle_id=cycle_id, name=name, segment=segment, start=start,
+                    end=start + len(frame), size=len(data), exit_token=exit_token(data),
+                    started=_iso(dispatched) if dispatched is not None else None,
+                    ended=_iso(mtime),
+                ))
+                done.append(path)
+                result.archived_bytes += len(data)
+        finally:
+            self._sync_close(handle)
+        if new_entries:
+            with open(self.index_path, "ab") as fh:
+                for entry in new_entries:
+                    fh.write((json.dumps(asdict(entry), separators=(",", ":")) + "\n").encode())
+                fh.flush()
+                os.fsync(fh.fileno())
+        for path in done:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        result.archived += len(new_entries)
+
+    def _retain(self, max_bytes: int, max_cycles: int, result: RunResult) -> None:
+        if max_bytes <= 0 and max_cycles <= 0:
+            return
+        entries = self.entries()
+        segments = sorted(self._segments())
+        if len(segments) < 2:
+            return
+        sizes = {name: os.path.getsize(os.path.join(self.dir, name)) for name in segments}
+        total = sum(sizes.values())
+        dropped: set[str] = set()
+        count = len(entries)
+        for name in segments[:-1]:  # never the segment being written
+            over_bytes = max_bytes > 0 and total > max_bytes
+            over_count = max_cycles > 0 and count > max_cycles
+            if not (over_bytes or over_count):
+                break
+            dropped.add(name)
+            total -= sizes[name]
+            count -= sum(1 for entry in entries if entry.segment == name)
+        if not dropped:
+            return
+        kept = [entry for entry in entries if entry.segment not in dropped]
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "wb") as fh:
+            for entry in kept:
+                fh.write((json.dumps(asdict(entry), separators=(",", ":")) + "\n").encode())
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.index_path)
+        for name in dropped:  # after the index stops pointing at them
+            os.unlink(os.path.join(self.dir, name))
+        result.dropped_segments += len(dropped)
+        result.dropped_cycles += len(entries) - len(kept)
+
+    # -- helpers -------------------------------------------------------------
+    def _segments(self) -> Iterator[str]:
+        with os.scandir(self.dir) as it:
+            for entry in it:
+                if entry.name.startswith(SEGMENT_PREFIX) and entry.is_file():
+                    yield entry.name
+
+    def _open_segment(self, codec: str, force_new: bool = False) -> tuple[str, Any]:
+        """Append handle on the newest segment, or a new one if it is full or another codec."""
+        segments = sorted(self._segments())
+        if segments and not force_new:
+            name = segments[-1]
+            path = os.path.join(self.dir, name)
+            if name.endswith(codecs.SUFFIXES[codec]) and os.path.getsize(path) < self.segment_bytes:
+                return name, open(path, "ab")
+        number = int(segments[-1][len(SEGMENT_PREFIX):].split(".")[0]) + 1 if segments else 1
+        name = f"{SEGMENT_PREFIX}{number:06d}.log{codecs.SUFFIXES[codec]}"
+        return name, open(os.path.join(self.dir, name), "ab")
+
+    @staticmethod
+    def _sync_close(handle: Any) -> None:
+        if handle.closed:
+            return
+        handle.flush()
+        os.fsync(handle.fileno())
+        handle.close()
+
+    def _dispatch_times(self) -> dict[str, float]:
+        if not self.metrics_file:
+            return {}
+        return {str(r.get("cycle_id")): float(r["ts"]) for r in read_recent(self.metrics_file)
+                if r.get("event") == "dispatch"}
+
+    def _dir_mtime(self) -> int:
+        return os.stat(self.log_dir).st_mtime_ns
+
+    def _read_stamp(self) -> str:
+        try:
+            with open(os.path.join(self.dir, STAMP_NAME), encoding="utf-8") as fh:
+                return fh.read().strip()
+        except FileNotFoundError:
+            return ""
+
+    def _write_stamp(self, stamp: str) -> None:
+        with open(os.path.join(self.dir, STAMP_NAME), "w", encoding="utf-8") as fh:
+            fh.write(stamp + "\n")
@@ -0,0 +1,75 @@
+"""Command-line entry point behind .deadf/bin/deadf-logs.py."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from ..admission.metrics import metrics_path
+from . import codec as codecs
+from .archive import SEGMENT_BYTES, LogArchive
+
+
+def default_deadf_dir() -> str:
+    # .deadf/lib/deadf/logarchive/cli.py -> .deadf
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compressed, indexed cycle log archive")
+    parser.add_argument("--deadf-dir", default=None, help="Project .deadf directory (default: this one)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("archive", help="Compress all but the newest logs, then apply retention")
+    p_run.add_argument("--keep", type=int, default=50, help="Newest logs left uncompressed (default: 50)")
+    p_run.add_argument("--max-mb", type=int, default=1024,
+                       help="Archive size cap in MiB, whole segments dropped (0 = none; default: 1024)")
+    p_run.add_argument("--max-cycles", type=int, default=0,
+                       help="Archived cycle cap, whole segments dropped (0 = none; default)")
+    p_run.add_argument("--codec", choices=("auto", "zstd", "gzip"), default="auto",
+                       help="auto = zstd when the zstandard module is installed, else gzip")
+    p_run.add_argument("--segment-mb", type=int, default=SEGMENT_BYTES // (1024 * 1024),
+                       help="Start a new segment past this size (default: 16)")
+
+    p_list = sub.add_parser("list", help="Archived cycles: id, exit token, start, end, size, segment")
+    p_list.add_argument("--last", type=int, default=0, help="Only the newest N (default: all)")
+
+    p_show = sub.add_parser("show", help="Print one cycle's log (plain or archived)")
+    p_show.add_argument("cycle_id")
+
+    args = parser.parse_args()
+    deadf_dir = args.deadf_dir or default_deadf_dir()
+    archive = LogArchive(os.path.join(deadf_dir, "logs"), metrics_file=metrics_path(deadf_dir))
+
+    if args.command == "archive":
+        try:
+            archive.codec = codecs.choose(args.codec)
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            sys.exit(2)
+        archive.segment_bytes = max(1, args.segment_mb) * 1024 * 1024
+        try:
+            result = archive.run(args.keep, args.max_mb * 1024 * 1024, args.max_cycles)
+        except OSError as exc:
+            print(f"error: cannot archive logs: {exc}", file=sys.stderr)
+            sys.exit(1)
+        if result.archived or result.dropped_segments:  # quiet when there was nothing to do
+            print(f"archived {result.archived} log(s), {result.archived_bytes} bytes; "
+                  f"dropped {result.dropped_segments} segment(s), {result.dropped_cycles} cycle(s)")
+    elif args.command == "list":
+        entries = archive.entries()
+        if args.last > 0:
+            entries = entries[-args.last:]
+        for entry in entries:
+            print("\t".join((entry.cycle_id, entry.exit_token, entry.started or "-", entry.ended,
+                             str(entry.size), entry.segment)))
+    elif args.command == "show":
+        try:
+            data = archive.extract(args.cycle_id)
+        except (OSError, ValueError) as exc:
+            print(f"error: cannot read {args.cycle_id}: {exc}", file=sys.stderr)
+            sys.exit(1)
+        if data is None:
+            print(f"error: no log for {args.cycle_id}", file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.buffer.write(data)
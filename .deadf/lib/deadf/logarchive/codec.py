@@ -0,0 +1,52 @@
+"""Per-cycle compression frames.
+
+Each archived log is compressed on its own: one gzip member or one zstd
+frame. Members concatenate into a valid stream, so ``zcat``/``zstdcat`` read
+a whole segment, and the index's byte range decompresses one cycle alone.
+"""
+from __future__ import annotations
+
+import gzip
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is always available
+    zstandard = None
+
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def available() -> list[str]:
+    return ["gzip", "zstd"] if zstandard is not None else ["gzip"]
+
+
+def choose(name: str = "auto") -> str:
+    if name == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if name not in available():
+        raise ValueError(f"codec '{name}' is not available (have: {', '.join(available())})")
+    return name
+
+
+def codec_of(segment_name: str) -> str:
+    for name, suffix in SUFFIXES.items():
+        if segment_name.endswith(suffix):
+            return name
+    raise ValueError(f"unknown segment type: {segment_name}")
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd segments need the zstandard module")
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    # mtime=0: the same log always compresses to the same bytes.
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decompress(frame: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd segments need the zstandard module")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(frame)
+    return gzip.decompress(frame)
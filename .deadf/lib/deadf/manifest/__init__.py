@@ -0,0 +1,9 @@
+"""deadf.manifest — lint-templates.py's view of the shipped ``.deadf`` files.
+
+The manifest lists every shipped file under ``.deadf/{bin,contracts,lib,
+templates}`` with its sha256. ``integrity`` checks those digests from a
+thread pool, remembering each file's digest by (size, mtime_ns, inode) so
+only files that changed since the last run are hashed again, and rewrites the
+manifest from the tree in one pass. ``refindex`` keeps the template ↔ sentinel
+grammar references in an index that is updated from template mtimes.
+"""
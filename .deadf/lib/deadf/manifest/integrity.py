@@ -0,0 +1,239 @@
+"""Manifest digest checks and regeneration.
+
+Digests of files whose (size, mtime_ns, inode) are unchanged come from
+``.deadf/cache/manifest/digests.json``. A file modified within
+``RACY_NS`` of being hashed is not cached: a later write in the same
+timestamp tick would otherwise keep the old stat key (git's "racy clean"
+problem). Someone who restores a file's size and mtime after editing it
+defeats the cache, so ``use_cache=False`` re-hashes everything.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from ..cachedir import ensure_cache_dir
+
+MANIFEST_DIRS = ("bin", "contracts", "lib", "templates")
+SKIP_DIRS = frozenset({"__pycache__"})
+SKIP_SUFFIXES = (".pyc",)
+CACHE_RELDIR = os.path.join("cache", "manifest")
+CACHE_NAME = "digests.json"
+CACHE_VERSION = 1
+RACY_NS = 2_000_000_000
+
+_ENTRY_RE = re.compile(r"^\s*-\s+path:\s*(.+?)\s*$")
+_SHA_RE = re.compile(r"^\s+sha256:\s*([0-9a-f]{64})\s*$")
+
+
+def parse_manifest(path: str) -> list[tuple[str, str | None]]:
+    """(path, sha256) pairs in manifest order; sha256 is None when absent."""
+    entries: list[tuple[str, str | None]] = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            m = _ENTRY_RE.match(line)
+            if m:
+                entries.append((m.group(1), None))
+                continue
+            m = _SHA_RE.match(line)
+            if m and entries and entries[-1][1] is None:
+                entries[-1] = (entries[-1][0], m.group(1))
+    return entries
+
+
+def file_sha256(path: str) -> str:
+    with open(path, "rb") as fh:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+        if os.fstat(fh.fileno()).st_size == 0:
+            return hashlib.sha256(b"").hexdigest()
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+
+def _stat_key(st: os.stat_result) -> list[int]:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+class DigestCache:
+    def __init__(self, deadf_dir: str, enabled: bool = True) -> None:
+        self.dir = os.path.join(deadf_dir, CACHE_RELDIR)
+        self.enabled = enabled
+        self.entries: dict[str, list] = {}
+        self.dirty = False
+        if enabled:
+            try:
+                with open(os.path.join(self.dir, CACHE_NAME), encoding="utf-8") as fh:
+                    data = json.load(fh)
+                if data.get("version") == CACHE_VERSION and isinstance(data.get("entries"), dict):
+                    self.entries = data["entries"]
+            except (OSError, ValueError, AttributeError):
+                pass
+
+    def get(self, rel: str, st: os.stat_result) -> str | None:
+        hit = self.entries.get(rel)
+        if self.enabled and isinstance(hit, list) and len(hit) == 4 and hit[:3] == _stat_key(st):
+            return hit[3]
+        return None
+
+    def put(self, rel: str, st: os.stat_result, digest: str, hashed_at_ns: int) -> None:
+        if not self.enabled:
+            return
+        if hashed_at_ns - st.st_mtime_ns < RACY_NS:
+            self.entries.pop(rel, None)
+        else:
+            self.entries[rel] = [*_stat_key(st), digest]
+        self.dirty = True
+
+    def save(self, keep: set[str]) -> None:
+        if not self.enabled:
+            return
+        stale = set(self.entries) - keep
+        if not (self.dirty or stale):
+            return
+        for rel in stale:
+            del self.entries[rel]
+        ensure_cache_dir(self.dir)
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=".digests.")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, fh, separators=(",", ":"))
+        os.replace(tmp, os.path.join(self.dir, CACHE_NAME))
+
+
+@dataclass
+class Digests:
+    digests: dict[str, str] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+    hashed: int = 0
+    cached: int = 0
+
+
+def digest_files(root: str, rels: list[str], cache: DigestCache, jobs: int = 8) -> Digests:
+    """sha256 of each ``root``-relative path, from the cache where the stat key matches."""
+    result = Digests()
+    todo: list[tuple[str, os.stat_result]] = []
+    for rel in rels:
+        try:
+            st = os.stat(os.path.join(root, rel))
+        except OSError:
+            result.missing.append(rel)
+            continue
+        hit = cache.get(rel, st)
+        if hit is not None:
+            result.digests[rel] = hit
+            result.cached += 1
+        else:
+            todo.append((rel, st))
+
+    def work(item: tuple[str, os.stat_result]) -> tuple[str, os.stat_result, str | None]:
+        rel, st = item
+        try:
+            return rel, st, file_sha256(os.path.join(root, rel))
+        except OSError:
+            return rel, st, None
+
+    if todo:
+        hashed_at = time.time_ns()
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(todo)))) as pool:
+            for rel, st, digest in pool.map(work, todo):
+                if digest is None:
+                    result.missing.append(rel)
+                    continue
+                result.digests[rel] = digest
+                result.hashed += 1
+                cache.put(rel, st, digest, hashed_at)
+    cache.save(set(result.digests))
+    return result
+
+
+@dataclass
+class IntegrityReport:
+    total: int
+    mismatched: list[str]
+    missing: list[str]
+    unlisted: list[str]
+    hashed: int
+    cached: int
+
+    @property
+    def ok(self) -> bool:
+        return not (self.mismatched or self.missing or self.unlisted)
+
+
+def inventory(root: str) -> list[str]:
+    """Root-relative paths of every file the manifest should list, sorted."""
+    found = []
+    stack = [os.path.join(".deadf", d) for d in MANIFEST_DIRS]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            it = os.scandir(os.path.join(root, rel_dir))
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(rel)
+                elif not entry.name.endswith(SKIP_SUFFIXES):
+                    found.append(rel)
+    return sorted(found)
+
+
+def check(root: str, manifest_path: str, jobs: int = 8, use_cache: bool = True) -> IntegrityReport:
+    entries = parse_manifest(manifest_path)
+    cache = DigestCache(os.path.join(root, ".deadf"), use_cache)
+    digests = digest_files(root, [rel for rel, _ in entries], cache, jobs)
+    mismatched = [rel for rel, sha in entries
+                  if rel in digests.digests and digests.digests[rel] != sha]
+    listed = {rel for rel, _ in entries}
+    return IntegrityReport(
+        total=len(entries), mismatched=mismatched, missing=sorted(digests.missing),
+        unlisted=[rel for rel in inventory(root) if rel not in listed],
+        hashed=digests.hashed, cached=digests.cached,
+    )
+
+
+def regenerate(root: str, manifest_path: str, jobs: int = 8, use_cache: bool = True) -> int:
+    """Rewrite the manifest from the tree; returns the number of files listed."""
+    rels = inventory(root)
+    cache = DigestCache(os.path.join(root, ".deadf"), use_cache)
+    digests = digest_files(root, rels, cache, jobs)
+    header: list[str] = []
+    try:
+        with open(manifest_path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.startswith("files:"):
+                    break
+                header.append(line)
+    except FileNotFoundError:
+        pass
+    if not header:
+        header = ["# deadf(ish) manifest — auto-generated file inventory\n",
+                  "# Run: sha256sum on each file to verify integrity\n",
+                  'version: "3.0"\n', 'generated_at: ""\n', "\n"]
+    stamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    header = [f'generated_at: "{stamp}"\n' if line.startswith("generated_at:") else line
+              for line in header]
+    body = "".join(f"  - path: {rel}\n    sha256: {digests.digests[rel]}\n"
+                   for rel in rels if rel in digests.digests)
+    try:
+        mode = os.stat(manifest_path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(manifest_path)),
+                               prefix=".manifest.")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write("".join(header) + "files:\n" + body)
+    os.chmod(tmp, mode)
+    os.replace(tmp, manifest_path)
+    return len(digests.digests)
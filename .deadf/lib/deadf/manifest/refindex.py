@@ -0,0 +1,172 @@
+"""Persistent template ↔ grammar index for lint-templates.py.
+
+``.deadf/cache/templates/index.json`` holds, per template under
+``.deadf/templates/``, its (size, mtime_ns) and the sentinel blocks it opens,
+plus the derived views lint-templates.py asks for::
+
+    {"version": 1,
+     "templates": {"verify/reflect.md": {"size": 2210, "mtime_ns": ...,
+                                         "refs": ["reflect.v1.md"], "marker": true}},
+     "grammars": ["plan.v1.md", ...],             # files in contracts/sentinel/
+     "used_by": {"reflect.v1.md": ["verify/reflect.md"]},
+     "orphaned": ["diagnostic.v1.md"]}
+
+``update`` stats every template but reads only those whose size or mtime
+changed (or that were written within ``RACY_NS`` of the last scan), and
+rebuilds ``used_by``/``orphaned`` only when something changed. Lookups are
+then dict and list reads.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any
+
+from ..cachedir import ensure_cache_dir
+from .integrity import RACY_NS
+
+CACHE_RELDIR = os.path.join("cache", "templates")
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+# <<<TRACK:V1:NONCE=...>>> opens a block; <<<END_TRACK:V1:...>>> closes one.
+MARKER_RE = re.compile(rb"<<<([A-Z0-9_]+):V(\d+):")
+
+
+def type_to_grammar(block_type: str, version: str) -> str:
+    name = block_type.lower().replace("_", "-")
+    return f"{name}.v{version}.md"
+
+
+def scan_text(data: bytes) -> tuple[list[str], bool]:
+    """Grammar file names the text's block openers need, and whether it has any marker."""
+    refs = set()
+    marker = False
+    for m in MARKER_RE.finditer(data):
+        marker = True
+        block_type = m.group(1).decode("ascii")
+        if not block_type.startswith("END_"):
+            refs.add(type_to_grammar(block_type, m.group(2).decode("ascii")))
+    return sorted(refs), marker
+
+
+def _path_key(rel: str) -> list[str]:
+    return rel.split("/")
+
+
+class TemplateIndex:
+    def __init__(self, deadf_dir: str, use_cache: bool = True) -> None:
+        self.deadf_dir = deadf_dir
+        self.templates_dir = os.path.join(deadf_dir, "templates")
+        self.sentinel_dir = os.path.join(deadf_dir, "contracts", "sentinel")
+        self.path = os.path.join(deadf_dir, CACHE_RELDIR, INDEX_NAME)
+        self.use_cache = use_cache
+        self.data: dict[str, Any] = {"version": INDEX_VERSION, "templates": {}, "grammars": [],
+                                     "used_by": {}, "orphaned": []}
+        self.reparsed = 0
+        self._grammar_set: frozenset[str] | None = None
+        if use_cache:
+            try:
+                with open(self.path, encoding="utf-8") as fh:
+                    loaded = json.load(fh)
+                if isinstance(loaded, dict) and loaded.get("version") == INDEX_VERSION:
+                    self.data = loaded
+            except (OSError, ValueError):
+                pass
+
+    # -- queries ---------------------------------------------------------
+
+    @property
+    def templates(self) -> dict[str, dict[str, Any]]:
+        return self.data["templates"]
+
+    def has_grammar(self, name: str) -> bool:
+        if self._grammar_set is None:
+            self._grammar_set = frozenset(self.data["grammars"])
+        return name in self._grammar_set
+
+    def used_by(self, grammar: str) -> list[str]:
+        """Templates that open blocks of ``grammar`` (a contracts/sentinel/ file name)."""
+        return self.data["used_by"].get(grammar, [])
+
+    def orphaned(self) -> list[str]:
+        """Grammars in contracts/sentinel/ that no template references."""
+        return self.data["orphaned"]
+
+    # -- maintenance -----------------------------------------------------
+
+    def _walk_templates(self) -> dict[str, os.stat_result]:
+        found: dict[str, os.stat_result] = {}
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                it = os.scandir(os.path.join(self.templates_dir, rel_dir))
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir():
+                        stack.append(rel)
+                    elif entry.is_file():
+                        found[rel] = entry.stat()
+        return found
+
+    def _grammar_files(self) -> list[str]:
+        try:
+            with os.scandir(self.sentinel_dir) as it:
+                return sorted(e.name for e in it if e.name.endswith(".md") and e.is_file())
+        except OSError:
+            return []
+
+    def update(self) -> bool:
+        """Bring the index up to date with the tree; returns whether anything changed."""
+        now = time.time_ns()
+        seen = self._walk_templates()
+        templates = self.data["templates"]
+        changed = False
+        for rel in [r for r in templates if r not in seen]:
+            del templates[rel]
+            changed = True
+        for rel, st in seen.items():
+            entry = templates.get(rel)
+            if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                continue
+            try:
+                with open(os.path.join(self.templates_dir, rel), "rb") as fh:
+                    refs, marker = scan_text(fh.read())
+            except OSError:
+                refs, marker = [], False
+            racy = now - st.st_mtime_ns < RACY_NS
+            templates[rel] = {"size": st.st_size, "mtime_ns": None if racy else st.st_mtime_ns,
+                              "refs": refs, "marker": marker}
+            self.reparsed += 1
+            changed = True
+        grammars = self._grammar_files()
+        if grammars != self.data["grammars"]:
+            self.data["grammars"] = grammars
+            self._grammar_set = None
+            changed = True
+        if changed:
+            used_by: dict[str, list[str]] = {}
+            for rel in sorted(templates, key=_path_key):
+                for grammar in templates[rel]["refs"]:
+                    used_by.setdefault(grammar, []).append(rel)
+            self.data["used_by"] = used_by
+            self.data["orphaned"] = [g for g in grammars if g not in used_by]
+            self._save()
+        return changed
+
+    def _save(self) -> None:
+        if not self.use_cache:
+            return
+        cache_dir = os.path.dirname(self.path)
+        ensure_cache_dir(cache_dir)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".index.")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(self.data, fh, separators=(",", ":"))
+        os.replace(tmp, self.path)
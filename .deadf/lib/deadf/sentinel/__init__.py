@@ -0,0 +1,123 @@
+"""deadf.sentinel — sentinel-delimited block parsing for the deadf(ish) pipeline.
+
+Block grammars live one per module and are imported (and their regexes
+compiled) on first use:
+
+    from deadf.sentinel import extract_block, get_config
+    result = extract_block(raw_text, nonce, get_config("plan"))
+
+    from deadf.sentinel import build_verdict
+    verdict = build_verdict(pairs, nonce, ["AC1", "AC2"])
+
+When a command's newest contract (.deadf/contracts/sentinel/<command>.v<N>.md)
+has a ``## Grammar table`` section, get_config builds the config from the
+compiled table (grammar.py, cached under .deadf/cache/sentinel/); the
+hand-written modules are the fallback and the reference tests/test-grammars.sh
+checks the tables against. DEADF_SENTINEL_TABLES=0 selects the hand-written modules.
+
+The hyphen-named scripts in .deadf/bin/ are thin entry points over cli.py.
+"""
+from __future__ import annotations
+
+import functools
+import importlib
+import os
+from typing import Any
+
+from .core import (
+    RE_CRITERION,
+    BlockConfig,
+    NonceMismatch,
+    ParseError,
+    extract_block,
+    extract_block_stream,
+)
+
+# ---------------------------------------------------------------------------
+# Block registry: command -> (module, factory)
+# ---------------------------------------------------------------------------
+BLOCK_TYPES: dict[str, tuple[str, str]] = {
+    "plan": ("plan", "make_plan_config"),
+    "track": ("track", "make_track_config"),
+    "spec": ("spec", "make_spec_config"),
+    "reflect": ("reflect", "make_reflect_config"),
+    "qa-review": ("qa_review", "make_qa_review_config"),
+    "verdict": ("verdict", "make_verdict_config"),
+}
+
+# Lazily resolved public names: name -> module that defines it.
+_LAZY_EXPORTS: dict[str, str] = {
+    "make_plan_config": "plan",
+    "make_track_config": "track",
+    "make_spec_config": "spec",
+    "make_reflect_config": "reflect",
+    "make_qa_review_config": "qa_review",
+    "make_verdict_config": "verdict",
+    "parse_verdict_batch": "verdict",
+    "parse_verdict": "verdict",
+    "build_verdict": "verdict",
+}
+
+
+def _factory(command: str) -> Any:
+    if command not in BLOCK_TYPES:
+        raise ParseError(f"unknown command '{command}'")
+    module_name, factory_name = BLOCK_TYPES[command]
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return getattr(module, factory_name)
+
+
+def _table(command: str) -> dict[str, Any] | None:
+    if os.environ.get("DEADF_SENTINEL_TABLES", "1") == "0":
+        return None
+    from . import grammar
+    return grammar.current_table(command)
+
+
+@functools.lru_cache(maxsize=256)
+def get_config(command: str, criterion: str | None = None) -> BlockConfig:
+    """BlockConfig for a command, built on first use and cached.
+
+    Built from the contract's compiled grammar table when it has one,
+    otherwise by the command's hand-written grammar module. Configs are
+    immutable and validators keep no state, so sharing them is safe.
+    """
+    if command not in BLOCK_TYPES:
+        raise ParseError(f"unknown command '{command}'")
+    if command == "verdict":
+        if criterion is None:
+            raise ParseError("--criterion is required for verdict")
+        if not RE_CRITERION.match(criterion):
+            raise ParseError("invalid --criterion format")
+    table = _table(command)
+    if table is not None:
+        from .grammar import table_config
+        return table_config(table, criterion)
+    if command != "verdict":
+        return _factory(command)()
+    return _factory(command)(criterion)
+
+
+def build_config(command: str, criterion: str | None = None) -> BlockConfig:
+    """Uncached get_config (a fresh BlockConfig per call)."""
+    return get_config.__wrapped__(command, criterion)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(f"{__name__}.{_LAZY_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "BLOCK_TYPES",
+    "BlockConfig",
+    "NonceMismatch",
+    "ParseError",
+    "build_config",
+    "extract_block",
+    "extract_block_stream",
+    "get_config",
+    *_LAZY_EXPORTS,
+]
@@ -0,0 +1,204 @@
+"""Acceptance-criteria linter for PLAN ACCEPTANCE and SPEC SUCCESS_CRITERIA items.
+
+A rule is a named vocabulary of words or phrases plus a warning template.
+All vocabularies are compiled into one case-insensitive regex shaped like a
+trie (``improve(?:ment)?|enhance|...``, factored by common prefix), so each
+text position is tried against the longest word at most once and a lint pass
+is linear in the text for a given rule set. Every hit is reported with its
+offset in the item text; ``warnings`` keeps its old shape, one message per
+item that has hits (for its first hit).
+
+The built-in ``vague-verb`` rule is the old plan heuristic. POLICY.yaml can
+add rules, replace a rule of the same name, or drop the built-ins::
+
+    acceptance_lint:
+      builtin: true
+      rules:
+        - name: unmeasurable
+          words: ["user-friendly", "seamless", "as needed"]
+          message: "{id} uses unmeasurable term '{word}'"
+
+Messages are ``str.format`` templates over ``id``, ``word``, ``rule`` and
+``offset``. The policy is ``$DEADF_POLICY`` or ``.deadf/state/POLICY.yaml``;
+``active_linter`` recompiles only when that file's stat key changes.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from ..state.reader import StateError, load, stat_key
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    words: tuple[str, ...]
+    message: str
+
+
+BUILTIN_RULES = (
+    Rule("vague-verb",
+         ("better", "cleanup", "enhance", "improve", "optimize", "refactor"),
+         "{id} uses vague verb '{word}' without metrics"),
+)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# .deadf/lib/deadf/sentinel -> .deadf
+DEFAULT_POLICY = os.path.abspath(os.path.join(_HERE, "..", "..", "..", "state", "POLICY.yaml"))
+
+
+class PolicyError(ValueError):
+    """POLICY.yaml's acceptance_lint section is malformed."""
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    trie: dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict[str, Any]) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            return f"(?:{body})?" if len(branches) == 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+class AcceptanceLinter:
+    def __init__(self, rules: Iterable[Rule], notes: Iterable[str] = ()) -> None:
+        self.rules = tuple(rules)
+        # Warnings about the policy itself, reported with every lint.
+        self.notes = list(notes)
+        self._by_word: dict[str, list[Rule]] = {}
+        # Matched spellings that do not lower-case to a vocabulary word ("İmprove").
+        self._aliases: dict[str, str | None] = {}
+        for rule in self.rules:
+            for word in rule.words:
+                self._by_word.setdefault(word.lower(), []).append(rule)
+        self._re = None
+        if self._by_word:
+            # Lookarounds rather than \b so words may start or end with punctuation ("etc.").
+            self._re = re.compile(rf"(?<!\w){_trie_pattern(self._by_word)}(?!\w)", re.IGNORECASE)
+
+    def lint(self, text: str) -> list[tuple[int, str, Rule]]:
+        """(offset, word, rule) for every hit in ``text``, in offset order."""
+        if self._re is None:
+            return []
+        hits = []
+        for m in self._re.finditer(text):
+            word = self._canonical(m.group())
+            for rule in self._by_word.get(word, ()):
+                hits.append((m.start(), word, rule))
+        return hits
+
+    def _canonical(self, matched: str) -> str | None:
+        """The vocabulary word the regex matched as ``matched``.
+
+        Case-insensitive matching folds some characters that ``str.lower``
+        maps elsewhere (``İ`` lowers to ``i`` plus a combining dot, ``ſ``
+        matches ``s``), so a miss is resolved with the regex's own notion of
+        equality and remembered.
+        """
+        word = matched.lower()
+        if word in self._by_word:
+            return word
+        if matched not in self._aliases:
+            self._aliases[matched] = next(
+                (w for w in self._by_word
+                 if re.fullmatch(re.escape(w), matched, re.IGNORECASE)), None)
+        return self._aliases[matched]
+
+    def lint_items(
+        self, items: list[dict[str, str]], id_key: str = "id", text_key: str = "text",
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """Every hit, and one formatted warning per item with hits (its first)."""
+        hits: list[dict[str, Any]] = []
+        warnings = list(self.notes)
+        for item in items:
+            item_id = item[id_key]
+            item_hits = self.lint(item[text_key])
+            for offset, word, rule in item_hits:
+                hits.append({"id": item_id, "rule": rule.name, "word": word, "offset": offset})
+            if item_hits:
+                offset, word, rule = item_hits[0]
+                warnings.append(rule.message.format(id=item_id, word=word, rule=rule.name,
+                                                    offset=offset))
+        return hits, warnings
+
+
+def rules_from_policy(policy: Any) -> list[Rule]:
+    """Rule set for a parsed POLICY.yaml (the built-ins when it has no section)."""
+    section = policy.get("acceptance_lint") if isinstance(policy, dict) else None
+    if section is None:
+        return list(BUILTIN_RULES)
+    if not isinstance(section, dict):
+        raise PolicyError("acceptance_lint must be a mapping")
+    builtin = section.get("builtin", True)
+    if not isinstance(builtin, bool):
+        raise PolicyError("acceptance_lint.builtin must be true or false")
+    rules = {r.name: r for r in BUILTIN_RULES} if builtin else {}
+    raw = section.get("rules")
+    if raw is None:
+        return list(rules.values())
+    if not isinstance(raw, list):
+        raise PolicyError("acceptance_lint.rules must be a list")
+    for i, entry in enumerate(raw):
+        where = f"acceptance_lint.rules[{i}]"
+        if not isinstance(entry, dict):
+            raise PolicyError(f"{where} must be a mapping")
+        name, words, message = entry.get("name"), entry.get("words"), entry.get("message")
+        if not isinstance(name, str) or not name:
+            raise PolicyError(f"{where}.name must be a non-empty string")
+        if not (isinstance(words, list) and words
+                and all(isinstance(w, str) and w.strip() for w in words)):
+            raise PolicyError(f"{where}.words must be a non-empty list of strings")
+        if not isinstance(message, str):
+            raise PolicyError(f"{where}.message must be a string")
+        try:
+            message.format(id="", word="", rule="", offset=0)
+        except (KeyError, IndexError, ValueError) as exc:
+            raise PolicyError(f"{where}.message: bad placeholder {exc}") from None
+        rules[name] = Rule(name, tuple(w.strip() for w in words), message)
+    return list(rules.values())
+
+
+_lock = threading.Lock()
+_active: tuple[Any, AcceptanceLinter] | None = None
+
+
+def policy_path() -> str:
+    return os.environ.get("DEADF_POLICY") or DEFAULT_POLICY
+
+
+def active_linter() -> AcceptanceLinter:
+    """Linter for the current policy file, rebuilt only when the file changes.
+
+    A policy that cannot be read or is malformed falls back to the built-in
+    rules and says so in every lint's warnings.
+    """
+    global _active
+    path = policy_path()
+    key = (path, stat_key(path))
+    with _lock:
+        if _active is not None and _active[0] == key:
+            return _active[1]
+        notes: list[str] = []
+        try:
+            rules = rules_from_policy(load(path)) if key[1] is not None else list(BUILTIN_RULES)
+        except (StateError, PolicyError) as exc:
+            rules = list(BUILTIN_RULES)
+            notes.append(f"acceptance_lint policy ignored: {exc}")
+        _active = (key, AcceptanceLinter(rules, notes))
+        return _active[1]
@@ -0,0 +1,167 @@
+"""Command-line entry points behind .deadf/bin/parse-blocks.py and build-verdict.py.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from . import get_config
+from .core import (
+    RE_AC_ID,
+    RE_NONCE,
+    NonceMismatch,
+    ParseError,
+    extract_block_stream,
+)
+
+# ---------------------------------------------------------------------------
+# parse-blocks.py
+# ---------------------------------------------------------------------------
+
+def parse_blocks_main() -> None:
+    """Entry point for .deadf/bin/parse-blocks.py."""
+    parser = argparse.ArgumentParser(
+        description="Extract sentinel-delimited blocks from LLM output"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_block(name: str, with_criterion: bool = False) -> None:
+        p = sub.add_parser(name)
+        p.add_argument(
+            "--nonce", required=True,
+            help="Expected 6-char uppercase hex nonce (e.g. 4F2C9A)"
+        )
+        if with_criterion:
+            p.add_argument(
+                "--criterion", required=True,
+                help="Expected criterion id (e.g. AC1)"
+            )
+
+    add_block("track")
+    add_block("spec")
+    add_block("plan")
+    add_block("verdict", with_criterion=True)
+    add_block("reflect")
+    add_block("qa-review")
+
+    p_batch = sub.add_parser(
+        "verdict-batch",
+        help="Parse a JSON array of [criterion_id, raw_response] pairs from stdin",
+    )
+    p_batch.add_argument(
+        "--nonce", required=True,
+        help="Expected 6-char uppercase hex nonce (e.g. 4F2C9A)"
+    )
+    p_batch.add_argument(
+        "--jobs", type=int, default=None,
+        help="Worker processes (default: a pool only for large inputs; 1 = serial)"
+    )
+
+    args = parser.parse_args()
+
+    if not RE_NONCE.match(args.nonce):
+        print(
+            f"error: invalid --nonce format '{args.nonce}' "
+            f"(must match ^[0-9A-F]{{6}}$)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    if args.command == "verdict-batch":
+        try:
+            criteria_pairs = json.load(sys.stdin)
+        except json.JSONDecodeError as exc:
+            print(f"error: invalid JSON input: {exc}", file=sys.stderr)
+            sys.exit(1)
+        from .verdict import parse_verdict_batch
+        try:
+            batch = parse_verdict_batch(criteria_pairs, args.nonce, args.jobs)
+        except (ParseError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            sys.exit(1)
+        json.dump(batch, sys.stdout, ensure_ascii=False, indent=None)
+        sys.stdout.write("\n")
+        sys.exit(0 if batch["failed"] == 0 else 1)
+
+    criterion = getattr(args, "criterion", None)
+    try:
+        config = get_config(args.command, criterion)
+        result = extract_block_stream(sys.stdin, args.nonce, config)
+    except NonceMismatch as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(2)
+    except (ParseError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=None)
+    sys.stdout.write("\n")
+
+
+
+# ---------------------------------------------------------------------------
+# build-verdict.py
+# ---------------------------------------------------------------------------
+def build_verdict_main() -> None:
+    """Entry point for .deadf/bin/build-verdict.py: stdin JSON pairs -> verdict JSON."""
+    parser = argparse.ArgumentParser(
+        description="Build sentinel verdict JSON from criterion responses"
+    )
+    parser.add_argument(
+        "--nonce", required=True,
+        help="Expected 6-char uppercase hex nonce (e.g. 4F2C9A)"
+    )
+    parser.add_argument(
+        "--criteria", required=True,
+        help="Comma-separated criterion IDs (e.g. AC1,AC2,AC3)"
+    )
+    args = parser.parse_args()
+
+    # Validate nonce format
+    if not RE_NONCE.match(args.nonce):
+        print(
+            f"error: invalid --nonce format '{args.nonce}' "
+            f"(must match ^[0-9A-F]{{6}}$)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    criteria_raw = [c.strip() for c in args.criteria.split(",")]
+    if any(c == "" for c in criteria_raw):
+        print("error: --criteria contains empty criterion id", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        expected_criteria = criteria_raw
+        if len(expected_criteria) == 0:
+            raise ValueError("--criteria cannot be empty")
+        for crit in expected_criteria:
+            if not RE_AC_ID.match(crit):
+                raise ValueError(
+                    f"invalid criterion id '{crit}' (must match ^AC[0-9]+$)"
+                )
+        if len(set(expected_criteria)) != len(expected_criteria):
+            raise ParseError("--criteria contains duplicate ids")
+    except (ParseError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    raw_text = sys.stdin.read()
+
+    try:
+        criteria_pairs = json.loads(raw_text)
+    except json.JSONDecodeError as exc:
+        print(f"error: invalid JSON input: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    from .verdict import build_verdict
+    try:
+        result = build_verdict(criteria_pairs, args.nonce, expected_criteria)
+    except (ParseError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=None)
+    sys.stdout.write("\n")
+
@@ -0,0 +1,533 @@
+"""Shared sentinel grammar core: errors, value decoding, payload parsing, scanning.
+
+Every block type is described by a BlockConfig; the per-type factories live in
+sibling modules and are loaded lazily through deadf.sentinel.get_config.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, TextIO
+
+# ---------------------------------------------------------------------------
+# Regexes shared across block types
+# ---------------------------------------------------------------------------
+RE_NONCE = re.compile(r'^[0-9A-F]{6}$')
+RE_TOP_KEY = re.compile(r'^[A-Z][A-Z0-9_]*$')
+RE_ITEM_KEY = re.compile(r'^[a-z][a-z_]*$')
+RE_SECTION_HEADER = re.compile(r'^([A-Z_]+):$')
+RE_KV_LINE = re.compile(r'^([A-Z][A-Z0-9_]*)=(.*)')
+RE_PATH = re.compile(r'^[a-zA-Z0-9_./-]+$')
+RE_AC_ID = re.compile(r'^AC[0-9]+$')
+RE_SC_ID = re.compile(r'^SC[0-9]+$')
+RE_BARE = re.compile(r'^[A-Za-z0-9_-]+$')
+RE_CRITERION = re.compile(r'^[A-Za-z0-9_:-]+$')
+
+# ---------------------------------------------------------------------------
+# Errors
+# ---------------------------------------------------------------------------
+class ParseError(Exception):
+    """Parse error with optional line number."""
+    def __init__(self, msg: str, line: int | None = None) -> None:
+        self.line = line
+        if line is not None:
+            super().__init__(f"line {line}: {msg}")
+        else:
+            super().__init__(msg)
+
+
+class NonceMismatch(Exception):
+    """Nonce mismatch error (expected nonce != block nonce)."""
+    def __init__(self, block_nonce: str, expected_nonce: str) -> None:
+        super().__init__(f"nonce mismatch: block={block_nonce}, expected={expected_nonce}")
+        self.block_nonce = block_nonce
+        self.expected_nonce = expected_nonce
+
+
+# ---------------------------------------------------------------------------
+# Quoted-value unescaping
+# ---------------------------------------------------------------------------
+ESCAPES = {"\\": "\\", '"': '"', "n": "\n", "t": "\t", "r": "\r"}
+
+
+_RE_ESCAPE = re.compile(r'\\(.)|\\\Z|"', re.S)
+
+
+def unescape_quoted(
+    raw: str,
+    line: int | None = None,
+    escapes: dict[str, str] = ESCAPES,
+) -> str:
+    """Unescape a quoted value (without surrounding quotes).
+
+    Processes: ``\\\\``, ``\\"``, ``\\n``, ``\\t``, ``\\r`` (or the given escape table).
+    Raises ParseError on invalid escapes or unmatched quotes; errors are
+    reported for the leftmost offending character.
+    """
+    if "\\" not in raw:
+        if '"' in raw:
+            raise ParseError("unescaped quote inside quoted value", line)
+        return raw
+
+    def _replace(m: re.Match[str]) -> str:
+        esc = m.group(1)
+        if esc is None:
+            if m.group() == '"':
+                raise ParseError("unescaped quote inside quoted value", line)
+            raise ParseError("unterminated escape sequence", line)
+        if esc not in escapes:
+            raise ParseError(f"invalid escape \\{esc}", line)
+        return escapes[esc]
+
+    return _RE_ESCAPE.sub(_replace, raw)
+
+
+def parse_value(
+    raw: str,
+    line: int | None = None,
+    escapes: dict[str, str] = ESCAPES,
+) -> tuple[str, bool]:
+    """Parse a raw value string. Returns (decoded_value, is_quoted)."""
+    stripped = raw.strip()
+    if stripped.startswith('"'):
+        if not stripped.endswith('"') or len(stripped) < 2:
+            raise ParseError("unmatched quote in value", line)
+        inner = stripped[1:-1]
+        return unescape_quoted(inner, line, escapes), True
+    return stripped, False
+
+
+# ---------------------------------------------------------------------------
+# Token splitting for list items (handles quoted strings)
+# ---------------------------------------------------------------------------
+# A token is a run of non-blank characters and complete "..." strings (which
+# may contain blanks and backslash escapes). A quote that cannot be closed
+# matches ``bad``.
+_RE_TOKEN = re.compile(
+    r'(?:[^ \t"]+|"[^"\\]*(?:\\.[^"\\]*)*")+|(?P<bad>")',
+    re.S,
+)
+
+
+def split_tokens(s: str, line: int | None = None) -> list[str]:
+    """Split string into tokens by unquoted whitespace."""
+    tokens: list[str] = []
+    for m in _RE_TOKEN.finditer(s):
+        if m.group("bad") is not None:
+            raise ParseError("unterminated quoted string in token", line)
+        tokens.append(m.group())
+    return tokens
+
+
+def parse_item_kv(
+    s: str,
+    line: int | None = None,
+    required_quoted_keys: set[str] | None = None,
+) -> dict[str, str]:
+    """Parse a list item into key=value pairs with unescaped values."""
+    tokens = split_tokens(s, line)
+    result: dict[str, str] = {}
+    required_quoted_keys = required_quoted_keys or set()
+    for tok in tokens:
+        eq = tok.find('=')
+        if eq < 0:
+            raise ParseError(f"expected key=value, got '{tok}'", line)
+        key = tok[:eq]
+        raw_val = tok[eq + 1:]
+        if not RE_ITEM_KEY.match(key):
+            raise ParseError(
+                f"invalid item key '{key}' (must match ^[a-z][a-z_]*$)", line
+            )
+        if key in result:
+            raise ParseError(f"duplicate item key '{key}'", line)
+        val, is_quoted = parse_value(raw_val, line)
+        if key in required_quoted_keys and not is_quoted:
+            raise ParseError(f"{key} must be quoted", line)
+        result[key] = val
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Path safety check
+# ---------------------------------------------------------------------------
+def validate_path(path: str, line: int | None = None) -> None:
+    """Validate a file path per spec."""
+    if not RE_PATH.match(path):
+        raise ParseError(f"invalid path characters: '{path}'", line)
+    if path.startswith('/'):
+        raise ParseError(f"absolute path not allowed: '{path}'", line)
+    parts = path.split('/')
+    if '..' in parts:
+        raise ParseError(f"path traversal not allowed: '{path}'", line)
+
+
+# ---------------------------------------------------------------------------
+# Block config
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class BlockConfig:
+    name: str
+    opener_re: re.Pattern[str]
+    closer_re: re.Pattern[str]
+    allowed_fields: set[str]
+    required_fields: set[str]
+    section_fields: set[str]
+    multiline_fields: set[str]
+    force_multiline_fields: set[str]
+    required_multiline_fields: set[str]
+    nonempty_multiline_fields: set[str]
+    field_quoted: dict[str, bool | None]
+    section_parsers: dict[str, Callable[[str, int, str], Any]]
+    validator: Callable[[dict[str, Any], dict[str, list[Any]], list[str]], dict[str, Any]]
+    # When set, only sentinels whose ``ac`` group equals label count (verdicts).
+    label: str | None = None
+    # With label_strict every sentinel counts, and a block whose ``ac`` group
+    # differs from label (or between opener and closer) is an error.
+    label_strict: bool = False
+    # Escape table for quoted values.
+    escapes: dict[str, str] = field(default_factory=lambda: ESCAPES)
+    # Values of these fields are upper-cased before validation.
+    upper_fields: frozenset[str] = frozenset()
+
+
+# ---------------------------------------------------------------------------
+# Shared parsing logic
+# ---------------------------------------------------------------------------
+def parse_payload(payload_lines: list[str], config: BlockConfig) -> dict[str, Any]:
+    """Parse payload lines into fields and sections, then validate via config."""
+    fields: dict[str, Any] = {}
+    seen_keys: set[str] = set()
+    sections: dict[str, list[Any]] = {k: [] for k in config.section_fields}
+    warnings: list[str] = []
+
+    current_section: str | None = None
+    pending_multiline: str | None = None
+    pending_multiline_line: int | None = None
+    multiline_parts: list[str] = []
+
+    def _flush_multiline() -> None:
+        nonlocal pending_multiline, pending_multiline_line, multiline_parts
+        if pending_multiline is not None:
+            if pending_multiline in config.required_multiline_fields:
+                if len(multiline_parts) == 0:
+                    raise ParseError(
+                        f"{pending_multiline} must have at least one continuation line",
+                        pending_multiline_line,
+                    )
+            joined = "\n".join(multiline_parts)
+            if pending_multiline in config.nonempty_multiline_fields and len(joined.strip()) == 0:
+                raise ParseError(f"{pending_multiline} cannot be empty", pending_multiline_line)
+            fields[pending_multiline] = joined
+            pending_multiline = None
+            pending_multiline_line = None
+            multiline_parts = []
+
+    for idx, raw_line in enumerate(payload_lines, start=1):
+        # Tab at start → error
+        if raw_line.startswith('\t'):
+            raise ParseError("tab character at start of line", idx)
+
+        # Blank line (0 chars) → skip; ends any active continuation
+        if len(raw_line) == 0:
+            _flush_multiline()
+            # Do not reset current_section; sections end at next header/field
+            continue
+
+        # Continuation line (2+ leading spaces)
+        if raw_line.startswith('  '):
+            if pending_multiline is not None:
+                multiline_parts.append(raw_line[2:])
+                continue
+            raise ParseError("unexpected continuation (no active multi-line field)", idx)
+
+        # If we get here with non-continuation, flush any pending multi-line
+        _flush_multiline()
+
+        # List item
+        if raw_line.startswith('- '):
+            if current_section is None:
+                raise ParseError("list item outside section", idx)
+            item_text = raw_line[2:]
+            parser = config.section_parsers.get(current_section)
+            if parser is None:
+                raise ParseError(f"no parser for section '{current_section}'", idx)
+            item = parser(item_text, idx, raw_line)
+            sections[current_section].append(item)
+            continue
+
+        # Section header
+        m_section = RE_SECTION_HEADER.match(raw_line)
+        if m_section:
+            key = m_section.group(1)
+            if not RE_TOP_KEY.match(key):
+                raise ParseError(f"invalid field name '{key}'", idx)
+            if key not in config.allowed_fields:
+                raise ParseError(f"unknown field '{key}'", idx)
+            if key not in config.section_fields:
+                raise ParseError(f"'{key}' cannot be a section header", idx)
+            if key in seen_keys:
+                raise ParseError(f"duplicate field '{key}'", idx)
+            seen_keys.add(key)
+            current_section = key
+            continue
+
+        # Key=value line
+        m_kv = RE_KV_LINE.match(raw_line)
+        if m_kv:
+            key = m_kv.group(1)
+            raw_val = m_kv.group(2)
+            if key not in config.allowed_fields:
+                raise ParseError(f"unknown field '{key}'", idx)
+            if key in config.section_fields:
+                raise ParseError(f"'{key}' must be a section header (use '{key}:')", idx)
+            if key in seen_keys:
+                raise ParseError(f"duplicate field '{key}'", idx)
+            seen_keys.add(key)
+            current_section = None
+
+            if key in config.force_multiline_fields and raw_val.strip() != '':
+                raise ParseError(f"{key} must be multi-line (use {key}=)", idx)
+
+            if key in config.multiline_fields and raw_val.strip() == '':
+                pending_multiline = key
+                pending_multiline_line = idx
+                multiline_parts = []
+                continue
+
+            val, is_quoted = parse_value(raw_val, idx, config.escapes)
+            quoted_req = config.field_quoted.get(key)
+            if quoted_req is True and not is_quoted:
+                raise ParseError(f"{key} must be quoted", idx)
+            if quoted_req is False and is_quoted:
+                raise ParseError(f"{key} must be unquoted", idx)
+            fields[key] = val.upper() if key in config.upper_fields else val
+            continue
+
+        # Unrecognized line
+        raise ParseError("unrecognized line content", idx)
+
+    _flush_multiline()
+
+    missing_fields = config.required_fields - seen_keys
+    if missing_fields:
+        raise ParseError(f"missing required fields: {', '.join(sorted(missing_fields))}")
+
+    return config.validator(fields, sections, warnings)
+
+
+# ---------------------------------------------------------------------------
+# Block extraction (streaming)
+# ---------------------------------------------------------------------------
+MAX_BLOCK_CHARS = 16_000
+READ_CHUNK_SIZE = 64 * 1024
+SENTINEL_PREFIX = "<<<"
+
+
+class SentinelScanner:
+    """Incremental sentinel scanner for one block type.
+
+    Raw LLM output is fed in arbitrary chunks. Sentinel candidates are found
+    with a plain ``<<<`` line-prefix search; only those lines are matched
+    against the opener/closer regexes. The payload between the first opener
+    and the following closer is the only text retained, and buffering stops
+    once it passes MAX_BLOCK_CHARS (its length is still tracked so the error
+    message stays exact). Peak memory tracks the block, not the transcript.
+    """
+
+    def __init__(self, config: BlockConfig) -> None:
+        self.config = config
+        self._buf = ""
+        self._base = 0            # transcript offset of _buf[0]
+        self._mid_line = False    # _buf starts inside an already-classified line
+        self._in_payload = False
+        self._payload: list[str] = []
+        self._payload_len = 0     # raw payload chars, line terminators included
+        self._overflow = False
+        self.opener_offsets: list[int] = []
+        self.closer_offsets: list[int] = []
+        self.opener_nonces: list[str] = []
+        self.closer_nonces: list[str] = []
+        self.opener_labels: list[str] = []
+        self.closer_labels: list[str] = []
+
+    def feed(self, chunk: str) -> None:
+        # CRLF normalize: dropping every CR matches replace("\r\n", "\n")
+        # followed by replace("\r", "").
+        if "\r" in chunk:
+            chunk = chunk.replace("\r", "")
+        self._buf += chunk
+        self._drain(final=False)
+
+    def _add_payload(self, text: str) -> None:
+        self._payload_len += len(text)
+        if self._overflow:
+            return
+        if self._payload_len - 1 > MAX_BLOCK_CHARS:
+            self._overflow = True
+            self._payload = []
+            return
+        self._payload.append(text)
+
+    def _match(self, regex: re.Pattern[str], line: str) -> re.Match[str] | None:
+        m = regex.match(line)
+        config = self.config
+        if m and config.label is not None and not config.label_strict and m.group("ac") != config.label:
+            return None
+        return m
+
+    def _sentinel_line(self, line: str, offset: int) -> None:
+        m = self._match(self.config.opener_re, line)
+        if m:
+            self.opener_offsets.append(offset)
+            self.opener_nonces.append(m.group("nonce"))
+            if self.config.label_strict:
+                self.opener_labels.append(m.group("ac"))
+            # Payload starts after the first opener; a second opener makes the
+            # block invalid, so stop buffering.
+            self._in_payload = len(self.opener_offsets) == 1
+            return
+        m = self._match(self.config.closer_re, line)
+        if m:
+            self.closer_offsets.append(offset)
+            self.closer_nonces.append(m.group("nonce"))
+            if self.config.label_strict:
+                self.closer_labels.append(m.group("ac"))
+            self._in_payload = False
+            return
+        if self._in_payload:
+            self._add_payload(line + "\n")
+
+    def _drain(self, final: bool) -> None:
+        buf = self._buf
+        n = len(buf)
+        start = 0
+        while start < n:
+            if self._mid_line:
+                nl = buf.find("\n", start)
+                end = n if nl < 0 else nl + 1
+                if self._in_payload:
+                    self._add_payload(buf[start:end])
+                start = end
+                if nl >= 0:
+                    self._mid_line = False
+                continue
+
+            if buf.startswith(SENTINEL_PREFIX, start):
+                nl = buf.find("\n", start)
+                if nl < 0:
+                    if not final:
+                        break  # wait for the rest of the sentinel line
+                    nl = n
+                self._sentinel_line(buf[start:nl], self._base + start)
+                start = nl + 1
+                continue
+
+            hit = buf.find("\n" + SENTINEL_PREFIX, start)
+            if hit >= 0:
+                if self._in_payload:
+                    self._add_payload(buf[start:hit + 1])
+                start = hit + 1
+                continue
+
+            # No sentinel candidate left: consume whole lines, then decide
+            # whether the trailing partial line can still become one.
+            nl = buf.rfind("\n", start)
+            line_start = start if nl < 0 else nl + 1
+            if self._in_payload and line_start > start:
+                self._add_payload(buf[start:line_start])
+            start = line_start
+            rest = buf[start:]
+            if not final and SENTINEL_PREFIX.startswith(rest):
+                break
+            if self._in_payload:
+                self._add_payload(rest)
+            self._mid_line = not final
+            start = n
+
+        self._base += start
+        self._buf = buf[start:]
+
+    def finish(self, nonce: str) -> list[str]:
+        """Flush remaining input, enforce sentinel rules, return payload lines."""
+        self._drain(final=True)
+        config = self.config
+
+        if len(self.opener_offsets) != 1:
+            raise ParseError(
+                f"expected exactly 1 <<<{config.name}: block, found {len(self.opener_offsets)}"
+            )
+        if len(self.closer_offsets) != 1:
+            raise ParseError(
+                f"expected exactly 1 <<<END_{config.name}: block, found {len(self.closer_offsets)}"
+            )
+
+        if self.opener_offsets[0] >= self.closer_offsets[0]:
+            raise ParseError("opener must appear before closer")
+
+        if config.label_strict and self.opener_labels[0] != self.closer_labels[0]:
+            raise ParseError(
+                f"criterion mismatch: opener={self.opener_labels[0]}, closer={self.closer_labels[0]}"
+            )
+
+        open_nonce = self.opener_nonces[0]
+        close_nonce = self.closer_nonces[0]
+        if open_nonce != close_nonce:
+            raise ParseError(
+                f"nonce mismatch: opener={open_nonce}, closer={close_nonce}"
+            )
+        if open_nonce != nonce:
+            raise NonceMismatch(open_nonce, nonce)
+        if config.label_strict and self.opener_labels[0] != config.label:
+            raise ParseError(
+                f"criterion mismatch: block={self.opener_labels[0]}, expected={config.label}"
+            )
+
+        payload_chars = max(self._payload_len - 1, 0)
+        if self._overflow or payload_chars > MAX_BLOCK_CHARS:
+            raise ParseError(
+                f"block content exceeds {MAX_BLOCK_CHARS} chars ({payload_chars})"
+            )
+
+        if self._payload_len == 0:
+            return []
+        # Raw payload ends with the newline that precedes the closer line.
+        return "".join(self._payload)[:-1].split("\n")
+
+
+def extract_block(raw_text: str, nonce: str, config: BlockConfig) -> dict[str, Any]:
+    if not RE_NONCE.match(nonce):
+        raise ValueError(f"invalid nonce format: '{nonce}' (must match ^[0-9A-F]{{6}}$)")
+
+    scanner = SentinelScanner(config)
+    scanner.feed(raw_text)
+    return parse_payload(scanner.finish(nonce), config)
+
+
+def extract_block_stream(stream: TextIO, nonce: str, config: BlockConfig) -> dict[str, Any]:
+    """Like extract_block, but reads *stream* in chunks instead of all at once."""
+    if not RE_NONCE.match(nonce):
+        raise ValueError(f"invalid nonce format: '{nonce}' (must match ^[0-9A-F]{{6}}$)")
+
+    scanner = SentinelScanner(config)
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        scanner.feed(chunk)
+    return parse_payload(scanner.finish(nonce), config)
+
+
+def validate_bare(value: str, line: int | None = None, field: str | None = None) -> str:
+    if len(value) == 0:
+        raise ParseError(f"{field or 'value'} cannot be empty", line)
+    if not RE_BARE.match(value):
+        raise ParseError(f"invalid bare value '{value}'", line)
+    if len(value) > 64:
+        raise ParseError(f"{field or 'value'} exceeds 64 chars ({len(value)})", line)
+    return value
+
+
+def parse_bool(value: str, line: int | None = None, field: str | None = None) -> bool:
+    if value not in {"true", "false"}:
+        raise ParseError(f"{field or 'value'} must be true or false", line)
+    return value == "true"
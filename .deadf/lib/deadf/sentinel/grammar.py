@@ -0,0 +1,478 @@
+"""Table-driven block grammars compiled from the sentinel contracts.
+
+Each ``.deadf/contracts/sentinel/<command>.v<N>.md`` may carry a
+``## Grammar table`` section with one fenced ``json`` block describing the
+block: its fields, list sections, ordered checks and output. ``compile_spec``
+validates that description into a table (plain JSON data), and
+``table_config`` turns a table into a BlockConfig whose section parsers and
+validator run pre-built check closures, so parsing never dispatches on the
+table at run time.
+
+Compiled tables are cached under ``.deadf/cache/sentinel/`` keyed by the
+sha256 of the contract (and ``COMPILER_VERSION``); a process that finds a
+current entry just loads the JSON. The hand-written modules (plan.py, ...)
+stay as the reference implementation: tests/test-grammars.sh checks that both
+agree on every fixture and on mutations of them.
+
+Spec format::
+
+    {"block": "PLAN", "version": 1, "label": false,
+     "fields": {"TITLE": {"required": true, "quoted": true},
+                "SUMMARY": {"required": true, "multiline": "force", "nonempty": true},
+                "NOTES": {"multiline": "allow"}},
+     "sections": {"FILES": {"required": true, "line_max": 1000, "item": "kv",
+                            "keys": ["path", "action", "rationale"],
+                            "quoted_keys": ["rationale"],
+                            "checks": [{"op": "path", "key": "path"}, ...]}},
+     "checks": [{"op": "max_len", "field": "TITLE", "max": 200,
+                 "message": "TITLE exceeds 200 chars ({len})"}, ...],
+     "output": [["title", "TITLE"], ["estimated_diff", "int:ESTIMATED_DIFF"],
+                ["files", "items:FILES"], ["warnings", "warnings"]]}
+
+Check ops: ``max_len``, ``nonempty``, ``single_line``, ``enum``, ``regex``
+(full match) and ``path`` apply to a field (``field``, or a list in
+``fields``) or, inside a section, to an item key (``key``); ``if_present``
+skips absent fields. ``bare``, ``bool`` and ``csv`` also store the decoded
+value for ``value:`` outputs. ``min_items``, ``max_items``, ``unique``,
+``count_equals`` and ``required_if`` work on sections and field pairs;
+``lint`` runs a section's items through the acceptance linter (acceptance.py)
+for the ``lint`` and ``warnings`` outputs. Messages are ``str.format``
+templates over ``field``, ``value``, ``len``, ``n`` and ``count``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Any, Callable
+
+from ..cachedir import ensure_cache_dir
+from .acceptance import active_linter
+from .core import (
+    BlockConfig,
+    ParseError,
+    parse_bool,
+    parse_item_kv,
+    parse_value,
+    validate_bare,
+    validate_path,
+)
+
+COMPILER_VERSION = 2
+GRAMMAR_HEADING = "## Grammar table"
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# .deadf/lib/deadf/sentinel -> .deadf
+DEADF_DIR = os.path.abspath(os.path.join(_HERE, "..", "..", ".."))
+CONTRACTS_DIR = os.path.join(DEADF_DIR, "contracts", "sentinel")
+CACHE_DIR = os.path.join(DEADF_DIR, "cache", "sentinel")
+
+# Generic verdict sentinel (same as verdict.VERDICT_OPENER); the label filters on ``ac``.
+_LABEL_PATTERN = r"[A-Za-z0-9_:-]+"
+
+FIELD_OPS = frozenset({"max_len", "nonempty", "single_line", "enum", "regex", "path",
+                       "bare", "bool", "csv"})
+BLOCK_OPS = frozenset({"min_items", "max_items", "unique", "count_equals", "required_if",
+                       "lint"})
+OUTPUT_KINDS = frozenset({"int", "opt", "value", "items"})
+
+
+class GrammarError(Exception):
+    """A contract's grammar table is malformed."""
+
+
+# ---------------------------------------------------------------------------
+# Contract -> spec -> table
+# ---------------------------------------------------------------------------
+def extract_spec(markdown: str) -> dict[str, Any] | None:
+    """The JSON object in the contract's grammar section, or None if it has none."""
+    start = markdown.find("\n" + GRAMMAR_HEADING)
+    if start < 0:
+        return None
+    m = re.search(r"^```json[ \t]*\n(.*?)^```", markdown[start:], re.S | re.M)
+    if m is None:
+        raise GrammarError(f"'{GRAMMAR_HEADING}' has no ```json block")
+    try:
+        spec = json.loads(m.group(1))
+    except ValueError as exc:
+        raise GrammarError(f"grammar table is not valid JSON: {exc}") from None
+    if not isinstance(spec, dict):
+        raise GrammarError("grammar table must be a JSON object")
+    return spec
+
+
+def _check_ops(checks: Any, allowed: frozenset[str], where: str) -> list[dict[str, Any]]:
+    if not isinstance(checks, list):
+        raise GrammarError(f"{where}: checks must be a list")
+    for check in checks:
+        if not isinstance(check, dict) or check.get("op") not in allowed:
+            raise GrammarError(f"{where}: unknown check {check!r}")
+        need = {"enum": "values", "regex": "pattern"}.get(check["op"])
+        if need and need not in check:
+            raise GrammarError(f"{where}: {check['op']} check needs '{need}'")
+    return checks
+
+
+def compile_spec(spec: dict[str, Any]) -> dict[str, Any]:
+    """Validate a grammar spec and flatten it into the table table_config reads."""
+    try:
+        block = spec["block"]
+        version = int(spec["version"])
+        fields = spec.get("fields", {})
+        sections = spec.get("sections", {})
+    except (KeyError, TypeError, ValueError) as exc:
+        raise GrammarError(f"grammar table needs block and version ({exc})") from None
+    if not re.fullmatch(r"[A-Z][A-Z0-9_]*", str(block)):
+        raise GrammarError(f"invalid block name {block!r}")
+
+    table: dict[str, Any] = {
+        "compiler": COMPILER_VERSION, "block": block, "version": version,
+        "label": bool(spec.get("label", False)),
+        "allowed": sorted([*fields, *sections]),
+        "required": sorted([k for k, f in fields.items() if f.get("required")]
+                           + [k for k, s in sections.items() if s.get("required")]),
+        "sections": {},
+        "multiline": sorted(k for k, f in fields.items() if f.get("multiline") in ("force", "allow")),
+        "force_multiline": sorted(k for k, f in fields.items() if f.get("multiline") == "force"),
+        "nonempty_multiline": sorted(k for k, f in fields.items() if f.get("nonempty")),
+        "quoted": {k: f["quoted"] for k, f in fields.items() if f.get("quoted") is not None},
+        "checks": [],
+        "output": [],
+    }
+    for name, sec in sections.items():
+        item = sec.get("item", "kv")
+        if item not in ("kv", "value"):
+            raise GrammarError(f"section {name}: item must be kv or value")
+        table["sections"][name] = {
+            "line_max": int(sec["line_max"]) if "line_max" in sec else None,
+            "item": item,
+            "keys": list(sec.get("keys", [])),
+            "quoted_keys": list(sec.get("quoted_keys", [])),
+            "quoted": sec.get("quoted"),
+            "quoted_message": sec.get("quoted_message"),
+            "checks": _check_ops(sec.get("checks", []), FIELD_OPS, f"section {name}"),
+        }
+    table["checks"] = _check_ops(spec.get("checks", []), FIELD_OPS | BLOCK_OPS, "checks")
+    for entry in spec.get("output", []):
+        if not (isinstance(entry, list) and len(entry) == 2 and all(isinstance(e, str) for e in entry)):
+            raise GrammarError(f"bad output entry {entry!r}")
+        kind, _, ref = entry[1].partition(":")
+        if ref and kind not in OUTPUT_KINDS:
+            raise GrammarError(f"bad output source {entry[1]!r}")
+        table["output"].append(entry)
+    return table
+
+
+# ---------------------------------------------------------------------------
+# Table -> BlockConfig
+# ---------------------------------------------------------------------------
+Check = Callable[[dict[str, Any]], None]
+
+
+def _value_check(check: dict[str, Any], target: str) -> Callable[[str, int | None, dict[str, Any]], Any]:
+    """One field/key check as a function of (value, line, store) -> stored value or None."""
+    op = check["op"]
+    msg = check.get("message", "")
+
+    def fmt(value: str) -> str:
+        return msg.format(field=target, value=value, len=len(value))
+
+    if op == "max_len":
+        limit = int(check["max"])
+
+        def run(value, line, _store):
+            if len(value) > limit:
+                raise ParseError(fmt(value), line)
+    elif op == "nonempty":
+        def run(value, line, _store):
+            if len(value) == 0:
+                raise ParseError(fmt(value), line)
+    elif op == "single_line":
+        def run(value, line, _store):
+            if "\n" in value or "\r" in value:
+                raise ParseError(fmt(value), line)
+    elif op == "enum":
+        values = frozenset(check["values"])
+
+        def run(value, line, _store):
+            if value not in values:
+                raise ParseError(fmt(value), line)
+    elif op == "regex":
+        pattern = re.compile(check["pattern"])
+
+        def run(value, line, _store):
+            if not pattern.fullmatch(value):
+                raise ParseError(fmt(value), line)
+    elif op == "path":
+        def run(value, line, _store):
+            validate_path(value, line)
+    elif op == "bare":
+        def run(value, line, store):
+            store[target] = validate_bare(value, line, field=target)
+    elif op == "bool":
+        def run(value, line, store):
+            store[target] = parse_bool(value, line, field=target)
+    elif op == "csv":
+        lo, hi = int(check.get("min", 0)), int(check.get("max", 1 << 30))
+
+        def run(value, line, store):
+            items: list[str] = []
+            for part in [p.strip() for p in value.split(",")]:
+                if part == "":
+                    raise ParseError(check["empty_message"].format(field=target), line)
+                items.append(validate_bare(part, line, field=target))
+            if len(items) < lo:
+                raise ParseError(check["min_message"].format(field=target, n=len(items)), line)
+            if len(items) > hi:
+                raise ParseError(check["max_message"].format(field=target, n=len(items)), line)
+            store[target] = items
+    else:  # pragma: no cover - compile_spec rejects unknown ops
+        raise GrammarError(f"unknown op {op!r}")
+    return run
+
+
+def _field_checks(check: dict[str, Any]) -> list[Check]:
+    targets = check["fields"] if "fields" in check else [check["field"]]
+    if_present = bool(check.get("if_present"))
+    out: list[Check] = []
+    for target in targets:
+        run = _value_check(check, target)
+
+        def field_check(ctx, target=target, run=run):
+            fields = ctx["fields"]
+            if if_present and target not in fields:
+                return
+            run(fields.get(target, ""), None, ctx["values"])
+        out.append(field_check)
+    return out
+
+
+def _block_check(check: dict[str, Any]) -> Check:
+    op = check["op"]
+    msg = check.get("message", "")
+    if op in ("min_items", "max_items"):
+        section, limit = check["section"], int(check["min" if op == "min_items" else "max"])
+        too_few = op == "min_items"
+
+        def run(ctx):
+            n = len(ctx["sections"].get(section, []))
+            if (n < limit) if too_few else (n > limit):
+                raise ParseError(msg.format(n=n))
+    elif op == "unique":
+        section, key = check["section"], check["key"]
+
+        def run(ctx):
+            seen: set[str] = set()
+            for item in ctx["sections"].get(section, []):
+                if item[key] in seen:
+                    raise ParseError(msg.format(value=item[key]))
+                seen.add(item[key])
+    elif op == "count_equals":
+        section, field = check["section"], check["field"]
+
+        def run(ctx):
+            count = int(ctx["fields"].get(field, ""))
+            n = len(ctx["sections"].get(section, []))
+            if n != count:
+                raise ParseError(msg.format(count=count, n=n))
+    elif op == "required_if":
+        field, when, equals = check["field"], check["when"], check["equals"]
+
+        def run(ctx):
+            if ctx["values"].get(when) is equals and not ctx["fields"].get(field):
+                raise ParseError(msg.format(field=field))
+    elif op == "lint":
+        section, id_key, text_key = check["section"], check["id_key"], check["text_key"]
+
+        def run(ctx):
+            hits, warnings = active_linter().lint_items(ctx["sections"].get(section, []),
+                                                        id_key, text_key)
+            ctx["lint"].extend(hits)
+            ctx["warnings"].extend(warnings)
+    else:  # pragma: no cover
+        raise GrammarError(f"unknown op {op!r}")
+    return run
+
+
+def _section_parser(name: str, sec: dict[str, Any]) -> Callable[[str, int, str], Any]:
+    line_max = sec["line_max"]
+    keys = frozenset(sec["keys"])
+    quoted_keys = set(sec["quoted_keys"])
+    runs = [(check["key"] if "key" in check else None, _value_check(check, check.get("key", name)))
+            for check in sec["checks"]]
+
+    if sec["item"] == "value":
+        quoted, quoted_message = sec["quoted"], sec["quoted_message"]
+
+        def parse_value_item(item_text: str, line: int, raw_line: str) -> str:
+            if line_max is not None and len(raw_line) > line_max:
+                raise ParseError(f"{name} line exceeds {line_max} chars", line)
+            val, is_quoted = parse_value(item_text, line)
+            if quoted and not is_quoted:
+                raise ParseError(quoted_message, line)
+            for _key, run in runs:
+                run(val, line, {})
+            return val
+        return parse_value_item
+
+    def parse_kv_item(item_text: str, line: int, raw_line: str) -> dict[str, str]:
+        if line_max is not None and len(raw_line) > line_max:
+            raise ParseError(f"{name} line exceeds {line_max} chars", line)
+        kv = parse_item_kv(item_text, line, required_quoted_keys=quoted_keys)
+        unknown = set(kv.keys()) - keys
+        if unknown:
+            raise ParseError(f"unknown {name} keys: {sorted(unknown)}", line)
+        missing = keys - set(kv.keys())
+        if missing:
+            raise ParseError(f"missing {name} keys: {sorted(missing)}", line)
+        for key, run in runs:
+            run(kv[key], line, {})
+        return kv
+    return parse_kv_item
+
+
+def _output(table: dict[str, Any], label: str | None) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    getters: list[tuple[str, Callable[[dict[str, Any]], Any]]] = []
+    for out_key, source in table["output"]:
+        kind, _, ref = source.partition(":")
+        if source == "label":
+            getters.append((out_key, lambda ctx: label))
+        elif source in ("lint", "warnings"):
+            getters.append((out_key, lambda ctx, s=source: ctx[s]))
+        elif not ref:
+            getters.append((out_key, lambda ctx, f=source: ctx["fields"].get(f, "")))
+        elif kind == "int":
+            getters.append((out_key, lambda ctx, f=ref: int(ctx["fields"].get(f, ""))))
+        elif kind == "opt":
+            getters.append((out_key, lambda ctx, f=ref: ctx["fields"].get(f)))
+        elif kind == "value":
+            getters.append((out_key, lambda ctx, f=ref: ctx["values"].get(f)))
+        else:  # items
+            sec = table["sections"][ref]
+            if sec["item"] == "value":
+                getters.append((out_key, lambda ctx, s=ref: list(ctx["sections"].get(s, []))))
+            else:
+                keys = tuple(sec["keys"])
+                getters.append((out_key, lambda ctx, s=ref, keys=keys: [
+                    {k: item[k] for k in keys} for item in ctx["sections"].get(s, [])]))
+
+    def build(ctx: dict[str, Any]) -> dict[str, Any]:
+        return {key: get(ctx) for key, get in getters}
+    return build
+
+
+def table_config(table: dict[str, Any], criterion: str | None = None) -> BlockConfig:
+    block, version = table["block"], table["version"]
+    if table["label"]:
+        label_group = rf"(?P<ac>{_LABEL_PATTERN}):"
+        label = criterion
+    else:
+        label_group, label = "", None
+    opener = re.compile(rf"^<<<{block}:V{version}:{label_group}NONCE=(?P<nonce>[0-9A-F]{{6}})>>>\s*$")
+    closer = re.compile(rf"^<<<END_{block}:{label_group}NONCE=(?P<nonce>[0-9A-F]{{6}})>>>\s*$")
+
+    checks: list[Check] = []
+    for check in table["checks"]:
+        if check["op"] in FIELD_OPS:
+            checks.extend(_field_checks(check))
+        else:
+            checks.append(_block_check(check))
+    build_output = _output(table, label)
+
+    def validate(fields: dict[str, Any], sections: dict[str, list[Any]], _w: list[str]) -> dict[str, Any]:
+        ctx = {"fields": fields, "sections": sections, "values": {}, "lint": [], "warnings": []}
+        for check in checks:
+            check(ctx)
+        return build_output(ctx)
+
+    return BlockConfig(
+        name=block,
+        opener_re=opener,
+        closer_re=closer,
+        allowed_fields=set(table["allowed"]),
+        required_fields=set(table["required"]),
+        section_fields=set(table["sections"]),
+        multiline_fields=set(table["multiline"]),
+        force_multiline_fields=set(table["force_multiline"]),
+        required_multiline_fields=set(table["force_multiline"]),
+        nonempty_multiline_fields=set(table["nonempty_multiline"]),
+        field_quoted=dict(table["quoted"]),
+        section_parsers={name: _section_parser(name, sec) for name, sec in table["sections"].items()},
+        validator=validate,
+        label=label,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Loading (with the compiled-table cache)
+# ---------------------------------------------------------------------------
+def contract_path(command: str, version: int = 1) -> str:
+    return os.path.join(CONTRACTS_DIR, f"{command}.v{version}.md")
+
+
+def contract_versions(command: str) -> list[int]:
+    """Versions of a command's contract on disk (``<command>.v<N>.md``), newest first."""
+    prefix = f"{command}.v"
+    try:
+        names = os.listdir(CONTRACTS_DIR)
+    except OSError:
+        return []
+    return sorted((int(name[len(prefix):-3]) for name in names
+                   if name.startswith(prefix) and name.endswith(".md")
+                   and name[len(prefix):-3].isdigit()), reverse=True)
+
+
+def current_table(command: str, use_cache: bool = True) -> dict[str, Any] | None:
+    """Table of the command's newest contract version (None without a grammar table).
+
+    The newest contract defines the block, so adding ``plan.v2.md`` with a
+    grammar table moves the parser to ``<<<PLAN:V2:...>>>`` without code.
+    Like the hand-written modules, one version is accepted per command.
+    """
+    versions = contract_versions(command)
+    return load_table(command, versions[0], use_cache) if versions else None
+
+
+def _cache_path(command: str, version: int) -> str:
+    return os.path.join(CACHE_DIR, f"{command}.v{version}.json")
+
+
+def load_table(command: str, version: int = 1, use_cache: bool = True) -> dict[str, Any] | None:
+    """Compiled table for a command's contract, or None when it has no grammar table."""
+    try:
+        with open(contract_path(command, version), "rb") as fh:
+            raw = fh.read()
+    except OSError:
+        return None
+    key = hashlib.sha256(raw + f"\0compiler={COMPILER_VERSION}".encode()).hexdigest()
+    cache = _cache_path(command, version)
+    if use_cache:
+        try:
+            with open(cache, encoding="utf-8") as fh:
+                cached = json.load(fh)
+            if cached.get("key") == key:
+                return cached["table"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+    spec = extract_spec(raw.decode("utf-8"))
+    table = compile_spec(spec) if spec is not None else None
+    if table is not None and table["version"] != version:
+        raise GrammarError(f"{os.path.basename(contract_path(command, version))}: "
+                           f"grammar table declares version {table['version']}")
+    if use_cache:
+        try:
+            _write_cache(cache, {"key": key, "table": table})
+        except OSError:
+            pass  # read-only checkout: compile every time
+    return table
+
+
+def _write_cache(path: str, data: dict[str, Any]) -> None:
+    ensure_cache_dir(os.path.dirname(path))
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".grammar.")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp, path)
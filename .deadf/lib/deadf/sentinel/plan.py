@@ -0,0 +1,169 @@
+"""PLAN:V1 block grammar.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .acceptance import active_linter
+from .core import (
+    RE_AC_ID,
+    BlockConfig,
+    ParseError,
+    parse_item_kv,
+    validate_path,
+)
+
+# ---------------------------------------------------------------------------
+# Plan-specific logic (kept behavior-identical to extract_plan.py)
+# ---------------------------------------------------------------------------
+FILES_REQUIRED_KEYS = frozenset({"path", "action", "rationale"})
+ACCEPTANCE_REQUIRED_KEYS = frozenset({"id", "text"})
+VALID_ACTIONS = frozenset({"add", "modify", "delete"})
+
+
+def make_plan_config() -> BlockConfig:
+    opener = re.compile(r'^<<<PLAN:V1:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+    closer = re.compile(r'^<<<END_PLAN:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+
+    def parse_files(item_text: str, line: int, raw_line: str) -> dict[str, str]:
+        if len(raw_line) > 1000:
+            raise ParseError("FILES line exceeds 1000 chars", line)
+        kv = parse_item_kv(item_text, line, required_quoted_keys={"rationale"})
+        unknown = set(kv.keys()) - FILES_REQUIRED_KEYS
+        if unknown:
+            raise ParseError(f"unknown FILES keys: {sorted(unknown)}", line)
+        missing = FILES_REQUIRED_KEYS - set(kv.keys())
+        if missing:
+            raise ParseError(f"missing FILES keys: {sorted(missing)}", line)
+        validate_path(kv["path"], line)
+        if kv["action"] not in VALID_ACTIONS:
+            raise ParseError(
+                f"invalid action '{kv['action']}' (must be add/modify/delete)", line
+            )
+        if "\n" in kv["rationale"] or "\r" in kv["rationale"]:
+            raise ParseError("rationale must be single-line", line)
+        if len(kv["rationale"]) > 300:
+            raise ParseError("rationale exceeds 300 chars", line)
+        return kv
+
+    # NOTE: acceptance_items and warnings are tracked via sections dict and
+    # a mutable list created per-call in validate_plan, NOT via closure capture.
+    # This avoids stale-state bugs when BlockConfig is reused across calls.
+
+    def parse_acceptance(item_text: str, line: int, raw_line: str) -> dict[str, str]:
+        if len(raw_line) > 600:
+            raise ParseError("ACCEPTANCE line exceeds 600 chars", line)
+        kv = parse_item_kv(item_text, line, required_quoted_keys={"text"})
+        unknown = set(kv.keys()) - ACCEPTANCE_REQUIRED_KEYS
+        if unknown:
+            raise ParseError(f"unknown ACCEPTANCE keys: {sorted(unknown)}", line)
+        missing = ACCEPTANCE_REQUIRED_KEYS - set(kv.keys())
+        if missing:
+            raise ParseError(f"missing ACCEPTANCE keys: {sorted(missing)}", line)
+        ac_id = kv["id"]
+        if not RE_AC_ID.match(ac_id):
+            raise ParseError(f"invalid AC id '{ac_id}' (must match ^AC[0-9]+$)", line)
+        text = kv["text"]
+        if len(text) == 0:
+            raise ParseError("acceptance text is empty", line)
+        if "\n" in text or "\r" in text:
+            raise ParseError("acceptance text must be single-line", line)
+        if len(text) > 400:
+            raise ParseError("acceptance text exceeds 400 chars", line)
+        return kv
+
+    def validate_plan(
+        fields: dict[str, Any],
+        sections: dict[str, list[Any]],
+        _warnings: list[str],
+    ) -> dict[str, Any]:
+        task_id = fields.get("TASK_ID", "")
+        title = fields.get("TITLE", "")
+        summary = fields.get("SUMMARY", "")
+        notes = fields.get("NOTES")
+        est_raw = fields.get("ESTIMATED_DIFF", "")
+        files_items = sections.get("FILES", [])
+        acceptance = sections.get("ACCEPTANCE", [])
+
+        if len(est_raw) > 10:
+            raise ParseError(f"ESTIMATED_DIFF exceeds 10 chars ({len(est_raw)})")
+        if not re.fullmatch(r'[1-9][0-9]*', est_raw):
+            raise ParseError(
+                f"ESTIMATED_DIFF must be a positive integer, got '{est_raw}'"
+            )
+
+        if len(files_items) == 0:
+            raise ParseError("FILES must have at least 1 item")
+        if len(acceptance) == 0:
+            raise ParseError("ACCEPTANCE must have at least 1 item")
+
+        if len(task_id) > 64:
+            raise ParseError(f"TASK_ID exceeds 64 chars ({len(task_id)})")
+        if len(title) > 200:
+            raise ParseError(f"TITLE exceeds 200 chars ({len(title)})")
+        if len(summary) > 4000:
+            raise ParseError(f"SUMMARY exceeds 4000 chars ({len(summary)})")
+        if notes is not None and len(notes) > 4000:
+            raise ParseError(f"NOTES exceeds 4000 chars ({len(notes)})")
+        if len(files_items) > 50:
+            raise ParseError(f"FILES has {len(files_items)} items (max 50)")
+        if len(acceptance) > 30:
+            raise ParseError(f"ACCEPTANCE has {len(acceptance)} items (max 30)")
+
+        # Duplicate-ID check (done here, not in parse_acceptance, to avoid closure state)
+        seen_ac_ids: set[str] = set()
+        for a in acceptance:
+            if a["id"] in seen_ac_ids:
+                raise ParseError(f"duplicate acceptance id '{a['id']}'")
+            seen_ac_ids.add(a["id"])
+
+        # Acceptance-text lint warnings (computed fresh per call)
+        lint, warnings = active_linter().lint_items(acceptance, "id", "text")
+
+        return {
+            "task_id": task_id,
+            "title": title,
+            "summary": summary,
+            "files": [
+                {"path": f["path"], "action": f["action"], "rationale": f["rationale"]}
+                for f in files_items
+            ],
+            "acceptance": [
+                {"id": a["id"], "text": a["text"]}
+                for a in acceptance
+            ],
+            "estimated_diff": int(est_raw),
+            "notes": notes,
+            "lint": lint,
+            "warnings": warnings,
+        }
+
+    return BlockConfig(
+        name="PLAN",
+        opener_re=opener,
+        closer_re=closer,
+        allowed_fields={
+            "TASK_ID", "TITLE", "SUMMARY", "FILES",
+            "ACCEPTANCE", "ESTIMATED_DIFF", "NOTES",
+        },
+        required_fields={
+            "TASK_ID", "TITLE", "SUMMARY", "FILES",
+            "ACCEPTANCE", "ESTIMATED_DIFF",
+        },
+        section_fields={"FILES", "ACCEPTANCE"},
+        multiline_fields={"SUMMARY", "NOTES"},
+        force_multiline_fields={"SUMMARY"},
+        required_multiline_fields={"SUMMARY"},
+        nonempty_multiline_fields={"SUMMARY"},
+        field_quoted={
+            "TITLE": True,
+            "TASK_ID": False,
+            "ESTIMATED_DIFF": False,
+        },
+        section_parsers={
+            "FILES": parse_files,
+            "ACCEPTANCE": parse_acceptance,
+        },
+        validator=validate_plan,
+    )
@@ -0,0 +1,173 @@
+"""QA_REVIEW:V1 block grammar.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .core import BlockConfig, ParseError, parse_item_kv, validate_path
+
+# ---------------------------------------------------------------------------
+# QA Review
+# ---------------------------------------------------------------------------
+QA_SEVERITIES = frozenset({"CRITICAL", "MAJOR", "MINOR"})
+QA_CATEGORIES = frozenset({"C0", "C1", "C2", "C3", "C4", "C5"})
+QA_FINDING_KEYS = frozenset({"severity", "category", "file", "issue"})
+QA_REMEDIATION_KEYS = frozenset({"file", "action"})
+
+
+def make_qa_review_config() -> BlockConfig:
+    opener = re.compile(r'^<<<QA_REVIEW:V1:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+    closer = re.compile(r'^<<<END_QA_REVIEW:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+
+    def parse_finding(item_text: str, line: int, raw_line: str) -> dict[str, str]:
+        if len(raw_line) > 1200:
+            raise ParseError("FINDINGS line exceeds 1200 chars", line)
+        kv = parse_item_kv(item_text, line, required_quoted_keys={"file", "issue"})
+        unknown = set(kv.keys()) - QA_FINDING_KEYS
+        if unknown:
+            raise ParseError(f"unknown FINDINGS keys: {sorted(unknown)}", line)
+        missing = QA_FINDING_KEYS - set(kv.keys())
+        if missing:
+            raise ParseError(f"missing FINDINGS keys: {sorted(missing)}", line)
+        if kv["severity"] not in QA_SEVERITIES:
+            raise ParseError(f"invalid severity '{kv['severity']}'", line)
+        if kv["category"] not in QA_CATEGORIES:
+            raise ParseError(f"invalid category '{kv['category']}'", line)
+        validate_path(kv["file"], line)
+        if "\n" in kv["issue"] or "\r" in kv["issue"]:
+            raise ParseError("issue must be single-line", line)
+        if len(kv["issue"]) == 0:
+            raise ParseError("issue cannot be empty", line)
+        if len(kv["issue"]) > 400:
+            raise ParseError("issue exceeds 400 chars", line)
+        return kv
+
+    def parse_remediation(item_text: str, line: int, raw_line: str) -> dict[str, str]:
+        if len(raw_line) > 800:
+            raise ParseError("REMEDIATION line exceeds 800 chars", line)
+        kv = parse_item_kv(item_text, line, required_quoted_keys={"file", "action"})
+        unknown = set(kv.keys()) - QA_REMEDIATION_KEYS
+        if unknown:
+            raise ParseError(f"unknown REMEDIATION keys: {sorted(unknown)}", line)
+        missing = QA_REMEDIATION_KEYS - set(kv.keys())
+        if missing:
+            raise ParseError(f"missing REMEDIATION keys: {sorted(missing)}", line)
+        validate_path(kv["file"], line)
+        if "\n" in kv["action"] or "\r" in kv["action"]:
+            raise ParseError("action must be single-line", line)
+        if len(kv["action"]) == 0:
+            raise ParseError("action cannot be empty", line)
+        if len(kv["action"]) > 200:
+            raise ParseError("action exceeds 200 chars", line)
+        return kv
+
+    def validate_qa_review(fields: dict[str, Any], sections: dict[str, list[Any]], _w: list[str]) -> dict[str, Any]:
+        verdict = fields.get("VERDICT", "")
+        risk = fields.get("RISK", "")
+        notes = fields.get("NOTES", "")
+        findings_count_raw = fields.get("FINDINGS_COUNT", "")
+        remediation_count_raw = fields.get("REMEDIATION_COUNT", "")
+
+        if verdict not in {"PASS", "FAIL"}:
+            raise ParseError("VERDICT must be PASS or FAIL")
+        if risk not in {"LOW", "MEDIUM", "HIGH"}:
+            raise ParseError("RISK must be LOW, MEDIUM, or HIGH")
+
+        for key in ["C0", "C1", "C2", "C3", "C4", "C5"]:
+            val = fields.get(key, "")
+            if val not in {"PASS", "FAIL"}:
+                raise ParseError(f"{key} must be PASS or FAIL")
+
+        if not re.fullmatch(r'[0-9]+', findings_count_raw):
+            raise ParseError(f"FINDINGS_COUNT must be a non-negative integer")
+        if not re.fullmatch(r'[0-9]+', remediation_count_raw):
+            raise ParseError(f"REMEDIATION_COUNT must be a non-negative integer")
+
+        findings_count = int(findings_count_raw)
+        remediation_count = int(remediation_count_raw)
+
+        if "\n" in notes or "\r" in notes:
+            raise ParseError("NOTES must be single-line")
+        if len(notes) > 500:
+            raise ParseError("NOTES exceeds 500 chars")
+
+        findings = sections.get("FINDINGS", [])
+        remediation = sections.get("REMEDIATION", [])
+
+        if len(findings) != findings_count:
+            raise ParseError(
+                f"FINDINGS_COUNT={findings_count} but {len(findings)} findings provided"
+            )
+        if len(remediation) != remediation_count:
+            raise ParseError(
+                f"REMEDIATION_COUNT={remediation_count} but {len(remediation)} items provided"
+            )
+
+        if len(findings) > 200:
+            raise ParseError(f"FINDINGS has {len(findings)} items (max 200)")
+        if len(remediation) > 200:
+            raise ParseError(f"REMEDIATION has {len(remediation)} items (max 200)")
+
+        return {
+            "verdict": verdict,
+            "risk": risk,
+            "c0": fields["C0"],
+            "c1": fields["C1"],
+            "c2": fields["C2"],
+            "c3": fields["C3"],
+            "c4": fields["C4"],
+            "c5": fields["C5"],
+            "findings_count": findings_count,
+            "findings": [
+                {
+                    "severity": f["severity"],
+                    "category": f["category"],
+                    "file": f["file"],
+                    "issue": f["issue"],
+                }
+                for f in findings
+            ],
+            "remediation_count": remediation_count,
+            "remediation": [
+                {"file": r["file"], "action": r["action"]} for r in remediation
+            ],
+            "notes": notes,
+        }
+
+    return BlockConfig(
+        name="QA_REVIEW",
+        opener_re=opener,
+        closer_re=closer,
+        allowed_fields={
+            "VERDICT", "RISK", "C0", "C1", "C2", "C3", "C4", "C5",
+            "FINDINGS_COUNT", "FINDINGS", "REMEDIATION_COUNT", "REMEDIATION", "NOTES",
+        },
+        required_fields={
+            "VERDICT", "RISK", "C0", "C1", "C2", "C3", "C4", "C5",
+            "FINDINGS_COUNT", "FINDINGS", "REMEDIATION_COUNT", "REMEDIATION", "NOTES",
+        },
+        section_fields={"FINDINGS", "REMEDIATION"},
+        multiline_fields=set(),
+        force_multiline_fields=set(),
+        required_multiline_fields=set(),
+        nonempty_multiline_fields=set(),
+        field_quoted={
+            "NOTES": True,
+            "VERDICT": False,
+            "RISK": False,
+            "C0": False,
+            "C1": False,
+            "C2": False,
+            "C3": False,
+            "C4": False,
+            "C5": False,
+            "FINDINGS_COUNT": False,
+            "REMEDIATION_COUNT": False,
+        },
+        section_parsers={
+            "FINDINGS": parse_finding,
+            "REMEDIATION": parse_remediation,
+        },
+        validator=validate_qa_review,
+    )
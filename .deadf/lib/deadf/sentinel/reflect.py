@@ -0,0 +1,86 @@
+"""REFLECT:V1 block grammar.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .core import BlockConfig, ParseError, parse_item_kv
+
+# ---------------------------------------------------------------------------
+# Reflect
+# ---------------------------------------------------------------------------
+REFLECT_DOCS = frozenset({
+    "TECH_STACK", "PATTERNS", "PITFALLS", "RISKS", "PRODUCT", "WORKFLOW", "GLOSSARY",
+})
+REFLECT_ACTIONS = frozenset({"append", "replace_section", "noop"})
+REFLECT_REQUIRED_KEYS = frozenset({"doc", "action", "section", "content"})
+
+
+def make_reflect_config() -> BlockConfig:
+    opener = re.compile(r'^<<<REFLECT:V1:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+    closer = re.compile(r'^<<<END_REFLECT:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+
+    def parse_update(item_text: str, line: int, raw_line: str) -> dict[str, str]:
+        if len(raw_line) > 1000:
+            raise ParseError("UPDATES line exceeds 1000 chars", line)
+        kv = parse_item_kv(item_text, line, required_quoted_keys={"section", "content"})
+        unknown = set(kv.keys()) - REFLECT_REQUIRED_KEYS
+        if unknown:
+            raise ParseError(f"unknown UPDATES keys: {sorted(unknown)}", line)
+        missing = REFLECT_REQUIRED_KEYS - set(kv.keys())
+        if missing:
+            raise ParseError(f"missing UPDATES keys: {sorted(missing)}", line)
+        if kv["doc"] not in REFLECT_DOCS:
+            raise ParseError(f"invalid doc '{kv['doc']}'", line)
+        if kv["action"] not in REFLECT_ACTIONS:
+            raise ParseError(f"invalid action '{kv['action']}'", line)
+        if "\n" in kv["section"] or "\r" in kv["section"]:
+            raise ParseError("section must be single-line", line)
+        if "\n" in kv["content"] or "\r" in kv["content"]:
+            raise ParseError("content must be single-line", line)
+        if len(kv["section"]) == 0:
+            raise ParseError("section cannot be empty", line)
+        if len(kv["section"]) > 200:
+            raise ParseError("section exceeds 200 chars", line)
+        if len(kv["content"]) > 1000:
+            raise ParseError("content exceeds 1000 chars", line)
+        return kv
+
+    def validate_reflect(fields: dict[str, Any], sections: dict[str, list[Any]], _w: list[str]) -> dict[str, Any]:
+        updates = sections.get("UPDATES", [])
+        scratch = fields.get("SCRATCH", "")
+
+        if len(updates) > 50:
+            raise ParseError(f"UPDATES has {len(updates)} items (max 50)")
+        if len(scratch) > 4000:
+            raise ParseError(f"SCRATCH exceeds 4000 chars ({len(scratch)})")
+
+        return {
+            "updates": [
+                {
+                    "doc": u["doc"],
+                    "action": u["action"],
+                    "section": u["section"],
+                    "content": u["content"],
+                }
+                for u in updates
+            ],
+            "scratch": scratch,
+        }
+
+    return BlockConfig(
+        name="REFLECT",
+        opener_re=opener,
+        closer_re=closer,
+        allowed_fields={"UPDATES", "SCRATCH"},
+        required_fields={"UPDATES", "SCRATCH"},
+        section_fields={"UPDATES"},
+        multiline_fields={"SCRATCH"},
+        force_multiline_fields={"SCRATCH"},
+        required_multiline_fields={"SCRATCH"},
+        nonempty_multiline_fields={"SCRATCH"},
+        field_quoted={},
+        section_parsers={"UPDATES": parse_update},
+        validator=validate_reflect,
+    )
@@ -0,0 +1,150 @@
+"""SPEC:V1 block grammar.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .acceptance import active_linter
+from .core import (
+    RE_SC_ID,
+    BlockConfig,
+    ParseError,
+    parse_item_kv,
+    parse_value,
+    validate_bare,
+)
+
+# ---------------------------------------------------------------------------
+# Spec
+# ---------------------------------------------------------------------------
+SUCCESS_REQUIRED_KEYS = frozenset({"id", "text"})
+
+
+def make_spec_config() -> BlockConfig:
+    opener = re.compile(r'^<<<SPEC:V1:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+    closer = re.compile(r'^<<<END_SPEC:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+
+    # NOTE: duplicate-ID check moved to validate_spec to avoid closure state leak.
+
+    def parse_success(item_text: str, line: int, raw_line: str) -> dict[str, str]:
+        if len(raw_line) > 600:
+            raise ParseError("SUCCESS_CRITERIA line exceeds 600 chars", line)
+        kv = parse_item_kv(item_text, line, required_quoted_keys={"text"})
+        unknown = set(kv.keys()) - SUCCESS_REQUIRED_KEYS
+        if unknown:
+            raise ParseError(f"unknown SUCCESS_CRITERIA keys: {sorted(unknown)}", line)
+        missing = SUCCESS_REQUIRED_KEYS - set(kv.keys())
+        if missing:
+            raise ParseError(f"missing SUCCESS_CRITERIA keys: {sorted(missing)}", line)
+        sc_id = kv["id"]
+        if not RE_SC_ID.match(sc_id):
+            raise ParseError(f"invalid SC id '{sc_id}' (must match ^SC[0-9]+$)", line)
+        text = kv["text"]
+        if len(text) == 0:
+            raise ParseError("success criteria text is empty", line)
+        if "\n" in text or "\r" in text:
+            raise ParseError("success criteria text must be single-line", line)
+        if len(text) > 400:
+            raise ParseError("success criteria text exceeds 400 chars", line)
+        return kv
+
+    def parse_dependency(item_text: str, line: int, raw_line: str) -> str:
+        if len(raw_line) > 600:
+            raise ParseError("DEPENDENCIES line exceeds 600 chars", line)
+        val, is_quoted = parse_value(item_text, line)
+        if not is_quoted:
+            raise ParseError("dependency must be quoted", line)
+        if len(val) == 0:
+            raise ParseError("dependency cannot be empty", line)
+        if "\n" in val or "\r" in val:
+            raise ParseError("dependency must be single-line", line)
+        if len(val) > 400:
+            raise ParseError("dependency exceeds 400 chars", line)
+        return val
+
+    def validate_spec(fields: dict[str, Any], sections: dict[str, list[Any]], _w: list[str]) -> dict[str, Any]:
+        track_id = validate_bare(fields.get("TRACK_ID", ""), field="TRACK_ID")
+        title = fields.get("TITLE", "")
+        scope = fields.get("SCOPE", "")
+        approach = fields.get("APPROACH", "")
+        constraints = fields.get("CONSTRAINTS", "")
+        est_raw = fields.get("ESTIMATED_TASKS", "")
+
+        if len(title) == 0:
+            raise ParseError("TITLE cannot be empty")
+        if len(title) > 200:
+            raise ParseError(f"TITLE exceeds 200 chars ({len(title)})")
+        if len(scope) > 4000:
+            raise ParseError(f"SCOPE exceeds 4000 chars ({len(scope)})")
+        if len(approach) > 4000:
+            raise ParseError(f"APPROACH exceeds 4000 chars ({len(approach)})")
+        if len(constraints) > 4000:
+            raise ParseError(f"CONSTRAINTS exceeds 4000 chars ({len(constraints)})")
+
+        if not re.fullmatch(r'[1-9][0-9]*', est_raw):
+            raise ParseError(
+                f"ESTIMATED_TASKS must be a positive integer, got '{est_raw}'"
+            )
+
+        success = sections.get("SUCCESS_CRITERIA", [])
+        deps = sections.get("DEPENDENCIES", [])
+        if len(success) == 0:
+            raise ParseError("SUCCESS_CRITERIA must have at least 1 item")
+        if len(success) > 30:
+            raise ParseError(f"SUCCESS_CRITERIA has {len(success)} items (max 30)")
+        if len(deps) > 30:
+            raise ParseError(f"DEPENDENCIES has {len(deps)} items (max 30)")
+
+        # Duplicate-ID check (done here, not in parse_success, to avoid closure state)
+        seen_sc_ids: set[str] = set()
+        for sc in success:
+            if sc["id"] in seen_sc_ids:
+                raise ParseError(f"duplicate success criteria id '{sc['id']}'")
+            seen_sc_ids.add(sc["id"])
+
+        lint, warnings = active_linter().lint_items(success, "id", "text")
+
+        return {
+            "track_id": track_id,
+            "title": title,
+            "scope": scope,
+            "approach": approach,
+            "constraints": constraints,
+            "success_criteria": [
+                {"id": sc["id"], "text": sc["text"]} for sc in success
+            ],
+            "dependencies": list(deps),
+            "estimated_tasks": int(est_raw),
+            "lint": lint,
+            "warnings": warnings,
+        }
+
+    return BlockConfig(
+        name="SPEC",
+        opener_re=opener,
+        closer_re=closer,
+        allowed_fields={
+            "TRACK_ID", "TITLE", "SCOPE", "APPROACH", "CONSTRAINTS",
+            "SUCCESS_CRITERIA", "DEPENDENCIES", "ESTIMATED_TASKS",
+        },
+        required_fields={
+            "TRACK_ID", "TITLE", "SCOPE", "APPROACH", "CONSTRAINTS",
+            "SUCCESS_CRITERIA", "DEPENDENCIES", "ESTIMATED_TASKS",
+        },
+        section_fields={"SUCCESS_CRITERIA", "DEPENDENCIES"},
+        multiline_fields={"SCOPE", "APPROACH", "CONSTRAINTS"},
+        force_multiline_fields={"SCOPE", "APPROACH", "CONSTRAINTS"},
+        required_multiline_fields={"SCOPE", "APPROACH", "CONSTRAINTS"},
+        nonempty_multiline_fields={"SCOPE", "APPROACH", "CONSTRAINTS"},
+        field_quoted={
+            "TITLE": True,
+            "TRACK_ID": False,
+            "ESTIMATED_TASKS": False,
+        },
+        section_parsers={
+            "SUCCESS_CRITERIA": parse_success,
+            "DEPENDENCIES": parse_dependency,
+        },
+        validator=validate_spec,
+    )
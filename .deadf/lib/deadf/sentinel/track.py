@@ -0,0 +1,110 @@
+"""TRACK:V1 block grammar.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .core import BlockConfig, ParseError, parse_bool, validate_bare
+
+# ---------------------------------------------------------------------------
+# Track
+# ---------------------------------------------------------------------------
+TRACK_REQUIRED = {
+    "TRACK_ID", "NAME", "PHASE", "GOAL", "REQUIREMENTS", "ESTIMATED_TASKS",
+}
+
+
+
+def make_track_config() -> BlockConfig:
+    opener = re.compile(r'^<<<TRACK:V1:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+    closer = re.compile(r'^<<<END_TRACK:NONCE=(?P<nonce>[0-9A-F]{6})>>>\s*$')
+
+    def validate_track(fields: dict[str, Any], _sections: dict[str, list[Any]], _w: list[str]) -> dict[str, Any]:
+        track_id = validate_bare(fields.get("TRACK_ID", ""), field="TRACK_ID")
+        name = fields.get("NAME", "")
+        phase = validate_bare(fields.get("PHASE", ""), field="PHASE")
+        goal = fields.get("GOAL", "")
+        req_raw = fields.get("REQUIREMENTS", "")
+        est_raw = fields.get("ESTIMATED_TASKS", "")
+
+        if len(name) == 0:
+            raise ParseError("NAME cannot be empty")
+        if len(goal) == 0:
+            raise ParseError("GOAL cannot be empty")
+        if len(name) > 200:
+            raise ParseError(f"NAME exceeds 200 chars ({len(name)})")
+        if len(goal) > 500:
+            raise ParseError(f"GOAL exceeds 500 chars ({len(goal)})")
+
+        requirements: list[str] = []
+        for part in [p.strip() for p in req_raw.split(',')]:
+            if part == "":
+                raise ParseError("REQUIREMENTS has empty item")
+            requirements.append(validate_bare(part, field="REQUIREMENTS"))
+        if len(requirements) == 0:
+            raise ParseError("REQUIREMENTS must have at least 1 item")
+        if len(requirements) > 30:
+            raise ParseError(f"REQUIREMENTS has {len(requirements)} items (max 30)")
+
+        if not re.fullmatch(r'[1-9][0-9]*', est_raw):
+            raise ParseError(
+                f"ESTIMATED_TASKS must be a positive integer, got '{est_raw}'"
+            )
+
+        phase_complete = None
+        phase_blocked = None
+        if "PHASE_COMPLETE" in fields:
+            phase_complete = parse_bool(fields["PHASE_COMPLETE"], field="PHASE_COMPLETE")
+        if "PHASE_BLOCKED" in fields:
+            phase_blocked = parse_bool(fields["PHASE_BLOCKED"], field="PHASE_BLOCKED")
+
+        reasons = fields.get("REASONS")
+        if phase_blocked is True and not reasons:
+            raise ParseError("REASONS required when PHASE_BLOCKED=true")
+        if reasons is not None:
+            if "\n" in reasons or "\r" in reasons:
+                raise ParseError("REASONS must be single-line")
+            if len(reasons) > 500:
+                raise ParseError("REASONS exceeds 500 chars")
+
+        return {
+            "track_id": track_id,
+            "name": name,
+            "phase": phase,
+            "goal": goal,
+            "requirements": requirements,
+            "estimated_tasks": int(est_raw),
+            "phase_complete": phase_complete,
+            "phase_blocked": phase_blocked,
+            "reasons": reasons,
+        }
+
+    return BlockConfig(
+        name="TRACK",
+        opener_re=opener,
+        closer_re=closer,
+        allowed_fields={
+            "TRACK_ID", "NAME", "PHASE", "GOAL", "REQUIREMENTS",
+            "ESTIMATED_TASKS", "PHASE_COMPLETE", "PHASE_BLOCKED", "REASONS",
+        },
+        required_fields=set(TRACK_REQUIRED),
+        section_fields=set(),
+        multiline_fields=set(),
+        force_multiline_fields=set(),
+        required_multiline_fields=set(),
+        nonempty_multiline_fields=set(),
+        field_quoted={
+            "NAME": True,
+            "GOAL": True,
+            "REASONS": True,
+            "TRACK_ID": False,
+            "PHASE": False,
+            "REQUIREMENTS": False,
+            "ESTIMATED_TASKS": False,
+            "PHASE_COMPLETE": False,
+            "PHASE_BLOCKED": False,
+        },
+        section_parsers={},
+        validator=validate_track,
+    )
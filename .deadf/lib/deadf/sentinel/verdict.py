@@ -0,0 +1,320 @@
+"""VERDICT:V1 block grammar, batch parsing and the verdict builder.
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import Any
+
+from .core import (
+    RE_AC_ID,
+    RE_CRITERION,
+    RE_NONCE,
+    BlockConfig,
+    NonceMismatch,
+    ParseError,
+    extract_block,
+)
+
+# ---------------------------------------------------------------------------
+# Verdict
+# ---------------------------------------------------------------------------
+
+def _verdict_sentinels(ac_pattern: str) -> tuple[re.Pattern[str], re.Pattern[str]]:
+    opener = re.compile(
+        rf'^<<<VERDICT:V1:(?P<ac>{ac_pattern}):NONCE=(?P<nonce>[0-9A-F]{{6}})>>>\s*$'
+    )
+    closer = re.compile(
+        rf'^<<<END_VERDICT:(?P<ac>{ac_pattern}):NONCE=(?P<nonce>[0-9A-F]{{6}})>>>\s*$'
+    )
+    return opener, closer
+
+
+# One generic grammar for every criterion; make_verdict_config filters
+# sentinels on the ``ac`` group instead of compiling per-criterion regexes.
+VERDICT_OPENER, VERDICT_CLOSER = _verdict_sentinels(r"[A-Za-z0-9_:-]+")
+# build_verdict only accepts ACn criteria.
+AC_VERDICT_OPENER, AC_VERDICT_CLOSER = _verdict_sentinels(r"AC[0-9]+")
+
+
+def make_verdict_config(criterion: str) -> BlockConfig:
+    def validate_verdict(fields: dict[str, Any], _sections: dict[str, list[Any]], _w: list[str]) -> dict[str, Any]:
+        answer = fields.get("ANSWER", "")
+        reason = fields.get("REASON", "")
+
+        if answer not in {"YES", "NO"}:
+            raise ParseError("ANSWER must be YES or NO")
+        if "\n" in reason or "\r" in reason:
+            raise ParseError("REASON must be single-line")
+        if len(reason) == 0:
+            raise ParseError("REASON cannot be empty")
+        if len(reason) > 500:
+            raise ParseError("REASON exceeds 500 chars")
+
+        return {
+            "criterion_id": criterion,
+            "answer": answer,
+            "reason": reason,
+        }
+
+    return BlockConfig(
+        name="VERDICT",
+        opener_re=VERDICT_OPENER,
+        closer_re=VERDICT_CLOSER,
+        allowed_fields={"ANSWER", "REASON"},
+        required_fields={"ANSWER", "REASON"},
+        section_fields=set(),
+        multiline_fields=set(),
+        force_multiline_fields=set(),
+        required_multiline_fields=set(),
+        nonempty_multiline_fields=set(),
+        field_quoted={
+            "ANSWER": False,
+            "REASON": True,
+        },
+        section_parsers={},
+        validator=validate_verdict,
+        label=criterion,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Verdict batch (all criteria in one invocation)
+# ---------------------------------------------------------------------------
+BATCH_POOL_THRESHOLD = 4 * 1024 * 1024  # total input chars before using a process pool
+
+
+def _parse_verdict_pair(job: tuple[str, str, str]) -> dict[str, Any]:
+    criterion, raw_response, nonce = job
+    try:
+        parsed = extract_block(raw_response, nonce, make_verdict_config(criterion))
+    except NonceMismatch as exc:
+        return {"criterion_id": criterion, "exit": 2, "error": str(exc)}
+    except (ParseError, ValueError) as exc:
+        return {"criterion_id": criterion, "exit": 1, "error": str(exc)}
+    return {"criterion_id": criterion, "exit": 0, **parsed}
+
+
+def parse_verdict_batch(
+    criteria_pairs: Any,
+    nonce: str,
+    jobs: int | None = None,
+) -> dict[str, Any]:
+    """Parse a JSON array of [criterion_id, raw_response] pairs.
+
+    Per-criterion failures are reported in the result (with the exit code the
+    single-verdict CLI would use); malformed input raises ParseError. With
+    jobs=None a process pool is used only when the total input is large.
+    """
+    if not RE_NONCE.match(nonce):
+        raise ValueError(f"invalid nonce format: '{nonce}' (must match ^[0-9A-F]{{6}}$)")
+    if not isinstance(criteria_pairs, list):
+        raise ParseError("input must be a JSON array of [criterion_id, raw_response]")
+
+    work: list[tuple[str, str, str]] = []
+    seen: set[str] = set()
+    for item in criteria_pairs:
+        if not isinstance(item, list) or len(item) != 2:
+            raise ParseError("each item must be [criterion_id, raw_response]")
+        crit_id, raw_response = item
+        if not isinstance(crit_id, str) or not isinstance(raw_response, str):
+            raise ParseError("criterion_id and raw_response must be strings")
+        if not RE_CRITERION.match(crit_id):
+            raise ParseError(f"invalid criterion id '{crit_id}'")
+        if crit_id in seen:
+            raise ParseError(f"duplicate criterion_id '{crit_id}'")
+        seen.add(crit_id)
+        work.append((crit_id, raw_response, nonce))
+
+    if jobs is None:
+        total = sum(len(w[1]) for w in work)
+        jobs = (os.cpu_count() or 1) if total >= BATCH_POOL_THRESHOLD else 1
+    jobs = max(1, min(jobs, len(work) or 1))
+
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_parse_verdict_pair, work))
+    else:
+        results = [_parse_verdict_pair(w) for w in work]
+
+    parsed = sum(1 for r in results if r["exit"] == 0)
+    return {
+        "results": results,
+        "total": len(results),
+        "parsed": parsed,
+        "failed": len(results) - parsed,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Verdict builder (build-verdict.py): ACn criteria, no \\n or \\r escapes
+# ---------------------------------------------------------------------------
+VERDICT_ESCAPES = {"\\": "\\", '"': '"', "t": "\t"}
+
+
+def make_builder_verdict_config(criterion: str) -> BlockConfig:
+    """VERDICT grammar as build_verdict reads it.
+
+    Unlike make_verdict_config, ANSWER is case-insensitive, REASON takes no
+    newline escapes, and a block for another criterion is an error rather
+    than ignored.
+    """
+    def validate_verdict(fields: dict[str, Any], _sections: dict[str, list[Any]], _w: list[str]) -> dict[str, Any]:
+        answer = fields["ANSWER"]
+        reason = fields["REASON"]
+
+        if answer not in {"YES", "NO"}:
+            raise ParseError(f"ANSWER must be YES or NO, got '{answer}'")
+        if len(reason) == 0:
+            raise ParseError("REASON cannot be empty")
+        if len(reason) > 500:
+            raise ParseError("REASON exceeds 500 chars")
+
+        return {"answer": answer, "reason": reason}
+
+    return BlockConfig(
+        name="VERDICT",
+        opener_re=AC_VERDICT_OPENER,
+        closer_re=AC_VERDICT_CLOSER,
+        allowed_fields={"ANSWER", "REASON"},
+        required_fields={"ANSWER", "REASON"},
+        section_fields=set(),
+        multiline_fields=set(),
+        force_multiline_fields=set(),
+        required_multiline_fields=set(),
+        nonempty_multiline_fields=set(),
+        field_quoted={
+            "ANSWER": False,
+            "REASON": True,
+        },
+        section_parsers={},
+        validator=validate_verdict,
+        label=criterion,
+        label_strict=True,
+        escapes=VERDICT_ESCAPES,
+        upper_fields=frozenset({"ANSWER"}),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Per-criterion parsing
+# ---------------------------------------------------------------------------
+def parse_verdict(raw_text: str, nonce: str, expected_id: str) -> dict[str, str]:
+    """Extract and parse a verdict block from raw text.
+
+    Every failure, a nonce mismatch included, raises ParseError; build_verdict
+    turns it into a NEEDS_HUMAN criterion.
+    """
+    try:
+        return extract_block(raw_text, nonce, make_builder_verdict_config(expected_id))
+    except NonceMismatch as exc:
+        raise ParseError(str(exc)) from exc
+
+
+# ---------------------------------------------------------------------------
+# Verdict assembly across criteria
+# ---------------------------------------------------------------------------
+def build_verdict(
+    criteria_pairs: list[list[str]],
+    nonce: str,
+    expected_criteria: list[str],
+) -> dict[str, Any]:
+    """Build a verdict JSON structure from criteria responses.
+
+    Args:
+        criteria_pairs: List of [criterion_id, raw_response] pairs.
+        nonce: Expected 6-char uppercase hex nonce.
+        expected_criteria: Ordered list of expected criterion IDs.
+
+    Returns:
+        Structured verdict dict.
+
+    Raises:
+        ParseError: On invalid input structure.
+        ValueError: If nonce or criteria formats are invalid.
+    """
+    if not RE_NONCE.match(nonce):
+        raise ValueError(
+            f"invalid nonce format: '{nonce}' (must match ^[0-9A-F]{{6}}$)"
+        )
+
+    if len(expected_criteria) == 0:
+        raise ValueError("expected_criteria cannot be empty")
+
+    expected_set: set[str] = set()
+    for crit in expected_criteria:
+        if not RE_AC_ID.match(crit):
+            raise ValueError(
+                f"invalid criterion id: '{crit}' (must match ^AC[0-9]+$)"
+            )
+        if crit in expected_set:
+            raise ParseError(f"duplicate expected criterion '{crit}'")
+        expected_set.add(crit)
+
+    if not isinstance(criteria_pairs, list):
+        raise ParseError("input must be a JSON array of [criterion_id, raw_response]")
+
+    responses: dict[str, str] = {}
+    for item in criteria_pairs:
+        if not isinstance(item, list) or len(item) != 2:
+            raise ParseError("each item must be [criterion_id, raw_response]")
+        crit_id, raw_response = item
+        if not isinstance(crit_id, str) or not isinstance(raw_response, str):
+            raise ParseError("criterion_id and raw_response must be strings")
+        if crit_id in responses:
+            raise ParseError(f"duplicate criterion_id '{crit_id}'")
+        if crit_id not in expected_set:
+            raise ParseError(
+                f"unexpected criterion_id '{crit_id}' (not in --criteria)"
+            )
+        responses[crit_id] = raw_response
+
+    criteria_out: dict[str, dict[str, str]] = {}
+    missing: list[str] = []
+    passed = 0
+    failed = 0
+    needs_human = 0
+
+    for crit in expected_criteria:
+        if crit not in responses:
+            missing.append(crit)
+            criteria_out[crit] = {
+                "answer": "NEEDS_HUMAN",
+                "reason": "missing criterion response",
+            }
+            needs_human += 1
+            continue
+
+        try:
+            parsed = parse_verdict(responses[crit], nonce, crit)
+            criteria_out[crit] = {
+                "answer": parsed["answer"],
+                "reason": parsed["reason"],
+            }
+            if parsed["answer"] == "YES":
+                passed += 1
+            else:
+                failed += 1
+        except ParseError as exc:
+            criteria_out[crit] = {
+                "answer": "NEEDS_HUMAN",
+                "reason": str(exc),
+            }
+            needs_human += 1
+
+    if needs_human > 0:
+        verdict = "NEEDS_HUMAN"
+    elif failed > 0:
+        verdict = "FAIL"
+    else:
+        verdict = "PASS"
+
+    return {
+        "verdict": verdict,
+        "criteria": criteria_out,
+        "missing": missing,
+        "total": len(expected_criteria),
+        "passed": passed,
+        "failed": failed,
+    }
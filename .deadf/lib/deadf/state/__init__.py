@@ -0,0 +1,8 @@
+"""deadf.state — STATE.yaml / POLICY.yaml access behind deadf-state.py.
+
+The shell side used to run one ``yq`` process per field. This package parses
+the file once and answers any number of field lookups from that parse
+(``reader``), keeps the parse across requests until the file is replaced
+(``serve``, ``watch``), and writes batches of fields under the state lock
+through an append-only journal (``store``, ``journal``).
+"""
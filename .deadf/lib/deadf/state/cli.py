@@ -0,0 +1,126 @@
+"""Command-line entry point behind .deadf/bin/deadf-state.py."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from .reader import (FieldSpec, FieldSpecError, StateCache, StateError, format_nul,
+                     format_shell, load_snapshot, resolve)
+from .store import StateStore, parse_assignment
+from .watch import StateWatcher
+
+WAIT_REQUEST = "!wait"
+
+
+def default_state_file() -> str:
+    """.deadf/state/STATE.yaml next to this library."""
+    # .deadf/lib/deadf/state/cli.py -> .deadf
+    deadf_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+    return os.path.join(deadf_dir, "state", "STATE.yaml")
+
+
+def _specs(raw: list[str]) -> list[FieldSpec]:
+    return [FieldSpec.parse(spec) for spec in raw]
+
+
+def serve(path: str, watch_dirs: list[str]) -> None:
+    """Answer requests on stdin until EOF.
+
+    Request: one line of tab-separated field specs, or ``!wait<TAB>SECONDS``
+    to block until the file differs from the version last served (or a
+    ``watch_dirs`` file is written, or the time runs out).
+    Response: an exit-code line (0 ok, 1 state error, 2 bad request), then
+    ``name='value'`` lines, ``changed``/``activity``/``timeout`` or the
+    error message, terminated by NUL.
+    """
+    cache = StateCache(path)
+    watcher: StateWatcher | None = None
+    out = sys.stdout
+    for line in sys.stdin:
+        parts = [s for s in line.rstrip("\n").split("\t") if s]
+        try:
+            if parts[:1] == [WAIT_REQUEST]:
+                try:
+                    timeout = float(parts[1])
+                except (IndexError, ValueError):
+                    raise FieldSpecError(f"usage: {WAIT_REQUEST}<TAB>SECONDS") from None
+                if watcher is None:
+                    watcher = StateWatcher(path, watch_dirs)
+                body, code = watcher.wait(cache.key, timeout) + "\n", 0
+            else:
+                body, code = format_shell(resolve(cache.get(), _specs(parts))), 0
+        except FieldSpecError as exc:
+            body, code = f"error: {exc}\n", 2
+        except StateError as exc:
+            body, code = f"error: {exc}\n", 1
+        out.write(f"{code}\n{body}\0")
+        out.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read STATE.yaml fields with one parse")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_get = sub.add_parser("get", help="Print the requested fields")
+    p_get.add_argument("--file", default=None, help="YAML file (default: .deadf/state/STATE.yaml)")
+    p_get.add_argument("--format", choices=("shell", "nul"), default="shell",
+                       help="name='value' lines for eval, or NUL-terminated values")
+    p_get.add_argument("fields", nargs="*", metavar="[NAME=]path[//default]")
+
+    p_serve = sub.add_parser("serve", help="Answer field requests on stdin (cached parse)")
+    p_serve.add_argument("--file", default=None, help="YAML file (default: .deadf/state/STATE.yaml)")
+    p_serve.add_argument("--watch", action="append", default=[], metavar="DIR",
+                         help="Also end !wait requests when a file in DIR is written")
+
+    p_set = sub.add_parser("set", help="Set fields in one journaled, locked batch")
+    p_set.add_argument("--file", default=None, help="YAML file (default: .deadf/state/STATE.yaml)")
+    p_set.add_argument("--lock-timeout", type=float, default=5.0,
+                       help="Seconds to wait for STATE.yaml.flock (default: 5)")
+    p_set.add_argument("--compact", action="store_true",
+                       help="Fold the journal into STATE.yaml now instead of at the threshold")
+    p_set.add_argument("assignments", nargs="+", metavar="path=value|path:=json")
+
+    p_compact = sub.add_parser("compact", help="Fold STATE.journal into STATE.yaml")
+    p_compact.add_argument("--file", default=None, help="YAML file (default: .deadf/state/STATE.yaml)")
+    p_compact.add_argument("--lock-timeout", type=float, default=5.0,
+                           help="Seconds to wait for STATE.yaml.flock (default: 5)")
+
+    args = parser.parse_args()
+    path = args.file or default_state_file()
+
+    if args.command == "get":
+        try:
+            specs = _specs(args.fields)
+        except FieldSpecError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            sys.exit(2)
+        try:
+            values = resolve(load_snapshot(path), specs)
+        except StateError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.write(format_shell(values) if args.format == "shell" else format_nul(values))
+    elif args.command == "set":
+        try:
+            patches = [parse_assignment(a) for a in args.assignments]
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            sys.exit(2)
+        try:
+            StateStore(path, args.lock_timeout).update(patches, compact=args.compact)
+        except (StateError, OSError) as exc:
+            print(f"error: cannot update {path}: {exc}", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "compact":
+        try:
+            applied = StateStore(path, args.lock_timeout).compact()
+        except (StateError, OSError) as exc:
+            print(f"error: cannot compact {path}: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(f"compacted {applied} batch(es)")
+    elif args.command == "serve":
+        try:
+            serve(path, args.watch)
+        except (BrokenPipeError, KeyboardInterrupt):
+            pass
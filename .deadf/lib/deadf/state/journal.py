@@ -0,0 +1,59 @@
+"""STATE.journal: append-only field patches not yet compacted into STATE.yaml.
+
+One JSON object per line::
+
+    {"ts": "2026-02-03T04:11:40Z", "set": [["cycle.status", "timed_out"],
+                                         ["phase", "needs_human"]]}
+
+A batch is one line, so it is applied entirely or not at all. A line cut
+short by a crash has no trailing newline and is ignored. Setting a field is
+idempotent, so replaying a batch that compaction already wrote into
+STATE.yaml (a crash between the rename and the journal removal) is harmless.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Iterable, Iterator
+
+Patch = tuple[tuple[str, ...], Any]
+
+
+def journal_path(state_path: str) -> str:
+    """STATE.yaml -> STATE.journal (same directory)."""
+    return os.path.splitext(state_path)[0] + ".journal"
+
+
+def encode_batch(patches: Iterable[Patch], ts: str) -> bytes:
+    entry = {"ts": ts, "set": [[".".join(path), value] for path, value in patches]}
+    return (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def read_batches(path: str) -> Iterator[list[Patch]]:
+    """Complete batches in journal order (nothing if there is no journal)."""
+    try:
+        with open(path, "rb") as fh:
+            lines = fh.read().split(b"\n")
+    except FileNotFoundError:
+        return
+    for raw in lines[:-1]:  # the last piece is "" or a torn, unterminated write
+        try:
+            entry = json.loads(raw)
+            yield [(tuple(str(p).split(".")), value) for p, value in entry["set"]]
+        except (ValueError, KeyError, TypeError):
+            continue
+
+
+def apply_patches(data: Any, patches: Iterable[Patch]) -> Any:
+    """Set each dotted path in ``data`` (creating mappings on the way); returns the root."""
+    if not isinstance(data, dict):
+        data = {}
+    for path, value in patches:
+        node = data
+        for part in path[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        node[path[-1]] = value
+    return data
@@ -0,0 +1,225 @@
+"""Parse a state file once, answer many field lookups.
+
+Fields are requested as ``[NAME=]path[//default]``:
+
+- ``path`` is dotted (``cycle.status``, ``loop.iteration``); a numeric part
+  indexes a list
+- ``//default`` replaces a missing, null or false value, like yq's ``//``
+- ``NAME`` is the shell variable to assign; it defaults to the path with
+  dots turned into underscores (``cycle_status``)
+
+Values print as ``yq -r`` prints them: strings raw, ``null``/``true``/
+``false`` and numbers as written, maps and lists as compact JSON. Timestamps
+stay strings (``cycle.started_at`` goes to ``date -d`` unchanged).
+
+PyYAML is used when it is importable; otherwise the file is converted with a
+single ``yq`` run, which is still one process for every field.
+
+Reads see STATE.yaml with any uncompacted STATE.journal batches applied
+(see ``journal``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import shlex
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .journal import apply_patches, journal_path, read_batches
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - depends on the host
+    yaml = None
+
+StatKey = tuple[int, int, int, int]
+SnapshotKey = tuple["StatKey | None", "StatKey | None"]
+
+RE_VAR_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_MISSING = object()
+
+
+class StateError(Exception):
+    """The state file is missing, unreadable or not valid YAML."""
+
+
+class FieldSpecError(ValueError):
+    """A field request does not follow ``[NAME=]path[//default]``."""
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    path: tuple[str, ...]
+    default: str | None = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "FieldSpec":
+        name, sep, rest = spec.partition("=")
+        if not sep or "." in name or "/" in name:
+            name, rest = "", spec
+        path, sep, default = rest.partition("//")
+        path = path.strip().lstrip(".")
+        if not path or any(not part for part in path.split(".")):
+            raise FieldSpecError(f"invalid field '{spec}'")
+        name = name or path.replace(".", "_").replace("-", "_")
+        if not RE_VAR_NAME.match(name):
+            raise FieldSpecError(f"invalid variable name '{name}' in field '{spec}'")
+        return cls(name, tuple(path.split(".")), default if sep else None)
+
+
+if yaml is not None:
+    _BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    class _StateLoader(_BaseLoader):  # type: ignore[misc, valid-type]
+        """SafeLoader that leaves timestamps as the strings they were written as."""
+
+        yaml_implicit_resolvers = {
+            first: [(tag, regexp) for tag, regexp in resolvers
+                    if tag != "tag:yaml.org,2002:timestamp"]
+            for first, resolvers in _BaseLoader.yaml_implicit_resolvers.items()
+        }
+
+
+def stat_key(path: str) -> StatKey | None:
+    """(device, inode, mtime, size) of ``path``, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _load_with_yq(path: str) -> Any:
+    # mikefarah/yq v4 needs -o=json; the Python yq wrapper prints JSON by default.
+    for argv in (["yq", "-o=json", ".", path], ["yq", ".", path]):
+        try:
+            proc = subprocess.run(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as exc:
+            raise StateError(f"cannot parse {path}: PyYAML not installed and {exc}") from exc
+        if proc.returncode == 0:
+            try:
+                return json.loads(proc.stdout or b"null")
+            except ValueError:
+                continue
+    raise StateError(f"cannot parse {path}: yq failed")
+
+
+def load(path: str) -> Any:
+    """Parsed contents of a YAML file (an empty file parses as an empty mapping)."""
+    if yaml is None:
+        data = _load_with_yq(path)
+    else:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = yaml.load(fh, Loader=_StateLoader)
+        except OSError as exc:
+            raise StateError(f"cannot read {path}: {exc}") from exc
+        except (yaml.YAMLError, UnicodeDecodeError) as exc:
+            raise StateError(f"cannot parse {path}: {exc}") from exc
+    return {} if data is None else data
+
+
+def snapshot_key(path: str) -> SnapshotKey:
+    """Stat keys of the state file and its journal (None for a missing file)."""
+    return (stat_key(path), stat_key(journal_path(path)))
+
+
+def load_snapshot(path: str) -> Any:
+    """STATE.yaml with the journal's batches applied.
+
+    The journal is read first: compaction renames the new STATE.yaml into
+    place before it removes the journal, so a journal read before the state
+    file never misses a batch the state file lacks.
+    """
+    batches = list(read_batches(journal_path(path)))
+    data = load(path)
+    for patches in batches:
+        data = apply_patches(data, patches)
+    return data
+
+
+class StateCache:
+    """One file's parse, reused until the file or its journal changes.
+
+    The cache key is (device, inode, mtime, size) of both: writers go through
+    temp+rename or append, so every update changes it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._key: SnapshotKey | None = None
+        self._data: Any = None
+        self.loads = 0
+
+    @property
+    def key(self) -> SnapshotKey | None:
+        """Key of the version last returned by ``get`` (None before the first)."""
+        return self._key
+
+    def get(self) -> Any:
+        key = snapshot_key(self.path)
+        if key[0] is None:
+            self._key = None
+            raise StateError(f"cannot read {self.path}")
+        if key != self._key:
+            self._key = None
+            self._data = load_snapshot(self.path)
+            self._key = key
+            self.loads += 1
+        return self._data
+
+
+def lookup(data: Any, path: Iterable[str]) -> Any:
+    node = data
+    for part in path:
+        if isinstance(node, dict):
+            node = node.get(part, _MISSING)
+        elif isinstance(node, list) and part.lstrip("-").isdigit():
+            try:
+                node = node[int(part)]
+            except IndexError:
+                return _MISSING
+        else:
+            return _MISSING
+        if node is _MISSING:
+            return node
+    return node
+
+
+def render(value: Any) -> str:
+    """A value as ``yq -r`` prints it."""
+    if value is None or value is _MISSING:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+    return str(value)
+
+
+def resolve(data: Any, specs: Iterable[FieldSpec]) -> list[tuple[str, str]]:
+    """(variable name, rendered value) for each requested field, in order."""
+    values = []
+    for spec in specs:
+        value = lookup(data, spec.path)
+        if spec.default is not None and (value is _MISSING or value is None or value is False):
+            values.append((spec.name, spec.default))
+        else:
+            values.append((spec.name, render(value)))
+    return values
+
+
+def format_shell(values: Iterable[tuple[str, str]]) -> str:
+    """``name='value'`` lines for ``eval``."""
+    return "".join(f"{name}={shlex.quote(value)}\n" for name, value in values)
+
+
+def format_nul(values: Iterable[tuple[str, str]]) -> str:
+    """Values only, each terminated by NUL (for ``mapfile -d ''``)."""
+    return "".join(f"{value}\0" for _, value in values)
@@ -0,0 +1,207 @@
+"""Batched STATE.yaml writes: journal append under the shared state lock.
+
+Every writer takes an exclusive ``flock`` on ``STATE.yaml.flock``, the lock
+the orchestrator, ralph.sh and cron-kick.sh already use. An update appends
+its whole batch of field patches to STATE.journal as one fsync'ed line, so a
+write costs O(batch), not O(STATE.yaml).
+
+Compaction writes STATE.yaml once with every pending batch applied (temp
+file, fsync, rename, permissions kept) and removes the journal. It runs
+lazily: when the journal reaches COMPACT_MAX_BATCHES batches or
+COMPACT_MAX_BYTES, when a writer asks for it (``set --compact``), or from
+``compact``. deadf-state readers apply pending batches themselves; anything
+that reads or rewrites STATE.yaml directly (the orchestrator's yq protocol in
+SKILL.md) runs ``deadf-state.py compact`` under the lock first.
+
+Compaction re-serialises the whole file: key order is kept, comments and the
+original quoting are not. Without PyYAML the YAML comes from ``yq``.
+"""
+from __future__ import annotations
+
+import errno
+import fcntl
+import json
+import os
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator
+
+from .journal import Patch, apply_patches, encode_batch, journal_path, read_batches
+from .reader import StateError, load, yaml
+
+LOCK_POLL_S = 0.05
+COMPACT_MAX_BATCHES = 16
+COMPACT_MAX_BYTES = 64 * 1024
+
+
+class StateLockTimeout(StateError):
+    """The state lock stayed held by another writer past the timeout."""
+
+
+def parse_assignment(spec: str) -> Patch:
+    """``path=value`` (string value) or ``path:=json`` (typed value)."""
+    path, sep, raw = spec.partition("=")
+    if not sep:
+        raise ValueError(f"invalid assignment '{spec}' (expected path=value or path:=json)")
+    value: Any = raw
+    if path.endswith(":"):
+        path = path[:-1]
+        try:
+            value = json.loads(raw)
+        except ValueError as exc:
+            raise ValueError(f"invalid JSON value in '{spec}': {exc}") from exc
+    path = path.strip().lstrip(".")
+    if not path or any(not part for part in path.split(".")):
+        raise ValueError(f"invalid field path in '{spec}'")
+    return tuple(path.split(".")), value
+
+
+def _dump_with_yq(data: Any) -> str:
+    text = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    # mikefarah/yq v4 reads JSON as YAML; the Python yq wrapper needs -y.
+    for argv in (["yq", "-P", "-o=yaml", "."], ["yq", "-y", "."]):
+        try:
+            proc = subprocess.run(argv, input=text, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as exc:
+            raise StateError(f"cannot write YAML: PyYAML not installed and {exc}") from exc
+        if proc.returncode == 0 and proc.stdout.strip():
+            return proc.stdout.decode("utf-8")
+    raise StateError("cannot write YAML: PyYAML not installed and yq failed")
+
+
+def dump(data: Any) -> str:
+    """Block-style YAML text for STATE.yaml, in the mapping's key order."""
+    if yaml is None:
+        return _dump_with_yq(data)
+    return yaml.safe_dump(data, sort_keys=False, default_flow_style=False, allow_unicode=True)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StateStore:
+    def __init__(self, path: str, lock_timeout: float = 5.0) -> None:
+        self.path = path
+        self.journal = journal_path(path)
+        self.lock_path = f"{path}.flock"
+        self.lock_timeout = lock_timeout
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        fd = os.open(self.lock_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            deadline = time.monotonic() + self.lock_timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except OSError as exc:
+                    if exc.errno not in (errno.EAGAIN, errno.EACCES):
+                        raise
+                    if time.monotonic() >= deadline:
+                        raise StateLockTimeout(
+                            f"cannot acquire {self.lock_path} within {self.lock_timeout:g}s"
+                        ) from None
+                    time.sleep(LOCK_POLL_S)
+            yield
+        finally:
+            os.close(fd)  # releases the flock
+
+    def update(self, patches: Iterable[Patch], compact: bool = False) -> bool:
+        """Journal one batch atomically; returns True if it also compacted.
+
+        Compacts when asked to or when the journal has grown past
+        COMPACT_MAX_BATCHES / COMPACT_MAX_BYTES.
+        """
+        batch = list(patches)
+        if not batch:
+            return False
+        if not os.path.exists(self.path):
+            raise StateError(f"cannot read {self.path}")
+        with self._locked():
+            batches, size = self._append(encode_batch(batch, _now()))
+            if compact or batches >= COMPACT_MAX_BATCHES or size >= COMPACT_MAX_BYTES:
+                self._compact()
+                return True
+        return False
+
+    def compact(self) -> int:
+        """Fold the journal into STATE.yaml; returns the number of batches applied."""
+        with self._locked():
+            return self._compact()
+
+    def _append(self, line: bytes) -> tuple[int, int]:
+        """Append a batch line after any complete lines already there.
+
+        Returns the journal's line count and size afterwards.
+        """
+        lines = 0
+        with open(self.journal, "ab+") as fh:
+            size = fh.seek(0, os.SEEK_END)
+            if size:
+                # Drop a torn tail from a crashed writer so this batch starts a line.
+                fh.seek(0)
+                content = fh.read()
+                keep = content.rfind(b"\n") + 1
+                if keep != size:
+                    fh.truncate(keep)
+                    size = keep
+                lines = content.count(b"\n", 0, keep)
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+        return lines + 1, size + len(line)
+
+    def _compact(self) -> int:
+        batches = list(read_batches(self.journal))
+        if not batches:
+            self._remove_journal()
+            return 0
+        data = load(self.path)
+        for patches in batches:
+            data = apply_patches(data, patches)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            mode = os.stat(self.path).st_mode & 0o7777
+        except OSError:
+            mode = 0o644
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".tmp.", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(dump(data))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.chmod(tmp, mode)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._fsync_dir(directory)
+        self._remove_journal()
+        return len(batches)
+
+    def _remove_journal(self) -> None:
+        try:
+            os.unlink(self.journal)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _fsync_dir(directory: str) -> None:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
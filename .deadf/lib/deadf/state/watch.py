@@ -0,0 +1,120 @@
+"""Block until the state file is replaced (or a watched log is written).
+
+On Linux the wait is an inotify watch (through ctypes, no extra package) on
+the state file's directory plus any extra directories; elsewhere, or if
+inotify cannot be set up, the state file is stat-polled once a second.
+
+A wait is relative to a cache key (see ``StateCache``): if the file or its
+journal already differs from the version the caller last read, the wait
+returns at once, so an update that lands between a read and the next wait is
+never missed.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Iterable
+
+from .reader import SnapshotKey, snapshot_key
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+STATE_DIR_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF
+LOG_DIR_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+FALLBACK_POLL_S = 1.0
+
+CHANGED = "changed"
+ACTIVITY = "activity"
+TIMEOUT = "timeout"
+
+
+class _Inotify:
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add(self, path: str, mask: int) -> int:
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {path}")
+        return wd
+
+    def read_wds(self) -> set[int]:
+        """Watch descriptors with pending events (drains the queue)."""
+        wds: set[int] = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return wds
+            off = 0
+            while off + EVENT_HEADER.size <= len(buf):
+                wd, _, _, name_len = EVENT_HEADER.unpack_from(buf, off)
+                wds.add(wd)
+                off += EVENT_HEADER.size + name_len
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class StateWatcher:
+    """Waits for the state file to change, or for writes under ``log_dirs``."""
+
+    def __init__(self, state_path: str, log_dirs: Iterable[str] = ()) -> None:
+        self.state_path = state_path
+        self._log_wds: set[int] = set()
+        self._inotify: _Inotify | None = None
+        try:
+            inotify = _Inotify()
+        except (OSError, AttributeError):
+            return  # no inotify (not Linux, or out of instances): poll
+        try:
+            inotify.add(os.path.dirname(os.path.abspath(state_path)), STATE_DIR_MASK)
+            for log_dir in log_dirs:
+                if os.path.isdir(log_dir):
+                    self._log_wds.add(inotify.add(log_dir, LOG_DIR_MASK))
+        except OSError:
+            inotify.close()
+            return
+        self._inotify = inotify
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def wait(self, since: SnapshotKey | None, timeout: float) -> str:
+        """CHANGED, ACTIVITY (a watched log was written) or TIMEOUT."""
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while True:
+            if snapshot_key(self.state_path) != since:
+                return CHANGED
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return TIMEOUT
+            if self._inotify is None:
+                time.sleep(min(remaining, FALLBACK_POLL_S))
+                continue
+            ready, _, _ = select.select([self._inotify.fd], [], [], remaining)
+            if ready and self._inotify.read_wds() & self._log_wds \
+                    and snapshot_key(self.state_path) == since:
+                return ACTIVITY
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
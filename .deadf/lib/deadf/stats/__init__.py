@@ -0,0 +1,8 @@
+"""deadf.stats — SQLite store of a project's cycle events (deadf-stats.py).
+
+Two append-only JSON-lines streams feed it: cron-kick.sh's ``log_json``
+events (``.deadf/logs/cron-kick.jsonl``) and the cycle metrics
+(``.deadf/metrics/cycles.jsonl``: dispatches, cycle times, verify results).
+``store`` tails both into ``.deadf/metrics/metrics.db``, and ``report`` answers
+the throughput questions people used to grep those files for.
+"""
@@ -0,0 +1,55 @@
+"""Command-line entry point behind .deadf/bin/deadf-stats.py."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from ..admission.metrics import metrics_path
+from . import report
+from .store import MetricsStore
+
+DB_RELPATH = os.path.join("metrics", "metrics.db")
+EVENTS_RELPATH = os.path.join("logs", "cron-kick.jsonl")
+
+
+def default_deadf_dir() -> str:
+    # .deadf/lib/deadf/stats/cli.py -> .deadf
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cycle throughput stats from the metrics store")
+    parser.add_argument("--deadf-dir", default=None, help="Project .deadf directory (default: this one)")
+    parser.add_argument("--db", default=None, help="SQLite file (default: .deadf/metrics/metrics.db)")
+    parser.add_argument("--hours", type=float, default=24.0, help="Report window (default: 24)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--ingest-only", action="store_true", help="Ingest new events, print nothing")
+    mode.add_argument("--no-ingest", action="store_true", help="Report from the store as it is")
+    args = parser.parse_args()
+
+    deadf_dir = args.deadf_dir or default_deadf_dir()
+    try:
+        store = MetricsStore(args.db or os.path.join(deadf_dir, DB_RELPATH))
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: cannot open metrics store: {exc}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        if not args.no_ingest:
+            store.ingest(os.path.join(deadf_dir, EVENTS_RELPATH), "kick", rotate=True)
+            store.ingest(metrics_path(deadf_dir), "cycle", rotate=True)
+        if args.ingest_only:
+            return
+        result = report.build(store.db, args.hours)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        store.close()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        sys.stdout.write(report.format_text(result))
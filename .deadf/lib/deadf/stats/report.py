@@ -0,0 +1,117 @@
+"""Throughput report over a time window of the metrics store."""
+from __future__ import annotations
+
+import sqlite3
+import time
+from typing import Any
+
+from ..util import quantile
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile (q in 0..1); None for no values."""
+    return round(quantile(values, q), 1) if values else None
+
+
+def build(db: sqlite3.Connection, hours: float, now: float | None = None) -> dict[str, Any]:
+    now = time.time() if now is None else now
+    since = now - hours * 3600
+
+    walls = [r[0] for r in db.execute(
+        "SELECT wall_s FROM cycle_events WHERE event = 'cycle' AND ts >= ? AND wall_s IS NOT NULL",
+        (since,))]
+    failed = db.execute(
+        "SELECT COUNT(*) FROM cycle_events WHERE event = 'cycle' AND ts >= ? AND exit_code != 0",
+        (since,)).fetchone()[0]
+    kicks = db.execute(
+        "SELECT COUNT(*) FROM kick_events WHERE event = 'spawn' AND ts >= ?", (since,)).fetchone()[0]
+
+    hourly: dict[int, dict[str, int]] = {}
+    first_hour = int(since // 3600)
+    for h in range(first_hour, int(now // 3600) + 1):
+        hourly[h] = {"cycles": 0, "skips": 0, "errors": 0}
+    for (ts,) in db.execute("SELECT ts FROM cycle_events WHERE event = 'cycle' AND ts >= ?", (since,)):
+        hourly.setdefault(int(ts // 3600), {"cycles": 0, "skips": 0, "errors": 0})["cycles"] += 1
+    for ts, event in db.execute(
+            "SELECT ts, event FROM kick_events WHERE event IN ('skip', 'error') AND ts >= ?", (since,)):
+        hourly.setdefault(int(ts // 3600), {"cycles": 0, "skips": 0, "errors": 0})[event + "s"] += 1
+
+    def grouped(sql: str) -> dict[str, int]:
+        return {str(reason): count for reason, count in db.execute(sql, (since,))}
+
+    verify = db.execute(
+        "SELECT COUNT(*), SUM(pass), AVG(seconds) FROM cycle_events "
+        "WHERE event = 'verify' AND ts >= ?", (since,)).fetchone()
+
+    tracks = []
+    for track, cycles, retries, max_retry, verifies, passes in db.execute(
+            """
+            SELECT COALESCE(d.track, '-'), COUNT(DISTINCT d.cycle_id),
+                   COUNT(DISTINCT CASE WHEN d.retry > 0 THEN d.cycle_id END),
+                   MAX(COALESCE(d.retry, 0)), COUNT(v.cycle_id), SUM(v.pass)
+            FROM cycle_events d
+            LEFT JOIN cycle_events v ON v.event = 'verify' AND v.cycle_id = d.cycle_id
+            WHERE d.event = 'dispatch' AND d.ts >= ?
+            GROUP BY 1 ORDER BY MIN(d.ts)
+            """, (since,)):
+        tracks.append({
+            "track": track, "cycles": cycles, "retry_cycles": retries, "max_retry": max_retry,
+            "verify_pass_rate": round(passes / verifies, 3) if verifies else None,
+        })
+
+    return {
+        "window_hours": hours,
+        "cycles": len(walls),
+        "cycles_per_hour": round(len(walls) / hours, 2) if hours > 0 else None,
+        "failed_cycles": failed,
+        "kicks": kicks,
+        "cycle_wall_s": {"p50": percentile(walls, 0.5), "p95": percentile(walls, 0.95),
+                         "max": round(max(walls), 1) if walls else None},
+        "skip_reasons": grouped(
+            "SELECT reason, COUNT(*) FROM kick_events WHERE event = 'skip' AND ts >= ? "
+            "GROUP BY reason ORDER BY 2 DESC"),
+        "error_reasons": grouped(
+            "SELECT reason, COUNT(*) FROM kick_events WHERE event = 'error' AND ts >= ? "
+            "GROUP BY reason ORDER BY 2 DESC"),
+        "admission": grouped(
+            "SELECT event || ':' || COALESCE(reason, '-'), COUNT(*) FROM cycle_events "
+            "WHERE event IN ('refuse', 'defer') AND ts >= ? GROUP BY 1 ORDER BY 2 DESC"),
+        "verify": {
+            "runs": verify[0],
+            "pass_rate": round(verify[1] / verify[0], 3) if verify[0] else None,
+            "mean_s": round(verify[2], 1) if verify[2] is not None else None,
+        },
+        "tracks": tracks,
+        "hourly": [{"hour": time.strftime("%Y-%m-%dT%H:00Z", time.gmtime(h * 3600)), **counts}
+                   for h, counts in sorted(hourly.items())],
+    }
+
+
+def format_text(report: dict[str, Any]) -> str:
+    def fmt(value: Any, unit: str = "") -> str:
+        return "-" if value is None else f"{value}{unit}"
+
+    wall = report["cycle_wall_s"]
+    verify = report["verify"]
+    lines = [
+        f"Last {report['window_hours']:g}h: {report['cycles']} cycles "
+        f"({fmt(report['cycles_per_hour'])}/h, {report['failed_cycles']} failed), "
+        f"{report['kicks']} cron kicks",
+        f"Cycle time: p50 {fmt(wall['p50'], 's')}  p95 {fmt(wall['p95'], 's')}  "
+        f"max {fmt(wall['max'], 's')}",
+        f"Verify: {verify['runs']} runs, pass rate {fmt(verify['pass_rate'])}, "
+        f"mean {fmt(verify['mean_s'], 's')}",
+    ]
+    for title, key in (("Skips", "skip_reasons"), ("Errors", "error_reasons"),
+                       ("Admission", "admission")):
+        if report[key]:
+            lines.append(f"{title}: " + ", ".join(f"{k} {v}" for k, v in report[key].items()))
+    if report["tracks"]:
+        lines.append("Tracks (cycles / retry cycles / max retry / verify pass rate):")
+        for t in report["tracks"]:
+            lines.append(f"  {t['track']}: {t['cycles']} / {t['retry_cycles']} / "
+                         f"{t['max_retry']} / {fmt(t['verify_pass_rate'])}")
+    lines.append("Hourly (cycles / skips / errors):")
+    for h in report["hourly"][-24:]:
+        lines.append(f"  {h['hour']}  {h['cycles']:3d} / {h['skips']:3d} / {h['errors']:3d}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,192 @@
+"""Incremental ingestion of JSON-lines event streams into SQLite.
+
+Each source file has a row in ``sources`` with the inode and byte offset
+ingested so far. A run reads only the complete lines past that offset and
+inserts them in the same transaction that moves the offset, so every line
+is stored exactly once even if a run is killed. If the inode changes or the
+file shrinks, the file was replaced, and it is read again from the start.
+
+Once a source is ingested and past ``ROTATE_BYTES`` it is renamed to
+``<path>.1`` (replacing the previous one) and its writers start a new file.
+Every run reads ``<path>.1`` before ``<path>``; a ``.1`` whose inode has no
+row of its own takes over the row of ``<path>`` with that inode, in the same
+transaction as its new lines. So a run killed right after the rename loses
+nothing: the next one finishes the renamed file from the stored offset. The
+rename is done under ``flock`` on the file, which is what admission control
+holds while it checks and records a dispatch.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any
+
+ROTATE_BYTES = 8 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path   TEXT PRIMARY KEY,
+    inode  INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+-- cron-kick.sh decisions: spawn, done, skip (reason), error (reason), ...
+CREATE TABLE IF NOT EXISTS kick_events (
+    ts        REAL NOT NULL,
+    level     TEXT,
+    event     TEXT NOT NULL,
+    exit_code INTEGER,
+    reason    TEXT,
+    cycle_id  TEXT
+);
+CREATE INDEX IF NOT EXISTS kick_events_ts ON kick_events (ts);
+-- Cycle metrics: dispatch (track, task, retry), cycle (wall_s, llm_s,
+-- exit_code), verify (seconds, pass, failures), refuse/defer (reason).
+CREATE TABLE IF NOT EXISTS cycle_events (
+    ts        REAL NOT NULL,
+    event     TEXT NOT NULL,
+    cycle_id  TEXT,
+    track     TEXT,
+    task      TEXT,
+    retry     INTEGER,
+    wall_s    REAL,
+    llm_s     REAL,
+    seconds   REAL,
+    exit_code INTEGER,
+    pass      INTEGER,
+    failures  INTEGER,
+    reason    TEXT
+);
+CREATE INDEX IF NOT EXISTS cycle_events_ts ON cycle_events (ts);
+CREATE INDEX IF NOT EXISTS cycle_events_cycle ON cycle_events (cycle_id);
+"""
+
+
+def _epoch(value: Any) -> float | None:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _int(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return int(value)
+    return value if isinstance(value, int) else None
+
+
+def _num(value: Any) -> float | None:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _str(value: Any) -> str | None:
+    return str(value) if isinstance(value, (str, int, float)) and not isinstance(value, bool) else None
+
+
+def _kick_row(record: dict[str, Any]) -> tuple[Any, ...] | None:
+    ts = _epoch(record.get("ts"))
+    event = _str(record.get("event"))
+    if ts is None or event is None:
+        return None
+    return (ts, _str(record.get("level")), event, _int(record.get("exit_code")),
+            _str(record.get("reason")), _str(record.get("cycle_id")) or None)
+
+
+def _cycle_row(record: dict[str, Any]) -> tuple[Any, ...] | None:
+    ts = _epoch(record.get("ts"))
+    event = _str(record.get("event"))
+    if ts is None or event is None:
+        return None
+    return (ts, event, _str(record.get("cycle_id")), _str(record.get("track")),
+            _str(record.get("task")), _int(record.get("retry")), _num(record.get("wall_s")),
+            _num(record.get("llm_s")), _num(record.get("seconds")), _int(record.get("exit_code")),
+            _int(record.get("pass")), _int(record.get("failures")), _str(record.get("reason")))
+
+
+SOURCES = {
+    "kick": ("INSERT INTO kick_events VALUES (?, ?, ?, ?, ?, ?)", _kick_row),
+    "cycle": ("INSERT INTO cycle_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", _cycle_row),
+}
+
+
+class MetricsStore:
+    def __init__(self, db_path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db = sqlite3.connect(db_path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def ingest(self, path: str, kind: str, rotate: bool = False) -> int:
+        """Store the new complete lines of ``path`` (and ``path.1``); returns how many rows were added."""
+        rotated = path + ".1"
+        added = self._ingest_file(rotated, kind, renamed_from=path)
+        added += self._ingest_file(path, kind)
+        if rotate and self._rotate(path, rotated):
+            # A writer that opened the file before the rename may still have
+            # appended to it: take those lines from the renamed inode.
+            added += self._ingest_file(rotated, kind, renamed_from=path)
+        return added
+
+    @staticmethod
+    def _rotate(path: str, rotated: str) -> bool:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            st = os.fstat(fd)
+            if st.st_size < ROTATE_BYTES or os.stat(path).st_ino != st.st_ino:
+                return False
+            os.replace(path, rotated)
+            return True
+        finally:
+            os.close(fd)
+
+    def _ingest_file(self, path: str, kind: str, renamed_from: str | None = None) -> int:
+        insert, to_row = SOURCES[kind]
+        try:
+            fh = open(path, "rb")
+        except FileNotFoundError:
+            return 0
+        with fh:
+            st = os.fstat(fh.fileno())
+            row = self.db.execute("SELECT inode, offset FROM sources WHERE path = ?", (path,)).fetchone()
+            moved = False
+            if (not row or row[0] != st.st_ino) and renamed_from:
+                old = self.db.execute("SELECT inode, offset FROM sources WHERE path = ?",
+                                      (renamed_from,)).fetchone()
+                if old and old[0] == st.st_ino:
+                    row, moved = old, True
+            offset = row[1] if row and row[0] == st.st_ino and row[1] <= st.st_size else 0
+            fh.seek(offset)
+            data = fh.read()
+        end = data.rfind(b"\n") + 1  # leave a partial last line for the next run
+        rows = []
+        for raw in data[:end].split(b"\n"):
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                parsed = to_row(record)
+                if parsed is not None:
+                    rows.append(parsed)
+        with self.db:
+            self.db.executemany(insert, rows)
+            if moved:
+                self.db.execute("DELETE FROM sources WHERE path = ?", (renamed_from,))
+            self.db.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                            (path, st.st_ino, offset + end))
+        return len(rows)
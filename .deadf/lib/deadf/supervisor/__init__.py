@@ -0,0 +1,7 @@
+"""deadf.supervisor — one scheduler for many deadf projects (deadf-supervisor.py).
+
+Replaces one ralph.sh process or crontab line per project: projects are
+discovered under configured roots, their STATE.yaml is read through
+``deadf.state`` (parsed only when it changes), and ready projects are kicked
+through their own ``.deadf/bin/cron-kick.sh`` under a global concurrency cap.
+"""
@@ -0,0 +1,48 @@
+"""Command-line entry point behind .deadf/bin/deadf-supervisor.py."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from .core import Supervisor, discover
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Schedule deadf cycles across many projects")
+    parser.add_argument("--root", action="append", required=True, metavar="DIR",
+                        help="Directory to search for projects (repeatable)")
+    parser.add_argument("--max-concurrent", type=int, default=os.cpu_count() or 1,
+                        help="Cycles running at once across all projects (default: CPU count)")
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="Seconds between readiness passes while idle (default: 5)")
+    parser.add_argument("--rescan", type=float, default=300.0,
+                        help="Seconds between project discovery scans (default: 300)")
+    parser.add_argument("--cycle-timeout", type=float, default=600.0,
+                        help="Kill a cycle's process group after this many seconds (default: 600)")
+    parser.add_argument("--kill-grace", type=float, default=10.0,
+                        help="Seconds between SIGTERM and SIGKILL for a timed-out cycle (default: 10)")
+    parser.add_argument("--max-depth", type=int, default=3,
+                        help="How deep under each root to look for projects (default: 3)")
+    parser.add_argument("--log", help="Append JSON-lines events here instead of stdout")
+    parser.add_argument("--once", action="store_true",
+                        help="Give every ready project one cycle, then exit")
+    parser.add_argument("--list", action="store_true", help="Print discovered projects and exit")
+    args = parser.parse_args()
+
+    for root in args.root:
+        if not os.path.isdir(root):
+            print(f"error: root is not a directory: {root}", file=sys.stderr)
+            sys.exit(2)
+    if args.list:
+        for path in discover(args.root, args.max_depth):
+            print(path)
+        return
+
+    events = open(args.log, "a", encoding="utf-8") if args.log else sys.stdout
+    try:
+        Supervisor(args.root, args.max_concurrent, args.interval, args.rescan,
+                   args.cycle_timeout, args.max_depth, events, args.kill_grace).run(once=args.once)
+    finally:
+        if events is not sys.stdout:
+            events.close()
@@ -0,0 +1,335 @@
+"""Discovery, readiness and dispatch for the multi-project supervisor.
+
+Readiness comes from each project's STATE.yaml (journal applied):
+
+- ``phase`` is not ``needs_human`` or ``complete``
+- ``cycle.status`` is not ``running``
+- the research phase has finished its interactive P2 brainstorm
+  (``.deadf/seed/P2_DONE``), which a supervisor cannot run
+- ``loop.iteration`` is below ``loop.max_iterations`` (default 200)
+- ``budget.started_at + budget.max_hours`` is still in the future
+
+Ready projects sit in a priority queue ordered by when they were last
+dispatched, so every ready project gets a cycle before any project gets a
+second one. A project runs at most one cycle at a time, and at most
+``max_concurrent`` cycles run in total. Dispatch errors back off per project
+(5s x failures², capped at 300s, as ralph.sh does). A kick that admission
+control refused or deferred (deadf-admission.py) holds the project back
+300s or 60s.
+
+Cycles run ``.deadf/bin/cron-kick.sh``. It keeps everything a cron line
+would do: the cron.lock, stale-cycle recovery, task-list rotation and log
+pruning, and kick.sh itself. Its output is appended to
+``.deadf/logs/supervisor.log`` in the project; past CHILD_LOG_MAX_BYTES that
+file moves to ``supervisor.log.1`` at the next dispatch, replacing the
+previous one. A cycle past its timeout gets SIGTERM on its process group and,
+``kill_grace`` seconds later, SIGKILL; the loop keeps scheduling meanwhile.
+The supervisor's own events go to one JSON-lines stream.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import IO, Any, Iterable
+
+from ..state.reader import StateCache, StateError, lookup
+from ..util import parse_ts
+
+KICK_RELPATH = os.path.join(".deadf", "bin", "cron-kick.sh")
+STATE_RELPATH = os.path.join(".deadf", "state", "STATE.yaml")
+P2_DONE_RELPATH = os.path.join(".deadf", "seed", "P2_DONE")
+CHILD_LOG_RELPATH = os.path.join(".deadf", "logs", "supervisor.log")
+CHILD_LOG_MAX_BYTES = 8 * 1024 * 1024
+
+PRUNE_DIRS = {".git", ".hg", ".svn", "node_modules", ".venv", "venv", "__pycache__", ".tox"}
+DEFAULT_MAX_ITERATIONS = 200
+BACKOFF_UNIT_S = 5
+BACKOFF_CAP_S = 300
+KILL_GRACE_S = 10
+
+# cron-kick.sh exit codes (see its header).
+EXIT_SKIP = {10: "lock_held", 11: "needs_human", 12: "complete", 13: "cycle_running",
+             14: "stale_running_cycle", 15: "admission_refused", 16: "admission_deferred"}
+# Admission skips do not change STATE.yaml, so readiness would pick the project
+# again at once; wait this long before asking again.
+ADMISSION_RECHECK_S = {15: BACKOFF_CAP_S, 16: 60}
+EXIT_ERROR = {20: "preflight_or_state_error", 21: "spawn_failed"}
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def discover(roots: Iterable[str], max_depth: int = 3) -> list[str]:
+    """Project directories (holding .deadf/state/STATE.yaml and cron-kick.sh) under ``roots``."""
+    found: list[str] = []
+    seen: set[str] = set()
+    for root in roots:
+        root = os.path.abspath(root)
+        base_depth = root.rstrip(os.sep).count(os.sep)
+        for dirpath, dirnames, _ in os.walk(root):
+            if os.path.isfile(os.path.join(dirpath, STATE_RELPATH)) \
+                    and os.access(os.path.join(dirpath, KICK_RELPATH), os.X_OK):
+                real = os.path.realpath(dirpath)
+                if real not in seen:
+                    seen.add(real)
+                    found.append(dirpath)
+                dirnames[:] = []  # projects do not nest
+                continue
+            if dirpath.count(os.sep) - base_depth >= max_depth:
+                dirnames[:] = []
+                continue
+            dirnames[:] = sorted(d for d in dirnames if d not in PRUNE_DIRS and d != ".deadf")
+    return sorted(found)
+
+
+def readiness(project_dir: str, state: Any, now: float) -> str | None:
+    """None if the project can be kicked, else the reason it cannot."""
+    phase = lookup(state, ("phase",))
+    if phase in ("needs_human", "complete"):
+        return str(phase)
+    if lookup(state, ("cycle", "status")) == "running":
+        return "cycle_running"
+    if phase == "research" and not os.path.exists(os.path.join(project_dir, P2_DONE_RELPATH)):
+        return "needs_init"
+    iteration = lookup(state, ("loop", "iteration"))
+    max_iter = lookup(state, ("loop", "max_iterations"))
+    if not isinstance(max_iter, int) or isinstance(max_iter, bool):
+        max_iter = DEFAULT_MAX_ITERATIONS
+    if isinstance(iteration, int) and not isinstance(iteration, bool) and iteration >= max_iter:
+        return "max_iterations"
+    max_hours = lookup(state, ("budget", "max_hours"))
+    started = parse_ts(lookup(state, ("budget", "started_at")))
+    if isinstance(max_hours, (int, float)) and not isinstance(max_hours, bool) \
+            and started is not None and now >= started + max_hours * 3600:
+        return "budget_exhausted"
+    return None
+
+
+@dataclass
+class Project:
+    path: str
+    cache: StateCache
+    last_dispatch: float = 0.0  # monotonic; 0 = never
+    failures: int = 0
+    not_before: float = 0.0
+    blocked: str | None = None
+    proc: subprocess.Popen[bytes] | None = None
+    started: float = 0.0
+    kill_at: float | None = None  # SIGKILL deadline once a timeout sent SIGTERM
+    log: IO[bytes] | None = field(default=None, repr=False)
+
+
+class Supervisor:
+    def __init__(
+        self,
+        roots: list[str],
+        max_concurrent: int,
+        interval: float = 5.0,
+        rescan: float = 300.0,
+        cycle_timeout: float = 600.0,
+        max_depth: int = 3,
+        events: IO[str] = sys.stdout,
+        kill_grace: float = KILL_GRACE_S,
+    ) -> None:
+        self.roots = roots
+        self.max_concurrent = max(1, max_concurrent)
+        self.interval = interval
+        self.rescan = rescan
+        self.cycle_timeout = cycle_timeout
+        self.max_depth = max_depth
+        self.events = events
+        self.kill_grace = kill_grace
+        self.projects: dict[str, Project] = {}
+        self.once = False
+        self._dispatched: set[str] = set()
+        self._stopping = False
+        self._last_scan = float("-inf")
+
+    # -- events --------------------------------------------------------------
+    def emit(self, level: str, event: str, project: str = "", **extra: Any) -> None:
+        record = {"ts": _utc_now(), "level": level, "event": event, "project_path": project}
+        record.update(extra)
+        try:
+            self.events.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.events.flush()
+        except (BrokenPipeError, ValueError):
+            pass  # reader went away (or the stream was closed); keep scheduling
+
+    # -- discovery -----------------------------------------------------------
+    def scan(self) -> None:
+        paths = discover(self.roots, self.max_depth)
+        for path in paths:
+            if path not in self.projects:
+                self.projects[path] = Project(path, StateCache(os.path.join(path, STATE_RELPATH)))
+                self.emit("INFO", "discovered", path)
+        for path in [p for p in self.projects if p not in paths]:
+            if self.projects[path].proc is None:
+                del self.projects[path]
+                self.emit("INFO", "removed", path)
+        self._last_scan = time.monotonic()
+
+    # -- scheduling ----------------------------------------------------------
+    def running(self) -> int:
+        return sum(1 for p in self.projects.values() if p.proc is not None)
+
+    def ready_queue(self, now_mono: float) -> list[tuple[float, str]]:
+        """Heap of (last dispatch, path) for projects that can be kicked now."""
+        wall = time.time()
+        queue: list[tuple[float, str]] = []
+        for project in self.projects.values():
+            if project.proc is not None or now_mono < project.not_before:
+                continue
+            if self.once and project.path in self._dispatched:
+                continue
+            try:
+                reason = readiness(project.path, project.cache.get(), wall)
+            except StateError as exc:
+                reason = "state_error"
+                if project.blocked != reason:
+                    self.emit("ERROR", "state_error", project.path, reason=str(exc))
+            if reason != project.blocked:
+                if reason:
+                    self.emit("INFO", "blocked", project.path, reason=reason)
+                elif project.blocked:
+                    self.emit("INFO", "ready", project.path)
+                project.blocked = reason
+            if reason is None:
+                queue.append((project.last_dispatch, project.path))
+        heapq.heapify(queue)
+        return queue
+
+    def dispatch(self, project: Project) -> None:
+        log_path = os.path.join(project.path, CHILD_LOG_RELPATH)
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        try:
+            if os.path.getsize(log_path) >= CHILD_LOG_MAX_BYTES:
+                os.replace(log_path, log_path + ".1")
+        except FileNotFoundError:
+            pass
+        project.log = open(log_path, "ab")
+        project.log.write(f"--- {_utc_now()} supervisor dispatch ---\n".encode())
+        project.log.flush()
+        project.proc = subprocess.Popen(
+            [os.path.join(project.path, KICK_RELPATH)], cwd=project.path,
+            stdin=subprocess.DEVNULL, stdout=project.log, stderr=subprocess.STDOUT,
+            start_new_session=True,  # own process group: a timeout kills the whole cycle
+        )
+        project.started = project.last_dispatch = time.monotonic()
+        project.kill_at = None
+        self._dispatched.add(project.path)
+        self.emit("INFO", "dispatch", project.path, pid=project.proc.pid,
+                  running=self.running(), max_concurrent=self.max_concurrent)
+
+    def reap(self) -> None:
+        now = time.monotonic()
+        for project in self.projects.values():
+            proc = project.proc
+            if proc is None:
+                continue
+            code = proc.poll()
+            if code is None:
+                if project.kill_at is None and now - project.started >= self.cycle_timeout:
+                    self.emit("ERROR", "cycle_timeout", project.path, pid=proc.pid,
+                              timeout_s=self.cycle_timeout)
+                    self._terminate(project, now)
+                elif project.kill_at is not None and now >= project.kill_at:
+                    self._signal(proc, signal.SIGKILL)
+                continue
+            elapsed = round(now - project.started, 1)
+            if project.kill_at is not None and code != 0:
+                project.failures += 1
+                backoff = min(BACKOFF_UNIT_S * project.failures ** 2, BACKOFF_CAP_S)
+                project.not_before = now + backoff
+                self.emit("ERROR", "error", project.path, exit_code=code,
+                          reason="terminated" if self._stopping else "cycle_timeout", elapsed_s=elapsed, failures=project.failures, backoff_s=backoff)
+            elif code == 0:
+                project.failures = 0
+                self.emit("INFO", "done", project.path, exit_code=0, elapsed_s=elapsed)
+            elif code in EXIT_SKIP:
+                project.not_before = now + ADMISSION_RECHECK_S.get(code, 0)
+                self.emit("INFO", "skip", project.path, exit_code=code, reason=EXIT_SKIP[code],
+                          elapsed_s=elapsed)
+            else:
+                project.failures += 1
+                backoff = min(BACKOFF_UNIT_S * project.failures ** 2, BACKOFF_CAP_S)
+                project.not_before = now + backoff
+                self.emit("ERROR", "error", project.path, exit_code=code,
+                          reason=EXIT_ERROR.get(code, "unexpected_exit"), elapsed_s=elapsed,
+                          failures=project.failures, backoff_s=backoff)
+            project.proc = None
+            if project.log is not None:
+                project.log.close()
+                project.log = None
+
+    def _terminate(self, project: Project, now: float) -> None:
+        """SIGTERM the cycle's process group; reap() sends SIGKILL after kill_grace."""
+        if project.proc is not None and project.kill_at is None:
+            project.kill_at = now + self.kill_grace
+            self._signal(project.proc, signal.SIGTERM)
+
+    @staticmethod
+    def _signal(proc: subprocess.Popen[bytes], sig: int) -> None:
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def tick(self) -> None:
+        """Reap finished cycles, then fill free slots from the ready queue."""
+        if time.monotonic() - self._last_scan >= self.rescan:
+            self.scan()
+        self.reap()
+        free = self.max_concurrent - self.running()
+        if free <= 0 or self._stopping:
+            return
+        queue = self.ready_queue(time.monotonic())
+        while free > 0 and queue:
+            _, path = heapq.heappop(queue)
+            try:
+                self.dispatch(self.projects[path])
+            except OSError as exc:
+                project = self.projects[path]
+                project.failures += 1
+                project.not_before = time.monotonic() + BACKOFF_CAP_S
+                self.emit("ERROR", "dispatch_failed", path, reason=str(exc))
+                continue
+            free -= 1
+
+    def stop(self, *_: Any) -> None:
+        self._stopping = True
+
+    def run(self, once: bool = False) -> None:
+        """Schedule until SIGTERM/SIGINT.
+
+        With ``once``, every ready project gets one cycle and the run ends
+        when the last of them has finished.
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.once = once
+        self.emit("INFO", "start", roots=self.roots, max_concurrent=self.max_concurrent)
+        self.scan()
+        while not self._stopping:
+            self.tick()
+            if once and self.running() == 0:
+                break  # tick reaped everything and found nothing left to dispatch
+            # Wake early for reaping; readiness is cheap (stat unless STATE.yaml changed).
+            time.sleep(min(self.interval, 1.0) if self.running() else self.interval)
+        now = time.monotonic()
+        for project in self.projects.values():
+            if project.proc is not None:
+                self.emit("INFO", "terminate", project.path, pid=project.proc.pid)
+                self._terminate(project, now)
+        while self.running():  # every cycle shares the one grace period
+            self.reap()
+            if self.running():
+                time.sleep(0.1)
+        self.emit("INFO", "stop")
@@ -0,0 +1,23 @@
+"""Small helpers shared by the deadf packages (state timestamps, cycle statistics)."""
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Any
+
+
+def parse_ts(value: Any) -> float | None:
+    """Unix time of an ISO-8601 STATE.yaml timestamp (``Z`` allowed); None if unset or invalid."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def quantile(values: list[float], q: float) -> float:
+    """Nearest-rank quantile (q in 0..1) of a non-empty list."""
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(q * len(ordered) - 1e-9)))
+    return ordered[rank - 1]
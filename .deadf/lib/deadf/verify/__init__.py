@@ -0,0 +1 @@
+"""deadf.verify — helpers behind .deadf/bin/verify.sh (via verify-helper.py)."""
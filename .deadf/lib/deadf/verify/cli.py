@@ -0,0 +1,121 @@
+"""Command-line entry point behind .deadf/bin/verify-helper.py."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from . import resultcache
+
+from .gitsnap import SnapshotError, snapshot
+from .secretscan import SecretConfigError, load_scanner
+from .testimpact import select_tests
+from .testreport import collect
+
+
+def _tsv(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Helpers for the deterministic verifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_snap = sub.add_parser("snapshot", help="Collect diff facts (paths, line counts, added lines)")
+    p_snap.add_argument("--repo", default=".", help="Repository directory (default: .)")
+    p_snap.add_argument("--out", required=True, help="Directory to write the snapshot into")
+
+    p_sec = sub.add_parser("secrets", help="Scan a snapshot's added lines for secrets")
+    p_sec.add_argument("--added", required=True, help="Snapshot added.tsv")
+    p_sec.add_argument("--config", help="Per-repo rules/allowlist JSON (optional)")
+
+    p_imp = sub.add_parser("test-impact", help="Select the pytest files a change can affect")
+    p_imp.add_argument("--repo", default=".", help="Project directory (default: .)")
+    p_imp.add_argument("--changed-z", help="NUL-separated changed paths (snapshot changed.z)")
+    p_imp.add_argument("--changed", action="append", default=[], help="Extra changed path")
+    p_imp.add_argument("--cache", required=True, help="Cache directory")
+    p_imp.add_argument("--runner", default="python3 -m pytest", help="pytest command")
+    p_imp.add_argument("--full-every", type=int, default=0,
+                       help="Run the full suite every N selections (0 = never)")
+    p_imp.add_argument("--force-full", default="", metavar="REASON",
+                       help="Run the full suite for this reason")
+    p_imp.add_argument("--timeout", type=float, default=None, help="Collection timeout (s)")
+
+    p_rep = sub.add_parser("test-report", help="Summarize a test run from its report or log")
+    p_rep.add_argument("--kind", choices=("junit", "jest", "none"), default="none",
+                       help="Structured report format the runner was asked for")
+    p_rep.add_argument("--report", help="Structured report file")
+    p_rep.add_argument("--log", required=True, help="Combined runner output")
+    p_rep.add_argument("--exit", type=int, default=0, help="Runner exit code")
+    p_rep.add_argument("--slowest", type=int, default=5, help="Slowest tests to list")
+
+    p_key = sub.add_parser("cache-key", help="Result-cache key for the current tree and inputs")
+    p_key.add_argument("--repo", default=".", help="Project directory (default: .)")
+    p_key.add_argument("--part", action="append", default=[], help="Extra key input (string)")
+    p_key.add_argument("--file", action="append", default=[], help="Extra key input (contents)")
+
+    p_get = sub.add_parser("cache-get", help="Print a cached result (exit 1 on a miss)")
+    p_get.add_argument("--cache", required=True, help="Cache directory")
+    p_get.add_argument("--key", required=True)
+
+    p_put = sub.add_parser("cache-put", help="Store the result JSON on stdin")
+    p_put.add_argument("--cache", required=True, help="Cache directory")
+    p_put.add_argument("--key", required=True)
+    p_put.add_argument("--max-kb", type=int, default=4096, help="Size budget for stored results")
+
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        try:
+            snapshot(args.repo, args.out)
+        except (SnapshotError, OSError) as exc:
+            print(f"error: git snapshot failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "secrets":
+        try:
+            scanner = load_scanner(args.config)
+            findings = scanner.scan_file(args.added)
+        except (SecretConfigError, OSError, ValueError) as exc:
+            print(f"error: secret scan failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        # rule<TAB>path<TAB>line<TAB>preview: the preview goes last since it may hold tabs.
+        for f in findings:
+            row = f"{f.rule}\t{_tsv(f.path)}\t{f.line}\t{f.preview}\n"
+            sys.stdout.buffer.write(row.encode("utf-8", "surrogateescape"))
+    elif args.command == "test-impact":
+        changed = list(args.changed)
+        if args.changed_z:
+            with open(args.changed_z, "rb") as fh:
+                changed += [p.decode("utf-8", "surrogateescape") for p in fh.read().split(b"\0") if p]
+        sel = select_tests(args.repo, changed, args.cache, args.runner, args.full_every,
+                           args.force_full, args.timeout)
+        # MODE/REASON/TOTAL, then one TEST= line per selected file.
+        print(f"MODE={sel.mode}")
+        print("REASON=" + " ".join(sel.reason.split()))
+        print(f"TOTAL={sel.total}")
+        for test in sel.tests:
+            print(f"TEST={test}")
+    elif args.command == "test-report":
+        report = collect(args.kind, args.report, args.log, args.slowest)
+        print(f"COUNT={report.count}")
+        print(f"SUMMARY={report.summary(args.exit)}")
+        print("JSON=" + json.dumps(report.to_json(), ensure_ascii=False))
+    elif args.command == "cache-key":
+        try:
+            print(resultcache.cache_key(args.repo, args.part, args.file))
+        except (resultcache.CacheKeyError, OSError) as exc:
+            print(f"error: cannot compute cache key: {exc}", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "cache-get":
+        result = resultcache.get(args.cache, args.key)
+        if result is None:
+            sys.exit(1)
+        result["cache"] = {"hit": True, "key": args.key}
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.command == "cache-put":
+        try:
+            resultcache.put(args.cache, args.key, json.load(sys.stdin), args.max_kb * 1024)
+        except (OSError, ValueError) as exc:
+            print(f"error: cannot store verify result: {exc}", file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,200 @@
+"""Git snapshot: collect the diff facts verify.sh needs in one pass.
+
+The base is HEAD~1 (working tree against the parent commit) or, on the first
+commit, HEAD itself via ``git show``. One ``--numstat -z`` run gives the changed
+paths and line counts; one streamed patch gives the added lines per file.
+Nothing is held in memory beyond the current patch line.
+
+Files written to the output directory:
+
+- summary.env  shell-sourceable SNAP_BASE, SNAP_DIFF_LINES, SNAP_FILE_COUNT
+- changed.z    changed paths, NUL-terminated (rename targets, like --name-only)
+- added.tsv    one added line per row: path<TAB>new-line-number<TAB>text
+"""
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import tempfile
+from typing import IO, Iterator
+
+# Explicit prefixes: diff.noprefix / diff.mnemonicPrefix must not change the
+# "+++ b/<path>" lines added_lines() strips.
+PATCH_ARGS = ("--no-color", "--no-ext-diff", "--src-prefix=a/", "--dst-prefix=b/")
+RE_HUNK = re.compile(rb'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+_C_ESCAPES = {b"n": b"\n", b"t": b"\t", b'"': b'"', b"\\": b"\\", b"a": b"\a",
+              b"b": b"\b", b"f": b"\f", b"r": b"\r", b"v": b"\v"}
+
+
+class SnapshotError(Exception):
+    """A git command needed for the snapshot failed."""
+
+
+def _git(repo: str, *args: str) -> list[str]:
+    return ["git", "-C", repo, "-c", "core.quotePath=false", *args]
+
+
+def find_base(repo: str) -> str:
+    """'parent' (diff against HEAD~1), 'root' (first commit) or 'none'."""
+    for rev, base in (("HEAD~1", "parent"), ("HEAD", "root")):
+        probe = subprocess.run(
+            _git(repo, "rev-parse", "--verify", "-q", rev),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        if probe.returncode == 0:
+            return base
+    return "none"
+
+
+def _diff_args(base: str, *extra: str) -> list[str]:
+    if base == "parent":
+        return ["diff", *extra, "HEAD~1"]
+    return ["show", *extra, "--format=", "HEAD"]
+
+
+def _unquote_path(raw: bytes) -> bytes:
+    """Undo git's C-style quoting of a path ("a\\tb" -> a<TAB>b)."""
+    if not (raw.startswith(b'"') and raw.endswith(b'"')):
+        return raw
+    body = raw[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        ch = body[i:i + 1]
+        if ch == b"\\" and i + 1 < len(body):
+            nxt = body[i + 1:i + 2]
+            if nxt in _C_ESCAPES:
+                out += _C_ESCAPES[nxt]
+                i += 2
+                continue
+            octal = body[i + 1:i + 4]
+            if re.fullmatch(rb"[0-7]{3}", octal):
+                out.append(int(octal, 8))
+                i += 4
+                continue
+        out += ch
+        i += 1
+    return bytes(out)
+
+
+def numstat(repo: str, base: str) -> tuple[list[bytes], int]:
+    """(changed paths, added+deleted line total) from one ``--numstat -z`` run."""
+    proc = subprocess.run(
+        _git(repo, *_diff_args(base, "--numstat", "-z")),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    if proc.returncode != 0:
+        raise SnapshotError(proc.stderr.decode("utf-8", "replace").strip() or "git numstat failed")
+    fields = proc.stdout.split(b"\0")
+    paths: list[bytes] = []
+    total = 0
+    i = 0
+    while i < len(fields):
+        rec = fields[i]
+        i += 1
+        if not rec:
+            continue
+        added, _, rest = rec.partition(b"\t")
+        deleted, _, path = rest.partition(b"\t")
+        if not path:
+            # Rename/copy: "<a>\t<d>\t" then NUL-separated old and new paths.
+            i += 1
+            path = fields[i] if i < len(fields) else b""
+            i += 1
+        for count in (added, deleted):
+            if count.isdigit():
+                total += int(count)
+        paths.append(path)
+    return paths, total
+
+
+def added_lines(stream: IO[bytes]) -> Iterator[tuple[bytes, int, bytes]]:
+    """Yield (path, new line number, text) for every added line of a patch.
+
+    Hunk bodies are delimited by the line counts in their ``@@`` headers, so
+    added lines that look like headers (``+++ ...``) are still content.
+    Target paths carry the ``b/`` prefix PATCH_ARGS asks for.
+    """
+    path: bytes | None = None
+    new_line = 0
+    old_left = new_left = 0
+    for raw in stream:
+        line = raw[:-1] if raw.endswith(b"\n") else raw
+        if old_left > 0 or new_left > 0:
+            tag = line[:1]
+            if tag == b"+":
+                if path is not None:
+                    yield path, new_line, line[1:]
+                new_line += 1
+                new_left -= 1
+            elif tag == b"-":
+                old_left -= 1
+            elif tag == b"\\":
+                pass  # "\ No newline at end of file"
+            else:
+                new_line += 1
+                old_left -= 1
+                new_left -= 1
+            continue
+        if line.startswith(b"\\"):
+            continue
+        m = RE_HUNK.match(line)
+        if m:
+            old_left = int(m.group(1) or b"1")
+            new_line = int(m.group(2))
+            new_left = int(m.group(3) or b"1")
+        elif line.startswith(b"diff --git "):
+            path = None
+        elif line.startswith(b"+++ "):
+            target = _unquote_path(line[4:].rstrip(b"\t"))
+            if target == b"/dev/null":
+                path = None
+            else:
+                path = target[2:]  # PATCH_ARGS pins the "b/" prefix
+
+
+def _tsv_field(value: bytes) -> bytes:
+    return value.replace(b"\\", b"\\\\").replace(b"\t", b"\\t").replace(b"\n", b"\\n")
+
+
+def snapshot(repo: str, out_dir: str) -> dict[str, int | str]:
+    """Write summary.env, changed.z and added.tsv for ``repo`` into ``out_dir``."""
+    os.makedirs(out_dir, exist_ok=True)
+    base = find_base(repo)
+    paths: list[bytes] = []
+    total = 0
+    added = 0
+
+    with open(os.path.join(out_dir, "added.tsv"), "wb") as tsv:
+        if base != "none":
+            paths, total = numstat(repo, base)
+            with tempfile.TemporaryFile() as err:
+                proc = subprocess.Popen(
+                    _git(repo, *_diff_args(base, *PATCH_ARGS)),
+                    stdout=subprocess.PIPE, stderr=err,
+                )
+                assert proc.stdout is not None
+                with proc.stdout:
+                    for path, line_no, text in added_lines(proc.stdout):
+                        tsv.write(b"%s\t%d\t%s\n" % (_tsv_field(path), line_no, text))
+                        added += 1
+                if proc.wait() != 0:
+                    err.seek(0)
+                    detail = err.read().decode("utf-8", "replace").strip()
+                    raise SnapshotError(detail or "git diff failed")
+
+    with open(os.path.join(out_dir, "changed.z"), "wb") as fh:
+        for path in paths:
+            fh.write(path + b"\0")
+
+    summary: dict[str, int | str] = {
+        "SNAP_BASE": base,
+        "SNAP_DIFF_LINES": total,
+        "SNAP_FILE_COUNT": len(paths),
+        "SNAP_ADDED_LINES": added,
+    }
+    with open(os.path.join(out_dir, "summary.env"), "w", encoding="utf-8") as fh:
+        for key, value in summary.items():
+            fh.write(f"{key}={value}\n")
+    return summary
@@ -0,0 +1,146 @@
+"""Content-addressed cache of verify.sh results.
+
+The key covers everything a verify run reads:
+
+- HEAD (and so the HEAD~1 diff base)
+- the working tree, as the tree id ``git write-tree`` gives for a scratch
+  copy of the index with every change and untracked file added. ``.deadf/``
+  is included: git_clean counts it, so a new track file must miss. Caches and
+  metrics under it ignore themselves and stay out of the key.
+- the detected test and lint commands and other caller-supplied settings
+- the contents of the task file, the secrets config, verify.sh itself and
+  this package
+
+A hit returns the stored result JSON. Entries are one file each under
+``results/``; reads refresh their mtime and writes evict the least recently
+used entries once the directory exceeds its size budget.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Any, Iterable
+
+from ..cachedir import ensure_cache_dir
+
+RESULTS_DIR = "results"
+KEY_VERSION = "2"
+
+
+class CacheKeyError(Exception):
+    """The repository state could not be hashed (not a git repo, git failed)."""
+
+
+def _git(repo: str, *args: str, env: dict[str, str] | None = None) -> str:
+    proc = subprocess.run(
+        ["git", "-C", repo, *args], env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    if proc.returncode != 0:
+        detail = proc.stderr.decode("utf-8", "replace").strip()
+        raise CacheKeyError(detail or f"git {args[0]} failed")
+    return proc.stdout.decode("utf-8", "replace").strip()
+
+
+def worktree_tree(repo: str) -> str:
+    """Tree id of the working tree (tracked + untracked, minus ignored files).
+
+    A copy of the real index keeps git's stat cache, so only files that
+    changed since the last ``git add``/``status`` are re-hashed.
+    """
+    index = _git(repo, "rev-parse", "--git-path", "index")
+    if not os.path.isabs(index):
+        index = os.path.join(repo, index)
+    with tempfile.TemporaryDirectory(prefix="deadf-verify-index.") as tmp:
+        scratch = os.path.join(tmp, "index")
+        if os.path.exists(index):
+            shutil.copyfile(index, scratch)
+        env = {**os.environ, "GIT_INDEX_FILE": scratch}
+        _git(repo, "add", "-A", "--", ".", env=env)
+        return _git(repo, "write-tree", env=env)
+
+
+def _hash_file(digest: Any, path: str) -> None:
+    digest.update(f"\0file:{path}\0".encode("utf-8", "surrogateescape"))
+    try:
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 16), b""):
+                digest.update(block)
+    except OSError:
+        digest.update(b"<missing>")
+
+
+def cache_key(repo: str, parts: Iterable[str] = (), files: Iterable[str] = ()) -> str:
+    """Key for the current repo state plus ``parts`` (strings) and ``files`` (contents)."""
+    digest = hashlib.sha256(f"deadf-verify-cache:{KEY_VERSION}".encode())
+    try:
+        head = _git(repo, "rev-parse", "--verify", "-q", "HEAD")
+    except CacheKeyError:
+        head = "<no commits>"
+    digest.update(f"\0head:{head}\0tree:{worktree_tree(repo)}".encode())
+    for part in parts:
+        digest.update(f"\0part:{part}".encode("utf-8", "surrogateescape"))
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    own_sources = sorted(
+        os.path.join(package_dir, n) for n in os.listdir(package_dir) if n.endswith(".py")
+    )
+    for path in [*files, *own_sources]:
+        _hash_file(digest, path)
+    return digest.hexdigest()
+
+
+def _entry(cache_dir: str, key: str) -> str:
+    if not key or not all(c in "0123456789abcdef" for c in key):
+        raise ValueError(f"invalid cache key '{key}'")
+    return os.path.join(cache_dir, RESULTS_DIR, f"{key}.json")
+
+
+def get(cache_dir: str, key: str) -> dict[str, Any] | None:
+    """Stored result for ``key`` (refreshing its LRU position), or None."""
+    try:
+        path = _entry(cache_dir, key)
+        with open(path, encoding="utf-8") as fh:
+            result = json.load(fh)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def put(cache_dir: str, key: str, result: dict[str, Any], max_bytes: int) -> None:
+    """Store ``result`` under ``key``, then evict LRU entries beyond ``max_bytes``."""
+    path = _entry(cache_dir, key)
+    ensure_cache_dir(cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(result, fh)
+    os.replace(tmp, path)
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir: str, max_bytes: int) -> int:
+    """Drop least recently used entries until the results fit ``max_bytes``."""
+    results = os.path.join(cache_dir, RESULTS_DIR)
+    entries = []
+    with os.scandir(results) as it:
+        for entry in it:
+            if entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,254 @@
+"""Secret scanning over the added lines of a git snapshot (added.tsv).
+
+Every rule is compiled into one alternation with a named group per rule, and
+each line is first checked against the rules' literal anchors (``AKIA``,
+``ghp_``, ``-----BEGIN``, ``://`` ...). Most diff lines contain none of them
+and are rejected after one literal search, so a scan costs one pass over the
+diff however many rules there are.
+
+A line that hits the alternation is re-run per rule, so matches that overlap
+across rules are all reported (as the old one-grep-per-pattern scan did).
+
+A per-repo JSON file can add rules, disable built-in ones and allowlist paths
+or matched values::
+
+    {
+      "rules": [{"id": "internal-token", "pattern": "itk_[0-9a-f]{32}",
+                 "anchors": ["itk_"], "description": "Internal API token"}],
+      "disable": ["connection-string"],
+      "allowlist": {"paths": ["tests/fixtures/*"], "patterns": ["EXAMPLE"]}
+    }
+
+A custom rule without ``anchors`` turns the literal prefilter off.
+"""
+from __future__ import annotations
+
+import fnmatch
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+MATCH_PREVIEW_CHARS = 20
+
+
+class SecretConfigError(Exception):
+    """The per-repo secret scan configuration is invalid."""
+
+
+@dataclass(frozen=True)
+class SecretRule:
+    id: str
+    pattern: str
+    anchors: tuple[str, ...]
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class Finding:
+    rule: str
+    path: str
+    line: int
+    match: str
+
+    @property
+    def preview(self) -> str:
+        """Truncated match, safe to print (never the whole secret)."""
+        return self.match[:MATCH_PREVIEW_CHARS] + "..."
+
+
+# Built-in rules, in the order verify.sh has always reported them.
+DEFAULT_RULES: tuple[SecretRule, ...] = (
+    SecretRule("aws-access-key", r'AKIA[0-9A-Z]{16}', ("AKIA",), "AWS access key"),
+    SecretRule("sk-secret-key", r'sk-[a-zA-Z0-9]{20,}', ("sk-",), "OpenAI / Stripe secret key"),
+    SecretRule("github-pat", r'ghp_[a-zA-Z0-9]{36}', ("ghp_",),
+               "GitHub personal access token"),
+    SecretRule("github-oauth", r'gho_[a-zA-Z0-9]{36}', ("gho_",), "GitHub OAuth token"),
+    SecretRule("github-fine-grained-pat", r'github_pat_[a-zA-Z0-9_]{82}', ("github_pat_",),
+               "GitHub fine-grained PAT"),
+    SecretRule("gitlab-pat", r'glpat-[a-zA-Z0-9\-]{20}', ("glpat-",), "GitLab PAT"),
+    SecretRule("slack-token", r'xox[bpras]-[a-zA-Z0-9\-]+', ("xox",), "Slack token"),
+    SecretRule(
+        "generic-assignment",
+        r'["\x27]?[a-zA-Z_]*(?:SECRET|TOKEN|KEY|PASSWORD|PASSWD|API_KEY|APIKEY|ACCESS_KEY)'
+        r'["\x27]?\s*[=:]\s*["\x27][^\s"\x27]{8,}["\x27]',
+        ("SECRET", "TOKEN", "KEY", "PASSW"),
+        "Secret-looking name assigned a quoted literal",
+    ),
+    SecretRule("private-key", r'-----BEGIN (RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----',
+               ("-----BEGIN",), "Private key"),
+    SecretRule("connection-string", r'(?:mysql|postgres|mongodb|redis)://[^\s]{10,}', ("://",),
+               "Database connection string"),
+)
+
+
+class SecretScanner:
+    """Compiled rule set plus allowlist."""
+
+    def __init__(
+        self,
+        rules: Iterable[SecretRule] = DEFAULT_RULES,
+        allow_paths: Iterable[str] = (),
+        allow_patterns: Iterable[str] = (),
+    ) -> None:
+        self.rules = tuple(rules)
+        self._rule_res = [re.compile(rule.pattern) for rule in self.rules]
+        try:
+            self._combined: re.Pattern[str] | None = re.compile(
+                "|".join(f"(?P<r{i}>{rule.pattern})" for i, rule in enumerate(self.rules))
+            )
+        except re.error:
+            # A custom rule that only compiles on its own (numbered backrefs,
+            # clashing group names): skip the combined pass, run rules one by one.
+            self._combined = None
+        anchors = sorted({a for rule in self.rules for a in rule.anchors}, key=len, reverse=True)
+        if self.rules and all(rule.anchors for rule in self.rules):
+            self._prefilter: re.Pattern[str] | None = re.compile(
+                "|".join(re.escape(a) for a in anchors)
+            )
+        else:
+            self._prefilter = None
+        self._allow_paths = tuple(allow_paths)
+        self._allow_res = [re.compile(p) for p in allow_patterns]
+
+    def _path_allowed(self, path: str) -> bool:
+        return any(fnmatch.fnmatchcase(path, glob) for glob in self._allow_paths)
+
+    def _value_allowed(self, value: str) -> bool:
+        return any(r.search(value) for r in self._allow_res)
+
+    def scan_line(self, path: str, line_no: int, text: str) -> list[Finding]:
+        if not self.rules:
+            return []
+        if self._prefilter is not None and not self._prefilter.search(text):
+            return []
+        if self._combined is not None and not self._combined.search(text):
+            return []
+        findings = []
+        for rule, rule_re in zip(self.rules, self._rule_res):
+            for m in rule_re.finditer(text):
+                if m.group(0) and not self._value_allowed(m.group(0)):
+                    findings.append(Finding(rule.id, path, line_no, m.group(0)))
+        return findings
+
+    def scan(self, rows: Iterable[tuple[str, int, str]]) -> list[Finding]:
+        """Findings for (path, line, text) rows, grouped by rule in rule order."""
+        by_rule: dict[str, list[Finding]] = {rule.id: [] for rule in self.rules}
+        skip_path: dict[str, bool] = {}
+        for path, line_no, text in rows:
+            if path not in skip_path:
+                skip_path[path] = self._path_allowed(path)
+            if skip_path[path]:
+                continue
+            for finding in self.scan_line(path, line_no, text):
+                by_rule[finding.rule].append(finding)
+        return [f for findings in by_rule.values() for f in findings]
+
+    def scan_file(self, path: str, chunk_size: int = 1 << 20) -> list[Finding]:
+        """Findings for a snapshot added.tsv.
+
+        The literal prefilter runs over whole chunks of the file rather than
+        line by line; only rows with an anchor hit are split and matched.
+        """
+        if self._prefilter is None:
+            return self.scan(read_added(path))
+        prefilter = self._prefilter
+
+        def hit_rows() -> Iterator[tuple[str, int, str]]:
+            with open(path, encoding="utf-8", errors="surrogateescape", newline="\n") as fh:
+                tail = ""
+                while True:
+                    data = fh.read(chunk_size)
+                    if not data:
+                        break
+                    cut = data.rfind("\n") + 1
+                    if not cut:
+                        tail += data
+                        continue
+                    chunk, tail = tail + data[:cut], data[cut:]
+                    yield from _rows_with_hits(chunk, prefilter)
+                if tail:
+                    yield from _rows_with_hits(tail + "\n", prefilter)
+
+        return self.scan(hit_rows())
+
+
+def _unescape_tsv(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return re.sub(r'\\(.)', lambda m: {"t": "\t", "n": "\n"}.get(m.group(1), m.group(1)), value)
+
+
+def read_added(path: str) -> Iterator[tuple[str, int, str]]:
+    """Rows of a snapshot added.tsv (path<TAB>line<TAB>text)."""
+    with open(path, encoding="utf-8", errors="surrogateescape", newline="\n") as fh:
+        for row in fh:
+            file_path, _, rest = row.rstrip("\n").partition("\t")
+            line_no, _, text = rest.partition("\t")
+            yield _unescape_tsv(file_path), int(line_no or 0), text
+
+
+def _rows_with_hits(chunk: str, prefilter: re.Pattern[str]) -> Iterator[tuple[str, int, str]]:
+    """added.tsv rows of ``chunk`` (whole lines) that contain a prefilter hit."""
+    pos = 0
+    while True:
+        m = prefilter.search(chunk, pos)
+        if m is None:
+            return
+        start = chunk.rfind("\n", 0, m.start()) + 1
+        end = chunk.index("\n", m.start())
+        file_path, _, rest = chunk[start:end].partition("\t")
+        line_no, _, text = rest.partition("\t")
+        yield _unescape_tsv(file_path), int(line_no or 0), text
+        pos = end + 1
+
+
+def _str_list(value: Any, what: str) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise SecretConfigError(f"{what} must be a list of strings")
+    return value
+
+
+def load_scanner(config_path: str | None = None) -> SecretScanner:
+    """Scanner for the built-in rules plus an optional per-repo JSON file."""
+    if config_path is None:
+        return SecretScanner()
+    try:
+        with open(config_path, encoding="utf-8") as fh:
+            config = json.load(fh)
+    except (OSError, ValueError) as exc:
+        raise SecretConfigError(f"cannot read {config_path}: {exc}") from exc
+    if not isinstance(config, dict):
+        raise SecretConfigError(f"{config_path}: top level must be an object")
+
+    disabled = set(_str_list(config.get("disable", []), "disable"))
+    rules = [rule for rule in DEFAULT_RULES if rule.id not in disabled]
+    known = {rule.id for rule in DEFAULT_RULES}
+    for i, raw in enumerate(config.get("rules", [])):
+        if not isinstance(raw, dict) or not isinstance(raw.get("id"), str) \
+                or not isinstance(raw.get("pattern"), str):
+            raise SecretConfigError(f"rules[{i}]: needs string 'id' and 'pattern'")
+        if raw["id"] in known:
+            raise SecretConfigError(f"rules[{i}]: duplicate rule id '{raw['id']}'")
+        try:
+            re.compile(raw["pattern"])
+        except re.error as exc:
+            raise SecretConfigError(f"rules[{i}] ({raw['id']}): bad pattern: {exc}") from exc
+        known.add(raw["id"])
+        rules.append(SecretRule(
+            raw["id"], raw["pattern"],
+            tuple(_str_list(raw.get("anchors", []), f"rules[{i}].anchors")),
+            str(raw.get("description", "")),
+        ))
+
+    allow = config.get("allowlist", {})
+    if not isinstance(allow, dict):
+        raise SecretConfigError("allowlist must be an object")
+    allow_patterns = _str_list(allow.get("patterns", []), "allowlist.patterns")
+    for pattern in allow_patterns:
+        try:
+            re.compile(pattern)
+        except re.error as exc:
+            raise SecretConfigError(f"allowlist.patterns: bad pattern '{pattern}': {exc}") from exc
+    return SecretScanner(rules, _str_list(allow.get("paths", []), "allowlist.paths"),
+                         allow_patterns)
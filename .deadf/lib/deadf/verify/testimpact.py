@@ -0,0 +1,304 @@
+"""Test-impact selection: which pytest files can a change affect?
+
+Python files are mapped to module names (relative to the repo root and to
+``src/``) and their imports read with ``ast``; a changed module's impact is
+every file that imports it, directly or transitively. The affected tests are
+the collected test files in that set, plus changed tests themselves and every
+test under a ``conftest.py`` in it (changed, or importing a changed module).
+
+The test-file index comes from ``pytest --collect-only -q`` and is cached
+until a test file, conftest, pytest config file or the set of Python paths
+changes. Parsed imports are cached per file by (mtime, size).
+
+Selection is conservative. The full suite runs whenever the change cannot be
+mapped safely: a deleted or unparsable Python file, a non-Python file that is
+not documentation, a pytest config change, a failed collection. It also runs
+every ``full_every`` selections, and whenever the caller forces it.
+"""
+from __future__ import annotations
+
+import ast
+import fnmatch
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from ..cachedir import ensure_cache_dir
+
+CACHE_VERSION = 1
+CACHE_FILE = "test-impact.json"
+
+PRUNE_DIRS = {
+    ".git", ".deadf", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv",
+    ".tox", ".nox", "build", "dist", "site-packages", ".mypy_cache", ".pytest_cache",
+    ".ruff_cache",
+}
+PYTEST_CONFIG_FILES = ("pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini")
+TEST_FILE_GLOBS = ("test_*.py", "*_test.py")
+# Changes to these never affect a test run.
+IGNORED_GLOBS = ("*.md", "*.rst", "docs/*", ".deadf/*", "LICENSE*", ".gitignore")
+
+
+@dataclass
+class Selection:
+    mode: str  # "impact" or "full"
+    reason: str
+    tests: list[str] = field(default_factory=list)
+    total: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Python files and module names
+# ---------------------------------------------------------------------------
+def python_files(repo: str) -> list[str]:
+    """Repo-relative paths of every .py file outside vendored/tool dirs."""
+    found: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(repo):
+        dirnames[:] = sorted(d for d in dirnames if d not in PRUNE_DIRS and not d.startswith("."))
+        rel_dir = os.path.relpath(dirpath, repo)
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                found.append(name if rel_dir == "." else os.path.join(rel_dir, name))
+    return found
+
+
+def module_names(path: str) -> list[str]:
+    """Importable names of a repo-relative .py path (root-based and src-based)."""
+    parts = path[:-3].split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    names = [".".join(parts)] if parts else []
+    if len(parts) > 1 and parts[0] == "src":
+        names.append(".".join(parts[1:]))
+    return names
+
+
+def parse_imports(source: bytes, path: str) -> list[tuple[int, str, list[str]]]:
+    """(level, module, imported names) for every import in a file."""
+    tree = ast.parse(source, filename=path)
+    imports: list[tuple[int, str, list[str]]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append((0, alias.name, []))
+        elif isinstance(node, ast.ImportFrom):
+            imports.append((node.level, node.module or "", [a.name for a in node.names]))
+    return imports
+
+
+def _resolve(
+    importer: str,
+    imp: tuple[int, str, list[str]],
+    modules: dict[str, str],
+) -> set[str]:
+    """Repo files an import statement in ``importer`` can load."""
+    level, module, names = imp
+    if level:
+        package = importer[:-3].split(os.sep)[:-1]
+        if level > 1:
+            package = package[:-(level - 1)] if level - 1 <= len(package) else []
+        base = ".".join(package + ([module] if module else []))
+        candidates = [base]
+    else:
+        candidates = [module]
+        # Sibling module on sys.path (pytest's rootdir insertion for test dirs).
+        sibling_dir = os.path.dirname(importer)
+        if sibling_dir:
+            candidates.append(".".join(sibling_dir.split(os.sep) + [module]))
+    found: set[str] = set()
+    for base in candidates:
+        if not base:
+            continue
+        # Importing a.b.c runs a/__init__.py and a/b/__init__.py as well.
+        parts = base.split(".")
+        for i in range(1, len(parts) + 1):
+            target = modules.get(".".join(parts[:i]))
+            if target:
+                found.add(target)
+        for name in names:
+            target = modules.get(f"{base}.{name}")
+            if target:
+                found.add(target)
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+def _load_cache(cache_dir: str) -> dict:
+    try:
+        with open(os.path.join(cache_dir, CACHE_FILE), encoding="utf-8") as fh:
+            cache = json.load(fh)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "imports": {}, "index": None, "runs_since_full": 0}
+
+
+def _save_cache(cache_dir: str, cache: dict) -> None:
+    ensure_cache_dir(cache_dir)
+    tmp = os.path.join(cache_dir, f".{CACHE_FILE}.{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh)
+    os.replace(tmp, os.path.join(cache_dir, CACHE_FILE))
+
+
+def _stat_key(repo: str, path: str) -> list[int] | None:
+    try:
+        st = os.stat(os.path.join(repo, path))
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _is_test_file(path: str) -> bool:
+    name = os.path.basename(path)
+    return any(fnmatch.fnmatchcase(name, g) for g in TEST_FILE_GLOBS)
+
+
+def _index_key(repo: str, py_files: list[str]) -> str:
+    digest = hashlib.sha256()
+    for path in py_files:
+        digest.update(path.encode("utf-8", "surrogateescape") + b"\0")
+        if _is_test_file(path) or os.path.basename(path) == "conftest.py":
+            digest.update(repr(_stat_key(repo, path)).encode())
+    for name in PYTEST_CONFIG_FILES:
+        digest.update(f"{name}={_stat_key(repo, name)}".encode())
+    return digest.hexdigest()
+
+
+def collect_test_files(repo: str, runner: list[str], timeout: float | None) -> dict[str, int]:
+    """{test file: collected test count} from ``pytest --collect-only -q``."""
+    proc = subprocess.run(
+        [*runner, "--collect-only", "-q"], cwd=repo,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout,
+    )
+    if proc.returncode not in (0, 5):  # 5 = no tests collected
+        raise RuntimeError(f"pytest --collect-only exited {proc.returncode}")
+    counts: dict[str, int] = {}
+    for line in proc.stdout.decode("utf-8", "replace").splitlines():
+        path, sep, _ = line.partition("::")
+        if sep and path.endswith(".py"):
+            path = os.path.normpath(path)
+            counts[path] = counts.get(path, 0) + 1
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+def _ignored(path: str) -> bool:
+    return any(fnmatch.fnmatchcase(path, g) for g in IGNORED_GLOBS)
+
+
+def select_tests(
+    repo: str,
+    changed: Iterable[str],
+    cache_dir: str,
+    runner: str = "python3 -m pytest",
+    full_every: int = 0,
+    force_full: str = "",
+    timeout: float | None = None,
+) -> Selection:
+    """Test files affected by ``changed`` (repo-relative paths), or the full suite."""
+    cache = _load_cache(cache_dir)
+    selection = _select(repo, sorted(set(changed)), cache, shlex.split(runner), full_every,
+                        force_full, timeout)
+    cache["runs_since_full"] = 0 if selection.mode == "full" else cache["runs_since_full"] + 1
+    try:
+        _save_cache(cache_dir, cache)
+    except OSError:
+        pass  # a read-only tree only loses the cache
+    return selection
+
+
+def _select(
+    repo: str,
+    changed: list[str],
+    cache: dict,
+    runner: list[str],
+    full_every: int,
+    force_full: str,
+    timeout: float | None,
+) -> Selection:
+    if force_full:
+        return Selection("full", force_full)
+    if full_every > 0 and cache["runs_since_full"] + 1 >= full_every:
+        return Selection("full", f"periodic full run (every {full_every} selections)")
+
+    py_files = python_files(repo)
+    py_set = set(py_files)
+    for path in changed:
+        if os.path.basename(path) in PYTEST_CONFIG_FILES and os.sep not in path:
+            return Selection("full", f"pytest configuration changed: {path}")
+        if path.endswith(".py"):
+            if path not in py_set:
+                return Selection("full", f"deleted or unindexed Python file: {path}")
+        elif not _ignored(path):
+            return Selection("full", f"non-Python file changed: {path}")
+
+    # Test-file index (cached pytest collection).
+    key = _index_key(repo, py_files)
+    index = cache.get("index")
+    if not index or index.get("key") != key:
+        try:
+            counts = collect_test_files(repo, runner, timeout)
+        except (OSError, RuntimeError, subprocess.TimeoutExpired) as exc:
+            return Selection("full", f"test collection failed: {exc}")
+        index = {"key": key, "files": counts}
+        cache["index"] = index
+    test_files: dict[str, int] = index["files"]
+
+    # Import graph, reversed: module file -> files importing it.
+    modules: dict[str, str] = {}
+    for path in py_files:
+        for name in module_names(path):
+            modules.setdefault(name, path)
+    old_imports = cache.get("imports", {})
+    new_imports: dict[str, dict] = {}
+    importers: dict[str, set[str]] = {}
+    for path in py_files:
+        stat = _stat_key(repo, path)
+        entry = old_imports.get(path)
+        if entry is None or entry["stat"] != stat:
+            try:
+                with open(os.path.join(repo, path), "rb") as fh:
+                    imports = parse_imports(fh.read(), path)
+            except (OSError, SyntaxError, ValueError):
+                if path in changed:
+                    return Selection("full", f"cannot parse changed file: {path}")
+                imports = []
+            entry = {"stat": stat, "imports": imports}
+        new_imports[path] = entry
+        for imp in entry["imports"]:
+            for target in _resolve(path, tuple(imp), modules):
+                if target != path:
+                    importers.setdefault(target, set()).add(path)
+    cache["imports"] = new_imports
+
+    affected: set[str] = set()
+    queue = [p for p in changed if p.endswith(".py")]
+    while queue:
+        path = queue.pop()
+        if path in affected:
+            continue
+        affected.add(path)
+        queue.extend(importers.get(path, ()))
+
+    selected = {p for p in affected if p in test_files}
+    # A conftest reached through the import graph (a helper it imports changed)
+    # affects its whole directory just like a changed conftest.
+    for path in affected:
+        if os.path.basename(path) == "conftest.py":
+            scope = os.path.dirname(path)
+            selected.update(t for t in test_files if not scope or t.startswith(scope + os.sep))
+    if len(selected) == len(test_files) and test_files:
+        return Selection("full", "change affects every test file", sorted(selected),
+                         len(test_files))
+    reason = f"{len(selected)} of {len(test_files)} test files affected"
+    return Selection("impact", reason, sorted(selected), len(test_files))
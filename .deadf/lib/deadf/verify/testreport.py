@@ -0,0 +1,205 @@
+"""Test-result ingestion: runner reports -> counts, failures, slowest tests.
+
+Sources, best first:
+
+- ``junit``: pytest ``--junitxml`` report, stream-parsed with iterparse
+  (testcase elements are cleared as they are read)
+- ``jest``: ``jest --json --outputFile`` report
+- ``tap``: TAP lines (``ok 1 - name`` / ``not ok 2 - name # SKIP``) in the log
+- ``text``: the last "N passed / N failed", "N passing / N failing" or
+  "Tests: ... N total" line in the log (what verify.sh used to grep for)
+
+The log is read line by line; nothing holds the whole runner output.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+MAX_FAILED_LISTED = 50
+
+RE_TAP = re.compile(r'^\s*(not )?ok\b(?:\s+\d+)?(?:\s*-)?\s*([^#]*?)\s*(?:#\s*(.*))?$')
+RE_TAP_DIRECTIVE = re.compile(r'(SKIP|TODO)\b', re.I)
+RE_TAP_PLAN = re.compile(r'^\s*1\.\.(\d+)')
+RE_TAP_TIME = re.compile(r'\btime=([\d.]+)ms')
+RE_PASSED = re.compile(r'(\d+) passed')
+RE_FAILED = re.compile(r'(\d+) failed')
+RE_PASSING = re.compile(r'(\d+) passing')
+RE_FAILING = re.compile(r'(\d+) failing')
+RE_JEST_TOTAL = re.compile(r'Tests:\s+.*?(\d+)\s+total')
+
+
+@dataclass
+class TestCase:
+    name: str
+    status: str  # passed | failed | error | skipped
+    duration_ms: float | None = None
+
+
+@dataclass
+class TestReport:
+    source: str
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration_ms: float = 0.0
+    slowest: list[TestCase] = field(default_factory=list)
+    failed_tests: list[str] = field(default_factory=list)
+    total_hint: int | None = None  # text source: a total without a pass/fail split
+
+    @property
+    def count(self) -> int:
+        if self.total_hint is not None:
+            return self.total_hint
+        return self.passed + self.failed
+
+    def summary(self, exit_code: int) -> str:
+        if self.source == "none":
+            return f"exit code {exit_code} (count unknown)"
+        if self.total_hint is not None:
+            return f"exit code {exit_code} ({self.total_hint} tests detected)"
+        return f"{self.passed} passed, {self.failed} failed"
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "passed": self.passed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "duration_ms": round(self.duration_ms),
+            "failed_tests": self.failed_tests,
+            "slowest": [
+                {"name": t.name, "status": t.status, "duration_ms": round(t.duration_ms or 0)}
+                for t in self.slowest
+            ],
+        }
+
+
+def aggregate(source: str, cases: Iterator[TestCase], slowest_n: int) -> TestReport:
+    """Fold per-test results into a report, keeping only the slowest N."""
+    report = TestReport(source)
+    heap: list[tuple[float, int, TestCase]] = []
+    for seq, case in enumerate(cases):
+        if case.status == "passed":
+            report.passed += 1
+        elif case.status == "skipped":
+            report.skipped += 1
+        else:
+            report.failed += 1
+            if len(report.failed_tests) < MAX_FAILED_LISTED:
+                report.failed_tests.append(case.name)
+        if case.duration_ms is not None:
+            report.duration_ms += case.duration_ms
+            if slowest_n > 0:
+                item = (case.duration_ms, -seq, case)
+                if len(heap) < slowest_n:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+    report.slowest = [c for _, _, c in sorted(heap, key=lambda i: i[:2], reverse=True)]
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+def junit_cases(path: str) -> Iterator[TestCase]:
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag != "testcase":
+            continue
+        classname = elem.get("classname", "")
+        name = f"{classname}::{elem.get('name', '')}" if classname else elem.get("name", "")
+        status = "passed"
+        for child in elem:
+            if child.tag in ("failure", "error"):
+                status = "failed" if child.tag == "failure" else "error"
+                break
+            if child.tag == "skipped":
+                status = "skipped"
+        try:
+            duration = float(elem.get("time", "")) * 1000
+        except ValueError:
+            duration = None
+        elem.clear()
+        yield TestCase(name, status, duration)
+
+
+def jest_cases(path: str) -> Iterator[TestCase]:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    for suite in data.get("testResults", []):
+        for result in suite.get("assertionResults", []):
+            status = result.get("status", "")
+            status = {"passed": "passed", "failed": "failed"}.get(status, "skipped")
+            duration = result.get("duration")
+            yield TestCase(
+                result.get("fullName") or result.get("title", ""),
+                status,
+                float(duration) if isinstance(duration, (int, float)) else None,
+            )
+
+
+def tap_cases(log_path: str) -> Iterator[TestCase]:
+    with open(log_path, encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            m = RE_TAP.match(line)
+            if not m:
+                continue
+            not_ok, name, comment = m.groups()
+            d = RE_TAP_DIRECTIVE.match(comment or "")
+            directive = d.group(1).upper() if d else None
+            if directive == "SKIP":
+                status = "skipped"
+            elif directive:  # TODO: expected failures do not fail the run
+                status = "skipped" if not_ok else "passed"
+            else:
+                status = "failed" if not_ok else "passed"
+            t = RE_TAP_TIME.search(comment or "")
+            yield TestCase(name, status, float(t.group(1)) if t else None)
+
+
+def _looks_like_tap(log_path: str) -> bool:
+    with open(log_path, encoding="utf-8", errors="replace") as fh:
+        return any(RE_TAP_PLAN.match(line) for line in fh)
+
+
+def text_report(log_path: str) -> TestReport:
+    """Counts from runner summary lines (last occurrence wins), as verify.sh grepped them."""
+    last: dict[re.Pattern[str], str] = {}
+    patterns = (RE_PASSED, RE_FAILED, RE_PASSING, RE_FAILING, RE_JEST_TOTAL)
+    with open(log_path, encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            for pattern in patterns:
+                matches = pattern.findall(line)
+                if matches:
+                    last[pattern] = matches[-1]
+    if RE_PASSED in last:
+        return TestReport("text", passed=int(last[RE_PASSED]), failed=int(last.get(RE_FAILED, 0)))
+    if RE_PASSING in last:
+        return TestReport("text", passed=int(last[RE_PASSING]),
+                          failed=int(last.get(RE_FAILING, 0)))
+    if RE_JEST_TOTAL in last:
+        return TestReport("text", total_hint=int(last[RE_JEST_TOTAL]))
+    return TestReport("none")
+
+
+def collect(kind: str, report_path: str | None, log_path: str, slowest_n: int = 5) -> TestReport:
+    """Best available report for a run: the structured ``kind`` report, then TAP, then text."""
+    if report_path and os.path.exists(report_path) and os.path.getsize(report_path) > 0:
+        try:
+            if kind == "junit":
+                return aggregate("junit", junit_cases(report_path), slowest_n)
+            if kind == "jest":
+                return aggregate("jest", jest_cases(report_path), slowest_n)
+        except (ET.ParseError, ValueError, OSError, AttributeError):
+            pass  # truncated/odd report (killed run): fall back to the log
+    if not os.path.exists(log_path):
+        return TestReport("none")
+    if _looks_like_tap(log_path):
+        return aggregate("tap", tap_cases(log_path), slowest_n)
+    return text_report(log_path)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""bench-tokenizer.py — Micro-benchmark for the sentinel list-item tokenizer.
+
+Times split_tokens/unescape_quoted on synthetic 1,000-item PLAN (FILES +
+ACCEPTANCE) and QA_REVIEW (FINDINGS + REMEDIATION) payloads, against the
+original character-by-character implementation, and checks both produce
+identical results.
+
+Usage: python3 bench/bench-tokenizer.py [--items 1000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".deadf", "lib"))
+
+from deadf.sentinel import core, get_config  # noqa: E402
+from deadf.sentinel.core import ESCAPES, ParseError  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Reference implementation (pre-regex tokenizer), kept for comparison
+# ---------------------------------------------------------------------------
+def legacy_unescape_quoted(
+    raw: str,
+    line: int | None = None,
+    escapes: dict[str, str] = ESCAPES,
+) -> str:
+    out: list[str] = []
+    i = 0
+    while i < len(raw):
+        ch = raw[i]
+        if ch == '"':
+            raise ParseError("unescaped quote inside quoted value", line)
+        if ch == '\\':
+            i += 1
+            if i >= len(raw):
+                raise ParseError("unterminated escape sequence", line)
+            esc = raw[i]
+            if esc not in escapes:
+                raise ParseError(f"invalid escape \\{esc}", line)
+            out.append(escapes[esc])
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def legacy_split_tokens(s: str, line: int | None = None) -> list[str]:
+    tokens: list[str] = []
+    i = 0
+    n = len(s)
+    while i < n:
+        while i < n and s[i] in (' ', '\t'):
+            i += 1
+        if i >= n:
+            break
+        start = i
+        while i < n and (s[i] not in (' ', '\t')):
+            if s[i] == '"':
+                i += 1
+                while i < n and s[i] != '"':
+                    if s[i] == '\\':
+                        i += 1
+                    i += 1
+                if i >= n:
+                    raise ParseError("unterminated quoted string in token", line)
+                i += 1
+            else:
+                i += 1
+        tokens.append(s[start:i])
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Synthetic payloads
+# ---------------------------------------------------------------------------
+def plan_payload(items: int) -> list[str]:
+    lines = ['TASK_ID=bench', 'TITLE="Tokenizer bench"', 'SUMMARY=', '  synthetic', 'FILES:']
+    half = items // 2
+    for i in range(half):
+        lines.append(
+            f'- path=src/pkg/module_{i}.py action=modify '
+            f'rationale="Update \\"handler\\" {i} for\\tthe new API"'
+        )
+    lines.append('ACCEPTANCE:')
+    for i in range(items - half):
+        lines.append(
+            f'- id=AC{i} text="tests/test_{i}.py passes with \\"strict\\" mode and no warnings"'
+        )
+    lines.append('ESTIMATED_DIFF=100')
+    return lines
+
+
+def qa_review_payload(items: int) -> list[str]:
+    half = items // 2
+    lines = ['VERDICT=FAIL', 'RISK=HIGH'] + [f'C{i}=PASS' for i in range(6)]
+    lines += [f'FINDINGS_COUNT={half}', 'FINDINGS:']
+    for i in range(half):
+        lines.append(
+            f'- severity=MAJOR category=C2 file="src/mod_{i}.py" '
+            f'issue="Handler {i} swallows \\"OSError\\" in the retry loop"'
+        )
+    lines += [f'REMEDIATION_COUNT={items - half}', 'REMEDIATION:']
+    for i in range(items - half):
+        lines.append(f'- file="src/mod_{i}.py" action="Re-raise after\\tlogging the error"')
+    lines.append('NOTES="synthetic"')
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Timing
+# ---------------------------------------------------------------------------
+def best_of(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def run_case(name: str, command: str, lines: list[str], items: int, repeat: int) -> bool:
+    # Skip the block-level validator (item-count limits); only item parsing is timed.
+    config = dataclasses.replace(get_config(command), validator=lambda _f, sections, _w: sections)
+
+    current = (core.split_tokens, core.unescape_quoted)
+    t_new, out_new = best_of(lambda: core.parse_payload(lines, config), repeat)
+    core.split_tokens, core.unescape_quoted = legacy_split_tokens, legacy_unescape_quoted
+    try:
+        t_old, out_old = best_of(lambda: core.parse_payload(lines, config), repeat)
+    finally:
+        core.split_tokens, core.unescape_quoted = current
+
+    same = out_new == out_old
+    print(
+        f"{name:<10} items={items:<6} legacy={t_old * 1000:8.2f} ms "
+        f"({items / t_old:10.0f} items/s)  regex={t_new * 1000:8.2f} ms "
+        f"({items / t_new:10.0f} items/s)  speedup={t_old / t_new:5.2f}x  "
+        f"{'identical' if same else 'MISMATCH'}"
+    )
+    return same
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the sentinel list-item tokenizer")
+    parser.add_argument("--items", type=int, default=1000, help="List items per payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    ok = run_case("plan", "plan", plan_payload(args.items), args.items, args.repeat)
+    ok &= run_case("qa-review", "qa-review", qa_review_payload(args.items), args.items, args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Synthetic sentinel transcripts for the parser benchmarks.
+
+Every block type registered in deadf.sentinel.BLOCK_TYPES has a generator
+that emits a grammar-valid block. The knobs:
+
+- items: list items (clamped to each grammar's maximum)
+- payload_chars: target payload size (clamped to MAX_BLOCK_CHARS)
+- escape_density: fraction of quoted-value characters written as escapes
+- noise_bytes: transcript text around the block, including near-miss
+  ``<<<`` lines that the scanner has to look at and reject
+
+Output is deterministic for a given seed. Run as a script to write
+transcripts to disk:
+
+    python3 bench/corpus.py --type plan --noise 1M --out /tmp/plan.txt
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from typing import Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".deadf", "lib"))
+
+from deadf.sentinel import BLOCK_TYPES  # noqa: E402
+from deadf.sentinel.core import MAX_BLOCK_CHARS  # noqa: E402
+
+NONCE = "4F2C9A"
+
+WORDS = (
+    "parser sentinel block nonce verify track spec plan task criteria module "
+    "handler retry budget cycle review finding remediation config state "
+    "the a of to and with for in on when after before returns raises"
+).split()
+
+ESCAPE_SEQS = ('\\"', "\\\\", "\\t")
+
+NOISE_DECOYS = (
+    "<<<<<<< HEAD",
+    ">>>>>>> feature/branch",
+    "<<<PLAN:V2:NONCE=4F2C9A>>>",
+    "<<<END_SOMETHING>>>",
+    "    <<<VERDICT:V1:AC1:NONCE=4F2C9A>>> (quoted in prose, indented)",
+    "<<< not a sentinel",
+)
+
+
+def parse_size(text: str) -> int:
+    """'64K' / '1M' / '50M' / '1024' -> bytes."""
+    text = text.strip().upper()
+    mult = 1
+    if text.endswith("K"):
+        mult, text = 1024, text[:-1]
+    elif text.endswith("M"):
+        mult, text = 1024 * 1024, text[:-1]
+    return int(float(text) * mult)
+
+
+# ---------------------------------------------------------------------------
+# Value helpers
+# ---------------------------------------------------------------------------
+def words(rng: random.Random, length: int) -> str:
+    """Plain words, exactly ``length`` chars (at least 1)."""
+    out: list[str] = []
+    size = 0
+    while size < length:
+        w = rng.choice(WORDS)
+        out.append(w)
+        size += len(w) + 1
+    return " ".join(out)[:max(1, length)].rstrip() or "x"
+
+
+def quoted(rng: random.Random, length: int, escape_density: float) -> str:
+    """A quoted value that decodes to ``length`` chars, with escapes mixed in."""
+    plain = words(rng, length)
+    if escape_density <= 0:
+        return f'"{plain}"'
+    out: list[str] = []
+    for ch in plain:
+        if rng.random() < escape_density:
+            out.append(rng.choice(ESCAPE_SEQS))
+        else:
+            out.append(ch)
+    return '"' + "".join(out) + '"'
+
+
+def multiline(rng: random.Random, length: int) -> list[str]:
+    body = words(rng, length)
+    return ["  " + body[i:i + 76].strip() for i in range(0, len(body), 76)]
+
+
+# ---------------------------------------------------------------------------
+# Per-type payload generators: (rng, items, text_len, escape_density) -> lines
+# ---------------------------------------------------------------------------
+def _plan(rng: random.Random, items: int, text_len: int, esc: float) -> list[str]:
+    files = max(1, min(50, items - items // 3))
+    acceptance = max(1, min(30, items - files))
+    lines = ["TASK_ID=bench_plan", f"TITLE={quoted(rng, 40, esc)}", "SUMMARY="]
+    lines += multiline(rng, 200)
+    lines.append("FILES:")
+    for i in range(files):
+        lines.append(
+            f"- path=src/pkg/module_{i}.py action=modify "
+            f"rationale={quoted(rng, min(text_len, 300), esc)}"
+        )
+    lines.append("ACCEPTANCE:")
+    for i in range(acceptance):
+        lines.append(f"- id=AC{i + 1} text={quoted(rng, min(text_len, 400), esc)}")
+    lines.append("ESTIMATED_DIFF=120")
+    return lines
+
+
+def _track(rng: random.Random, items: int, text_len: int, esc: float) -> list[str]:
+    reqs = ",".join(f"req_{i}" for i in range(max(1, min(30, items))))
+    return [
+        "TRACK_ID=bench_track",
+        f"NAME={quoted(rng, min(text_len, 200), esc)}",
+        "PHASE=build",
+        f"GOAL={quoted(rng, min(text_len, 500), esc)}",
+        f"REQUIREMENTS={reqs}",
+        "ESTIMATED_TASKS=5",
+        "PHASE_COMPLETE=false",
+        "PHASE_BLOCKED=true",
+        f"REASONS={quoted(rng, min(text_len, 500), esc)}",
+    ]
+
+
+def _spec(rng: random.Random, items: int, text_len: int, esc: float) -> list[str]:
+    success = max(1, min(30, items - items // 2))
+    deps = max(0, min(30, items - success))
+    lines = ["TRACK_ID=bench_track", f"TITLE={quoted(rng, 40, esc)}"]
+    for field in ("SCOPE", "APPROACH", "CONSTRAINTS"):
+        lines.append(f"{field}=")
+        lines += multiline(rng, 200)
+    lines.append("SUCCESS_CRITERIA:")
+    for i in range(success):
+        lines.append(f"- id=SC{i + 1} text={quoted(rng, min(text_len, 400), esc)}")
+    lines.append("DEPENDENCIES:")
+    for _ in range(deps):
+        lines.append(f"- {quoted(rng, min(text_len, 400), esc)}")
+    lines.append("ESTIMATED_TASKS=7")
+    return lines
+
+
+def _reflect(rng: random.Random, items: int, text_len: int, esc: float) -> list[str]:
+    docs = ("TECH_STACK", "PATTERNS", "PITFALLS", "RISKS", "PRODUCT", "WORKFLOW", "GLOSSARY")
+    lines = ["UPDATES:"]
+    for i in range(max(1, min(50, items))):
+        lines.append(
+            f"- doc={docs[i % len(docs)]} action=append section={quoted(rng, 20, esc)} "
+            f"content={quoted(rng, min(text_len, int(850 / (1 + esc))), esc)}"
+        )
+    lines.append("SCRATCH=")
+    lines += multiline(rng, 200)
+    return lines
+
+
+def _qa_review(rng: random.Random, items: int, text_len: int, esc: float) -> list[str]:
+    findings = max(0, min(200, items - items // 2))
+    remediation = max(0, min(200, items - findings))
+    lines = ["VERDICT=FAIL", "RISK=MEDIUM"] + [f"C{i}=PASS" for i in range(6)]
+    lines += [f"FINDINGS_COUNT={findings}", "FINDINGS:"]
+    for i in range(findings):
+        lines.append(
+            f"- severity=MAJOR category=C{i % 6} file=\"src/mod_{i}.py\" "
+            f"issue={quoted(rng, min(text_len, 400), esc)}"
+        )
+    lines += [f"REMEDIATION_COUNT={remediation}", "REMEDIATION:"]
+    for i in range(remediation):
+        lines.append(f"- file=\"src/mod_{i}.py\" action={quoted(rng, min(text_len, 200), esc)}")
+    lines.append(f"NOTES={quoted(rng, 60, esc)}")
+    return lines
+
+
+def _verdict(rng: random.Random, items: int, text_len: int, esc: float) -> list[str]:
+    return ["ANSWER=YES", f"REASON={quoted(rng, min(text_len, 480), esc)}"]
+
+
+GENERATORS: dict[str, Callable[[random.Random, int, int, float], list[str]]] = {
+    "plan": _plan,
+    "track": _track,
+    "spec": _spec,
+    "reflect": _reflect,
+    "qa-review": _qa_review,
+    "verdict": _verdict,
+}
+
+SENTINELS: dict[str, tuple[str, str]] = {
+    "plan": ("<<<PLAN:V1:NONCE={n}>>>", "<<<END_PLAN:NONCE={n}>>>"),
+    "track": ("<<<TRACK:V1:NONCE={n}>>>", "<<<END_TRACK:NONCE={n}>>>"),
+    "spec": ("<<<SPEC:V1:NONCE={n}>>>", "<<<END_SPEC:NONCE={n}>>>"),
+    "reflect": ("<<<REFLECT:V1:NONCE={n}>>>", "<<<END_REFLECT:NONCE={n}>>>"),
+    "qa-review": ("<<<QA_REVIEW:V1:NONCE={n}>>>", "<<<END_QA_REVIEW:NONCE={n}>>>"),
+    "verdict": ("<<<VERDICT:V1:{c}:NONCE={n}>>>", "<<<END_VERDICT:{c}:NONCE={n}>>>"),
+}
+
+assert set(GENERATORS) == set(BLOCK_TYPES), "corpus generators out of sync with BLOCK_TYPES"
+
+
+def payload_lines(
+    block_type: str,
+    items: int = 20,
+    payload_chars: int = 4000,
+    escape_density: float = 0.0,
+    seed: int = 0,
+) -> list[str]:
+    """Grammar-valid payload lines, as close to min(payload_chars, MAX_BLOCK_CHARS) as fits.
+
+    Per-item text length is binary-searched; if even the shortest items
+    overflow, the item count is reduced.
+    """
+    target = min(payload_chars, MAX_BLOCK_CHARS)
+    gen = GENERATORS[block_type]
+
+    def build(n_items: int, text_len: int) -> tuple[list[str], int]:
+        lines = gen(random.Random(seed), n_items, text_len, escape_density)
+        return lines, len("\n".join(lines))
+
+    while True:
+        best, size = build(items, 8)
+        if size <= target or items <= 1:
+            break
+        items = max(1, int(items * target / size * 0.95))
+    lo, hi = 9, 1000
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        lines, size = build(items, mid)
+        if size <= target:
+            best, lo = lines, mid + 1
+        else:
+            hi = mid - 1
+    return best
+
+
+def block(block_type: str, lines: list[str], nonce: str = NONCE, criterion: str = "AC1") -> str:
+    opener, closer = SENTINELS[block_type]
+    return "\n".join(
+        [opener.format(n=nonce, c=criterion), *lines, closer.format(n=nonce, c=criterion)]
+    )
+
+
+def noise(noise_bytes: int, seed: int = 0) -> str:
+    """Roughly ``noise_bytes`` of transcript-like text (never a valid sentinel)."""
+    if noise_bytes <= 0:
+        return ""
+    rng = random.Random(seed)
+    pool = [words(rng, rng.randint(20, 120)) for _ in range(512)]
+    pool += [f"  - step {i}: {words(rng, 40)}" for i in range(64)]
+    pool += list(NOISE_DECOYS)
+    avg = sum(len(p) + 1 for p in pool) / len(pool)
+    count = max(1, int(noise_bytes / avg))
+    return "\n".join(rng.choices(pool, k=count)) + "\n"
+
+
+def transcript(
+    block_type: str,
+    noise_bytes: int = 1024,
+    items: int = 20,
+    payload_chars: int = 4000,
+    escape_density: float = 0.0,
+    seed: int = 0,
+    criterion: str = "AC1",
+) -> str:
+    """Noise + block + noise, with the block about a third of the way in."""
+    text = block(block_type, payload_lines(block_type, items, payload_chars, escape_density, seed),
+                 criterion=criterion)
+    before = noise_bytes // 3
+    return noise(before, seed) + text + "\n" + noise(noise_bytes - before, seed + 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic sentinel transcript")
+    parser.add_argument("--type", required=True, choices=sorted(GENERATORS))
+    parser.add_argument("--noise", default="1K", help="Noise around the block (e.g. 1K, 1M, 50M)")
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--payload", type=int, default=4000, help="Target payload chars")
+    parser.add_argument("--escapes", type=float, default=0.0, help="Escape density (0-1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="-", help="Output file (default stdout)")
+    args = parser.parse_args()
+
+    text = transcript(args.type, parse_size(args.noise), args.items, args.payload,
+                      args.escapes, args.seed)
+    if args.out == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+
+if __name__ == "__main__":
+    main()
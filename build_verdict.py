@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Backward-compat wrapper — real script moved to .deadf/bin/build-verdict.py"""
+"""Backward-compat wrapper — the verdict parser lives in .deadf/lib/deadf/sentinel/verdict.py"""
 import os, sys
-real = os.path.join(os.path.dirname(__file__), '.deadf', 'bin', 'build-verdict.py')
-exec(open(real).read())
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '.deadf', 'lib'))
+from deadf.sentinel.cli import build_verdict_main
+from deadf.sentinel.core import ParseError
+from deadf.sentinel.verdict import build_verdict, parse_verdict
+
+if __name__ == "__main__":
+    build_verdict_main()
@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
 """extract_plan.py — Backward-compat wrapper for parse-blocks.py plan.
 
-Reads raw LLM output from stdin and delegates parsing to
-`.deadf/bin/parse-blocks.py plan`.
+Streams raw LLM output from stdin through the `deadf.sentinel` plan grammar
+in-process (no subprocess).
 """
 from __future__ import annotations
 
 import argparse
+import json
 import os
-import subprocess
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".deadf", "lib"))
+
+from deadf.sentinel import NonceMismatch, ParseError, extract_block_stream, get_config  # noqa: E402
+from deadf.sentinel.core import RE_NONCE  # noqa: E402
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -22,24 +27,25 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    script_path = os.path.join(
-        os.path.dirname(__file__), ".deadf", "bin", "parse-blocks.py"
-    )
-    cmd = [sys.executable, script_path, "plan", "--nonce", args.nonce]
-
-    raw_text = sys.stdin.read()
-    proc = subprocess.run(
-        cmd,
-        input=raw_text,
-        text=True,
-        capture_output=True,
-    )
-
-    if proc.stdout:
-        sys.stdout.write(proc.stdout)
-    if proc.stderr:
-        sys.stderr.write(proc.stderr)
-    sys.exit(proc.returncode)
+    if not RE_NONCE.match(args.nonce):
+        print(
+            f"error: invalid --nonce format '{args.nonce}' "
+            f"(must match ^[0-9A-F]{{6}}$)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    try:
+        result = extract_block_stream(sys.stdin, args.nonce, get_config("plan"))
+    except NonceMismatch as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(2)
+    except (ParseError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=None)
+    sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
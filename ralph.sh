@@ -14,6 +14,9 @@
 # Usage: ralph.sh <project_path> [mode]
 
 set -uo pipefail
+# The Python helpers import .deadf/lib; bytecode caches written there would
+# show up in the project's git status (verify.sh's git_clean check).
+export PYTHONDONTWRITEBYTECODE=1
 
 # ── Arguments ──────────────────────────────────────────────────────────────
 PROJECT_PATH="${1:?Usage: ralph.sh <project_path> [mode]}"
@@ -22,15 +25,22 @@ MODE="${2:-yolo}"
 # ── Configuration ──────────────────────────────────────────────────────────
 CYCLE_TIMEOUT="${RALPH_TIMEOUT:-600}"
 POLL_INTERVAL="${RALPH_POLL:-15}"
+WATCH_MODE="${RALPH_WATCH:-0}"
+WATCH_MAX_WAIT="${RALPH_WATCH_MAX_WAIT:-300}"
 LOG_DIR="$PROJECT_PATH/.deadf/logs"
 LOCK_FILE="$PROJECT_PATH/.deadf/ralph.lock"
 STATE_FILE="$PROJECT_PATH/.deadf/state/STATE.yaml"
-STATE_LOCK_FILE="${STATE_FILE}.flock"
 KICK_SCRIPT="$PROJECT_PATH/.deadf/bin/kick.sh"
+STATE_HELPER="$PROJECT_PATH/.deadf/bin/deadf-state.py"
+ADMISSION_HELPER="$PROJECT_PATH/.deadf/bin/deadf-admission.py"
 MAX_LOG_FILES="${RALPH_MAX_LOGS:-50}"
 ROTATE_LOGS="${RALPH_ROTATE_LOGS:-1}"
+ARCHIVE_MAX_MB="${RALPH_ARCHIVE_MAX_MB:-1024}"
+ARCHIVE_MAX_CYCLES="${RALPH_ARCHIVE_MAX_CYCLES:-0}"
+LOGS_HELPER="$PROJECT_PATH/.deadf/bin/deadf-logs.py"
 DISPATCH_TIMEOUT="${RALPH_DISPATCH_TIMEOUT:-$CYCLE_TIMEOUT}"
 STATE_LOCK_TIMEOUT=5
+STATE_READ_TIMEOUT=10
 STATE_UPDATE_RETRIES=3
 
 # ── Validate Numeric Config ────────────────────────────────────────────────
@@ -38,10 +48,15 @@ STATE_UPDATE_RETRIES=3
 [[ "$CYCLE_TIMEOUT" -ge 1 ]]        || { echo "[ralph] ERROR: RALPH_TIMEOUT must be ≥1, got: $CYCLE_TIMEOUT" >&2; exit 1; }
 [[ "$POLL_INTERVAL" =~ ^[0-9]+$ ]]  || { echo "[ralph] ERROR: RALPH_POLL must be a positive integer, got: $POLL_INTERVAL" >&2; exit 1; }
 [[ "$POLL_INTERVAL" -ge 1 ]]        || { echo "[ralph] ERROR: RALPH_POLL must be ≥1, got: $POLL_INTERVAL" >&2; exit 1; }
+[[ "$WATCH_MODE" == "0" || "$WATCH_MODE" == "1" ]] || { echo "[ralph] ERROR: RALPH_WATCH must be 0 or 1, got: $WATCH_MODE" >&2; exit 1; }
+[[ "$WATCH_MAX_WAIT" =~ ^[0-9]+$ ]] || { echo "[ralph] ERROR: RALPH_WATCH_MAX_WAIT must be a positive integer, got: $WATCH_MAX_WAIT" >&2; exit 1; }
+[[ "$WATCH_MAX_WAIT" -ge 1 ]]       || { echo "[ralph] ERROR: RALPH_WATCH_MAX_WAIT must be ≥1, got: $WATCH_MAX_WAIT" >&2; exit 1; }
 [[ "$MAX_LOG_FILES" =~ ^[0-9]+$ ]]    || { echo "[ralph] ERROR: RALPH_MAX_LOGS must be a positive integer, got: $MAX_LOG_FILES" >&2; exit 1; }
 [[ "$MAX_LOG_FILES" -ge 1 ]]           || { echo "[ralph] ERROR: RALPH_MAX_LOGS must be ≥1, got: $MAX_LOG_FILES" >&2; exit 1; }
 [[ "$ROTATE_LOGS" =~ ^[0-9]+$ ]]      || { echo "[ralph] ERROR: RALPH_ROTATE_LOGS must be 0 or 1, got: $ROTATE_LOGS" >&2; exit 1; }
 [[ "$ROTATE_LOGS" -eq 0 || "$ROTATE_LOGS" -eq 1 ]] || { echo "[ralph] ERROR: RALPH_ROTATE_LOGS must be 0 or 1, got: $ROTATE_LOGS" >&2; exit 1; }
+[[ "$ARCHIVE_MAX_MB" =~ ^[0-9]+$ ]]   || { echo "[ralph] ERROR: RALPH_ARCHIVE_MAX_MB must be a non-negative integer, got: $ARCHIVE_MAX_MB" >&2; exit 1; }
+[[ "$ARCHIVE_MAX_CYCLES" =~ ^[0-9]+$ ]] || { echo "[ralph] ERROR: RALPH_ARCHIVE_MAX_CYCLES must be a non-negative integer, got: $ARCHIVE_MAX_CYCLES" >&2; exit 1; }
 [[ "$DISPATCH_TIMEOUT" =~ ^[0-9]+$ ]] || { echo "[ralph] ERROR: RALPH_DISPATCH_TIMEOUT must be a positive integer, got: $DISPATCH_TIMEOUT" >&2; exit 1; }
 [[ "$DISPATCH_TIMEOUT" -ge 1 ]]        || { echo "[ralph] ERROR: RALPH_DISPATCH_TIMEOUT must be ≥1, got: $DISPATCH_TIMEOUT" >&2; exit 1; }
 
@@ -49,6 +64,7 @@ STATE_UPDATE_RETRIES=3
 [[ -d "$PROJECT_PATH" ]] || { echo "[ralph] ERROR: Project path does not exist: $PROJECT_PATH" >&2; exit 1; }
 [[ -f "$STATE_FILE" ]]   || { echo "[ralph] ERROR: STATE.yaml not found: $STATE_FILE" >&2; exit 1; }
 [[ -x "$KICK_SCRIPT" ]]  || { echo "[ralph] ERROR: kick.sh not found or not executable: $KICK_SCRIPT" >&2; exit 1; }
+[[ -f "$STATE_HELPER" ]] || { echo "[ralph] ERROR: deadf-state.py not found: $STATE_HELPER" >&2; exit 1; }
 
 mkdir -p "$LOG_DIR" || { echo "[ralph] ERROR: Cannot create log dir: $LOG_DIR" >&2; exit 1; }
 
@@ -58,10 +74,9 @@ if ! yq --version 2>/dev/null | grep -qE 'version v?4\.'; then
     echo "[ralph] ERROR: yq v4.x required (mikefarah/yq). Found: $(yq --version 2>/dev/null || echo 'unknown')" >&2
     exit 1
 fi
+command -v python3 &>/dev/null  || { echo "[ralph] ERROR: python3 required but not found" >&2; exit 1; }
 command -v pgrep &>/dev/null    || { echo "[ralph] ERROR: pgrep required but not found" >&2; exit 1; }
-command -v stat &>/dev/null     || { echo "[ralph] ERROR: stat required but not found" >&2; exit 1; }
 command -v flock &>/dev/null    || { echo "[ralph] ERROR: flock required but not found" >&2; exit 1; }
-command -v mktemp &>/dev/null   || { echo "[ralph] ERROR: mktemp required but not found" >&2; exit 1; }
 
 if command -v timeout &>/dev/null; then
     TIMEOUT_CMD="timeout"
@@ -73,28 +88,10 @@ else
     exit 1
 fi
 
-STAT_STYLE=""
-if stat -c '%a' "$STATE_FILE" >/dev/null 2>&1; then
-    STAT_STYLE="gnu"
-elif stat -f '%Lp' "$STATE_FILE" >/dev/null 2>&1; then
-    STAT_STYLE="bsd"
-else
-    echo "[ralph] ERROR: stat does not support -c '%a' (GNU) or -f '%Lp' (BSD). Cannot preserve permissions safely." >&2
-    exit 1
-fi
-
 # ── Logging ────────────────────────────────────────────────────────────────
 log() { echo "[ralph] $(date -u -Iseconds) $*"; }
 log_err() { echo "[ralph] $(date -u -Iseconds) ERROR: $*" >&2; }
 
-stat_perms() {
-    case "$STAT_STYLE" in
-        gnu) stat -c '%a' "$1" ;;
-        bsd) stat -f '%Lp' "$1" ;;
-        *) return 1 ;;
-    esac
-}
-
 # ── Lock Management ───────────────────────────────────────────────────────
 # Lockfile held by flock for the lifetime of this process.
 
@@ -189,70 +186,92 @@ trap cleanup INT TERM HUP QUIT
 trap on_exit EXIT
 
 # ── STATE.yaml Helpers ─────────────────────────────────────────────────────
-read_field() {
-    yq -r ".$1 // \"unknown\"" "$STATE_FILE" 2>/dev/null || echo "unknown"
+# All fields ralph reads come from one deadf-state.py parse per poll. The
+# helper runs as a coprocess that keeps the parse until STATE.yaml is
+# replaced; if it dies or stops answering, each read becomes one `get` call.
+STATE_FIELDS=(
+    "STATE_PHASE=phase//unknown"
+    "STATE_CYCLE_STATUS=cycle.status//unknown"
+    "STATE_ITERATION=loop.iteration//unknown"
+    "STATE_MAX_ITER=loop.max_iterations//unknown"
+)
+STATE_PHASE="unknown"
+STATE_CYCLE_STATUS="unknown"
+STATE_ITERATION="unknown"
+STATE_MAX_ITER="unknown"
+
+start_state_server() {
+    local -a watch_args=()
+    [[ "$WATCH_MODE" -eq 1 ]] && watch_args=(--watch "$LOG_DIR")
+    coproc STATE_SERVER { exec python3 "$STATE_HELPER" serve --file "$STATE_FILE" "${watch_args[@]}" 2>/dev/null; }
 }
 
-get_iteration()    { read_field "loop.iteration"; }
-get_phase()        { read_field "phase"; }
-get_cycle_status() { read_field "cycle.status"; }
-get_max_iter()     { read_field "loop.max_iterations"; }
+stop_state_server() {
+    if [[ -n "${STATE_SERVER_PID:-}" ]]; then
+        kill "$STATE_SERVER_PID" 2>/dev/null || true
+        wait "$STATE_SERVER_PID" 2>/dev/null || true
+        STATE_SERVER_PID=""
+        log "State helper stopped; falling back to one read per poll"
+    fi
+}
 
-# Ralph may ONLY set these specific values:
-# Uses atomic temp+rename + shared flock to avoid race conditions with orchestrator writes.
-update_state_field() {
-    local field="$1"
-    local value="$2"
-    local attempt
-    local tmp
-    if ! { [[ "$field" == "phase" && "$value" == "needs_human" ]] \
-        || [[ "$field" == "cycle.status" && "$value" == "timed_out" ]]; }; then
-        log_err "Refusing unauthorized state write: ${field}=${value}"
-        return 1
+# Sets STATE_PHASE, STATE_CYCLE_STATUS, STATE_ITERATION, STATE_MAX_ITER.
+# Returns 1 if STATE.yaml cannot be read or parsed.
+read_state() {
+    local reply="" rc=""
+    if [[ -n "${STATE_SERVER_PID:-}" && -n "${STATE_SERVER[1]:-}" && -n "${STATE_SERVER[0]:-}" ]]; then
+        local request
+        request=$(IFS=$'\t'; printf '%s' "${STATE_FIELDS[*]}")
+        if printf '%s\n' "$request" >&"${STATE_SERVER[1]}" 2>/dev/null \
+            && IFS= read -r -d '' -t "$STATE_READ_TIMEOUT" -u "${STATE_SERVER[0]}" reply; then
+            rc=${reply%%$'\n'*}
+            reply=${reply#*$'\n'}
+        else
+            reply=""
+            stop_state_server
+        fi
+    fi
+    if [[ -z "$rc" ]]; then
+        reply=$(python3 "$STATE_HELPER" get --file "$STATE_FILE" "${STATE_FIELDS[@]}" 2>/dev/null)
+        rc=$?
     fi
+    [[ "$rc" == "0" ]] || return 1
+    eval "$reply"
+}
+
+# Ralph may ONLY set these specific values:
+# All fields of one update go to deadf-state.py as a single batch, journaled
+# under the shared STATE.yaml.flock (readers through deadf-state.py see it at once).
+update_state_fields() {
+    local assignment attempt
+    for assignment in "$@"; do
+        if ! [[ "$assignment" == "phase=needs_human" || "$assignment" == "cycle.status=timed_out" ]]; then
+            log_err "Refusing unauthorized state write: ${assignment}"
+            return 1
+        fi
+    done
     for ((attempt=1; attempt<=STATE_UPDATE_RETRIES; attempt++)); do
-        tmp=$(mktemp "${STATE_FILE}.ralph.tmp.XXXXXX") || {
-            log_err "FAILED to create temp file for STATE.yaml update (attempt ${attempt}/${STATE_UPDATE_RETRIES})"
-            sleep 0.2
-            continue
-        }
-        if (
-            flock -w "$STATE_LOCK_TIMEOUT" 9 || {
-                log_err "Cannot acquire lock on STATE.yaml (attempt ${attempt}/${STATE_UPDATE_RETRIES})"
-                exit 10
-            }
-            local orig_perms
-            orig_perms=$(stat_perms "$STATE_FILE" 2>/dev/null) || orig_perms=""
-            if ! yq --arg value "$value" ".${field} = \$value" "$STATE_FILE" > "$tmp" 2>/dev/null; then
-                log_err "FAILED to write ${field}=${value} to STATE.yaml (attempt ${attempt}/${STATE_UPDATE_RETRIES})"
-                rm -f "$tmp"
-                exit 11
-            fi
-            if ! mv -f "$tmp" "$STATE_FILE"; then
-                log_err "FAILED to mv tmp file for ${field}=${value} (attempt ${attempt}/${STATE_UPDATE_RETRIES})"
-                rm -f "$tmp"
-                exit 12
-            fi
-            [[ -n "$orig_perms" ]] && chmod "$orig_perms" "$STATE_FILE" 2>/dev/null || true
-        ) 9>"$STATE_LOCK_FILE"; then
+        if python3 "$STATE_HELPER" set --file "$STATE_FILE" \
+            --lock-timeout "$STATE_LOCK_TIMEOUT" "$@" >/dev/null; then
             return 0
         fi
-        rm -f "$tmp"
+        log_err "FAILED to write $* to STATE.yaml (attempt ${attempt}/${STATE_UPDATE_RETRIES})"
         sleep 0.2
     done
     return 1
 }
 
 set_phase_needs_human() {
-    if ! update_state_field "phase" "needs_human"; then
+    if ! update_state_fields "phase=needs_human"; then
         log_err "FAILED to update phase=needs_human after ${STATE_UPDATE_RETRIES} attempts"
         return 1
     fi
 }
 
-set_cycle_timed_out() {
-    if ! update_state_field "cycle.status" "timed_out"; then
-        log_err "FAILED to update cycle.status=timed_out after ${STATE_UPDATE_RETRIES} attempts"
+# Timeout escalation: both fields in one batch, so no reader sees one without the other.
+set_timed_out_needs_human() {
+    if ! update_state_fields "cycle.status=timed_out" "phase=needs_human"; then
+        log_err "FAILED to update cycle.status=timed_out, phase=needs_human after ${STATE_UPDATE_RETRIES} attempts"
         return 1
     fi
 }
@@ -270,18 +289,42 @@ require_state_update() {
     fi
 }
 
+# ── Waiting ────────────────────────────────────────────────────────────────
+# Poll mode sleeps POLL_INTERVAL. Watch mode (RALPH_WATCH=1) asks the state
+# helper to block until STATE.yaml is replaced or a cycle log is written
+# (inotify), capped at RALPH_WATCH_MAX_WAIT and at the given limit; without
+# the helper it falls back to sleeping.
+wait_for_state() {
+    local limit="$1"
+    local wait_s="$POLL_INTERVAL"
+    if [[ "$WATCH_MODE" -eq 1 ]]; then
+        wait_s="$WATCH_MAX_WAIT"
+        [[ "$limit" -lt "$wait_s" ]] && wait_s="$limit"
+        [[ "$wait_s" -lt 1 ]] && wait_s=1
+        if [[ -n "${STATE_SERVER_PID:-}" && -n "${STATE_SERVER[1]:-}" && -n "${STATE_SERVER[0]:-}" ]]; then
+            local reply
+            if printf '!wait\t%s\n' "$wait_s" >&"${STATE_SERVER[1]}" 2>/dev/null \
+                && IFS= read -r -d '' -t "$((wait_s + STATE_READ_TIMEOUT))" -u "${STATE_SERVER[0]}" reply; then
+                return 0
+            fi
+            stop_state_server
+        fi
+        [[ "$POLL_INTERVAL" -lt "$wait_s" ]] && wait_s="$POLL_INTERVAL"
+    fi
+    sleep "$wait_s"
+}
+
 # ── State Validation ───────────────────────────────────────────────────────
+# Re-reads STATE.yaml; callers use the STATE_* values it leaves behind.
 validate_state() {
-    if ! yq '.' "$STATE_FILE" > /dev/null 2>&1; then
+    if ! read_state; then
         log_err "STATE.yaml is unparseable"
         set_phase_needs_human 2>/dev/null || true
         release_lock
         exit 1
     fi
-    local phase
-    local cycle_status
-    phase=$(read_field "phase")
-    cycle_status=$(read_field "cycle.status")
+    local phase="$STATE_PHASE"
+    local cycle_status="$STATE_CYCLE_STATUS"
     case "$phase" in
         research|select-track|execute|complete|needs_human) ;;
         *) log_err "STATE.yaml has invalid phase or cycle.status (phase=$phase, cycle.status=$cycle_status)"
@@ -300,38 +343,53 @@ validate_state() {
     esac
 }
 
+# ── Admission ──────────────────────────────────────────────────────────────
+# kick.sh exits 15 when admission control refuses a cycle (iteration cap, or
+# the time budget cannot fit one) and 16 when it defers one (dispatch rate
+# limit). For a deferral, ask how long until a dispatch slot frees up.
+admission_retry_after() {
+    local out ADMISSION_RETRY_AFTER_S=""
+    out=$(python3 "$ADMISSION_HELPER" --deadf-dir "$PROJECT_PATH/.deadf" check 2>/dev/null) || true
+    eval "$(grep '^ADMISSION_RETRY_AFTER_S=' <<< "$out")"
+    local wait_s="$ADMISSION_RETRY_AFTER_S"
+    [[ "$wait_s" =~ ^[0-9]+$ && "$wait_s" -ge 1 ]] || wait_s="$POLL_INTERVAL"
+    [[ "$wait_s" -gt 300 ]] && wait_s=300
+    printf '%s' "$wait_s"
+}
+
 # ── Log Rotation ───────────────────────────────────────────────────────────
-# Keep the most recent $MAX_LOG_FILES log files, delete older ones.
+# Keep the most recent $MAX_LOG_FILES logs as plain files; older ones move into
+# the compressed, indexed archive (.deadf/logs/archive/, see deadf-logs.py),
+# capped at RALPH_ARCHIVE_MAX_MB / RALPH_ARCHIVE_MAX_CYCLES (0 = no cap).
+# The archiver skips its directory scan when nothing changed since its last run.
 rotate_logs() {
     if [[ "$ROTATE_LOGS" == "0" ]]; then
         return 0
     fi
 
-    local log_count
-    log_count=$(find "$LOG_DIR" -maxdepth 1 -name 'cycle-*.log' -type f 2>/dev/null | wc -l)
-
-    if [[ "$log_count" -gt "$MAX_LOG_FILES" ]]; then
-        local to_remove=$(( log_count - MAX_LOG_FILES ))
-        log "Rotating logs: removing $to_remove oldest files (keeping $MAX_LOG_FILES)"
-        # POSIX-compatible: use ls -t (newest first), tail to get oldest, remove via while-read
-        # shellcheck disable=SC2012
-        ls -t "$LOG_DIR"/cycle-*.log 2>/dev/null \
-            | tail -n "$to_remove" \
-            | while IFS= read -r _logfile; do rm -f "$_logfile"; done
+    local summary
+    if ! summary=$(python3 "$LOGS_HELPER" --deadf-dir "$PROJECT_PATH/.deadf" archive \
+        --keep "$MAX_LOG_FILES" --max-mb "$ARCHIVE_MAX_MB" --max-cycles "$ARCHIVE_MAX_CYCLES"); then
+        log_err "Log archiving failed; logs left in place"
+        return 0
     fi
+    [[ -z "$summary" ]] || log "Rotating logs: $summary"
 }
 
 # ── Main Loop ──────────────────────────────────────────────────────────────
 acquire_lock
-log "Starting — project=$PROJECT_PATH mode=$MODE timeout=${CYCLE_TIMEOUT}s poll=${POLL_INTERVAL}s"
+log "Starting — project=$PROJECT_PATH mode=$MODE timeout=${CYCLE_TIMEOUT}s poll=${POLL_INTERVAL}s watch=${WATCH_MODE}"
+
+start_state_server
 
 # Read max iterations (with fallback)
-MAX_ITERATIONS=$(get_max_iter)
+read_state || true
+MAX_ITERATIONS="$STATE_MAX_ITER"
 [[ "$MAX_ITERATIONS" == "unknown" || "$MAX_ITERATIONS" == "null" ]] && MAX_ITERATIONS=200
 [[ "$MAX_ITERATIONS" =~ ^[0-9]+$ ]] || MAX_ITERATIONS=200
 log "Max iterations: $MAX_ITERATIONS"
 
-RUNNING_WAITED=0
+RUNNING_SINCE=""
 DISPATCH_FAILURES=0
 
 while true; do
@@ -341,8 +399,8 @@ while true; do
     # Validate state is parseable each iteration
     validate_state
 
-    PHASE=$(get_phase)
-    ITERATION=$(get_iteration)
+    PHASE="$STATE_PHASE"
+    ITERATION="$STATE_ITERATION"
 
     # ── Terminal conditions ──────────────────────────────────────────────
     if [[ "$PHASE" == "complete" ]]; then
@@ -364,20 +422,20 @@ while true; do
     fi
 
     # ── Wait if cycle already running (with timeout) ───────────────────
-    if [[ "$(get_cycle_status)" == "running" ]]; then
-        sleep "$POLL_INTERVAL"
-        RUNNING_WAITED=$((RUNNING_WAITED + POLL_INTERVAL))
+    if [[ "$STATE_CYCLE_STATUS" == "running" ]]; then
+        [[ -n "$RUNNING_SINCE" ]] || RUNNING_SINCE=$SECONDS
+        wait_for_state $(( CYCLE_TIMEOUT - (SECONDS - RUNNING_SINCE) ))
+        RUNNING_WAITED=$((SECONDS - RUNNING_SINCE))
         log "Cycle already running. Waited ${RUNNING_WAITED}/${CYCLE_TIMEOUT}s"
         if [[ "$RUNNING_WAITED" -ge "$CYCLE_TIMEOUT" ]]; then
             log "Existing cycle timed out after ${CYCLE_TIMEOUT}s in running state"
-            require_state_update "cycle.status=timed_out" set_cycle_timed_out
-            require_state_update "phase=needs_human" set_phase_needs_human
+            require_state_update "cycle.status=timed_out,phase=needs_human" set_timed_out_needs_human
             release_lock
             exit 1
         fi
         continue
     fi
-    RUNNING_WAITED=0
+    RUNNING_SINCE=""
 
     # ── P12 init (research phase) ───────────────────────────────────────
     if [[ "$PHASE" == "research" && ! -f "$PROJECT_PATH/.deadf/seed/P2_DONE" ]]; then
@@ -406,6 +464,17 @@ while true; do
 
     "$TIMEOUT_CMD" "$DISPATCH_TIMEOUT" "$KICK_SCRIPT"
     dispatch_rc=$?
+    if [[ "$dispatch_rc" -eq 15 ]]; then
+        log "Admission refused: no cycle fits the remaining budget (iteration=$local_iter). Stopping."
+        release_lock
+        exit 1
+    fi
+    if [[ "$dispatch_rc" -eq 16 ]]; then
+        retry_after=$(admission_retry_after)
+        log "Admission deferred: dispatch rate limit reached. Retrying in ${retry_after}s"
+        sleep "$retry_after"
+        continue
+    fi
     if [[ "$dispatch_rc" -ne 0 ]]; then
         log_err "Failed to kick cycle (exit code: $dispatch_rc)"
         DISPATCH_FAILURES=$((DISPATCH_FAILURES + 1))
@@ -424,10 +493,11 @@ while true; do
 
     # ── Wait for cycle completion ────────────────────────────────────────
     WAITED=0
+    WAIT_START=$SECONDS
     SAW_RUNNING=0
     while true; do
-        sleep "$POLL_INTERVAL"
-        WAITED=$((WAITED + POLL_INTERVAL))
+        wait_for_state $(( CYCLE_TIMEOUT - WAITED ))
+        WAITED=$((SECONDS - WAIT_START))
 
         # Check for shutdown during wait
         [[ "$SHUTTING_DOWN" -eq 1 ]] && break
@@ -435,8 +505,8 @@ while true; do
         # Re-validate state each poll
         validate_state
 
-        CS=$(get_cycle_status)
-        PH=$(get_phase)
+        CS="$STATE_CYCLE_STATUS"
+        PH="$STATE_PHASE"
 
         if [[ "$CS" == "running" ]]; then
             SAW_RUNNING=1
@@ -461,8 +531,7 @@ while true; do
         # Timeout enforcement
         if [[ "$WAITED" -ge "$CYCLE_TIMEOUT" ]]; then
             log "Cycle timeout after ${CYCLE_TIMEOUT}s"
-            require_state_update "cycle.status=timed_out" set_cycle_timed_out
-            require_state_update "phase=needs_human" set_phase_needs_human
+            require_state_update "cycle.status=timed_out,phase=needs_human" set_timed_out_needs_human
             release_lock
             exit 1
         fi
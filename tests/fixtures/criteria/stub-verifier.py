@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Offline stand-in for the verifier CLI (`claude --print`).
+
+Reads a rendered verify-criterion.md prompt on stdin and answers with a
+verdict block for its criterion. Directives in the criterion text choose the
+behavior: [stub:no] answers NO, [stub:garbage] prints no block,
+[stub:exit=N] exits N, [stub:sleep=S] sleeps S seconds first. Anything else
+answers YES.
+"""
+import re
+import sys
+import time
+
+prompt = sys.stdin.read()
+criterion, text = re.search(r'^CRITERION\n(AC[0-9]+): "(.*)"$', prompt, re.M).groups()
+nonce = re.search(rf"<<<VERDICT:V1:{criterion}:NONCE=([0-9A-F]{{6}})>>>", prompt).group(1)
+
+m = re.search(r"\[stub:sleep=([0-9.]+)\]", text)
+if m:
+    time.sleep(float(m.group(1)))
+m = re.search(r"\[stub:exit=([0-9]+)\]", text)
+if m:
+    print("stub failure", file=sys.stderr)
+    sys.exit(int(m.group(1)))
+if "[stub:garbage]" in text:
+    print("I think it looks fine.")
+    sys.exit(0)
+
+answer = "NO" if "[stub:no]" in text else "YES"
+print(f"<<<VERDICT:V1:{criterion}:NONCE={nonce}>>>")
+print(f"ANSWER={answer}")
+print(f'REASON="stub verdict for {criterion}"')
+print(f"<<<END_VERDICT:{criterion}:NONCE={nonce}>>>")
@@ -0,0 +1,159 @@
+#!/usr/bin/env bash
+# deadf-admission.py against scratch .deadf directories with synthetic
+# cycles.jsonl histories: the prediction (quantile, history window, the
+# MIN_SAMPLES fallback to the cycle timeout), every refuse/defer/admit path
+# with its exit code (15/16 are what ralph.sh and cron-kick.sh branch on),
+# retry_after_s, what admit records, and the flock'd check-then-record.
+set -u
+set -o pipefail
+
+helper="$PWD/.deadf/bin/deadf-admission.py"
+passed=0
+failed=0
+total=0
+tmpdir=$(mktemp -d)
+trap 'rm -rf "$tmpdir"' EXIT
+deadf="$tmpdir/p/.deadf"
+
+POLICY=$'escalation:\n  cycle_timeout_s: 600\n  max_hours: 24\n  max_iterations: 200
+admission:\n  max_dispatches_per_hour: 3\n  history_cycles: 5\n  estimate_quantile: 0.9'
+
+# setup STARTED_AGO_S MAX_HOURS [ITERATION] [EVENT:AGO_S[:WALL_S]]... — write
+# STATE.yaml (budget started STARTED_AGO_S ago, or null for "-") and POLICY.yaml,
+# and replace cycles.jsonl with the given records
+setup() {
+  python3 - "$deadf" "$POLICY" "$@" <<'PY'
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+deadf, policy, started_ago, max_hours = sys.argv[1:5]
+iteration = sys.argv[5] if len(sys.argv) > 5 else "1"
+specs = sys.argv[6:]
+now = time.time()
+os.makedirs(os.path.join(deadf, "state"), exist_ok=True)
+os.makedirs(os.path.join(deadf, "metrics"), exist_ok=True)
+started = "null" if started_ago == "-" else '"' + datetime.fromtimestamp(
+    now - float(started_ago), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") + '"'
+with open(os.path.join(deadf, "state", "STATE.yaml"), "w", encoding="utf-8") as fh:
+    fh.write(f"phase: execute\nloop:\n  iteration: {iteration}\n  max_iterations: 5\n"
+             f"budget:\n  started_at: {started}\n  max_hours: {max_hours}\n"
+             "track:\n  id: auth\ntask:\n  id: T3\n  retry_count: 1\n")
+with open(os.path.join(deadf, "state", "POLICY.yaml"), "w", encoding="utf-8") as fh:
+    fh.write(policy + "\n")
+with open(os.path.join(deadf, "metrics", "cycles.jsonl"), "w", encoding="utf-8") as fh:
+    for n, spec in enumerate(specs):
+        event, ago, *wall = spec.split(":")
+        record = {"ts": now - float(ago), "event": event, "cycle_id": f"h{n}"}
+        if wall:
+            record.update(wall_s=float(wall[0]), exit_code=0)
+        fh.write(json.dumps(record) + "\n")
+PY
+}
+
+# check NAME EXPECTED_RC PYTHON-EXPR — run after `rc`/`out` are set; EXPR sees
+# `doc` (out parsed as JSON, or None), `records` (cycles.jsonl) and `out`
+check() {
+  local name=$1 want_rc=$2 expr=$3
+  local ok
+  ok=$(OUT="$out" python3 - "$deadf" "$expr" <<'PY' 2>/dev/null
+import json
+import os
+import sys
+
+deadf, expr = sys.argv[1], sys.argv[2]
+out = os.environ["OUT"]
+try:
+    doc = json.loads(out)
+except ValueError:
+    doc = None
+with open(os.path.join(deadf, "metrics", "cycles.jsonl"), encoding="utf-8") as fh:
+    records = [json.loads(line) for line in fh]
+print("yes" if eval(f"({expr})") else "no")
+PY
+)
+  if [[ $rc -eq $want_rc && "$ok" == "yes" ]]; then
+    echo "PASS $name"
+    ((passed++))
+  else
+    echo "FAIL $name (exit $rc, want $want_rc)"
+    printf '%s\n' "$out" | head -20
+    ((failed++))
+  fi
+  ((total++))
+}
+
+admission() { python3 "$helper" --deadf-dir "$deadf" "$@"; }
+
+# Fewer than MIN_SAMPLES (3) cycles: the prediction is the 600s timeout, which
+# does not fit the 360s left of a 1.1h budget started an hour ago.
+setup 3600 1.1 1 cycle:900:100 cycle:500:120
+out=$(admission check --format json 2>&1)
+rc=$?
+check "admission-min-samples-refuse" 15 "doc['action'] == 'refuse' and doc['reason'] == 'budget_insufficient'
+and doc['predicted_s'] == 600.0 and doc['samples'] == 2 and 355 < doc['remaining_s'] <= 360"
+
+# Three cycles are enough: the 0.9 quantile of the last five (nearest rank)
+# is the prediction, and the older 900s cycle is outside the window.
+setup 3600 1.1 1 cycle:3000:900 cycle:2500:100 cycle:2000:150 cycle:1500:300 cycle:1000:200 cycle:500:250
+out=$(admission check --format json 2>&1)
+rc=$?
+check "admission-predicted-admit" 0 "doc['action'] == 'admit' and doc['reason'] == 'ok'
+and doc['predicted_s'] == 300.0 and doc['samples'] == 5 and len(records) == 6"
+
+setup 3600 1.1 1 cycle:2000:100 cycle:1500:400 cycle:1000:200
+out=$(admission check 2>&1)
+rc=$?
+check "admission-budget-insufficient" 15 "'ADMISSION_ACTION=refuse' in out.splitlines()
+and 'ADMISSION_REASON=budget_insufficient' in out.splitlines() and 'ADMISSION_PREDICTED_S=400.0' in out.splitlines()"
+
+setup 7200 1 1
+out=$(admission check --format json 2>&1)
+rc=$?
+check "admission-budget-exhausted" 15 "doc['reason'] == 'budget_exhausted' and doc['remaining_s'] < 0"
+
+setup - 1 5
+out=$(admission check --format json 2>&1)
+rc=$?
+check "admission-max-iterations" 15 "doc['reason'] == 'max_iterations' and doc['remaining_s'] is None"
+
+# Rate limit: three dispatches in the last hour (one older does not count).
+# The slot frees when the one from 3000s ago ages out, in 600s.
+setup - 24 1 dispatch:4000 dispatch:3000 dispatch:1200 dispatch:600
+out=$(admission check --format json 2>&1)
+rc=$?
+check "admission-rate-limited" 16 "doc['action'] == 'defer' and doc['reason'] == 'rate_limited'
+and 598 <= doc['retry_after_s'] <= 600 and len(records) == 4"
+
+# admit records the deferral; a dispatch that ages out lets the next one in,
+# recorded with the state's track, task and retry count.
+out=$(admission admit --cycle-id c-deferred --format json 2>&1)
+rc=$?
+check "admission-admit-records-defer" 16 "records[-1]['event'] == 'defer' and records[-1]['reason'] == 'rate_limited'
+and records[-1]['cycle_id'] == 'c-deferred' and len(records) == 5"
+
+setup - 24 1 dispatch:4000 dispatch:3700 dispatch:1200 dispatch:600
+out=$(admission admit --cycle-id c-ok 2>&1)
+rc=$?
+check "admission-admit-records-dispatch" 0 "'ADMISSION_ACTION=admit' in out.splitlines()
+and {k: records[-1].get(k) for k in ('event', 'cycle_id', 'track', 'task', 'retry')}
+== {'event': 'dispatch', 'cycle_id': 'c-ok', 'track': 'auth', 'task': 'T3', 'retry': 1}
+and 'reason' not in records[-1] and records[-1]['predicted_s'] == 600.0"
+
+# Check-then-record under flock: eight concurrent kicks, three slots free.
+setup - 24 1
+for n in 1 2 3 4 5 6 7 8; do
+  ( admission admit --cycle-id "race-$n" --format json >/dev/null 2>&1; echo $? > "$tmpdir/rc-$n" ) &
+done
+wait
+out=$(cat "$tmpdir"/rc-* | sort | uniq -c | awk '{print $2 ":" $1}' | paste -sd' ')
+rc=0
+check "admission-concurrent-admits" 0 "out == '0:3 16:5'
+and sum(r['event'] == 'dispatch' for r in records) == 3 and sum(r['event'] == 'defer' for r in records) == 5"
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
@@ -0,0 +1,157 @@
+#!/usr/bin/env bash
+# init-collect: the .gitignore matcher against `git check-ignore` and
+# `git ls-files` on a scratch tree (comments, negation, anchored, `**`,
+# dir-only, character classes, nested ignore files, .git/info/exclude), and
+# init-collect.py --no-gitignore against init-collect.sh's find fallback.
+set -u
+set -o pipefail
+
+lib="$PWD/.deadf/lib"
+bin="$PWD/.deadf/bin"
+passed=0
+failed=0
+total=0
+tmpdir=$(mktemp -d)
+trap 'rm -rf "$tmpdir"' EXIT
+
+# mktree ROOT PATH... — create each PATH (a trailing / makes a directory)
+mktree() {
+  local root=$1; shift
+  local p
+  for p in "$@"; do
+    if [[ "$p" == */ ]]; then
+      mkdir -p "$root/$p"
+    else
+      mkdir -p "$(dirname "$root/$p")"
+      printf '%s\n' "$p" > "$root/$p"
+    fi
+  done
+}
+
+report() {
+  local name=$1 ok=$2
+  if [[ "$ok" == "yes" ]]; then
+    echo "PASS $name"
+    ((passed++))
+  else
+    echo "FAIL $name"
+    printf '%s\n' "$out" | head -20
+    ((failed++))
+  fi
+  ((total++))
+}
+
+# The ignore fixture: a git repository whose untracked files are the tree.
+repo="$tmpdir/ignore"
+git init -q "$repo"
+cat > "$repo/.gitignore" <<'EOF'
+# comments and blank lines are skipped
+
+*.log
+!keep.log
+/build/
+docs/**/*.tmp
+**/cache/
+out
+logs/
+src/*.gen.py
+tmp[0-9].txt
+tmp[!0-9]x.txt
+\#hash
+a/**/z.txt
+EOF
+mkdir -p "$repo/src"
+cat > "$repo/src/.gitignore" <<'EOF'
+local.txt
+!*.log
+/anchored.txt
+deep/
+EOF
+printf 'secret.env\n' >> "$repo/.git/info/exclude"
+mktree "$repo" a.log keep.log sub/keep.log build/x.txt sub/build/x.txt \
+  docs/a.tmp docs/x/y/b.tmp docs/c.md cache/z deep/cache/z deep/cachefile out src/out/f.py \
+  src/main.py src/a.gen.py src/deep/b.gen.py src/x/deep/c.py src/local.txt src/x/local.txt \
+  src/x.log src/anchored.txt src/x/anchored.txt tmp1.txt tmpa.txt tmpax.txt tmp1x.txt '#hash' \
+  a/logs b/logs/f.txt a/z.txt a/b/c/z.txt secret.env sub/secret.env README.md empty/
+
+# Walk the way the collector does (ignored directories are not entered) and
+# print "<ignored 0|1> <path>" for every path visited.
+python3 - "$lib" "$repo" > "$tmpdir/ours" <<'PY'
+import os
+import sys
+
+sys.path.insert(0, sys.argv[1])
+from deadf.initcollect.gitignore import IgnoreMatcher
+
+root = sys.argv[2]
+matcher = IgnoreMatcher(root)
+stack = [""]
+while stack:
+    rel_dir = stack.pop()
+    matcher.enter(rel_dir)
+    for entry in sorted(os.scandir(os.path.join(root, rel_dir)), key=lambda e: e.name):
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        if rel == ".git":
+            continue
+        ignored = matcher.ignored(rel, entry.is_dir())
+        print(int(ignored), rel)
+        if entry.is_dir() and not ignored:
+            stack.append(rel)
+PY
+
+# Every visited path: our verdict equals git check-ignore's.
+git -C "$repo" check-ignore --stdin < <(cut -d' ' -f2- "$tmpdir/ours") | sort > "$tmpdir/git-ignored"
+out=$(diff <(awk '$1 == 1 { sub(/^1 /, ""); print }' "$tmpdir/ours" | sort) "$tmpdir/git-ignored")
+report "gitignore-check-ignore" "$([[ -z "$out" && $(wc -l < "$tmpdir/git-ignored") -ge 15 ]] && echo yes || echo no)"
+
+# The files we keep are exactly the untracked, not-ignored files git lists.
+git -C "$repo" ls-files --others --exclude-standard | sort > "$tmpdir/git-kept"
+python3 - "$tmpdir/ours" "$repo" <<'PY' | sort > "$tmpdir/ours-kept"
+import os
+import sys
+
+root = sys.argv[2]
+with open(sys.argv[1], encoding="utf-8") as fh:
+    for line in fh:
+        flag, rel = line.rstrip("\n").split(" ", 1)
+        if flag == "0" and os.path.isfile(os.path.join(root, rel)):
+            print(rel)
+PY
+out=$(diff "$tmpdir/ours-kept" "$tmpdir/git-kept")
+report "gitignore-ls-files" "$([[ -z "$out" ]] && grep -qx 'src/x.log' "$tmpdir/git-kept" && echo yes || echo no)"
+
+# --no-gitignore reproduces the find fallback byte for byte. Both sort in
+# byte order here; the fallback's `sort` follows the locale otherwise.
+proj="$tmpdir/collect"
+mktree "$proj" package.json 'my dir/requirements.txt' a/b/c/go.mod a/b/c/d/Cargo.toml \
+  tsconfig.json tsconfig.build.json .eslintrc.cjs src/vite.config.ts setup.cfg \
+  README.md docs/ARCHITECTURE.md docs/readme.md .github/workflows/ci.yml \
+  .github/workflows/nested/deep/release.yaml .gitlab-ci.yml .circleci/config.yml \
+  src/main.py src/index.ts app.rb node_modules/pkg/package.json build/main.js \
+  vendor/go.mod .deadf/state/README.md ignored/main.go .gitignore
+printf 'ignored/\n*.cfg\n' > "$proj/.gitignore"
+seq 1 300 | sed 's/^/line /' > "$proj/README.md"
+cp -r "$proj" "$tmpdir/collect-py"
+LC_ALL=C DEADF_COLLECT_PY=0 bash "$bin/init-collect.sh" --project "$proj" >/dev/null 2>&1
+rc_sh=$?
+python3 "$bin/init-collect.py" --project "$tmpdir/collect-py" --no-gitignore >/dev/null 2>&1
+rc_py=$?
+out=$(diff -r "$proj/.deadf/p12/evidence" "$tmpdir/collect-py/.deadf/p12/evidence" 2>&1)
+report "collect-no-gitignore-matches-find" "$([[ $rc_sh -eq 0 && $rc_py -eq 0 && -z "$out" \
+  && -f "$proj/.deadf/p12/evidence/entry-ignored_main.go.txt" \
+  && $(ls "$proj/.deadf/p12/evidence" | wc -l) -ge 15 ]] && echo yes || echo no)"
+
+# Without --no-gitignore the ignored paths drop out of the evidence.
+rm -rf "$tmpdir/collect-py/.deadf/p12"
+python3 "$bin/init-collect.py" --project "$tmpdir/collect-py" >/dev/null 2>&1
+rc=$?
+out=$(diff -r "$proj/.deadf/p12/evidence" "$tmpdir/collect-py/.deadf/p12/evidence" 2>&1)
+report "collect-gitignore-drops-ignored" "$([[ $rc -eq 0 ]] \
+  && [[ "$(printf '%s\n' "$out" | grep -c '^Only in')" -eq 2 ]] \
+  && grep -q 'entry-ignored_main.go.txt' <<< "$out" && grep -q 'config-setup.cfg.txt' <<< "$out" \
+  && ! grep -q '^ignored' "$tmpdir/collect-py/.deadf/p12/evidence/tree.txt" && echo yes || echo no)"
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
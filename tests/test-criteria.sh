@@ -0,0 +1,102 @@
+#!/usr/bin/env bash
+# verify-criteria.py against the offline stub verifier: concurrency, the
+# --jobs cap, per-criterion timeouts, NEEDS_HUMAN / --fail-fast short-circuits
+# and agreement with build-verdict.py on the collected responses.
+set -u
+set -o pipefail
+
+driver=".deadf/bin/verify-criteria.py"
+stub="python3 tests/fixtures/criteria/stub-verifier.py"
+nonce="4F2C9A"
+passed=0
+failed=0
+total=0
+tmpdir=$(mktemp -d)
+trap 'rm -rf "$tmpdir"' EXIT
+
+# plan_file NAME TEXT... — a parse-blocks.py plan output with criteria AC1..ACn
+plan_file() {
+  local name=$1
+  shift
+  python3 - "$tmpdir/$name.json" "$@" <<'PY'
+import json
+import sys
+
+acceptance = [{"id": f"AC{i}", "text": text} for i, text in enumerate(sys.argv[2:], start=1)]
+plan = {"task_id": "stub_task", "title": "Stub task", "summary": "Offline driver test.",
+        "files": [{"path": "src/app.py", "action": "modify", "rationale": "stub"}],
+        "acceptance": acceptance, "estimated_diff": 10, "notes": None, "warnings": []}
+with open(sys.argv[1], "w", encoding="utf-8") as fh:
+    json.dump(plan, fh)
+PY
+  echo "$tmpdir/$name.json"
+}
+
+# check NAME PYTHON-EXPR — run after `out` holds the driver's JSON; EXPR sees `doc`
+check() {
+  local name=$1 expr=$2
+  local ok
+  ok=$(printf '%s' "$out" | python3 -c "
+import json, sys
+doc = json.load(sys.stdin)
+print('yes' if ($expr) else 'no')
+" 2>/dev/null)
+  if [[ $rc -eq 0 && "$ok" == "yes" ]]; then
+    echo "PASS $name"
+    ((passed++))
+  else
+    echo "FAIL $name (exit $rc)"
+    printf '%s\n' "$out" | head -40
+    ((failed++))
+  fi
+  ((total++))
+}
+
+plan=$(plan_file pass "Adds the parser [stub:sleep=1]" "Wires the CLI [stub:sleep=1]" \
+  "Updates docs [stub:sleep=1]" "Handles errors [stub:sleep=1]")
+out=$(python3 "$driver" --plan "$plan" --nonce "$nonce" --cli "$stub" --jobs 4 \
+  --save-responses "$tmpdir/pairs.json")
+rc=$?
+bv=$(python3 .deadf/bin/build-verdict.py --nonce "$nonce" --criteria AC1,AC2,AC3,AC4 < "$tmpdir/pairs.json")
+check "criteria-concurrent-pass" "doc['verdict'] == 'PASS' and doc['passed'] == 4 and doc['elapsed_s'] < 2.5
+and all(doc[k] == v for k, v in json.loads('''$bv''').items())"
+
+plan=$(plan_file cap "One [stub:sleep=0.5]" "Two [stub:sleep=0.5]" "Three [stub:sleep=0.5]")
+out=$(python3 "$driver" --plan "$plan" --nonce "$nonce" --cli "$stub" --jobs 1)
+rc=$?
+check "criteria-jobs-cap" "doc['verdict'] == 'PASS' and doc['elapsed_s'] >= 1.5"
+
+plan=$(plan_file human "Answers garbage [stub:garbage]" "Slow [stub:sleep=10]" "Slower [stub:sleep=10]")
+out=$(python3 "$driver" --plan "$plan" --nonce "$nonce" --cli "$stub")
+rc=$?
+check "criteria-needs-human-short-circuit" "doc['verdict'] == 'NEEDS_HUMAN' and doc['decided_by'] == 'AC1'
+and doc['skipped'] == ['AC2', 'AC3'] and doc['criteria']['AC2']['answer'] == 'SKIPPED'
+and doc['missing'] == [] and doc['elapsed_s'] < 5"
+
+plan=$(plan_file failfast "Rejected [stub:no]" "Slow [stub:sleep=10]")
+out=$(python3 "$driver" --plan "$plan" --nonce "$nonce" --cli "$stub" --fail-fast)
+rc=$?
+check "criteria-fail-fast" "doc['verdict'] == 'FAIL' and doc['failed'] == 1 and doc['skipped'] == ['AC2']
+and doc['elapsed_s'] < 5"
+
+plan=$(plan_file nofailfast "Rejected [stub:no]" "Later [stub:sleep=0.5]")
+out=$(python3 "$driver" --plan "$plan" --nonce "$nonce" --cli "$stub")
+rc=$?
+check "criteria-no-waits-without-fail-fast" "doc['verdict'] == 'FAIL' and doc['passed'] == 1
+and doc['skipped'] == [] and doc['decided_by'] is None"
+
+plan=$(plan_file timeout "Hangs [stub:sleep=5]" "Crashes [stub:exit=3] [stub:sleep=2]")
+out=$(python3 "$driver" --plan "$plan" --nonce "$nonce" --cli "$stub" --timeout 0.5 --criteria AC1)
+rc=$?
+check "criteria-timeout" "doc['verdict'] == 'NEEDS_HUMAN' and doc['missing'] == ['AC1'] and doc['total'] == 1
+and 'timed out' in doc['criteria']['AC1']['reason'] and doc['elapsed_s'] < 2"
+
+out=$(python3 "$driver" --plan "$plan" --nonce "$nonce" --cli "$stub" --criteria AC2)
+rc=$?
+check "criteria-cli-exit" "doc['verdict'] == 'NEEDS_HUMAN' and doc['missing'] == ['AC2']
+and doc['criteria']['AC2']['reason'].startswith('verifier CLI exited 3')"
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
@@ -0,0 +1,196 @@
+#!/usr/bin/env bash
+# Conformance: configs compiled from the contracts' grammar tables must parse
+# exactly like the hand-written grammar modules — same result, or the same
+# error class and message — on every fixture and on line-level mutations of it.
+set -u
+set -o pipefail
+
+fixtures_dir="tests/fixtures/sentinels"
+lib_dir=".deadf/lib"
+# Exercise POLICY.yaml's acceptance_lint rules along with the built-in ones.
+export DEADF_POLICY="POLICY.yaml"
+passed=0
+failed=0
+total=0
+
+for fixture in "$fixtures_dir"/*.txt; do
+  [ -e "$fixture" ] || continue
+  base=$(basename "$fixture")
+  out=$(python3 - "$lib_dir" "$fixture" <<'PY' 2>&1
+import re
+import sys
+
+sys.path.insert(0, sys.argv[1])
+from deadf.sentinel import BLOCK_TYPES, _factory, extract_block
+from deadf.sentinel.grammar import load_table, table_config
+
+path = sys.argv[2]
+name = path.rsplit("/", 1)[-1]
+command = next(c for c in sorted(BLOCK_TYPES, key=len, reverse=True) if name.startswith(c + "-"))
+text = open(path, encoding="utf-8").read()
+nonce = re.search(r"NONCE=([0-9A-F]{6})", text).group(1)
+criterion = None
+if command == "verdict":
+    criterion = re.search(r"<<<VERDICT:V1:([A-Za-z0-9_:-]+):NONCE=", text).group(1)
+    hand = _factory(command)(criterion)
+else:
+    hand = _factory(command)()
+table = load_table(command, use_cache=False)
+if table is None:
+    sys.exit(f"{command}: contract has no grammar table")
+compiled = table_config(table, criterion)
+
+
+def outcome(config, raw):
+    try:
+        return ("ok", extract_block(raw, nonce, config))
+    except Exception as exc:  # noqa: BLE001 - the exception itself is compared
+        return (type(exc).__name__, str(exc))
+
+
+def variants(raw):
+    yield raw
+    lines = raw.split("\n")
+    body = [i for i, line in enumerate(lines) if line and not line.startswith("<<<")]
+    for i in body:
+        line = lines[i]
+        yield "\n".join(lines[:i] + lines[i + 1:])
+        yield "\n".join(lines[:i + 1] + [line] + lines[i + 1:])
+        key, sep, value = line.partition("=")
+        if sep and not line.startswith(("- ", "  ")):
+            for repl in ("", '""', "x" * 4100, '"' + "y" * 4100 + '"', "0", "-3", "true", "a,,b",
+                         '"two\\nlines"', value.strip('"'), f'"{value}"', "AC1", "PASS"):
+                yield "\n".join(lines[:i] + [f"{key}={repl}"] + lines[i + 1:])
+        if line.startswith("- "):
+            for old, new in (("path=", "path=../x "), ("id=", "id=BAD"), ("text=", "text=\"\" t="),
+                             ('text="', 'text="Improve it, better, REFACTOR etc. as needed '),
+                             ('"', '"' + "z" * 1300), ("=", "=/abs ")):
+                yield "\n".join(lines[:i] + [line.replace(old, new, 1)] + lines[i + 1:])
+            yield "\n".join(lines[:i + 1] + [line] * 60 + lines[i + 1:])
+            yield "\n".join(lines[:i] + [line + ' extra="1"'] + lines[i + 1:])
+
+
+cases = mismatches = 0
+for raw in variants(text):
+    cases += 1
+    a, b = outcome(hand, raw), outcome(compiled, raw)
+    if a != b:
+        mismatches += 1
+        if mismatches <= 3:
+            print(f"  case {cases}: hand={a!r}\n           table={b!r}")
+print(f"{cases} cases")
+sys.exit(1 if mismatches else 0)
+PY
+)
+  rc=$?
+  if [[ $rc -eq 0 ]]; then
+    echo "PASS $base (${out##*$'\n'})"
+    ((passed++))
+  else
+    echo "FAIL $base"
+    echo "$out"
+    ((failed++))
+  fi
+  ((total++))
+done
+
+# The cached artifact is keyed by the contract's hash: an edited contract is
+# recompiled and a current entry loads without compiling.
+out=$(python3 - "$lib_dir" <<'PY' 2>&1
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, sys.argv[1])
+from deadf.sentinel import grammar
+
+tmp = tempfile.mkdtemp()
+try:
+    shutil.copy(grammar.contract_path("verdict"), tmp)
+    grammar.CONTRACTS_DIR = tmp
+    grammar.CACHE_DIR = os.path.join(tmp, "cache")
+    first = grammar.load_table("verdict")
+    assert os.path.exists(os.path.join(grammar.CACHE_DIR, "verdict.v1.json")), "no cache written"
+    compile_spec, calls = grammar.compile_spec, []
+    grammar.compile_spec = lambda spec: calls.append(1) or compile_spec(spec)
+    assert grammar.load_table("verdict") == first and not calls, "cache entry not used"
+    with open(grammar.contract_path("verdict"), encoding="utf-8") as fh:
+        text = fh.read()
+    with open(grammar.contract_path("verdict"), "w", encoding="utf-8") as fh:
+        fh.write(text.replace('"max": 500', '"max": 400'))
+    edited = grammar.load_table("verdict")
+    assert calls and edited != first, "edited contract not recompiled"
+finally:
+    shutil.rmtree(tmp)
+PY
+)
+if [[ $? -eq 0 ]]; then
+  echo "PASS grammar-cache"
+  ((passed++))
+else
+  echo "FAIL grammar-cache"
+  echo "$out"
+  ((failed++))
+fi
+((total++))
+
+# The newest contract version defines the block: a plan.v2.md with a V2 grammar
+# table moves the parser to <<<PLAN:V2:...>>>, and a table whose version does
+# not match its file name is rejected.
+out=$(python3 - "$lib_dir" "$fixtures_dir/plan-valid.txt" <<'PY' 2>&1
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, sys.argv[1])
+from deadf.sentinel import grammar
+from deadf.sentinel.core import ParseError, extract_block
+
+with open(sys.argv[2], encoding="utf-8") as fh:
+    v1_block = fh.read()
+tmp = tempfile.mkdtemp()
+try:
+    shutil.copy(grammar.contract_path("plan"), tmp)
+    grammar.CONTRACTS_DIR = tmp
+    grammar.CACHE_DIR = os.path.join(tmp, "cache")
+    assert grammar.current_table("plan")["version"] == 1
+    with open(grammar.contract_path("plan"), encoding="utf-8") as fh:
+        text = fh.read()
+    with open(grammar.contract_path("plan", 2), "w", encoding="utf-8") as fh:
+        fh.write(text.replace('"version": 1', '"version": 2'))
+    assert grammar.contract_versions("plan") == [2, 1], grammar.contract_versions("plan")
+    config = grammar.table_config(grammar.current_table("plan"))
+    result = extract_block(v1_block.replace("<<<PLAN:V1:", "<<<PLAN:V2:"), "4F2C9A", config)
+    assert result["acceptance"], "V2 block not parsed"
+    try:
+        extract_block(v1_block, "4F2C9A", config)
+        raise AssertionError("V1 block accepted by the V2 table")
+    except ParseError:
+        pass
+    with open(grammar.contract_path("plan", 3), "w", encoding="utf-8") as fh:
+        fh.write(text)
+    try:
+        grammar.current_table("plan")
+        raise AssertionError("plan.v3.md with a version 1 table accepted")
+    except grammar.GrammarError as exc:
+        assert "declares version 1" in str(exc), exc
+finally:
+    shutil.rmtree(tmp)
+PY
+)
+if [[ $? -eq 0 ]]; then
+  echo "PASS grammar-contract-version"
+  ((passed++))
+else
+  echo "FAIL grammar-contract-version"
+  echo "$out"
+  ((failed++))
+fi
+((total++))
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
@@ -0,0 +1,179 @@
+#!/usr/bin/env bash
+# deadf-logs.py archive/list/show against scratch .deadf/logs directories:
+# archiving all but the newest logs, listing, extracting one cycle, segment
+# rollover, retention dropping whole segments by bytes and by count, and the
+# two crash leftovers (an indexed log still on disk, unindexed segment bytes).
+set -u
+set -o pipefail
+
+helper="$PWD/.deadf/bin/deadf-logs.py"
+passed=0
+failed=0
+total=0
+tmpdir=$(mktemp -d)
+trap 'rm -rf "$tmpdir"' EXIT
+
+# mklogs DEADF_DIR KIND NAME... — write .deadf/logs/cycle-NAME.log, each one
+# minute newer than the previous; KIND text ends in an exit token, KIND random
+# is 600 KiB of incompressible bytes. Originals are kept in $tmpdir/orig.
+mklogs() {
+  python3 - "$@" <<'PY'
+import os
+import sys
+import time
+
+deadf, kind, names = sys.argv[1], sys.argv[2], sys.argv[3:]
+logs = os.path.join(deadf, "logs")
+orig = os.path.join(os.path.dirname(os.path.dirname(deadf)), "orig")
+os.makedirs(logs, exist_ok=True)
+os.makedirs(orig, exist_ok=True)
+base = time.time() - 3600
+existing = [e.stat().st_mtime for e in os.scandir(logs) if e.name.endswith(".log")]
+if existing:
+    base = max(existing)
+for i, name in enumerate(names, start=1):
+    if kind == "text":
+        token = ("CYCLE_OK", "CYCLE_FAIL", "DONE")[i % 3]
+        data = "".join(f"{name} line {n}\n" for n in range(200)).encode() + f"{token}\n".encode()
+    else:
+        data = os.urandom(600 * 1024)
+    for path in (os.path.join(logs, f"cycle-{name}.log"), os.path.join(orig, name)):
+        with open(path, "wb") as fh:
+            fh.write(data)
+    os.utime(os.path.join(logs, f"cycle-{name}.log"), (base + 60 * i, base + 60 * i))
+PY
+}
+
+# check NAME EXPECTED_RC PYTHON-EXPR — run after `rc`/`out` are set; EXPR sees
+# `index` (index.jsonl entries), `segments` (segment file names), `plain`
+# (cycle ids still in .deadf/logs), `orig(ID)` (original bytes) and `out`
+check() {
+  local name=$1 want_rc=$2 expr=$3
+  local ok
+  ok=$(OUT="$out" python3 - "$deadf" "$expr" <<'PY' 2>/dev/null
+import json
+import os
+import sys
+
+deadf, expr = sys.argv[1], sys.argv[2]
+logs = os.path.join(deadf, "logs")
+archive = os.path.join(logs, "archive")
+index = []
+if os.path.exists(os.path.join(archive, "index.jsonl")):
+    with open(os.path.join(archive, "index.jsonl"), encoding="utf-8") as fh:
+        index = [json.loads(line) for line in fh]
+segments = sorted(n for n in os.listdir(archive) if n.startswith("segment-")) \
+    if os.path.isdir(archive) else []
+plain = sorted(n[len("cycle-"):-len(".log")] for n in os.listdir(logs)
+               if n.startswith("cycle-") and n.endswith(".log"))
+out = os.environ["OUT"]
+
+
+def orig(cycle_id):
+    with open(os.path.join(os.path.dirname(os.path.dirname(deadf)), "orig", cycle_id), "rb") as fh:
+        return fh.read()
+
+
+print("yes" if eval(f"({expr})") else "no")
+PY
+)
+  if [[ $rc -eq $want_rc && "$ok" == "yes" ]]; then
+    echo "PASS $name"
+    ((passed++))
+  else
+    echo "FAIL $name (exit $rc, want $want_rc)"
+    printf '%s\n' "$out" | head -20
+    ((failed++))
+  fi
+  ((total++))
+}
+
+logs() { python3 "$helper" --deadf-dir "$deadf" "$@"; }
+
+# Archive all but the newest two: oldest first, one index line each.
+deadf="$tmpdir/basic/p/.deadf"
+mklogs "$deadf" text c1 c2 c3 c4 c5 c6
+out=$(logs archive --keep 2 2>&1)
+rc=$?
+check "logs-archive" 0 "out.startswith('archived 4 log(s)') and plain == ['c5', 'c6']
+and [e['cycle_id'] for e in index] == ['c1', 'c2', 'c3', 'c4'] and len(segments) == 1
+and [e['exit_token'] for e in index] == ['CYCLE_FAIL', 'DONE', 'CYCLE_OK', 'CYCLE_FAIL']
+and all(e['size'] == len(orig(e['cycle_id'])) and e['name'] == f\"cycle-{e['cycle_id']}.log\" for e in index)"
+
+out=$(logs archive --keep 2 2>&1)
+rc=$?
+check "logs-archive-unchanged" 0 "out == '' and len(index) == 4"
+
+out=$(logs list --last 2 2>&1)
+rc=$?
+check "logs-list" 0 "[line.split('\t')[:2] for line in out.splitlines()] == [['c3', 'CYCLE_OK'], ['c4', 'CYCLE_FAIL']]
+and all(line.split('\t')[5] == segments[0] for line in out.splitlines())"
+
+# show decompresses one archived frame, or reads a log that is still plain.
+logs show c2 > "$tmpdir/show-c2"
+rc=$?
+out=$(cat "$tmpdir/show-c2"; echo x)
+check "logs-show-archived" 0 "out[:-1].encode() == orig('c2')"
+logs show c6 > "$tmpdir/show-c6"
+rc=$?
+out=$(cat "$tmpdir/show-c6"; echo x)
+check "logs-show-plain" 0 "out[:-1].encode() == orig('c6')"
+out=$(logs show nope 2>&1)
+rc=$?
+check "logs-show-missing" 1 "'no log for nope' in out"
+
+# Crash after the index was written but before the plain log was removed: the
+# next run removes the log without indexing it twice.
+cp "$tmpdir/basic/orig/c3" "$deadf/logs/cycle-c3.log"
+touch -d '-2 hours' "$deadf/logs/cycle-c3.log"
+mklogs "$deadf" text c7
+out=$(logs archive --keep 2 2>&1)
+rc=$?
+check "logs-recover-indexed-plain" 0 "out.startswith('archived 1 log(s)') and plain == ['c6', 'c7']
+and [e['cycle_id'] for e in index] == ['c1', 'c2', 'c3', 'c4', 'c5']"
+
+# Crash after a frame was written but before its index line: the stray bytes
+# stay at the segment's end, new frames go after them and every cycle still reads back.
+seg="$deadf/logs/archive/$(ls "$deadf/logs/archive" | grep '^segment-' | tail -n1)"
+seg_size=$(stat -c %s "$seg")
+head -c 777 /dev/urandom >> "$seg"
+mklogs "$deadf" text c8
+out=$(logs archive --keep 2 2>&1)
+rc=$?
+check "logs-recover-unindexed-bytes" 0 "out.startswith('archived 1 log(s)')
+and index[-1]['cycle_id'] == 'c6' and index[-1]['start'] == $seg_size + 777"
+ok=yes
+for id in c1 c4 c6; do
+  logs show "$id" | cmp -s - "$tmpdir/basic/orig/$id" || ok=no
+done
+out=$ok
+rc=0
+check "logs-show-after-recovery" 0 "out == 'yes'"
+
+# Rollover: 600 KiB incompressible logs with 1 MiB segments, two per segment.
+deadf="$tmpdir/retain/p/.deadf"
+mklogs "$deadf" random r1 r2 r3 r4 r5
+out=$(logs archive --keep 0 --segment-mb 1 2>&1)
+rc=$?
+check "logs-segment-rollover" 0 "len(index) == 5 and plain == [] and len(segments) == 3
+and [e['segment'] for e in index] == [segments[0]] * 2 + [segments[1]] * 2 + [segments[2]]"
+
+# Byte retention drops whole segments, oldest first, until under the cap.
+out=$(logs archive --keep 0 --max-mb 2 2>&1)
+rc=$?
+check "logs-retention-bytes" 0 "'dropped 1 segment(s), 2 cycle(s)' in out
+and [e['cycle_id'] for e in index] == ['r3', 'r4', 'r5'] and len(segments) == 2"
+
+# Count retention never drops the segment being written.
+out=$(logs archive --keep 0 --max-mb 0 --max-cycles 1 2>&1)
+rc=$?
+check "logs-retention-count" 0 "'dropped 1 segment(s), 2 cycle(s)' in out
+and [e['cycle_id'] for e in index] == ['r5'] and len(segments) == 1 and segments[0] == index[0]['segment']"
+out=$(logs show r1 2>&1)
+rc=$?
+check "logs-show-dropped" 1 "'no log for r1' in out"
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
@@ -129,6 +129,98 @@ PY
   ((total++))
 done
 
+# verdict-batch: every verdict fixture in one invocation, results in input order
+batch_out=$(python3 - "$fixtures_dir" <<'PY' | python3 .deadf/bin/parse-blocks.py verdict-batch --nonce 4F2C9A
+import json
+import pathlib
+import sys
+
+fixtures = pathlib.Path(sys.argv[1])
+pairs = [
+    ["AC1", (fixtures / "verdict-valid.txt").read_text(encoding="utf-8")],
+    ["AC2", (fixtures / "verdict-invalid.txt").read_text(encoding="utf-8")],
+]
+print(json.dumps(pairs))
+PY
+)
+rc=$?
+batch_ok=$(printf '%s' "$batch_out" | python3 -c '
+import json, sys
+doc = json.load(sys.stdin)
+codes = [r["exit"] for r in doc["results"]]
+ids = [r["criterion_id"] for r in doc["results"]]
+print("yes" if ids == ["AC1", "AC2"] and codes[0] == 0 and codes[1] != 0 else "no")
+' 2>/dev/null)
+if [[ $rc -eq 1 && "$batch_ok" == "yes" ]]; then
+  echo "PASS verdict-batch"
+  ((passed++))
+else
+  echo "FAIL verdict-batch (exit $rc)"
+  ((failed++))
+fi
+((total++))
+
+# build-verdict: lower-case ANSWER is accepted, a block for another criterion
+# and a \n escape in REASON make that criterion NEEDS_HUMAN.
+bv_out=$(python3 - <<'PY' | python3 .deadf/bin/build-verdict.py --nonce 4F2C9A --criteria AC1,AC2,AC3
+import json
+
+
+def block(ac, body, label=None):
+    return (f"<<<VERDICT:V1:{label or ac}:NONCE=4F2C9A>>>\n{body}\n"
+            f"<<<END_VERDICT:{label or ac}:NONCE=4F2C9A>>>\n")
+
+
+print(json.dumps([
+    ["AC1", block("AC1", 'ANSWER=yes\r\nREASON="tests pass\\tlocally"')],
+    ["AC2", block("AC2", 'ANSWER=YES\nREASON="ok"', label="AC9")],
+    ["AC3", block("AC3", 'ANSWER=NO\nREASON="two\\nlines"')],
+]))
+PY
+)
+rc=$?
+bv_ok=$(printf '%s' "$bv_out" | python3 -c '
+import json, sys
+doc = json.load(sys.stdin)
+c = doc["criteria"]
+print("yes" if doc["verdict"] == "NEEDS_HUMAN"
+      and c["AC1"] == {"answer": "YES", "reason": "tests pass\tlocally"}
+      and c["AC2"] == {"answer": "NEEDS_HUMAN", "reason": "criterion mismatch: block=AC9, expected=AC2"}
+      and c["AC3"] == {"answer": "NEEDS_HUMAN", "reason": "line 2: invalid escape \\n"} else "no")
+' 2>/dev/null)
+if [[ $rc -eq 0 && "$bv_ok" == "yes" ]]; then
+  echo "PASS build-verdict"
+  ((passed++))
+else
+  echo "FAIL build-verdict (exit $rc)"
+  ((failed++))
+fi
+((total++))
+
+# Acceptance lint: every rule hit (built-in and POLICY.yaml rules) with its offset.
+lint_out=$(sed -e 's/text="Nonce mismatch exits with code 2"/text="Improve startup, refactor the loader, etc."/' \
+  -e 's/text="parse-blocks.py plan emits JSON on valid input"/text="İmprove parse-blocks.py JSON output"/' \
+  "$fixtures_dir/plan-valid.txt" | DEADF_POLICY=POLICY.yaml python3 .deadf/bin/parse-blocks.py plan --nonce 4F2C9A)
+rc=$?
+lint_ok=$(printf '%s' "$lint_out" | python3 -c '
+import json, sys
+doc = json.load(sys.stdin)
+hits = [(h["id"], h["rule"], h["word"], h["offset"]) for h in doc["lint"]]
+want = [("AC1", "vague-verb", "improve", 0), ("AC2", "vague-verb", "improve", 0), ("AC2", "vague-verb", "refactor", 17),
+        ("AC2", "unmeasurable", "etc", 38)]
+# warnings keep their old shape: one message per item, for its first hit
+print("yes" if hits == want and doc["warnings"] == [
+    f"{ac} uses vague verb \x27improve\x27 without metrics" for ac in ("AC1", "AC2")] else "no")
+' 2>/dev/null)
+if [[ $rc -eq 0 && "$lint_ok" == "yes" ]]; then
+  echo "PASS plan-acceptance-lint"
+  ((passed++))
+else
+  echo "FAIL plan-acceptance-lint (exit $rc)"
+  ((failed++))
+fi
+((total++))
+
 echo "Summary: $passed passed, $failed failed, $total total"
 if [[ $failed -ne 0 ]]; then
   exit 1
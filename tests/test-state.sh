@@ -0,0 +1,168 @@
+#!/usr/bin/env bash
+# deadf-state.py set/compact/get against scratch STATE.yaml files: batch
+# writes, lazy compaction (threshold and --compact), journal-aware reads,
+# torn journal tails, replayed batches after a crash, the lock timeout and
+# compaction keeping the file mode.
+set -u
+set -o pipefail
+
+helper=".deadf/bin/deadf-state.py"
+passed=0
+failed=0
+total=0
+tmpdir=$(mktemp -d)
+trap 'rm -rf "$tmpdir"' EXIT
+
+# fresh_state NAME — a STATE.yaml with a running cycle, no journal
+fresh_state() {
+  local dir="$tmpdir/$1"
+  mkdir -p "$dir"
+  cat > "$dir/STATE.yaml" <<'YAML'
+phase: execute
+cycle:
+  status: running
+  id: cycle-7
+loop:
+  iteration: 3
+YAML
+  echo "$dir/STATE.yaml"
+}
+
+# check NAME EXPECTED_RC PYTHON-EXPR — run after `rc`/`out` are set; EXPR sees
+# `state` (STATE.yaml as parsed), `journal` (bool: STATE.journal exists) and `out`
+check() {
+  local name=$1 want_rc=$2 expr=$3
+  local ok
+  ok=$(OUT="$out" python3 - "$state" "$expr" <<'PY' 2>/dev/null
+import os
+import sys
+
+import yaml
+
+path, expr = sys.argv[1], sys.argv[2]
+with open(path, encoding="utf-8") as fh:
+    state = yaml.safe_load(fh)
+journal = os.path.exists(os.path.splitext(path)[0] + ".journal")
+out = os.environ["OUT"]
+print("yes" if eval(f"({expr})") else "no")
+PY
+)
+  if [[ $rc -eq $want_rc && "$ok" == "yes" ]]; then
+    echo "PASS $name"
+    ((passed++))
+  else
+    echo "FAIL $name (exit $rc, want $want_rc)"
+    printf '%s\n' "$out" | head -20
+    ((failed++))
+  fi
+  ((total++))
+}
+
+# One batch, typed and string values: journaled only, STATE.yaml untouched,
+# and get already sees it.
+state=$(fresh_state set)
+out=$(python3 "$helper" set --file "$state" "cycle.status=timed_out" "phase=needs_human" \
+  "loop.iteration:=4" "budget.tokens:=null" 2>&1 \
+  && python3 "$helper" get --file "$state" "cycle.status" "phase" "loop.iteration" "budget.tokens" 2>&1)
+rc=$?
+check "state-set-batch" 0 "out.split() == ['cycle_status=timed_out', 'phase=needs_human', 'loop_iteration=4',
+'budget_tokens=null'] and state['phase'] == 'execute' and 'budget' not in state and journal"
+
+# --compact folds the journal in at once, key order and the file mode kept.
+state=$(fresh_state set-compact)
+chmod 640 "$state"
+out=$(python3 "$helper" set --file "$state" "cycle.status=timed_out" "loop.iteration:=4" 2>&1 \
+  && python3 "$helper" set --file "$state" --compact "phase=needs_human" 2>&1)
+rc=$?
+check "state-set-compact" 0 "state == {'phase': 'needs_human', 'cycle': {'status': 'timed_out', 'id': 'cycle-7'},
+'loop': {'iteration': 4}} and list(state) == ['phase', 'cycle', 'loop'] and not journal
+and oct(os.stat(path).st_mode & 0o777) == '0o640'"
+
+# The journal is compacted by the write that brings it to 16 batches.
+state=$(fresh_state threshold)
+for i in $(seq 15); do
+  python3 "$helper" set --file "$state" "loop.iteration:=$i" >/dev/null 2>&1
+done
+out=$(wc -l < "${state%.yaml}.journal")
+rc=$?
+check "state-threshold-pending" 0 "out.strip() == '15' and state['loop']['iteration'] == 3 and journal"
+out=$(python3 "$helper" set --file "$state" "loop.iteration:=16" 2>&1)
+rc=$?
+check "state-threshold-compacts" 0 "state['loop']['iteration'] == 16 and not journal"
+
+# get applies batches still pending in the journal (a writer killed before compaction).
+state=$(fresh_state pending)
+printf '%s\n' '{"ts":"2026-02-03T04:11:40Z","set":[["cycle.status","timed_out"],["phase","needs_human"]]}' \
+  > "${state%.yaml}.journal"
+out=$(python3 "$helper" get --file "$state" "status=cycle.status" "phase" "id=cycle.id" 2>&1)
+rc=$?
+check "state-get-through-journal" 0 "out.split() == ['status=timed_out', 'phase=needs_human', 'id=cycle-7']
+and state['phase'] == 'execute' and journal"
+
+# A torn tail (no newline) is ignored by readers and trimmed by the next write.
+state=$(fresh_state torn)
+{
+  printf '%s\n' '{"ts":"2026-02-03T04:11:40Z","set":[["cycle.status","timed_out"]]}'
+  printf '%s' '{"ts":"2026-02-03T04:11:41Z","set":[["phase","compl'
+} > "${state%.yaml}.journal"
+out=$(python3 "$helper" get --file "$state" "status=cycle.status" "phase" 2>&1)
+rc=$?
+check "state-torn-tail-read" 0 "out.split() == ['status=timed_out', 'phase=execute']"
+out=$(python3 "$helper" set --file "$state" "loop.iteration:=9" 2>&1 && cat "${state%.yaml}.journal")
+rc=$?
+check "state-torn-tail-write" 0 "len(out.splitlines()) == 2 and out.endswith('[[\"loop.iteration\",9]]}')
+and 'compl' not in out"
+out=$(python3 "$helper" compact --file "$state" 2>&1)
+rc=$?
+check "state-torn-tail-compact" 0 "out.strip() == 'compacted 2 batch(es)'
+and state['cycle']['status'] == 'timed_out' and state['phase'] == 'execute'
+and state['loop']['iteration'] == 9 and not journal"
+
+# A crash between the rename and the journal removal: the batch is already in
+# STATE.yaml and is replayed on top of it without changing anything.
+state=$(fresh_state replay)
+python3 "$helper" set --file "$state" --compact "cycle.status=timed_out" "phase=needs_human" >/dev/null 2>&1
+cp "$state" "$tmpdir/replay-before.yaml"
+printf '%s\n' '{"ts":"2026-02-03T04:11:40Z","set":[["cycle.status","timed_out"],["phase","needs_human"]]}' \
+  > "${state%.yaml}.journal"
+out=$(python3 "$helper" compact --file "$state" 2>&1)
+rc=$?
+check "state-replayed-batch" 0 "out.strip() == 'compacted 1 batch(es)' and not journal
+and open(path, encoding='utf-8').read() == open('$tmpdir/replay-before.yaml', encoding='utf-8').read()"
+
+# Another writer holds STATE.yaml.flock: set gives up after --lock-timeout with exit 1.
+state=$(fresh_state locked)
+python3 - "$state.flock" <<'PY' &
+import fcntl
+import sys
+import time
+
+with open(sys.argv[1], "w") as fh:
+    fcntl.flock(fh, fcntl.LOCK_EX)
+    time.sleep(3)
+PY
+holder=$!
+for _ in $(seq 50); do  # until the holder has the lock
+  if [[ -e "$state.flock" ]] && ! python3 -c \
+      'import fcntl, sys; fcntl.flock(open(sys.argv[1]), fcntl.LOCK_EX | fcntl.LOCK_NB)' \
+      "$state.flock" 2>/dev/null; then
+    break
+  fi
+  sleep 0.05
+done
+out=$(python3 "$helper" set --file "$state" --lock-timeout 0.3 "phase=needs_human" 2>&1)
+rc=$?
+kill "$holder" 2>/dev/null
+wait "$holder" 2>/dev/null
+check "state-lock-timeout" 1 "'cannot acquire' in out and state['phase'] == 'execute' and not journal"
+
+# A malformed assignment is a usage error and writes nothing.
+state=$(fresh_state usage)
+out=$(python3 "$helper" set --file "$state" "phase" 2>&1)
+rc=$?
+check "state-set-usage" 2 "'invalid assignment' in out and state['phase'] == 'execute' and not journal"
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
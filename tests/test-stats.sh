@@ -0,0 +1,156 @@
+#!/usr/bin/env bash
+# deadf-stats.py against a scratch .deadf directory: incremental ingest of
+# complete lines only, exactly-once on re-runs, rotation of both sources past
+# 8 MiB (and a run killed right after the rename), the admission tail across a
+# rotation, and the report's cycle-time percentiles.
+set -u
+set -o pipefail
+
+helper="$PWD/.deadf/bin/deadf-stats.py"
+lib="$PWD/.deadf/lib"
+passed=0
+failed=0
+total=0
+tmpdir=$(mktemp -d)
+trap 'rm -rf "$tmpdir"' EXIT
+
+deadf="$tmpdir/p/.deadf"
+mkdir -p "$deadf/metrics" "$deadf/logs"
+cycles="$deadf/metrics/cycles.jsonl"
+kicks="$deadf/logs/cron-kick.jsonl"
+
+# emit FILE KIND FIRST LAST [PAD] — append records FIRST..LAST (cycle records
+# with wall_s = N, or cron-kick spawn events), each padded with PAD bytes
+emit() {
+  python3 - "$@" <<'PY'
+import json
+import sys
+import time
+
+path, kind, first, last = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+pad = "x" * int(sys.argv[5]) if len(sys.argv) > 5 else ""
+now = time.time() - 600
+with open(path, "a", encoding="utf-8") as fh:
+    for n in range(first, last + 1):
+        if kind == "cycle":
+            record = {"ts": now, "event": "cycle", "cycle_id": f"c{n}", "wall_s": float(n),
+                      "exit_code": 0 if n % 5 else 1, "pad": pad}
+        else:
+            record = {"ts": now, "level": "info", "event": "spawn", "cycle_id": f"c{n}", "pad": pad}
+        fh.write(json.dumps(record) + "\n")
+PY
+}
+
+# check NAME EXPECTED_RC PYTHON-EXPR — run after `rc`/`out` are set; EXPR sees
+# `ids(table)` (cycle ids stored in kick_events/cycle_events, in insert order),
+# `exists(path)`, `out` and `doc` (out parsed as JSON, or None)
+check() {
+  local name=$1 want_rc=$2 expr=$3
+  local ok
+  ok=$(OUT="$out" python3 - "$deadf" "$expr" <<'PY' 2>/dev/null
+import json
+import os
+import sqlite3
+import sys
+
+deadf, expr = sys.argv[1], sys.argv[2]
+db = sqlite3.connect(os.path.join(deadf, "metrics", "metrics.db"))
+out = os.environ["OUT"]
+try:
+    doc = json.loads(out)
+except ValueError:
+    doc = None
+exists = os.path.exists
+
+
+def ids(table):
+    return [int(r[0][1:]) for r in db.execute(f"SELECT cycle_id FROM {table} ORDER BY rowid")]
+
+
+print("yes" if eval(f"({expr})") else "no")
+PY
+)
+  if [[ $rc -eq $want_rc && "$ok" == "yes" ]]; then
+    echo "PASS $name"
+    ((passed++))
+  else
+    echo "FAIL $name (exit $rc, want $want_rc)"
+    printf '%s\n' "$out" | head -20
+    ((failed++))
+  fi
+  ((total++))
+}
+
+stats() { python3 "$helper" --deadf-dir "$deadf" "$@"; }
+
+# Incremental ingest: a partial last line waits for the next run.
+emit "$cycles" cycle 1 10
+printf '{"ts": %s, "event": "cycle", "cycle_id": "c11", "wa' "$(date +%s)" >> "$cycles"
+out=$(stats --ingest-only 2>&1)
+rc=$?
+check "stats-ingest-complete-lines" 0 "out == '' and ids('cycle_events') == list(range(1, 11))"
+
+out=$(stats --ingest-only 2>&1)
+rc=$?
+check "stats-ingest-rerun" 0 "ids('cycle_events') == list(range(1, 11))"
+
+printf 'll_s": 11.0, "exit_code": 0}\n' >> "$cycles"
+emit "$cycles" cycle 12 20
+out=$(stats --ingest-only 2>&1)
+rc=$?
+check "stats-ingest-appended" 0 "ids('cycle_events') == list(range(1, 21))"
+
+# Percentiles are nearest-rank over wall_s 1..20; every fifth cycle failed.
+out=$(stats --no-ingest --json 2>&1)
+rc=$?
+check "stats-report-percentiles" 0 "doc['cycles'] == 20 and doc['failed_cycles'] == 4
+and doc['cycle_wall_s'] == {'p50': 10.0, 'p95': 19.0, 'max': 20.0}"
+
+# Rotation: cycles.jsonl past 8 MiB moves to .1 once ingested; the new file
+# starts from zero and nothing is stored twice.
+emit "$cycles" cycle 21 8300 1000
+out=$(stats --ingest-only 2>&1)
+rc=$?
+check "stats-rotate-cycles" 0 "ids('cycle_events') == list(range(1, 8301))
+and exists('$cycles.1') and not exists('$cycles')"
+
+emit "$cycles" cycle 8301 8305
+out=$(stats --ingest-only 2>&1)
+rc=$?
+check "stats-rotate-rerun" 0 "ids('cycle_events') == list(range(1, 8306))"
+
+# Admission control reads the end of .1 when the new file is shorter than its tail.
+out=$(python3 - "$lib" "$cycles" <<'PY' 2>&1
+import sys
+
+sys.path.insert(0, sys.argv[1])
+from deadf.admission.metrics import read_recent
+
+records = read_recent(sys.argv[2], tail_bytes=64 * 1024)
+print(" ".join(r["cycle_id"] for r in records))
+PY
+)
+rc=$?
+check "stats-tail-across-rotation" 0 "out.split()[-5:] == ['c8301', 'c8302', 'c8303', 'c8304', 'c8305']
+and out.split()[-6] == 'c8300' and 40 < len(out.split()) < 70"
+
+# Killed after the rename: cron-kick.jsonl was ingested up to k10, got k11..k20,
+# then was renamed to .1 before those were read. The next run finishes .1 from
+# the stored offset and starts the new file from zero.
+emit "$kicks" kick 1 10
+out=$(stats --ingest-only 2>&1)
+emit "$kicks" kick 11 20
+mv "$kicks" "$kicks.1"
+emit "$kicks" kick 21 25
+out=$(stats --ingest-only 2>&1)
+rc=$?
+check "stats-crash-after-rename" 0 "ids('kick_events') == list(range(1, 26))"
+
+out=$(stats --ingest-only 2>&1)
+rc=$?
+check "stats-crash-after-rename-rerun" 0 "ids('kick_events') == list(range(1, 26))"
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
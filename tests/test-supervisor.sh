@@ -0,0 +1,178 @@
+#!/usr/bin/env bash
+# deadf-supervisor.py against scratch projects whose cron-kick.sh is a fake
+# that sleeps and exits with a chosen code: discovery, readiness, fairness
+# ordering, the concurrency cap, backoff, the timeout kill (without stalling
+# the other projects) and the supervisor.log cap.
+set -u
+set -o pipefail
+
+helper="$PWD/.deadf/bin/deadf-supervisor.py"
+passed=0
+failed=0
+total=0
+tmpdir=$(mktemp -d)
+trap 'rm -rf "$tmpdir"' EXIT
+
+# project ROOT NAME SLEEP EXIT [STATE-YAML] — a project whose cron-kick.sh
+# appends "start NAME T" / "end NAME T" to ROOT/runs.log around `sleep SLEEP`
+project() {
+  local root=$1 name=$2 sleep_s=$3 code=$4
+  local state=${5:-$'phase: execute\ncycle:\n  status: idle\nloop:\n  iteration: 1'}
+  local dir="$root/$name"
+  mkdir -p "$dir/.deadf/state" "$dir/.deadf/bin"
+  printf '%s\n' "$state" > "$dir/.deadf/state/STATE.yaml"
+  cat > "$dir/.deadf/bin/cron-kick.sh" <<SH
+#!/usr/bin/env bash
+${FAKE_PRELUDE:-}
+echo "start $name \$(date +%s.%N)" >> "$root/runs.log"
+sleep $sleep_s
+echo "end $name \$(date +%s.%N)" >> "$root/runs.log"
+exit $code
+SH
+  chmod +x "$dir/.deadf/bin/cron-kick.sh"
+}
+
+# check NAME PYTHON-EXPR — EXPR sees `events` (the supervisor's JSON events),
+# `runs` ([(start|end, name, t)] from runs.log) and `out`
+check() {
+  local name=$1 expr=$2
+  local ok
+  ok=$(OUT="$out" python3 - "$root" "$expr" <<'PY' 2>/dev/null
+import json
+import os
+import sys
+
+root, expr = sys.argv[1], sys.argv[2]
+events = []
+if os.path.exists(os.path.join(root, "events.jsonl")):
+    with open(os.path.join(root, "events.jsonl"), encoding="utf-8") as fh:
+        events = [json.loads(line) for line in fh]
+runs = []
+if os.path.exists(os.path.join(root, "runs.log")):
+    with open(os.path.join(root, "runs.log"), encoding="utf-8") as fh:
+        runs = [(kind, name, float(t)) for kind, name, t in (line.split() for line in fh)]
+out = os.environ["OUT"]
+
+
+def dispatched(name=None):
+    return [os.path.basename(e["project_path"]) for e in events if e["event"] == "dispatch"
+            and (name is None or os.path.basename(e["project_path"]) == name)]
+
+
+def max_overlap():
+    level = peak = 0
+    for kind, _, _ in sorted(runs, key=lambda r: (r[2], r[0] == "start")):
+        level += 1 if kind == "start" else -1
+        peak = max(peak, level)
+    return peak
+
+
+print("yes" if eval(f"({expr})") else "no")
+PY
+)
+  if [[ "$ok" == "yes" ]]; then
+    echo "PASS $name"
+    ((passed++))
+  else
+    echo "FAIL $name"
+    printf '%s\n' "$out" | head -20
+    ((failed++))
+  fi
+  ((total++))
+}
+
+# run_for SECONDS ARGS... — a long-running supervisor, stopped with SIGTERM
+run_for() {
+  local seconds=$1; shift
+  python3 "$helper" --log "$root/events.jsonl" "$@" &
+  local pid=$!
+  sleep "$seconds"
+  kill -TERM "$pid" 2>/dev/null
+  wait "$pid"
+}
+
+# Discovery: projects up to --max-depth, not inside another project, not in
+# pruned directories, and only with an executable cron-kick.sh.
+root="$tmpdir/discover"
+project "$root" a 0 0
+project "$root" group/b 0 0
+project "$root" group/deep/deeper/c 0 0
+project "$root" a/nested 0 0
+project "$root" node_modules/d 0 0
+project "$root" e 0 0
+chmod -x "$root/e/.deadf/bin/cron-kick.sh"
+out=$(python3 "$helper" --root "$root" --max-depth 3 --list 2>&1)
+check "supervisor-discovery" "out.split() == [root + '/a', root + '/group/b']"
+
+# Readiness: only the idle project is kicked; every other one reports why not.
+root="$tmpdir/ready"
+project "$root" ok 0 0
+project "$root" human 0 0 $'phase: needs_human'
+project "$root" done 0 0 $'phase: complete'
+project "$root" running 0 0 $'phase: execute\ncycle:\n  status: running'
+project "$root" research 0 0 $'phase: research'
+project "$root" maxed 0 0 $'phase: execute\nloop:\n  iteration: 5\n  max_iterations: 5'
+project "$root" budget 0 0 $'phase: execute\nbudget:\n  started_at: "2020-01-01T00:00:00Z"\n  max_hours: 1'
+out=$(python3 "$helper" --root "$root" --log "$root/events.jsonl" --once 2>&1)
+check "supervisor-readiness" "dispatched() == ['ok']
+and {os.path.basename(e['project_path']): e['reason'] for e in events if e['event'] == 'blocked'}
+== {'human': 'needs_human', 'done': 'complete', 'running': 'cycle_running',
+    'research': 'needs_init', 'maxed': 'max_iterations', 'budget': 'budget_exhausted'}"
+
+# Fairness: with one slot, every ready project gets a cycle before any gets a second.
+root="$tmpdir/fair"
+project "$root" p1 0 0
+project "$root" p2 0 0
+project "$root" p3 0 0
+out=$(run_for 3 --root "$root" --max-concurrent 1 --interval 0.05 2>&1)
+check "supervisor-fairness" "len(dispatched()) >= 6
+and all(dispatched()[i:i + 3] == ['p1', 'p2', 'p3'] for i in range(0, len(dispatched()) - 2, 3))"
+
+# Concurrency cap: four 1s cycles, two slots.
+root="$tmpdir/cap"
+for name in c1 c2 c3 c4; do project "$root" "$name" 1 0; done
+out=$(python3 "$helper" --root "$root" --log "$root/events.jsonl" --max-concurrent 2 --once 2>&1)
+check "supervisor-concurrency-cap" "sorted(dispatched()) == ['c1', 'c2', 'c3', 'c4'] and max_overlap() == 2
+and max(e['running'] for e in events if e['event'] == 'dispatch') == 2"
+
+# Backoff: an erroring project (exit 20) waits 5s after its first failure,
+# while a healthy one keeps being kicked; an admission deferral (exit 16) waits 60s.
+root="$tmpdir/backoff"
+project "$root" bad 0 20
+project "$root" deferred 0 16
+project "$root" good 0 0
+out=$(run_for 2 --root "$root" --max-concurrent 3 --interval 0.05 2>&1)
+check "supervisor-backoff" "dispatched('bad') == ['bad'] and dispatched('deferred') == ['deferred']
+and len(dispatched('good')) > 3
+and [(e['reason'], e['failures'], e['backoff_s']) for e in events
+     if e['event'] == 'error' and e['project_path'].endswith('/bad')] == [('preflight_or_state_error', 1, 5)]
+and [e['reason'] for e in events if e['event'] == 'skip'] == ['admission_deferred']"
+
+# Timeout: a cycle that ignores SIGTERM is SIGKILLed after --kill-grace, and
+# the other project keeps being kicked during the grace period.
+root="$tmpdir/timeout"
+FAKE_PRELUDE="trap '' TERM" project "$root" stuck 30 0
+project "$root" quick 0 0
+out=$(run_for 6 --root "$root" --max-concurrent 2 --cycle-timeout 1 --kill-grace 3 --interval 0.05 2>&1)
+check "supervisor-timeout-kill" "[e['event'] for e in events if e['project_path'].endswith('/stuck')]
+== ['discovered', 'dispatch', 'cycle_timeout', 'error']
+and [(e['reason'], e['exit_code']) for e in events
+     if e['event'] == 'error' and e['project_path'].endswith('/stuck')] == [('cycle_timeout', -9)]
+and 3.5 <= [e for e in events if e['event'] == 'error'][0]['elapsed_s'] < 5
+and ('end', 'stuck') not in [(k, n) for k, n, _ in runs]
+and any(t0 + 1.5 < t < t0 + 3.5 for t0 in [t for k, n, t in runs if n == 'stuck']
+        for k, n, t in runs if (k, n) == ('start', 'quick'))"
+
+# supervisor.log past 8 MiB moves to supervisor.log.1 at the next dispatch.
+root="$tmpdir/childlog"
+project "$root" big 0 0
+mkdir -p "$root/big/.deadf/logs"
+truncate -s 9M "$root/big/.deadf/logs/supervisor.log"
+out=$(python3 "$helper" --root "$root" --log "$root/events.jsonl" --once 2>&1)
+check "supervisor-log-cap" "os.path.getsize(root + '/big/.deadf/logs/supervisor.log.1') == 9 * 1024 * 1024
+and 0 < os.path.getsize(root + '/big/.deadf/logs/supervisor.log') < 1024"
+
+echo "Summary: $passed passed, $failed failed, $total total"
+if [[ $failed -ne 0 ]]; then
+  exit 1
+fi
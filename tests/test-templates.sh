@@ -32,6 +32,15 @@ else
   report_fail "lint-templates (exit $rc)"
 fi
 
+# 1b) Manifest digests (every file re-hashed, no cache)
+python3 .deadf/bin/lint-templates.py --integrity --no-cache >/dev/null 2>&1
+rc=$?
+if [[ $rc -eq 0 ]]; then
+  report_pass "manifest-integrity"
+else
+  report_fail "manifest-integrity (exit $rc)"
+fi
+
 # 2) Manifest count vs disk count
 mapfile -t manifest_paths < <(
   python3 - "$MANIFEST_PATH" <<'PY'
@@ -105,6 +114,84 @@ for entry in "${sample_hashes[@]}"; do
   fi
 done
 
+# 4) Template index on a scratch copy of .deadf: only changed templates are
+# re-read, and --used-by and the orphan lists follow edits, additions and removals.
+scratch=$(mktemp -d)
+trap 'rm -rf "$scratch"' EXIT
+mkdir -p "$scratch/.deadf"
+cp -r .deadf/bin .deadf/lib .deadf/contracts .deadf/templates .deadf/manifest.yaml "$scratch/.deadf/"
+find "$scratch/.deadf" -exec touch -d '-1 hour' {} +
+
+# index_check NAME EXPECTED_RC PYTHON-EXPR — runs `lint-templates.py --json`
+# on the scratch copy; EXPR sees the report as `doc` and `used_by(GRAMMAR)`
+index_check() {
+  local name=$1 want_rc=$2 expr=$3
+  local out rc ok
+  out=$(python3 .deadf/bin/lint-templates.py --root "$scratch" --json 2>&1)
+  rc=$?
+  ok=$(OUT="$out" python3 - "$scratch" "$expr" <<'PY' 2>/dev/null
+import json
+import os
+import subprocess
+import sys
+
+scratch, expr = sys.argv[1], sys.argv[2]
+doc = json.loads(os.environ["OUT"])
+
+
+def used_by(grammar):
+    return subprocess.run([sys.executable, ".deadf/bin/lint-templates.py", "--root", scratch,
+                           "--used-by", grammar], capture_output=True, text=True).stdout.split()
+
+
+print("yes" if eval(f"({expr})") else "no")
+PY
+)
+  if [[ $rc -eq $want_rc && "$ok" == "yes" ]]; then
+    report_pass "$name"
+  else
+    report_fail "$name (exit $rc, want $want_rc)"
+    printf '%s\n' "$out" | head -20
+  fi
+}
+
+index_check "index-first-scan" 0 "doc['templates']['reparsed'] == doc['templates']['count'] > 20
+and used_by('diagnostic.v1.md') == ['repair/auto-diagnose.md'] and doc['orphaned_grammars'] == []"
+
+index_check "index-unchanged" 0 "doc['templates']['reparsed'] == 0"
+
+touch -d '-10 minutes' "$scratch/.deadf/templates/verify/reflect.md"
+index_check "index-touched" 0 "doc['templates']['reparsed'] == 1
+and doc['templates']['references']['verify/reflect.md'] == ['reflect.v1.md']"
+
+# A new opener in one template: reparsed once, and its grammar is missing.
+printf '<<<AUDIT:V1:NONCE={nonce}>>>\n<<<END_AUDIT:NONCE={nonce}>>>\n' \
+  >> "$scratch/.deadf/templates/verify/reflect.md"
+touch -d '-5 minutes' "$scratch/.deadf/templates/verify/reflect.md"
+index_check "index-edited" 1 "doc['templates']['reparsed'] == 1
+and doc['templates']['references']['verify/reflect.md'] == ['audit.v1.md', 'reflect.v1.md']
+and doc['missing_grammars'] == [{'template': 'verify/reflect.md', 'grammar': 'audit.v1.md'}]"
+
+# Adding the grammar changes only the grammar list; nothing is re-read.
+printf '# AUDIT v1\n' > "$scratch/.deadf/contracts/sentinel/audit.v1.md"
+index_check "index-grammar-added" 0 "doc['templates']['reparsed'] == 0 and doc['missing_grammars'] == []
+and used_by('audit.v1.md') == ['verify/reflect.md']"
+
+# Orphaned grammars: one nobody opens, and one whose only template stops opening it.
+printf '# UNUSED v1\n' > "$scratch/.deadf/contracts/sentinel/unused.v1.md"
+sed -i '/DIAGNOSTIC:V1/d' "$scratch/.deadf/templates/repair/auto-diagnose.md"
+touch -d '-5 minutes' "$scratch/.deadf/templates/repair/auto-diagnose.md"
+index_check "index-orphaned-grammar" 1 "doc['templates']['reparsed'] == 1
+and doc['orphaned_grammars'] == ['diagnostic.v1.md', 'unused.v1.md']
+and used_by('diagnostic.v1.md') == [] and used_by('audit.v1.md') == ['verify/reflect.md']"
+
+# A removed template drops out of the references and of used_by.
+rm "$scratch/.deadf/templates/verify/reflect.md"
+index_check "index-template-removed" 1 "doc['templates']['reparsed'] == 0
+and 'verify/reflect.md' not in doc['templates']['references']
+and doc['orphaned_grammars'] == ['audit.v1.md', 'diagnostic.v1.md', 'reflect.v1.md', 'unused.v1.md']
+and used_by('reflect.v1.md') == []"
+
 echo "Summary: $passed passed, $failed failed, $total total"
 if [[ $failed -ne 0 ]]; then
   exit 1